@@ -46,6 +46,12 @@ except Exception as e:
 
 print(f"🔍 DEBUG: Final sample_documents value: {sample_documents}")
 
+# Conversation memory keeps a write-behind cache that must be flushed on shutdown
+try:
+    from .modules.conversation_memory import conversation_memory
+except ImportError:
+    conversation_memory = None
+
 # Create FastAPI app
 app = FastAPI(title="Interpreter Service", version="1.0.0")
 
@@ -408,6 +414,13 @@ class SimpleOrchestratorIntegration:
 
 orchestrator_integration = SimpleOrchestratorIntegration()
 
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Write pending conversation changes back to memory-agent."""
+    if conversation_memory is not None:
+        await conversation_memory.close()
+
 # ============================================================================
 # CORE ENDPOINTS
 # ============================================================================
@@ -26,6 +26,12 @@ from services.shared.core.constants_new import ServiceNames
 from services.shared.monitoring.logging import fire_and_forget
 from services.shared.intelligent_caching import get_service_cache
 
+# Text patterns used per request, compiled once
+_WHITESPACE_RE = re.compile(r'\s+')
+_PUNCTUATION_RE = re.compile(r'[^\w\s\?\.\!\,\:\;\'\"]')
+_FILE_PATH_RE = re.compile(r'[\w\-\.\/]+\.[\w]+')
+_DATE_RE = re.compile(r'\b\d{1,2}/\d{1,2}/\d{4}\b')
+
 
 class ConversationState(Enum):
     """Conversation states for advanced dialogue management."""
@@ -414,6 +420,7 @@ class AdvancedIntentRecognizer:
 
     def __init__(self):
         self.intent_patterns: Dict[str, List[Dict[str, Any]]] = self._load_intent_patterns()
+        self._compile_intent_patterns()
         self.entity_extractors: Dict[str, Callable] = self._load_entity_extractors()
         self.context_analyzer = ContextAnalyzer()
 
@@ -447,6 +454,13 @@ class AdvancedIntentRecognizer:
             ]
         }
 
+    def _compile_intent_patterns(self):
+        """Compile intent patterns once; call again after editing ``intent_patterns``."""
+        self._compiled_intent_patterns = [
+            (intent, [(re.compile(info["pattern"], re.IGNORECASE), info["weight"]) for info in patterns])
+            for intent, patterns in self.intent_patterns.items()
+        ]
+
     def _load_entity_extractors(self) -> Dict[str, Callable]:
         """Load entity extraction functions."""
         return {
@@ -518,10 +532,10 @@ class AdvancedIntentRecognizer:
         text = text.lower()
 
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _WHITESPACE_RE.sub(' ', text).strip()
 
         # Remove punctuation (keep some for context)
-        text = re.sub(r'[^\w\s\?\.\!\,\:\;\'\"]', '', text)
+        text = _PUNCTUATION_RE.sub('', text)
 
         return text
 
@@ -529,15 +543,12 @@ class AdvancedIntentRecognizer:
         """Calculate intent scores based on pattern matching."""
         scores = {}
 
-        for intent, patterns in self.intent_patterns.items():
+        for intent, patterns in self._compiled_intent_patterns:
             score = 0.0
             matches = 0
 
-            for pattern_info in patterns:
-                pattern = pattern_info["pattern"]
-                weight = pattern_info["weight"]
-
-                if re.search(pattern, text, re.IGNORECASE):
+            for pattern, weight in patterns:
+                if pattern.search(text):
                     score += weight
                     matches += 1
 
@@ -657,15 +668,13 @@ class AdvancedIntentRecognizer:
     def _extract_file_path(self, text: str) -> Optional[str]:
         """Extract file path from text."""
         # Simple path pattern matching
-        path_pattern = r'[\w\-\.\/]+\.[\w]+'
-        match = re.search(path_pattern, text)
+        match = _FILE_PATH_RE.search(text)
         return match.group(0) if match else None
 
     def _extract_date_range(self, text: str) -> Optional[Dict[str, str]]:
         """Extract date range from text."""
         # Simple date pattern matching
-        date_pattern = r'\b\d{1,2}/\d{1,2}/\d{4}\b'
-        dates = re.findall(date_pattern, text)
+        dates = _DATE_RE.findall(text)
 
         if len(dates) >= 2:
             return {"start_date": dates[0], "end_date": dates[1]}
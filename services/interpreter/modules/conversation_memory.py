@@ -6,37 +6,34 @@ Enables the interpreter to maintain context, learn from previous queries,
 and provide more intelligent responses based on conversation history.
 """
 
+import asyncio
 import json
 import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from collections import defaultdict, deque
 from services.shared.clients import ServiceClients
 from services.shared.constants_new import ServiceNames
 from services.shared.logging import fire_and_forget
 
+try:
+    from .session_cache import WriteBehindSessionCache, STORED, FAILED
+except ImportError:
+    from session_cache import WriteBehindSessionCache, STORED, FAILED
+
 
 class ConversationMemory:
     """Manages conversation context and memory for enhanced user interactions."""
 
-    def __init__(self):
+    def __init__(self, max_cached_users: int = 1024, flush_interval_seconds: float = 5.0,
+                 max_dirty_users: int = 100):
         self.client = ServiceClients()
         self.memory_agent_url = "http://memory-agent:5030"
         self.interpreter_namespace = "interpreter_conversations"
 
-        # Local cache for performance (backed by memory-agent)
-        self.cache = defaultdict(lambda: {
-            "sessions": deque(maxlen=10),  # Keep last 10 sessions in cache
-            "preferences": {},
-            "domain_context": {},
-            "recent_workflows": deque(maxlen=20),
-            "frequent_patterns": defaultdict(int),
-            "last_activity": None,
-            "total_interactions": 0
-        })
-
         # Global conversation patterns (also cached)
         self.global_patterns = defaultdict(int)
+        self._global_patterns_dirty = False
         self.workflow_transitions = defaultdict(lambda: defaultdict(int))
 
         # Context expiration settings
@@ -44,9 +41,32 @@ class ConversationMemory:
         self.context_retention = timedelta(days=7)
         self.cache_ttl = timedelta(minutes=30)  # Cache validity period
 
+        # Local write-behind cache (backed by memory-agent): turns are applied
+        # locally and written back in batches
+        self.cache = WriteBehindSessionCache(
+            loader=self._load_user_context_from_memory,
+            writer=self._store_user_contexts,
+            max_entries=max_cached_users,
+            ttl_seconds=self.cache_ttl.total_seconds(),
+            flush_interval_seconds=flush_interval_seconds,
+            max_dirty=max_dirty_users
+        )
+
         # Initialize memory-agent connection
         self.memory_agent_available = False
 
+    @staticmethod
+    def _empty_user_context() -> Dict[str, Any]:
+        return {
+            "sessions": deque(maxlen=10),  # Keep last 10 sessions in cache
+            "preferences": {},
+            "domain_context": {},
+            "recent_workflows": deque(maxlen=20),
+            "frequent_patterns": defaultdict(int),
+            "last_activity": None,
+            "total_interactions": 0
+        }
+
     async def _check_memory_agent_availability(self) -> bool:
         """Check if memory-agent service is available."""
         try:
@@ -61,19 +81,22 @@ class ConversationMemory:
     # MEMORY-AGENT INTEGRATION METHODS
     # ============================================================================
 
+    def _memory_payload(self, key: str, data: Any, ttl_seconds: Optional[int] = None) -> Dict[str, Any]:
+        payload = {
+            "key": f"{self.interpreter_namespace}:{key}",
+            "data": data,
+            "namespace": self.interpreter_namespace
+        }
+
+        if ttl_seconds:
+            payload["ttl_seconds"] = ttl_seconds
+
+        return payload
+
     async def _store_memory(self, key: str, data: Any, ttl_seconds: Optional[int] = None) -> bool:
         """Store data in memory-agent with optional TTL."""
         try:
-            memory_key = f"{self.interpreter_namespace}:{key}"
-
-            payload = {
-                "key": memory_key,
-                "data": data,
-                "namespace": self.interpreter_namespace
-            }
-
-            if ttl_seconds:
-                payload["ttl_seconds"] = ttl_seconds
+            payload = self._memory_payload(key, data, ttl_seconds)
 
             response = await self.client.post_json(f"{self.memory_agent_url}/memory/store", payload)
 
@@ -88,6 +111,19 @@ class ConversationMemory:
             )
             return False
 
+    async def _store_memories(self, items: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Store several items concurrently, one memory-agent call each.
+
+        Each item holds ``key``, ``data`` and optionally ``ttl_seconds``.
+        Returns an outcome per key: stored or failed. memory-agent has no batch
+        or conditional write, so the last write of a key wins.
+        """
+        stored = await asyncio.gather(*(
+            self._store_memory(item["key"], item["data"], item.get("ttl_seconds"))
+            for item in items
+        ))
+        return {item["key"]: STORED if ok else FAILED for item, ok in zip(items, stored)}
+
     async def _retrieve_memory(self, key: str) -> Optional[Any]:
         """Retrieve data from memory-agent."""
         try:
@@ -156,28 +192,23 @@ class ConversationMemory:
             return []
 
     async def _load_user_context_from_memory(self, user_id: str) -> Dict[str, Any]:
-        """Load user conversation context from memory-agent."""
+        """Load user conversation context from memory-agent, bypassing the local cache."""
         try:
             context_key = f"user_context:{user_id}"
             stored_context = await self._retrieve_memory(context_key)
 
             if stored_context:
-                # Convert stored data back to appropriate types
-                if "sessions" in stored_context:
-                    # Reconstruct deque from list
-                    sessions_list = stored_context["sessions"]
-                    stored_context["sessions"] = deque(sessions_list, maxlen=10)
+                context = self._empty_user_context()
+                context.update(stored_context)
 
-                if "recent_workflows" in stored_context:
-                    workflows_list = stored_context["recent_workflows"]
-                    stored_context["recent_workflows"] = deque(workflows_list, maxlen=20)
-
-                if "frequent_patterns" in stored_context:
-                    stored_context["frequent_patterns"] = defaultdict(int, stored_context["frequent_patterns"])
+                # Convert stored data back to appropriate types
+                context["sessions"] = deque(context["sessions"], maxlen=10)
+                context["recent_workflows"] = deque(context["recent_workflows"], maxlen=20)
+                context["frequent_patterns"] = defaultdict(int, context["frequent_patterns"])
 
-                return stored_context
+                return context
 
-            return self.cache[user_id]  # Return empty cache structure
+            return self._empty_user_context()
 
         except Exception as e:
             fire_and_forget(
@@ -186,39 +217,78 @@ class ConversationMemory:
                 ServiceNames.INTERPRETER,
                 {"user_id": user_id, "error": str(e)}
             )
-            return self.cache[user_id]
+            return self._empty_user_context()
 
-    async def _save_user_context_to_memory(self, user_id: str, context: Dict[str, Any]) -> bool:
-        """Save user conversation context to memory-agent."""
-        try:
-            # Prepare data for storage (convert deques to lists)
-            storage_data = context.copy()
+    async def _get_user_data(self, user_id: str) -> Dict[str, Any]:
+        """User conversation context, read through the local cache."""
+        return await self.cache.get(user_id)
 
-            if "sessions" in storage_data:
-                storage_data["sessions"] = list(storage_data["sessions"])
+    def _serialize_user_context(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Prepare data for storage (convert deques to lists)."""
+        storage_data = context.copy()
 
-            if "recent_workflows" in storage_data:
-                storage_data["recent_workflows"] = list(storage_data["recent_workflows"])
+        if "sessions" in storage_data:
+            storage_data["sessions"] = list(storage_data["sessions"])
 
-            if "frequent_patterns" in storage_data:
-                storage_data["frequent_patterns"] = dict(storage_data["frequent_patterns"])
+        if "recent_workflows" in storage_data:
+            storage_data["recent_workflows"] = list(storage_data["recent_workflows"])
 
-            context_key = f"user_context:{user_id}"
+        if "frequent_patterns" in storage_data:
+            storage_data["frequent_patterns"] = dict(storage_data["frequent_patterns"])
 
-            # Store with 7-day TTL (context_retention)
-            ttl_seconds = int(self.context_retention.total_seconds())
+        return storage_data
 
-            return await self._store_memory(context_key, storage_data, ttl_seconds)
+    async def _store_user_contexts(self, contexts: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, str]:
+        """Write dirty user contexts (and global patterns) to memory-agent."""
+        # Store with 7-day TTL (context_retention)
+        ttl_seconds = int(self.context_retention.total_seconds())
 
-        except Exception as e:
-            fire_and_forget(
-                "memory_agent_save_error",
-                f"Failed to save user context to memory: {str(e)}",
-                ServiceNames.INTERPRETER,
-                {"user_id": user_id, "error": str(e)}
-            )
+        items = [
+            {
+                "key": f"user_context:{user_id}",
+                "data": self._serialize_user_context(context),
+                "ttl_seconds": ttl_seconds
+            }
+            for user_id, context in contexts
+        ]
+
+        include_global = self._global_patterns_dirty
+        if include_global:
+            items.append({"key": "global_patterns", "data": dict(self.global_patterns)})
+            self._global_patterns_dirty = False
+
+        outcomes = await self._store_memories(items)
+
+        if include_global and outcomes.get("global_patterns") != STORED:
+            self._global_patterns_dirty = True
+
+        return {
+            user_id: outcomes.get(f"user_context:{user_id}", FAILED)
+            for user_id, _ in contexts
+        }
+
+    async def flush(self, user_id: Optional[str] = None) -> Dict[str, str]:
+        """Write pending conversation changes to memory-agent now."""
+        return await self.cache.flush([user_id] if user_id else None)
+
+    async def end_session(self, user_id: str) -> bool:
+        """Close the user's current session and write it back immediately."""
+        if not user_id:
             return False
 
+        def close_session(user_data: Dict[str, Any]):
+            if user_data["sessions"] and user_data["sessions"][-1].get("active", False):
+                user_data["sessions"][-1]["active"] = False
+                user_data["sessions"][-1]["end_time"] = datetime.utcnow().isoformat()
+
+        await self.cache.update(user_id, close_session)
+        outcomes = await self.flush(user_id)
+        return outcomes.get(user_id) == STORED
+
+    async def close(self):
+        """Flush all pending changes; call on service shutdown."""
+        await self.cache.close()
+
     async def _load_global_patterns_from_memory(self) -> Dict[str, int]:
         """Load global conversation patterns from memory-agent."""
         try:
@@ -262,15 +332,21 @@ class ConversationMemory:
             return {}
 
         try:
-            # Try to load from memory-agent first, then fall back to cache
-            user_data = await self._load_user_context_from_memory(user_id)
+            # Served from the local cache; memory-agent is only read on a miss
+            user_data = await self._get_user_data(user_id)
 
-            # Check if context has expired
-            last_activity = user_data.get("last_activity")
-            if last_activity and datetime.fromisoformat(last_activity) < datetime.utcnow() - self.session_timeout:
-                await self._start_new_session(user_id)
-                # Reload updated context
-                user_data = await self._load_user_context_from_memory(user_id)
+            # Check if context has expired; the expired session is written
+            # back before a new one replaces it
+            if self._is_session_expired(user_data):
+                await self.end_session(user_id)
+
+                def restart_expired_session(data: Dict[str, Any]):
+                    if self._is_session_expired(data):
+                        new_session = self._start_new_session(data, user_id)
+                        data["last_activity"] = new_session["start_time"]
+
+                await self.cache.update(user_id, restart_expired_session)
+                user_data = await self._get_user_data(user_id)
 
             # Build current context
             current_session = user_data["sessions"][-1] if user_data["sessions"] else {}
@@ -305,18 +381,8 @@ class ConversationMemory:
             if not user_id:
                 return False
 
-            # Load current user data from memory
-            user_data = await self._load_user_context_from_memory(user_id)
             current_time = datetime.utcnow().isoformat()
 
-            # Ensure we have a current session
-            if not user_data["sessions"] or self._is_new_session_needed(user_data):
-                await self._start_new_session(user_id)
-                # Reload after session creation
-                user_data = await self._load_user_context_from_memory(user_id)
-
-            current_session = user_data["sessions"][-1]
-
             # Create interaction record
             interaction = {
                 "timestamp": current_time,
@@ -330,28 +396,45 @@ class ConversationMemory:
                 "intent": result.get("intent", "unknown")
             }
 
-            # Add to current session
-            if "interactions" not in current_session:
-                current_session["interactions"] = []
-            current_session["interactions"].append(interaction)
+            # A session that timed out or filled up ends here: write it back now
+            # rather than leaving it to the next batch
+            user_data = await self._get_user_data(user_id)
+            if user_data["sessions"] and self._is_new_session_needed(user_data):
+                await self.end_session(user_id)
+
+            def apply_interaction(user_data: Dict[str, Any]) -> Dict[str, Any]:
+                # Ensure we have a current session
+                if not user_data["sessions"] or self._is_new_session_needed(user_data):
+                    self._start_new_session(user_data, user_id)
 
-            # Update user statistics
-            user_data["total_interactions"] += 1
-            user_data["last_activity"] = current_time
-            user_data["recent_workflows"].append(workflow_name)
+                current_session = user_data["sessions"][-1]
 
-            # Update patterns
-            await self._update_patterns(user_id, query, workflow_name, interaction)
+                # Add to current session
+                if "interactions" not in current_session:
+                    current_session["interactions"] = []
+                current_session["interactions"].append(dict(interaction))
 
-            # Update preferences based on successful interactions
-            if result.get("status") == "success":
-                await self._update_preferences(user_id, workflow_name, interaction)
+                # Update user statistics
+                user_data["total_interactions"] += 1
+                user_data["last_activity"] = current_time
+                user_data["recent_workflows"].append(workflow_name)
 
-            # Update domain context
-            await self._update_domain_context(user_id, workflow_name, interaction)
+                # Update user patterns
+                self._update_user_patterns(user_data, query)
 
-            # Save updated context to memory-agent
-            await self._save_user_context_to_memory(user_id, user_data)
+                # Update preferences based on successful interactions
+                if result.get("status") == "success":
+                    self._update_preferences(user_data, workflow_name, interaction)
+
+                # Update domain context
+                self._update_domain_context(user_data, workflow_name)
+                return current_session
+
+            # Applied to the cached context now; written back to memory-agent in a later batch
+            current_session = await self.cache.update(user_id, apply_interaction)
+
+            user_data = await self._get_user_data(user_id)
+            self._update_global_patterns(query, workflow_name, list(user_data["recent_workflows"]))
 
             fire_and_forget(
                 "conversation_updated",
@@ -375,11 +458,8 @@ class ConversationMemory:
             )
             return False
 
-    async def _start_new_session(self, user_id: str) -> Dict[str, Any]:
-        """Start a new conversation session for a user."""
-        # Load current user data from memory
-        user_data = await self._load_user_context_from_memory(user_id)
-
+    def _start_new_session(self, user_data: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+        """Start a new conversation session in the user's context."""
         new_session = {
             "session_id": f"{user_id}_{int(time.time())}",
             "start_time": datetime.utcnow().isoformat(),
@@ -388,18 +468,19 @@ class ConversationMemory:
             "active": True
         }
 
-        # Close previous session if exists
-        if user_data["sessions"]:
+        # Close previous session if it is still open
+        if user_data["sessions"] and user_data["sessions"][-1].get("active", False):
             user_data["sessions"][-1]["active"] = False
             user_data["sessions"][-1]["end_time"] = datetime.utcnow().isoformat()
 
         user_data["sessions"].append(new_session)
 
-        # Save updated context to memory
-        await self._save_user_context_to_memory(user_id, user_data)
-
         return new_session
 
+    def _is_session_expired(self, user_data: Dict[str, Any]) -> bool:
+        last_activity = user_data.get("last_activity")
+        return bool(last_activity) and datetime.fromisoformat(last_activity) < datetime.utcnow() - self.session_timeout
+
     def _is_new_session_needed(self, user_data: Dict[str, Any]) -> bool:
         """Determine if a new session should be started."""
         if not user_data["sessions"]:
@@ -420,20 +501,19 @@ class ConversationMemory:
         
         return False
 
-    async def _update_patterns(self, user_id: str, query: str, workflow_name: str, 
-                             interaction: Dict[str, Any]):
-        """Update usage patterns for learning."""
-        user_data = self.user_conversations[user_id]
-        
-        # Update user-specific patterns
+    def _update_user_patterns(self, user_data: Dict[str, Any], query: str):
+        """Update the user's own usage patterns."""
+        query_pattern = self._extract_query_pattern(query)
+        patterns = user_data["frequent_patterns"]
+        patterns[query_pattern] = patterns.get(query_pattern, 0) + 1
+
+    def _update_global_patterns(self, query: str, workflow_name: str, recent_workflows: List[str]):
+        """Update process-wide usage patterns for learning."""
         query_pattern = self._extract_query_pattern(query)
-        user_data["frequent_patterns"][query_pattern] += 1
-        
-        # Update global patterns
         self.global_patterns[query_pattern] += 1
+        self._global_patterns_dirty = True
         
         # Update workflow transitions
-        recent_workflows = list(user_data["recent_workflows"])
         if len(recent_workflows) >= 2:
             prev_workflow = recent_workflows[-2]
             self.workflow_transitions[prev_workflow][workflow_name] += 1
@@ -465,31 +545,27 @@ class ConversationMemory:
         else:
             return "general_query"
 
-    async def _update_preferences(self, user_id: str, workflow_name: str, 
-                                interaction: Dict[str, Any]):
+    def _update_preferences(self, user_data: Dict[str, Any], workflow_name: str,
+                            interaction: Dict[str, Any]):
         """Update user preferences based on successful interactions."""
-        user_data = self.user_conversations[user_id]
         preferences = user_data["preferences"]
         
-        # Track preferred workflows
-        if "preferred_workflows" not in preferences:
-            preferences["preferred_workflows"] = defaultdict(int)
-        preferences["preferred_workflows"][workflow_name] += 1
+        # Track preferred workflows (plain dicts, since stored contexts come back as JSON)
+        workflows = preferences.setdefault("preferred_workflows", {})
+        workflows[workflow_name] = workflows.get(workflow_name, 0) + 1
         
         # Track preferred services
         services_used = interaction.get("services_used", [])
         if services_used:
-            if "preferred_services" not in preferences:
-                preferences["preferred_services"] = defaultdict(int)
+            services = preferences.setdefault("preferred_services", {})
             for service in services_used:
-                preferences["preferred_services"][service] += 1
+                services[service] = services.get(service, 0) + 1
         
         # Track preferred interaction patterns
         intent = interaction.get("intent", "unknown")
         if intent != "unknown":
-            if "preferred_intents" not in preferences:
-                preferences["preferred_intents"] = defaultdict(int)
-            preferences["preferred_intents"][intent] += 1
+            intents = preferences.setdefault("preferred_intents", {})
+            intents[intent] = intents.get(intent, 0) + 1
         
         # Update confidence thresholds based on user feedback
         confidence = interaction.get("confidence", 0.0)
@@ -499,10 +575,8 @@ class ConversationMemory:
             elif preferences["confidence_preference"] == "medium":
                 preferences["confidence_preference"] = "high"
 
-    async def _update_domain_context(self, user_id: str, workflow_name: str, 
-                                   interaction: Dict[str, Any]):
+    def _update_domain_context(self, user_data: Dict[str, Any], workflow_name: str):
         """Update domain context based on interaction patterns."""
-        user_data = self.user_conversations[user_id]
         domain_context = user_data["domain_context"]
         
         # Map workflows to domains
@@ -528,9 +602,8 @@ class ConversationMemory:
                 domain_context["domain_confidence"] += 1
             else:
                 # Track secondary domains
-                if "secondary_domains" not in domain_context:
-                    domain_context["secondary_domains"] = defaultdict(int)
-                domain_context["secondary_domains"][domain] += 1
+                secondary_domains = domain_context.setdefault("secondary_domains", {})
+                secondary_domains[domain] = secondary_domains.get(domain, 0) + 1
                 
                 # Switch primary domain if secondary becomes more frequent
                 if domain_context["secondary_domains"][domain] > domain_context["domain_confidence"]:
@@ -586,8 +659,8 @@ class ConversationMemory:
         if not user_id:
             return {}
 
-        # Load user data from memory-agent
-        user_data = await self._load_user_context_from_memory(user_id)
+        # Read through the local cache
+        user_data = await self._get_user_data(user_id)
         return user_data["preferences"]
 
     async def get_conversation_history(self, user_id: str, limit: int = 10) -> List[Dict[str, Any]]:
@@ -595,8 +668,8 @@ class ConversationMemory:
         if not user_id:
             return []
 
-        # Load user data from memory-agent
-        user_data = await self._load_user_context_from_memory(user_id)
+        # Read through the local cache
+        user_data = await self._get_user_data(user_id)
         all_interactions = []
 
         # Collect interactions from all sessions
@@ -638,7 +711,7 @@ class ConversationMemory:
                 })
 
         # Suggest based on workflow transitions
-        user_data = await self._load_user_context_from_memory(user_id)
+        user_data = await self._get_user_data(user_id)
         recent_workflows = list(user_data["recent_workflows"])
         if recent_workflows:
             last_workflow = recent_workflows[-1]
@@ -661,9 +734,8 @@ class ConversationMemory:
             context_key = f"user_context:{user_id}"
             await self._delete_memory(context_key)
 
-            # Also clear from local cache if exists
-            if user_id in self.cache:
-                del self.cache[user_id]
+            # Also clear from local cache, dropping unwritten changes
+            self.cache.discard(user_id)
 
             return True
         except Exception:
@@ -673,7 +745,7 @@ class ConversationMemory:
         """Get conversation analytics."""
         if user_id:
             # User-specific analytics
-            user_data = await self._load_user_context_from_memory(user_id)
+            user_data = await self._get_user_data(user_id)
             return {
                 "user_id": user_id,
                 "total_interactions": user_data.get("total_interactions", 0),
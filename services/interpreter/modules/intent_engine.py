@@ -0,0 +1,173 @@
+"""Compiled intent matching for the Interpreter service.
+
+Intent patterns are compiled once when the recognizer loads. All patterns of
+an intent are merged into a single alternation with one named group per
+pattern, so an intent costs one regex search instead of one per pattern, and
+intents whose required keywords are absent from the query are skipped
+without running a regex at all. Recognition results are memoized in a
+bounded LRU keyed by the normalized query.
+"""
+
+import copy
+import re
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Pattern, Sequence, Tuple
+
+# Characters that end the literal prefix of a pattern
+_REGEX_SPECIAL = set("\\.^$*+?{}[]()|")
+_OPTIONAL_QUANTIFIERS = set("?*{")
+_MIN_KEYWORD_LENGTH = 3
+
+
+def required_keyword(pattern: str) -> Optional[str]:
+    """Literal text every match of ``pattern`` must contain, if one can be read off.
+
+    Only the leading literal run of a pattern without a top-level alternation
+    is used; a character made optional by a following quantifier is dropped.
+    Returns None when no keyword of useful length can be derived, which makes
+    the pattern always a candidate.
+    """
+    if _has_top_level_alternation(pattern):
+        return None
+
+    literal = []
+    for char in pattern:
+        if char in _REGEX_SPECIAL:
+            if char in _OPTIONAL_QUANTIFIERS and literal:
+                literal.pop()
+            break
+        literal.append(char)
+
+    keyword = "".join(literal).strip()
+    if len(keyword) < _MIN_KEYWORD_LENGTH:
+        return None
+    return keyword.casefold()
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    depth = 0
+    escaped = in_class = False
+    for char in pattern:
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+    return False
+
+
+class CompiledIntent:
+    """All patterns of one intent compiled into a named-group alternation."""
+
+    def __init__(self, intent: str, patterns: Sequence[str], flags: int = re.IGNORECASE):
+        self.intent = intent
+        self.patterns = list(patterns)
+        self.compiled = [re.compile(pattern, flags) for pattern in self.patterns]
+        self.combined = re.compile(
+            "|".join(f"(?P<p{i}>{pattern})" for i, pattern in enumerate(self.patterns)), flags
+        )
+
+        keywords = [required_keyword(pattern) for pattern in self.patterns]
+        # Any pattern without a keyword can match anything, so the intent can't be skipped
+        self.keywords: Optional[Tuple[str, ...]] = (
+            tuple(keywords) if keywords and all(keywords) else None
+        )
+
+    def may_match(self, folded_text: str) -> bool:
+        """Cheap prefilter: False only when no pattern of the intent can match."""
+        if self.keywords is None:
+            return True
+        return any(keyword in folded_text for keyword in self.keywords)
+
+    def search(self, text: str) -> Optional[Tuple[str, "re.Match"]]:
+        """Leftmost match over all patterns as ``(pattern, match)``, or None."""
+        match = self.combined.search(text)
+        if match is None:
+            return None
+        return self.patterns[int(match.lastgroup[1:])], match
+
+    def search_each(self, text: str) -> Iterator[Tuple[str, "re.Match"]]:
+        """Per-pattern matches in declaration order, for callers that need every match."""
+        for pattern, compiled in zip(self.patterns, self.compiled):
+            match = compiled.search(text)
+            if match:
+                yield pattern, match
+
+
+class CompiledIntentPatterns:
+    """Intent pattern table compiled once, queried with a keyword prefilter."""
+
+    def __init__(self, intent_patterns: Dict[str, Sequence[str]], flags: int = re.IGNORECASE):
+        self.intents: List[CompiledIntent] = [
+            CompiledIntent(intent, patterns, flags)
+            for intent, patterns in intent_patterns.items() if patterns
+        ]
+
+    def candidates(self, text: str) -> Iterator[CompiledIntent]:
+        """Intents that may match ``text``, in declaration order."""
+        folded = text.casefold()
+        for compiled in self.intents:
+            if compiled.may_match(folded):
+                yield compiled
+
+    def __len__(self) -> int:
+        return len(self.intents)
+
+
+def compile_entity_patterns(entity_patterns: Dict[str, str],
+                            flags: int = re.IGNORECASE) -> Dict[str, Pattern]:
+    """Compile entity extraction patterns once."""
+    return {entity_type: re.compile(pattern, flags) for entity_type, pattern in entity_patterns.items()}
+
+
+class IntentResultCache:
+    """Bounded LRU of recognition results keyed by normalized query.
+
+    Results are deep-copied in and out so callers can mutate the entities
+    they get back without corrupting the cache.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return query.strip()
+
+    def get(self, query: str) -> Optional[Tuple[str, float, Dict[str, Any]]]:
+        key = self.normalize(query)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        intent, confidence, entities = entry
+        return intent, confidence, copy.deepcopy(entities)
+
+    def put(self, query: str, intent: str, confidence: float, entities: Dict[str, Any]) -> None:
+        if self.max_entries <= 0:
+            return
+        key = self.normalize(query)
+        self._entries[key] = (intent, confidence, copy.deepcopy(entities))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -5,7 +5,6 @@ extracted from the main interpreter service to improve maintainability.
 Enhanced with ecosystem context awareness for project-specific understanding.
 """
 
-import re
 from typing import Dict, Any, List, Tuple, Optional
 
 from services.shared.core.models.models import Document, Finding
@@ -16,12 +15,14 @@ from .shared_utils import (
     build_interpreter_context
 )
 from .ecosystem_context import ecosystem_context
+from .intent_engine import CompiledIntentPatterns, IntentResultCache, compile_entity_patterns
 
 
 class IntentRecognizer:
     """NLP-based intent recognition engine."""
 
-    def __init__(self):
+    def __init__(self, cache_size: int = 1024):
+        self._result_cache = IntentResultCache(cache_size)
         # Initialize with ecosystem context
         self._load_ecosystem_patterns()
 
@@ -189,11 +190,27 @@ class IntentRecognizer:
 
         # Add dynamic patterns based on ecosystem services
         self._add_service_specific_patterns()
+        self._compile_patterns()
+
+    def _compile_patterns(self):
+        """Compile intent and entity patterns once; call again after editing the tables."""
+        self._compiled_intents = CompiledIntentPatterns(self.intent_patterns)
+        self._compiled_entities = compile_entity_patterns(self.entity_patterns)
+        self._result_cache.clear()
+
+    def clear_cache(self):
+        """Drop memoized recognition results."""
+        self._result_cache.clear()
+
+    @staticmethod
+    def _service_capabilities() -> Dict[str, Any]:
+        """Static service capability table, empty when the context doesn't expose one."""
+        return getattr(ecosystem_context, "service_capabilities", None) or {}
 
     def _add_service_specific_patterns(self):
         """Add service-specific intent patterns based on ecosystem capabilities."""
         # Get service capabilities from ecosystem context
-        services = ecosystem_context.service_capabilities
+        services = self._service_capabilities()
 
         # Add patterns for each service based on its capabilities
         for service_name, service_info in services.items():
@@ -233,6 +250,11 @@ class IntentRecognizer:
 
     def recognize_intent(self, query: str) -> Tuple[str, float, Dict[str, Any]]:
         """Recognize intent from user query using ecosystem context."""
+        query = self._result_cache.normalize(query)
+        cached = self._result_cache.get(query)
+        if cached is not None:
+            return cached
+
         context = build_interpreter_context("recognize_intent", query_length=len(query))
 
         try:
@@ -242,22 +264,31 @@ class IntentRecognizer:
             best_score = 0.0
             intent_metadata = {}
 
-            # Check each intent pattern
-            for intent, patterns in self.intent_patterns.items():
-                for pattern in patterns:
-                    match = re.search(pattern, query_lower, re.IGNORECASE)
-                    if match:
-                        # Enhanced scoring with ecosystem context
-                        score = self._calculate_intent_score(intent, query_lower, match, pattern)
-                        intent_metadata[intent] = {
-                            "pattern": pattern,
-                            "match": match.group(),
-                            "score": score
-                        }
-
-                        if score > best_score:
-                            best_score = score
-                            best_intent = intent
+            # Check each candidate intent with one search over all of its patterns
+            for compiled in self._compiled_intents.candidates(query_lower):
+                found = compiled.search(query_lower)
+                if not found:
+                    continue
+                pattern, match = found
+                # Enhanced scoring with ecosystem context
+                score = self._calculate_intent_score(compiled.intent, query_lower, match, pattern)
+                if len(match.group()) < 3:
+                    # Short matches are penalized, so another pattern may still score higher
+                    for other_pattern, other_match in compiled.search_each(query_lower):
+                        other_score = self._calculate_intent_score(
+                            compiled.intent, query_lower, other_match, other_pattern
+                        )
+                        if other_score > score:
+                            pattern, match, score = other_pattern, other_match, other_score
+                intent_metadata[compiled.intent] = {
+                    "pattern": pattern,
+                    "match": match.group(),
+                    "score": score
+                }
+
+                if score > best_score:
+                    best_score = score
+                    best_intent = compiled.intent
 
             # Use ecosystem context for additional intent recognition
             if best_score < 0.7:  # If confidence is low, try ecosystem-aware recognition
@@ -277,6 +308,7 @@ class IntentRecognizer:
                 "suggested_workflows": self._suggest_workflows(query_lower, best_intent)
             }
 
+            self._result_cache.put(query, best_intent, best_score, entities)
             return best_intent, best_score, entities
 
         except Exception as e:
@@ -298,7 +330,7 @@ class IntentRecognizer:
             base_score = max(base_score, 0.8)
 
         # Boost for service-specific patterns
-        if "_" in intent and any(service in intent for service in ecosystem_context.service_capabilities.keys()):
+        if "_" in intent and any(service in intent for service in self._service_capabilities().keys()):
             base_score += 0.1
 
         # Reduce score for very short matches
@@ -318,7 +350,7 @@ class IntentRecognizer:
         if detected_services:
             # Try to infer intent based on mentioned services
             for service in detected_services:
-                service_capabilities = ecosystem_context.service_capabilities.get(service, {}).get("capabilities", [])
+                service_capabilities = self._service_capabilities().get(service, {}).get("capabilities", [])
                 for capability in service_capabilities:
                     # Look for capability-related words in query
                     capability_words = capability.replace("_", " ").split()
@@ -341,7 +373,7 @@ class IntentRecognizer:
     def _detect_services_in_query(self, query: str) -> List[str]:
         """Detect service mentions in the query."""
         detected = []
-        for service_name, service_info in ecosystem_context.service_capabilities.items():
+        for service_name, service_info in self._service_capabilities().items():
             aliases = service_info.get("aliases", [])
             all_names = [service_name.replace("_", " ")] + aliases
 
@@ -354,7 +386,7 @@ class IntentRecognizer:
     def _detect_capabilities_in_query(self, query: str) -> List[str]:
         """Detect capability mentions in the query."""
         detected = []
-        for service_info in ecosystem_context.service_capabilities.values():
+        for service_info in self._service_capabilities().values():
             capabilities = service_info.get("capabilities", [])
             for capability in capabilities:
                 capability_words = capability.replace("_", " ").split()
@@ -439,8 +471,8 @@ class IntentRecognizer:
         try:
             entities = {}
 
-            for entity_type, pattern in self.entity_patterns.items():
-                matches = re.findall(pattern, query, re.IGNORECASE)
+            for entity_type, pattern in self._compiled_entities.items():
+                matches = pattern.findall(query)
                 if matches:
                     # Clean up matches
                     if entity_type == "repo":
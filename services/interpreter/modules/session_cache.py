@@ -0,0 +1,204 @@
+"""Write-behind session cache for the Interpreter service.
+
+Conversation state lives in memory-agent, but every user turn used to read
+and write it several times. This cache keeps recently active users' state
+locally (LRU with a TTL), applies turns to the local copy and writes dirty
+state back in batches on a timer, when too many users are dirty, or when a
+session ends.
+
+Writes are last-writer-wins: memory-agent has no conditional (versioned)
+write, so if two interpreter replicas cache the same user, the later flush
+overwrites the other's turns. Route a user to one replica, or keep the TTL
+short, where that matters.
+"""
+
+import asyncio
+import copy
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Per-key outcomes reported by the writer
+STORED = "stored"
+FAILED = "failed"
+
+Mutation = Callable[[Dict[str, Any]], Any]
+Loader = Callable[[str], Awaitable[Dict[str, Any]]]
+Writer = Callable[[List[Tuple[str, Dict[str, Any]]]], Awaitable[Dict[str, str]]]
+
+# Outcome of a shared load whose caller was cancelled before the session arrived;
+# the callers sharing it go back to the cache and load it themselves
+_RETRY = object()
+
+
+@dataclass
+class CachedSession:
+    """Locally cached state for one key."""
+
+    data: Dict[str, Any]
+    loaded_at: float
+    # Updates applied locally but not yet written
+    pending: int = 0
+
+    @property
+    def dirty(self) -> bool:
+        return self.pending > 0
+
+
+class WriteBehindSessionCache:
+    """Read-through, write-behind cache of per-user state.
+
+    ``loader(key)`` returns the stored data and ``writer(items)`` stores
+    ``[(key, data), ...]``, returning an outcome per key. Dirty entries are
+    never evicted or expired before they are written.
+    """
+
+    def __init__(self, loader: Loader, writer: Writer, max_entries: int = 1024,
+                 ttl_seconds: float = 1800.0, flush_interval_seconds: float = 5.0,
+                 max_dirty: int = 100, clock: Callable[[], float] = time.monotonic):
+        self.loader = loader
+        self.writer = writer
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_dirty = max_dirty
+        self.clock = clock
+
+        self._entries: "OrderedDict[str, CachedSession]" = OrderedDict()
+        self._dirty: "OrderedDict[str, None]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Future] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "failures": 0}
+
+    async def get(self, key: str) -> Dict[str, Any]:
+        """Current state for ``key``, loading it from the store on a miss."""
+        return (await self._session(key)).data
+
+    async def update(self, key: str, mutation: Mutation) -> Any:
+        """Apply ``mutation`` to the cached state and queue it for write-back."""
+        session = await self._session(key)
+        result = mutation(session.data)
+        session.pending += 1
+        self._dirty[key] = None
+
+        if len(self._dirty) >= self.max_dirty:
+            await self.flush()
+        else:
+            self._schedule_flush()
+        return result
+
+    async def flush(self, keys: Optional[List[str]] = None) -> Dict[str, str]:
+        """Write dirty entries (all, or only ``keys``) in one batched call."""
+        async with self._flush_lock:
+            targets = [key for key in (keys if keys is not None else list(self._dirty)) if key in self._dirty]
+            if not targets:
+                return {}
+
+            batch, flushed = [], {}
+            for key in targets:
+                session = self._entries[key]
+                # Snapshot so turns applied while the write is in flight stay pending
+                batch.append((key, copy.deepcopy(session.data)))
+                flushed[key] = (session, session.pending)
+
+            try:
+                outcomes = await self.writer(batch)
+            except Exception:
+                outcomes = {}
+
+            for key, (session, count) in flushed.items():
+                outcome = outcomes.get(key, FAILED)
+                if outcome == STORED:
+                    self.stats["writes"] += 1
+                    session.pending -= count
+                    if not session.pending:
+                        self._dirty.pop(key, None)
+                else:
+                    self.stats["failures"] += 1
+
+            self._evict()
+            return {key: outcomes.get(key, FAILED) for key in targets}
+
+    async def close(self):
+        """Cancel the flush timer and write everything still dirty."""
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        self._flush_task = None
+        await self.flush()
+
+    def discard(self, key: str):
+        """Drop ``key`` locally, including unwritten changes."""
+        self._entries.pop(key, None)
+        self._dirty.pop(key, None)
+
+    def is_dirty(self, key: str) -> bool:
+        return key in self._dirty
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "entries": len(self._entries), "dirty": len(self._dirty)}
+
+    async def _session(self, key: str) -> CachedSession:
+        while True:
+            session = self._entries.get(key)
+            if session is not None and (session.dirty or self.clock() - session.loaded_at <= self.ttl_seconds):
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return session
+
+            # Concurrent misses for the same key share one load
+            pending = self._loading.get(key)
+            if pending is None:
+                break
+            session = await asyncio.shield(pending)
+            if session is not _RETRY:
+                return session
+
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            data = await self.loader(key)
+            session = CachedSession(data=data, loaded_at=self.clock())
+            self._entries[key] = session
+            self._entries.move_to_end(key)
+            self._evict()
+            future.set_result(session)
+            return session
+        except asyncio.CancelledError:
+            # Nothing was loaded, but the callers sharing this load were not cancelled
+            future.set_result(_RETRY)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Callers sharing the load re-raise it; with none, it still counts as handled
+            future.exception()
+            raise
+        finally:
+            del self._loading[key]
+
+    def _evict(self):
+        """Drop least recently used clean entries beyond ``max_entries``."""
+        excess = len(self._entries) - self.max_entries
+        if excess <= 0:
+            return
+        for key in list(self._entries):
+            if excess <= 0:
+                break
+            if key not in self._dirty:
+                del self._entries[key]
+                excess -= 1
+
+    def _schedule_flush(self):
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self):
+        while self._dirty:
+            await asyncio.sleep(self.flush_interval_seconds)
+            await self.flush()
@@ -0,0 +1,116 @@
+"""Tests for the compiled intent matching engine."""
+
+import re
+import sys
+import os
+
+# Add the services directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.intent_engine import (
+    CompiledIntent, CompiledIntentPatterns, IntentResultCache, compile_entity_patterns, required_keyword
+)
+
+
+INTENT_PATTERNS = {
+    "analyze_document": [r"analyze\s+(?:this\s+)?document", r"check\s+(?:document\s+)?consistency"],
+    "ingest_github": [r"ingest\s+github", r"import\s+github\s+(?:repo|repository)"],
+    "help": [r"help", r"what\s+can\s+you\s+do", r"commands?"],
+    "short": [r"hi", r"hello\s+there"],
+    "anything": [r"(?:show|list)\s+tools?"]
+}
+
+
+class TestRequiredKeyword:
+    """Test keyword extraction for the prefilter."""
+
+    def test_leading_literal_is_used(self):
+        assert required_keyword(r"analyze\s+document") == "analyze"
+        assert required_keyword(r"import\s+github") == "import"
+
+    def test_optional_trailing_character_is_dropped(self):
+        assert required_keyword(r"commands?") == "command"
+        assert required_keyword(r"tools*") == "tool"
+
+    def test_patterns_without_safe_keyword(self):
+        assert required_keyword(r"(?:show|list)\s+tools?") is None
+        assert required_keyword(r"find|search") is None
+        assert required_keyword(r"hi") is None
+
+
+class TestCompiledIntentPatterns:
+    """Test the merged per-intent alternations."""
+
+    def test_search_matches_first_matching_pattern_leftmost(self):
+        compiled = CompiledIntent("help", INTENT_PATTERNS["help"])
+
+        pattern, match = compiled.search("so what can you do? help")
+        assert pattern == r"what\s+can\s+you\s+do"
+        assert match.group() == "what can you do"
+        assert compiled.search("nothing relevant") is None
+
+    def test_matches_agree_with_individual_patterns(self):
+        queries = [
+            "Please ANALYZE this document", "check consistency now", "import github repository x",
+            "hi", "hello there", "list tools", "what can you do", "unrelated words", "commands"
+        ]
+        table = CompiledIntentPatterns(INTENT_PATTERNS)
+
+        for query in queries:
+            expected = {
+                intent for intent, patterns in INTENT_PATTERNS.items()
+                if any(re.search(pattern, query.lower(), re.IGNORECASE) for pattern in patterns)
+            }
+            found = {compiled.intent for compiled in table.candidates(query.lower()) if compiled.search(query.lower())}
+            assert found == expected, query
+
+    def test_prefilter_skips_intents_without_keywords(self):
+        table = CompiledIntentPatterns(INTENT_PATTERNS)
+
+        candidates = [compiled.intent for compiled in table.candidates("list tools")]
+        # Intents with a pattern lacking a keyword are always candidates
+        assert candidates == ["short", "anything"]
+
+    def test_search_each_yields_every_matching_pattern(self):
+        compiled = CompiledIntent("short", INTENT_PATTERNS["short"])
+
+        matches = [match.group() for _, match in compiled.search_each("hi, hello there")]
+        assert matches == ["hi", "hello there"]
+
+    def test_entity_patterns_are_compiled(self):
+        entities = compile_entity_patterns({"jira_key": r'\b[A-Z]{2,}-\d+\b'})
+
+        assert entities["jira_key"].findall("see proj-12 and ABC-3") == ["proj-12", "ABC-3"]
+
+
+class TestIntentResultCache:
+    """Test the bounded recognition result cache."""
+
+    def test_normalized_hits_return_copies(self):
+        cache = IntentResultCache(max_entries=4)
+        cache.put(" analyze it ", "analyze_document", 0.9, {"url": ["https://x"]})
+
+        intent, confidence, entities = cache.get("analyze it")
+        entities["url"].append("mutated")
+
+        assert (intent, confidence) == ("analyze_document", 0.9)
+        assert cache.get("analyze it")[2] == {"url": ["https://x"]}
+        assert cache.get("other") is None
+        assert cache.get_stats() == {"entries": 1, "hits": 2, "misses": 1}
+
+    def test_least_recently_used_is_evicted(self):
+        cache = IntentResultCache(max_entries=2)
+        cache.put("a", "x", 0.1, {})
+        cache.put("b", "y", 0.2, {})
+        cache.get("a")
+        cache.put("c", "z", 0.3, {})
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+    def test_disabled_cache_stores_nothing(self):
+        cache = IntentResultCache(max_entries=0)
+        cache.put("a", "x", 0.1, {})
+
+        assert cache.get("a") is None
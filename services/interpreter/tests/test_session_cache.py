@@ -0,0 +1,189 @@
+"""Tests for the write-behind conversation session cache."""
+
+import asyncio
+import copy
+import pytest
+import sys
+import os
+
+# Add the services directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.session_cache import WriteBehindSessionCache, STORED, FAILED
+
+
+class FakeStore:
+    """Key-value store standing in for memory-agent."""
+
+    def __init__(self, load_delay=0.0):
+        self.values = {}
+        self.loads = 0
+        self.write_calls = 0
+        self.fail = False
+        self.load_delay = load_delay
+
+    async def load(self, key):
+        self.loads += 1
+        await asyncio.sleep(self.load_delay)
+        return copy.deepcopy(self.values.get(key, {"turns": []}))
+
+    async def write(self, items):
+        self.write_calls += 1
+        if self.fail:
+            raise ConnectionError("memory-agent down")
+        for key, data in items:
+            self.values[key] = copy.deepcopy(data)
+        return {key: STORED for key, _ in items}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def add_turn(turn):
+    def mutation(data):
+        data["turns"].append(turn)
+        return len(data["turns"])
+    return mutation
+
+
+def make_cache(store, **kwargs):
+    kwargs.setdefault("flush_interval_seconds", 60.0)
+    return WriteBehindSessionCache(store.load, store.write, **kwargs)
+
+
+class TestWriteBehindSessionCache:
+    """Test read-through and write-behind behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_turns_are_written_in_one_batch(self):
+        store = FakeStore()
+        cache = make_cache(store)
+
+        for i in range(5):
+            await cache.update("alice", add_turn(i))
+            await cache.get("alice")
+        await cache.update("bob", add_turn("x"))
+
+        assert store.loads == 2
+        assert store.write_calls == 0
+        assert cache.is_dirty("alice")
+
+        assert await cache.flush() == {"alice": STORED, "bob": STORED}
+        assert store.write_calls == 1
+        assert store.values["alice"] == {"turns": [0, 1, 2, 3, 4]}
+        assert not cache.is_dirty("alice")
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_turns_during_a_write_stay_pending(self):
+        store = FakeStore()
+        cache = make_cache(store)
+        await cache.update("alice", add_turn(1))
+        write = store.write
+
+        async def slow_write(items):
+            await asyncio.sleep(0.02)
+            return await write(items)
+
+        cache.writer = slow_write
+        flushing = asyncio.create_task(cache.flush())
+        await asyncio.sleep(0.01)
+        await cache.update("alice", add_turn(2))
+
+        assert await flushing == {"alice": STORED}
+        assert store.values["alice"] == {"turns": [1]}
+        assert cache.is_dirty("alice")
+        await cache.close()
+        assert store.values["alice"] == {"turns": [1, 2]}
+
+    @pytest.mark.asyncio
+    async def test_failed_write_keeps_entry_dirty(self):
+        store = FakeStore()
+        cache = make_cache(store)
+        await cache.update("alice", add_turn(1))
+
+        store.fail = True
+        assert await cache.flush() == {"alice": FAILED}
+        assert cache.is_dirty("alice")
+
+        store.fail = False
+        await cache.close()
+        assert store.values["alice"] == {"turns": [1]}
+
+    @pytest.mark.asyncio
+    async def test_ttl_reloads_clean_entries_only(self):
+        store = FakeStore()
+        clock = Clock()
+        cache = make_cache(store, ttl_seconds=10, clock=clock)
+
+        await cache.update("alice", add_turn(1))
+        clock.now = 100
+        await cache.get("alice")
+        # Dirty entries are never expired before being written
+        assert store.loads == 1
+
+        await cache.flush()
+        await cache.get("alice")
+        assert store.loads == 2
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_lru_evicts_clean_entries(self):
+        store = FakeStore()
+        cache = make_cache(store, max_entries=2)
+
+        await cache.update("dirty", add_turn(1))
+        await cache.get("a")
+        await cache.get("b")
+
+        stats = cache.get_stats()
+        assert stats["entries"] == 2
+        assert cache.is_dirty("dirty")
+        await cache.close()
+        assert store.values["dirty"] == {"turns": [1]}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self):
+        store = FakeStore()
+        cache = make_cache(store)
+
+        results = await asyncio.gather(*(cache.get("alice") for _ in range(10)))
+
+        assert store.loads == 1
+        assert all(result is results[0] for result in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_load_is_retried_by_waiters(self):
+        store = FakeStore(load_delay=0.05)
+        cache = make_cache(store)
+        leader = asyncio.create_task(cache.get("alice"))
+        await asyncio.sleep(0.01)
+        waiters = asyncio.gather(*(cache.get("alice") for _ in range(3)))
+        await asyncio.sleep(0.01)
+
+        leader.cancel()
+        results = await waiters
+
+        assert leader.cancelled()
+        assert results == [{"turns": []}] * 3
+        assert store.loads == 2
+
+    @pytest.mark.asyncio
+    async def test_timer_and_dirty_limit_trigger_flushes(self):
+        store = FakeStore()
+        cache = make_cache(store, flush_interval_seconds=0.01, max_dirty=3)
+
+        await cache.update("a", add_turn(1))
+        await asyncio.sleep(0.05)
+        assert store.values["a"] == {"turns": [1]}
+
+        for key in ("b", "c", "d"):
+            await cache.update(key, add_turn(1))
+        # Third dirty user forces an immediate batch
+        assert {"b", "c", "d"} <= set(store.values)
+        await cache.close()
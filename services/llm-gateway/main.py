@@ -5,7 +5,7 @@ and provides basic LLM routing functionality.
 """
 
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from typing import Dict, Any, List, Optional, AsyncGenerator
 import asyncio
@@ -14,6 +14,8 @@ import json
 import os
 import httpx
 
+from modules.metrics_collector import MetricsCollector, PROMETHEUS_CONTENT_TYPE
+
 # Service configuration
 SERVICE_NAME = "llm-gateway"
 SERVICE_TITLE = "LLM Gateway"
@@ -67,6 +69,9 @@ app = FastAPI(
     version=SERVICE_VERSION
 )
 
+# Request metrics, exposed for Prometheus at /metrics
+metrics_collector = MetricsCollector()
+
 # Simple health check endpoint
 @app.get("/health")
 async def health():
@@ -143,6 +148,10 @@ async def query_llm(request: LLMQuery):
                 if response.status_code == 200:
                     result = response.json()
                     processing_time = time.time() - start_time
+                    await metrics_collector.record_request(
+                        "query", "ollama", processing_time, len(result.get("response", "").split()),
+                        model=request.model
+                    )
                     
                     return GatewayResponse(
                         success=True,
@@ -159,6 +168,10 @@ async def query_llm(request: LLMQuery):
                     )
                     
         except Exception as e:
+            await metrics_collector.record_request(
+                "query", "ollama", time.time() - start_time, 0,
+                success=False, error_type=type(e).__name__, model=request.model
+            )
             raise HTTPException(
                 status_code=500,
                 detail=f"Error querying Ollama: {str(e)}"
@@ -202,6 +215,10 @@ async def chat_llm(request: ChatRequest):
                 if response.status_code == 200:
                     result = response.json()
                     processing_time = time.time() - start_time
+                    await metrics_collector.record_request(
+                        "chat", "ollama", processing_time, len(result.get("response", "").split()),
+                        model=request.model
+                    )
                     
                     return GatewayResponse(
                         success=True,
@@ -222,6 +239,10 @@ async def chat_llm(request: ChatRequest):
                     )
                     
         except Exception as e:
+            await metrics_collector.record_request(
+                "chat", "ollama", time.time() - start_time, 0,
+                success=False, error_type=type(e).__name__, model=request.model
+            )
             raise HTTPException(
                 status_code=500,
                 detail=f"Error in chat with Ollama: {str(e)}"
@@ -330,6 +351,12 @@ async def list_ollama_models():
             detail=f"Error fetching Ollama models: {str(e)}"
         )
 
+# Prometheus scrape endpoint
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Request metrics in the Prometheus text exposition format."""
+    return Response(content=metrics_collector.render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -345,7 +372,8 @@ async def root():
             "query": "/query",
             "chat": "/chat",
             "stream": "/stream",
-            "ollama_models": "/ollama/models"
+            "ollama_models": "/ollama/models",
+            "metrics": "/metrics"
         }
     }
 
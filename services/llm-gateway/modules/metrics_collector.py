@@ -4,9 +4,10 @@ Collects comprehensive metrics for LLM usage, performance, costs, and error trac
 Provides insights into provider performance, cost optimization, and system health.
 """
 
+import math
 import time
 from collections import defaultdict, deque
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable
 from dataclasses import dataclass, field
 
 from services.shared.logging import fire_and_forget
@@ -24,6 +25,96 @@ class RequestMetrics:
     success: bool
     error_type: Optional[str] = None
     user_id: Optional[str] = None
+    model: Optional[str] = None
+
+
+# Coarse latency buckets (seconds) exposed to Prometheus
+PROMETHEUS_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with fixed memory.
+
+    Bucket ``i`` (for ``i >= 1``) covers ``(min_value * growth**(i-1), min_value * growth**i]``,
+    so any reported percentile is within ``growth - 1`` relative error of the true value.
+    Bucket 0 holds values at or below ``min_value``; the last bucket absorbs overflow.
+    """
+
+    def __init__(self, min_value: float = 0.001, max_value: float = 600.0, growth: float = 1.05):
+        self.min_value = min_value
+        self.growth = growth
+        self._log_growth = math.log(growth)
+        self.bucket_count = int(math.ceil(math.log(max_value / min_value) / self._log_growth)) + 2
+        self.counts: List[int] = [0] * self.bucket_count
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def _index(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        # Upper edges are inclusive; the tolerance keeps exact edges out of the next bucket
+        index = max(1, int(math.ceil(math.log(value / self.min_value) / self._log_growth - 1e-9)))
+        return index if index < self.bucket_count else self.bucket_count - 1
+
+    def upper_bound(self, index: int) -> float:
+        """Upper edge of a bucket."""
+        return self.min_value * (self.growth ** index)
+
+    def record(self, value: float):
+        """Record one observation in O(1)."""
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencyHistogram"):
+        """Add another histogram with the same bucket layout into this one."""
+        for i, c in enumerate(other.counts):
+            if c:
+                self.counts[i] += c
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def reset(self):
+        """Clear all observations."""
+        self.counts = [0] * self.bucket_count
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Estimate the q-quantile (0 < q <= 1) from the bucket counts."""
+        if self.count == 0:
+            return 0.0
+        target = max(1, int(math.ceil(q * self.count)))
+        cumulative = 0
+        for i, c in enumerate(self.counts):
+            cumulative += c
+            if cumulative >= target:
+                if i == 0:
+                    return min(self.min_value, self.max)
+                # Geometric midpoint of the bucket, never above the observed max
+                return min(self.min_value * (self.growth ** (i - 0.5)), self.max)
+        return self.max
+
+    def cumulative_counts(self, bounds: List[float]) -> List[int]:
+        """Observation counts at or below each bound (bucket-aligned approximation)."""
+        result = []
+        cumulative = 0
+        i = 0
+        for bound in bounds:
+            while i < self.bucket_count - 1 and self.upper_bound(i) <= bound * (1 + 1e-9):
+                cumulative += self.counts[i]
+                i += 1
+            result.append(cumulative)
+        return result
 
 
 @dataclass
@@ -36,7 +127,10 @@ class ProviderMetrics:
     total_cost: float = 0.0
     total_response_time: float = 0.0
     error_counts: Dict[str, int] = field(default_factory=dict)
-    response_times: List[float] = field(default_factory=list)
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    # Distinct error types tracked individually; the rest are folded into "other"
+    MAX_ERROR_TYPES = 50
 
     def add_request(self, metrics: RequestMetrics):
         """Add a request to the provider metrics."""
@@ -47,16 +141,15 @@ class ProviderMetrics:
         else:
             self.failed_requests += 1
             if metrics.error_type:
-                self.error_counts[metrics.error_type] = self.error_counts.get(metrics.error_type, 0) + 1
+                error_type = metrics.error_type
+                if error_type not in self.error_counts and len(self.error_counts) >= self.MAX_ERROR_TYPES:
+                    error_type = "other"
+                self.error_counts[error_type] = self.error_counts.get(error_type, 0) + 1
 
         self.total_tokens += metrics.tokens_used
         self.total_cost += metrics.cost
         self.total_response_time += metrics.response_time
-
-        # Keep last 100 response times for rolling averages
-        self.response_times.append(metrics.response_time)
-        if len(self.response_times) > 100:
-            self.response_times.pop(0)
+        self.latency.record(metrics.response_time)
 
     def get_success_rate(self) -> float:
         """Get success rate as percentage."""
@@ -78,10 +171,104 @@ class ProviderMetrics:
 
     def get_tokens_per_second(self) -> float:
         """Get tokens per second rate."""
-        total_time = sum(self.response_times)
-        if total_time == 0:
+        if self.total_response_time == 0:
             return 0.0
-        return sum(self.response_times[-10:]) / max(total_time, 0.001)  # Use last 10 for recency
+        return self.total_tokens / max(self.total_response_time, 0.001)
+
+    def get_latency_percentiles(self) -> Dict[str, float]:
+        """Get p50/p95/p99 response times in seconds."""
+        return {
+            "p50": self.latency.percentile(0.50),
+            "p95": self.latency.percentile(0.95),
+            "p99": self.latency.percentile(0.99)
+        }
+
+
+@dataclass
+class WindowBucket:
+    """Counters for one time slot of a TimeBucketRing."""
+    epoch: int = -1
+    requests: int = 0
+    errors: int = 0
+    tokens: int = 0
+    cost: float = 0.0
+    response_time: float = 0.0
+    start_time: float = 0.0
+    providers: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def reset(self, epoch: int, start_time: float):
+        self.epoch = epoch
+        self.requests = 0
+        self.errors = 0
+        self.tokens = 0
+        self.cost = 0.0
+        self.response_time = 0.0
+        self.start_time = start_time
+        self.providers = {}
+        self.latency.reset()
+
+
+class TimeBucketRing:
+    """Fixed-size ring of time buckets (e.g. 24 hourly or 7 daily slots).
+
+    A slot is reused once its epoch falls out of the window, so recording is O(1)
+    and memory is bounded by ``size`` regardless of request volume.
+    """
+
+    def __init__(self, bucket_seconds: int, size: int):
+        self.bucket_seconds = bucket_seconds
+        self.size = size
+        self.buckets: List[WindowBucket] = [WindowBucket() for _ in range(size)]
+
+    def _bucket_for(self, timestamp: float) -> WindowBucket:
+        epoch = int(timestamp // self.bucket_seconds)
+        bucket = self.buckets[epoch % self.size]
+        if bucket.epoch != epoch:
+            bucket.reset(epoch, epoch * self.bucket_seconds)
+        return bucket
+
+    def record(self, metrics: RequestMetrics):
+        """Fold one request into the bucket for its timestamp."""
+        bucket = self._bucket_for(metrics.timestamp)
+        bucket.requests += 1
+        bucket.tokens += metrics.tokens_used
+        bucket.cost += metrics.cost
+        bucket.response_time += metrics.response_time
+        if not metrics.success:
+            bucket.errors += 1
+        bucket.latency.record(metrics.response_time)
+
+        provider = bucket.providers.get(metrics.provider)
+        if provider is None:
+            provider = bucket.providers[metrics.provider] = {"requests": 0, "tokens": 0, "cost": 0.0}
+        provider["requests"] += 1
+        provider["tokens"] += metrics.tokens_used
+        provider["cost"] += metrics.cost
+
+    def live_buckets(self, now: float, span: Optional[int] = None) -> List[WindowBucket]:
+        """Buckets within the last ``span`` slots (default: the whole ring), oldest first."""
+        span = min(span or self.size, self.size)
+        current = int(now // self.bucket_seconds)
+        live = [b for b in self.buckets if current - span < b.epoch <= current]
+        return sorted(live, key=lambda b: b.epoch)
+
+    def snapshot(self, now: float) -> Dict[int, Dict[str, Any]]:
+        """Per-slot counters keyed by epoch."""
+        return {
+            b.epoch: {
+                "requests": b.requests,
+                "tokens": b.tokens,
+                "cost": b.cost,
+                "errors": b.errors,
+                "start_time": b.start_time
+            }
+            for b in self.live_buckets(now)
+        }
+
+    def clear(self):
+        for bucket in self.buckets:
+            bucket.reset(-1, 0.0)
 
 
 class MetricsCollector:
@@ -92,15 +279,42 @@ class MetricsCollector:
         self.request_history: deque = deque(maxlen=1000)  # Keep last 1000 requests
         self.start_time = time.time()
 
-        # Rolling metrics windows
-        self.hourly_metrics: Dict[int, Dict[str, Any]] = {}
-        self.daily_metrics: Dict[int, Dict[str, Any]] = {}
+        # All-time counters and latency distribution (constant memory)
+        self.total_recorded = 0
+        self.total_errors = 0
+        self.latency = LatencyHistogram()
+
+        # Rolling metrics windows: 24 hourly and 7 daily slots
+        self.hourly_window = TimeBucketRing(3600, 24)
+        self.daily_window = TimeBucketRing(86400, 7)
+
+        # Consumers of per-request metrics (e.g. the provider router's latency tracking)
+        self._listeners: List[Callable[[RequestMetrics], None]] = []
+
+    def add_listener(self, listener: Callable[[RequestMetrics], None]):
+        """Register a callback invoked synchronously for every recorded request."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[RequestMetrics], None]):
+        """Unregister a previously added request listener."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify_listeners(self, metrics: RequestMetrics):
+        """Forward a request record to all listeners, isolating listener failures."""
+        for listener in list(self._listeners):
+            try:
+                listener(metrics)
+            except Exception:
+                pass
 
     async def record_request(self, request_type: str, provider: str,
                            response_time: float, tokens_used: int,
                            cost: float = 0.0, success: bool = True,
                            error_type: Optional[str] = None,
-                           user_id: Optional[str] = None):
+                           user_id: Optional[str] = None,
+                           model: Optional[str] = None):
         """Record metrics for a single LLM request."""
         try:
             metrics = RequestMetrics(
@@ -111,7 +325,8 @@ class MetricsCollector:
                 cost=cost,
                 success=success,
                 error_type=error_type,
-                user_id=user_id
+                user_id=user_id,
+                model=model
             )
 
             # Add to provider metrics
@@ -123,6 +338,8 @@ class MetricsCollector:
             # Update rolling metrics
             await self._update_rolling_metrics(metrics)
 
+            self._notify_listeners(metrics)
+
             # Log high-level metrics
             if not success or response_time > 30:  # Log slow or failed requests
                 fire_and_forget(
@@ -162,6 +379,9 @@ class MetricsCollector:
             )
 
             self.request_history.append(metrics)
+            self.total_recorded += 1
+            self.total_errors += 1
+            self.latency.record(response_time)
 
             fire_and_forget(
                 "llm_gateway_error_recorded",
@@ -177,56 +397,25 @@ class MetricsCollector:
             # Avoid recursive error logging
             pass
 
-    async def _update_rolling_metrics(self, metrics: RequestMetrics):
-        """Update rolling metrics windows."""
-        current_hour = int(metrics.timestamp // 3600)
-        current_day = int(metrics.timestamp // 86400)
-
-        # Hourly metrics
-        if current_hour not in self.hourly_metrics:
-            self.hourly_metrics[current_hour] = {
-                "requests": 0,
-                "tokens": 0,
-                "cost": 0.0,
-                "errors": 0,
-                "start_time": metrics.timestamp
-            }
+    @property
+    def hourly_metrics(self) -> Dict[int, Dict[str, Any]]:
+        """Per-hour counters for the last 24 hours, keyed by hour epoch."""
+        return self.hourly_window.snapshot(time.time())
 
-        hour_data = self.hourly_metrics[current_hour]
-        hour_data["requests"] += 1
-        hour_data["tokens"] += metrics.tokens_used
-        hour_data["cost"] += metrics.cost
-        if not metrics.success:
-            hour_data["errors"] += 1
-
-        # Daily metrics
-        if current_day not in self.daily_metrics:
-            self.daily_metrics[current_day] = {
-                "requests": 0,
-                "tokens": 0,
-                "cost": 0.0,
-                "errors": 0,
-                "start_time": metrics.timestamp
-            }
+    @property
+    def daily_metrics(self) -> Dict[int, Dict[str, Any]]:
+        """Per-day counters for the last 7 days, keyed by day epoch."""
+        return self.daily_window.snapshot(time.time())
 
-        day_data = self.daily_metrics[current_day]
-        day_data["requests"] += 1
-        day_data["tokens"] += metrics.tokens_used
-        day_data["cost"] += metrics.cost
+    async def _update_rolling_metrics(self, metrics: RequestMetrics):
+        """Update rolling metrics windows in O(1)."""
+        self.total_recorded += 1
         if not metrics.success:
-            day_data["errors"] += 1
-
-        # Clean old rolling metrics (keep last 24 hours and 7 days)
-        current_time = time.time()
-        cutoff_hour = int((current_time - 86400) // 3600)  # 24 hours ago
-        cutoff_day = int((current_time - 604800) // 86400)  # 7 days ago
+            self.total_errors += 1
+        self.latency.record(metrics.response_time)
 
-        self.hourly_metrics = {
-            h: data for h, data in self.hourly_metrics.items() if h > cutoff_hour
-        }
-        self.daily_metrics = {
-            d: data for d, data in self.daily_metrics.items() if d > cutoff_day
-        }
+        self.hourly_window.record(metrics)
+        self.daily_window.record(metrics)
 
     def get_metrics_summary(self) -> Dict[str, Any]:
         """Get comprehensive metrics summary."""
@@ -242,18 +431,9 @@ class MetricsCollector:
             }
 
             # Performance metrics
-            if self.request_history:
-                response_times = [req.response_time for req in self.request_history]
-                average_response_time = sum(response_times) / len(response_times)
-                cache_hit_rate = 0.0  # Would need cache integration
-
-                # Error rate
-                error_count = sum(1 for req in self.request_history if not req.success)
-                error_rate = (error_count / len(self.request_history)) * 100 if self.request_history else 0
-            else:
-                average_response_time = 0.0
-                cache_hit_rate = 0.0
-                error_rate = 0.0
+            average_response_time = self.latency.mean()
+            cache_hit_rate = 0.0  # Would need cache integration
+            error_rate = (self.total_errors / self.total_recorded) * 100 if self.total_recorded else 0.0
 
             # Uptime calculation
             uptime_seconds = time.time() - self.start_time
@@ -265,6 +445,9 @@ class MetricsCollector:
                 "total_tokens_used": total_tokens,
                 "total_cost": round(total_cost, 4),
                 "average_response_time": round(average_response_time, 3),
+                "p50_response_time": round(self.latency.percentile(0.50), 3),
+                "p95_response_time": round(self.latency.percentile(0.95), 3),
+                "p99_response_time": round(self.latency.percentile(0.99), 3),
                 "cache_hit_rate": round(cache_hit_rate, 3),
                 "error_rate": round(error_rate, 2),
                 "uptime_percentage": uptime_percentage,
@@ -286,6 +469,7 @@ class MetricsCollector:
                 return {"error": f"Provider '{provider}' not found"}
 
             pm = self.provider_metrics[provider]
+            percentiles = pm.get_latency_percentiles()
             return {
                 "provider": provider,
                 "total_requests": pm.total_requests,
@@ -295,6 +479,9 @@ class MetricsCollector:
                 "total_tokens": pm.total_tokens,
                 "total_cost": round(pm.total_cost, 4),
                 "average_response_time": round(pm.get_average_response_time(), 3),
+                "p50_response_time": round(percentiles["p50"], 3),
+                "p95_response_time": round(percentiles["p95"], 3),
+                "p99_response_time": round(percentiles["p99"], 3),
                 "average_cost_per_request": round(pm.get_average_cost_per_request(), 4),
                 "tokens_per_second": round(pm.get_tokens_per_second(), 2),
                 "error_breakdown": pm.error_counts
@@ -307,34 +494,41 @@ class MetricsCollector:
         }
 
     def get_performance_trends(self, hours: int = 24) -> Dict[str, Any]:
-        """Get performance trends over the specified time period."""
-        current_time = time.time()
-        cutoff_time = current_time - (hours * 3600)
+        """Get performance trends over the specified time period.
 
-        # Filter recent requests
-        recent_requests = [
-            req for req in self.request_history
-            if req.timestamp > cutoff_time
-        ]
+        Served from the hourly ring (up to 24 hours) or the daily ring (up to 7 days),
+        so the cost is proportional to the number of slots, not requests.
+        """
+        current_time = time.time()
+        if hours <= self.hourly_window.size:
+            buckets = self.hourly_window.live_buckets(current_time, hours)
+        else:
+            days = int(math.ceil(hours / 24))
+            buckets = self.daily_window.live_buckets(current_time, days)
 
-        if not recent_requests:
+        total_requests = sum(b.requests for b in buckets)
+        if not total_requests:
             return {"error": f"No requests found in the last {hours} hours"}
 
         # Calculate trends
-        total_requests = len(recent_requests)
-        successful_requests = sum(1 for req in recent_requests if req.success)
-        failed_requests = total_requests - successful_requests
+        failed_requests = sum(b.errors for b in buckets)
+        successful_requests = total_requests - failed_requests
 
-        avg_response_time = sum(req.response_time for req in recent_requests) / total_requests
-        total_tokens = sum(req.tokens_used for req in recent_requests)
-        total_cost = sum(req.cost for req in recent_requests)
+        avg_response_time = sum(b.response_time for b in buckets) / total_requests
+        total_tokens = sum(b.tokens for b in buckets)
+        total_cost = sum(b.cost for b in buckets)
+
+        latency = LatencyHistogram()
+        for b in buckets:
+            latency.merge(b.latency)
 
         # Provider breakdown
         provider_stats = defaultdict(lambda: {"requests": 0, "tokens": 0, "cost": 0.0})
-        for req in recent_requests:
-            provider_stats[req.provider]["requests"] += 1
-            provider_stats[req.provider]["tokens"] += req.tokens_used
-            provider_stats[req.provider]["cost"] += req.cost
+        for b in buckets:
+            for provider, stats in b.providers.items():
+                provider_stats[provider]["requests"] += stats["requests"]
+                provider_stats[provider]["tokens"] += stats["tokens"]
+                provider_stats[provider]["cost"] += stats["cost"]
 
         return {
             "time_period_hours": hours,
@@ -343,6 +537,9 @@ class MetricsCollector:
             "failed_requests": failed_requests,
             "success_rate": round((successful_requests / total_requests) * 100, 2),
             "average_response_time": round(avg_response_time, 3),
+            "p50_response_time": round(latency.percentile(0.50), 3),
+            "p95_response_time": round(latency.percentile(0.95), 3),
+            "p99_response_time": round(latency.percentile(0.99), 3),
             "total_tokens": total_tokens,
             "total_cost": round(total_cost, 4),
             "requests_per_hour": round(total_requests / hours, 2),
@@ -400,8 +597,11 @@ class MetricsCollector:
         """Reset all metrics (useful for testing)."""
         self.provider_metrics.clear()
         self.request_history.clear()
-        self.hourly_metrics.clear()
-        self.daily_metrics.clear()
+        self.total_recorded = 0
+        self.total_errors = 0
+        self.latency.reset()
+        self.hourly_window.clear()
+        self.daily_window.clear()
         self.start_time = time.time()
 
         fire_and_forget(
@@ -409,3 +609,54 @@ class MetricsCollector:
             "Metrics have been reset",
             ServiceNames.LLM_GATEWAY
         )
+
+    def render_prometheus(self) -> str:
+        """Render metrics in the Prometheus text exposition format (version 0.0.4).
+
+        Latency histograms are exposed with coarse cumulative ``le`` buckets derived
+        from the fine log buckets, plus precomputed p50/p95/p99 gauges.
+        """
+        lines: List[str] = []
+
+        def escape(value: str) -> str:
+            return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+        lines.append("# HELP llm_gateway_requests_total Total LLM requests by provider and outcome")
+        lines.append("# TYPE llm_gateway_requests_total counter")
+        for provider, pm in self.provider_metrics.items():
+            label = escape(provider)
+            lines.append(f'llm_gateway_requests_total{{provider="{label}",status="success"}} {pm.successful_requests}')
+            lines.append(f'llm_gateway_requests_total{{provider="{label}",status="error"}} {pm.failed_requests}')
+
+        lines.append("# HELP llm_gateway_tokens_total Total tokens used by provider")
+        lines.append("# TYPE llm_gateway_tokens_total counter")
+        for provider, pm in self.provider_metrics.items():
+            lines.append(f'llm_gateway_tokens_total{{provider="{escape(provider)}"}} {pm.total_tokens}')
+
+        lines.append("# HELP llm_gateway_cost_total Total estimated cost by provider")
+        lines.append("# TYPE llm_gateway_cost_total counter")
+        for provider, pm in self.provider_metrics.items():
+            lines.append(f'llm_gateway_cost_total{{provider="{escape(provider)}"}} {pm.total_cost}')
+
+        lines.append("# HELP llm_gateway_request_duration_seconds LLM request latency")
+        lines.append("# TYPE llm_gateway_request_duration_seconds histogram")
+        for provider, pm in self.provider_metrics.items():
+            label = escape(provider)
+            cumulative = pm.latency.cumulative_counts(list(PROMETHEUS_LATENCY_BUCKETS))
+            for bound, count in zip(PROMETHEUS_LATENCY_BUCKETS, cumulative):
+                lines.append(f'llm_gateway_request_duration_seconds_bucket{{provider="{label}",le="{bound}"}} {count}')
+            lines.append(f'llm_gateway_request_duration_seconds_bucket{{provider="{label}",le="+Inf"}} {pm.latency.count}')
+            lines.append(f'llm_gateway_request_duration_seconds_sum{{provider="{label}"}} {pm.latency.total}')
+            lines.append(f'llm_gateway_request_duration_seconds_count{{provider="{label}"}} {pm.latency.count}')
+
+        lines.append("# HELP llm_gateway_request_duration_quantile_seconds Estimated LLM request latency quantiles")
+        lines.append("# TYPE llm_gateway_request_duration_quantile_seconds gauge")
+        for provider, pm in self.provider_metrics.items():
+            label = escape(provider)
+            for name, value in pm.get_latency_percentiles().items():
+                quantile = int(name[1:]) / 100
+                lines.append(
+                    f'llm_gateway_request_duration_quantile_seconds{{provider="{label}",quantile="{quantile}"}} {value}'
+                )
+
+        return "\n".join(lines) + "\n"
@@ -5,8 +5,11 @@ content analysis, availability, cost optimization, and performance requirements.
 """
 
 import asyncio
+import math
+import random
 import time
-from typing import Dict, Any, List, Optional
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
 import httpx
 
 from services.shared.clients import ServiceClients
@@ -34,12 +37,224 @@ class ProviderResponse:
         self.error = error
 
 
+@dataclass
+class ProviderStats:
+    """Exponentially weighted latency/error statistics for a provider and model.
+
+    Also carries the outlier-ejection state: a provider that fails repeatedly is
+    ejected for a backoff period and re-admitted afterwards; the first request
+    after the backoff acts as the recovery probe.
+    """
+    ewma_latency: float = 0.0
+    ewma_variance: float = 0.0
+    ewma_error_rate: float = 0.0
+    samples: int = 0
+    consecutive_failures: int = 0
+    ejection_count: int = 0
+    ejected_until: float = 0.0
+    last_updated: float = 0.0
+
+    def observe(self, latency: float, success: bool, alpha: float):
+        """Fold one request outcome into the running averages."""
+        if self.samples == 0:
+            self.ewma_latency = latency
+            self.ewma_variance = 0.0
+            self.ewma_error_rate = 0.0 if success else 1.0
+        else:
+            delta = latency - self.ewma_latency
+            self.ewma_latency += alpha * delta
+            self.ewma_variance = (1 - alpha) * (self.ewma_variance + alpha * delta * delta)
+            self.ewma_error_rate += alpha * ((0.0 if success else 1.0) - self.ewma_error_rate)
+
+        self.samples += 1
+        self.last_updated = time.monotonic()
+        if success:
+            self.consecutive_failures = 0
+        else:
+            self.consecutive_failures += 1
+
+    def p95_latency(self) -> float:
+        """Approximate p95 latency from the EWMA mean and variance."""
+        return self.ewma_latency + 1.645 * math.sqrt(max(self.ewma_variance, 0.0))
+
+    def is_ejected(self, now: float) -> bool:
+        """Whether the provider is currently excluded from routing."""
+        return now < self.ejected_until
+
+
 class ProviderRouter:
     """Intelligent routing of LLM requests to appropriate providers."""
 
-    def __init__(self):
+    def __init__(self, metrics_collector=None):
         self.client = ServiceClients()
         self.providers = self._initialize_providers()
+        self.routing_config = self._load_routing_config()
+        self._availability_cache: Optional[Tuple[float, Dict[str, Dict[str, Any]]]] = None
+
+        # Latency/error tracking keyed by (provider, model)
+        self.provider_stats: Dict[Tuple[str, str], ProviderStats] = {}
+        self.routing_counters: Dict[str, int] = {
+            "routed": 0,
+            "hedged": 0,
+            "hedge_wins": 0,
+            "failovers": 0,
+            "ejections": 0,
+            "recoveries": 0
+        }
+
+        # Request outcomes flow router -> MetricsCollector -> router when a collector is attached
+        self.metrics_collector = None
+        if metrics_collector is not None:
+            self.attach_metrics_collector(metrics_collector)
+
+    def _load_routing_config(self) -> Dict[str, Any]:
+        """Load adaptive routing settings."""
+        return {
+            "strategy": get_config_value("ROUTING_STRATEGY", "adaptive", section="routing"),
+            "ewma_alpha": float(get_config_value("ROUTING_EWMA_ALPHA", "0.2", section="routing")),
+            "initial_latency": float(get_config_value("ROUTING_INITIAL_LATENCY", "1.0", section="routing")),
+            "error_penalty": float(get_config_value("ROUTING_ERROR_PENALTY", "4.0", section="routing")),
+            "cost_weight": float(get_config_value("ROUTING_COST_WEIGHT", "1.0", section="routing")),
+            "hedging_enabled": str(get_config_value("ROUTING_HEDGING_ENABLED", "true", section="routing")).lower() == "true",
+            "hedge_min_samples": int(get_config_value("ROUTING_HEDGE_MIN_SAMPLES", "10", section="routing")),
+            "hedge_default_delay": float(get_config_value("ROUTING_HEDGE_DEFAULT_DELAY", "2.0", section="routing")),
+            "hedge_min_delay": float(get_config_value("ROUTING_HEDGE_MIN_DELAY", "0.05", section="routing")),
+            "ejection_consecutive_failures": int(get_config_value("ROUTING_EJECTION_CONSECUTIVE_FAILURES", "5", section="routing")),
+            "ejection_error_rate": float(get_config_value("ROUTING_EJECTION_ERROR_RATE", "0.5", section="routing")),
+            "ejection_min_samples": int(get_config_value("ROUTING_EJECTION_MIN_SAMPLES", "10", section="routing")),
+            "ejection_base_seconds": float(get_config_value("ROUTING_EJECTION_BASE_SECONDS", "30", section="routing")),
+            "ejection_max_seconds": float(get_config_value("ROUTING_EJECTION_MAX_SECONDS", "300", section="routing")),
+            "availability_ttl": float(get_config_value("ROUTING_AVAILABILITY_TTL", "10", section="routing"))
+        }
+
+    def attach_metrics_collector(self, metrics_collector):
+        """Feed routing statistics from a MetricsCollector's request stream."""
+        if self.metrics_collector is not None:
+            self.metrics_collector.remove_listener(self._on_request_metrics)
+        self.metrics_collector = metrics_collector
+        metrics_collector.add_listener(self._on_request_metrics)
+
+    def _on_request_metrics(self, metrics):
+        """MetricsCollector listener: update stats for provider-attributed requests."""
+        if metrics.provider not in self.providers:
+            return
+        model = metrics.model or self.providers[metrics.provider].get('model', '')
+        self.record_outcome(metrics.provider, model, metrics.response_time, metrics.success)
+
+    def _get_stats(self, provider_config: Dict[str, Any]) -> ProviderStats:
+        """Get (or create) the stats entry for a provider config."""
+        key = (provider_config['name'], provider_config.get('model', ''))
+        stats = self.provider_stats.get(key)
+        if stats is None:
+            stats = self.provider_stats[key] = ProviderStats()
+        return stats
+
+    def record_outcome(self, provider: str, model: str, latency: float, success: bool):
+        """Update latency/error tracking and apply ejection or recovery."""
+        key = (provider, model or '')
+        stats = self.provider_stats.get(key)
+        if stats is None:
+            stats = self.provider_stats[key] = ProviderStats()
+
+        config = self.routing_config
+        stats.observe(latency, success, config["ewma_alpha"])
+        now = time.monotonic()
+
+        if success:
+            if stats.ejection_count and not stats.is_ejected(now):
+                # Successful probe after the backoff elapsed: fully re-admit
+                stats.ejection_count = 0
+                self.routing_counters["recoveries"] += 1
+            return
+
+        if stats.is_ejected(now):
+            return
+
+        should_eject = (
+            stats.consecutive_failures >= config["ejection_consecutive_failures"] or
+            (stats.samples >= config["ejection_min_samples"] and
+             stats.ewma_error_rate >= config["ejection_error_rate"]) or
+            stats.ejection_count > 0  # failed recovery probe
+        )
+        if should_eject:
+            stats.ejection_count += 1
+            backoff = min(
+                config["ejection_base_seconds"] * (2 ** (stats.ejection_count - 1)),
+                config["ejection_max_seconds"]
+            )
+            stats.ejected_until = now + backoff
+            self.routing_counters["ejections"] += 1
+            fire_and_forget(
+                "llm_gateway_provider_ejected",
+                f"Provider {provider} ejected for {backoff:.0f}s",
+                ServiceNames.LLM_GATEWAY,
+                {
+                    "provider": provider,
+                    "model": model,
+                    "consecutive_failures": stats.consecutive_failures,
+                    "error_rate": round(stats.ewma_error_rate, 3),
+                    "ejection_count": stats.ejection_count
+                }
+            )
+
+    def _routing_score(self, provider_config: Dict[str, Any], max_cost: float) -> float:
+        """Lower is better: expected latency inflated by error rate and relative cost."""
+        stats = self.provider_stats.get((provider_config['name'], provider_config.get('model', '')))
+        config = self.routing_config
+
+        if stats is None or stats.samples == 0:
+            latency = config["initial_latency"]
+            error_rate = 0.0
+        else:
+            latency = stats.ewma_latency
+            error_rate = stats.ewma_error_rate
+
+        cost_factor = 1.0
+        if max_cost > 0:
+            cost_factor += config["cost_weight"] * provider_config.get('cost_per_token', 0.0) / max_cost
+
+        return latency * (1 + config["error_penalty"] * error_rate) * cost_factor
+
+    def _filter_ejected(self, candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop ejected providers; if every candidate is ejected, keep them all (panic mode)."""
+        now = time.monotonic()
+        healthy = [p for p in candidates if not self._get_stats(p).is_ejected(now)]
+        return healthy or candidates
+
+    def _choose_adaptive(self, candidates: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Power-of-two-choices selection over the routing score."""
+        if not candidates:
+            return None
+
+        if self.routing_config["strategy"] != "adaptive":
+            return min(candidates, key=lambda x: x.get('cost_per_token', 0))
+
+        candidates = self._filter_ejected(candidates)
+        if len(candidates) == 1:
+            return candidates[0]
+
+        max_cost = max(p.get('cost_per_token', 0.0) for p in candidates)
+        first, second = random.sample(candidates, 2)
+        return min((first, second), key=lambda p: self._routing_score(p, max_cost))
+
+    def _select_backup_provider(self, candidates: List[Dict[str, Any]],
+                                primary: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Best-scoring healthy candidate other than the primary, used for hedging."""
+        now = time.monotonic()
+        others = [p for p in candidates
+                  if p['name'] != primary['name'] and not self._get_stats(p).is_ejected(now)]
+        if not others:
+            return None
+        max_cost = max(p.get('cost_per_token', 0.0) for p in others)
+        return min(others, key=lambda p: self._routing_score(p, max_cost))
+
+    def _hedge_delay(self, provider_config: Dict[str, Any]) -> float:
+        """Delay before a hedge is launched: the primary's estimated p95 latency."""
+        config = self.routing_config
+        stats = self.provider_stats.get((provider_config['name'], provider_config.get('model', '')))
+        if stats is None or stats.samples < config["hedge_min_samples"]:
+            return config["hedge_default_delay"]
+        return max(stats.p95_latency(), config["hedge_min_delay"])
 
     def _initialize_providers(self) -> Dict[str, Dict[str, Any]]:
         """Initialize available LLM providers."""
@@ -103,7 +318,7 @@ class ProviderRouter:
         """Route request to appropriate provider and execute."""
         try:
             # Select optimal provider
-            selected_provider = await self._select_provider(request)
+            selected_provider, candidates = await self._select_provider_with_candidates(request)
 
             if not selected_provider:
                 return ProviderResponse(
@@ -113,6 +328,16 @@ class ProviderRouter:
                     error="No suitable provider available"
                 )
 
+            self.routing_counters["routed"] += 1
+
+            # Hedge only when the router was free to choose among several providers
+            backup = None
+            if self.routing_config["hedging_enabled"] and len(candidates) > 1:
+                backup = self._select_backup_provider(candidates, selected_provider)
+
+            if backup:
+                return await self._execute_hedged(request, selected_provider, backup)
+
             # Execute request with selected provider
             return await self._execute_with_provider(request, selected_provider)
 
@@ -126,15 +351,22 @@ class ProviderRouter:
 
     async def _select_provider(self, request) -> Optional[Dict[str, Any]]:
         """Select the optimal provider for the request."""
+        selected, _ = await self._select_provider_with_candidates(request)
+        return selected
+
+    async def _select_provider_with_candidates(
+            self, request) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Select a provider and return the candidate pool it was chosen from."""
         available_providers = await self._get_available_providers()
 
         if not available_providers:
-            return None
+            return None, []
 
         # If specific provider requested, use it if available
         if hasattr(request, 'provider') and request.provider:
             if request.provider in available_providers:
-                return available_providers[request.provider]
+                requested = available_providers[request.provider]
+                return requested, [requested]
 
         # Intelligent provider selection based on:
         # 1. Security requirements
@@ -149,21 +381,80 @@ class ProviderRouter:
             'password', 'secret', 'token', 'key', 'credential', 'confidential'
         ])
 
+        candidates = list(available_providers.values())
         if is_sensitive:
-            # Prefer secure providers for sensitive content
-            secure_providers = [p for p in available_providers.values()
+            # Restrict sensitive content to secure providers
+            secure_providers = [p for p in candidates
                               if p.get('security_level') == 'high']
             if secure_providers:
-                return secure_providers[0]
+                candidates = secure_providers
+
+        # Latency/error-aware selection, biased towards cheaper providers
+        return self._choose_adaptive(candidates), candidates
 
-        # Cost optimization: prefer cheaper providers for non-critical requests
-        sorted_providers = sorted(available_providers.values(),
-                                key=lambda x: x.get('cost_per_token', 0))
+    async def _execute_hedged(self, request, primary: Dict[str, Any],
+                              backup: Dict[str, Any]) -> ProviderResponse:
+        """Execute on the primary, hedging to the backup once the p95 budget elapses.
 
-        return sorted_providers[0] if sorted_providers else None
+        The first successful response wins and the other in-flight request is
+        cancelled. A fast primary failure fails over to the backup directly.
+        """
+        primary_task = asyncio.create_task(self._execute_with_provider(request, primary))
+        pending = {primary_task}
+
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self._hedge_delay(primary))
+            if done:
+                result = primary_task.result()
+                if result.success:
+                    return result
+                self.routing_counters["failovers"] += 1
+                return await self._execute_with_provider(request, backup)
+
+            self.routing_counters["hedged"] += 1
+            backup_task = asyncio.create_task(self._execute_with_provider(request, backup))
+            pending = {primary_task, backup_task}
+
+            result = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if result.success:
+                        if task is backup_task:
+                            self.routing_counters["hedge_wins"] += 1
+                        return result
+            return result
+
+        finally:
+            for task in pending:
+                task.cancel()
 
     async def _execute_with_provider(self, request, provider_config: Dict[str, Any]) -> ProviderResponse:
-        """Execute LLM request with specific provider."""
+        """Execute LLM request with specific provider and record its latency/outcome."""
+        start_time = time.monotonic()
+        result = await self._dispatch_to_provider(request, provider_config)
+        latency = time.monotonic() - start_time
+
+        if self.metrics_collector is not None:
+            await self.metrics_collector.record_request(
+                "completion",
+                provider_config['name'],
+                latency,
+                result.tokens_used,
+                cost=result.cost,
+                success=result.success,
+                error_type=result.error or None,
+                model=provider_config.get('model')
+            )
+        else:
+            self.record_outcome(provider_config['name'], provider_config.get('model', ''),
+                                latency, result.success)
+
+        return result
+
+    async def _dispatch_to_provider(self, request, provider_config: Dict[str, Any]) -> ProviderResponse:
+        """Dispatch the request to the provider-specific implementation."""
         provider_name = provider_config['name']
 
         try:
@@ -353,13 +644,28 @@ class ProviderRouter:
         )
 
     async def _get_available_providers(self) -> Dict[str, Dict[str, Any]]:
-        """Get providers that are currently available and configured."""
-        available = {}
-
-        for name, config in self.providers.items():
-            if await self._check_provider_availability(config):
-                available[name] = config
+        """Get providers that are currently available and configured.
+
+        Probes run concurrently and results are reused for a short TTL so the
+        request path does not pay a health check round-trip per request.
+        """
+        now = time.monotonic()
+        cached = self._availability_cache
+        if cached and now - cached[0] < self.routing_config["availability_ttl"]:
+            return cached[1]
+
+        names = list(self.providers.keys())
+        results = await asyncio.gather(
+            *(self._check_provider_availability(self.providers[name]) for name in names),
+            return_exceptions=True
+        )
+        available = {
+            name: self.providers[name]
+            for name, ok in zip(names, results)
+            if ok is True
+        }
 
+        self._availability_cache = (now, available)
         return available
 
     async def _check_provider_availability(self, provider_config: Dict[str, Any]) -> bool:
@@ -410,27 +716,67 @@ class ProviderRouter:
         return provider_list
 
     async def check_provider_health(self) -> Dict[str, Any]:
-        """Check health status of all providers."""
+        """Check health status of all providers, including observed request latency."""
         health_status = {}
+        now = time.monotonic()
 
-        for name, config in self.providers.items():
-            try:
-                available = await self._check_provider_availability(config)
+        names = list(self.providers.keys())
+        results = await asyncio.gather(
+            *(self._check_provider_availability(self.providers[name]) for name in names),
+            return_exceptions=True
+        )
+
+        for name, result in zip(names, results):
+            config = self.providers[name]
+            if isinstance(result, Exception):
                 health_status[name] = {
-                    "available": available,
-                    "status": "healthy" if available else "unhealthy",
+                    "available": False,
+                    "status": "error",
+                    "error": str(result),
                     "last_checked": time.time()
                 }
-            except Exception as e:
+            else:
                 health_status[name] = {
-                    "available": False,
-                    "status": "error",
-                    "error": str(e),
+                    "available": result,
+                    "status": "healthy" if result else "unhealthy",
                     "last_checked": time.time()
                 }
 
+            stats = self.provider_stats.get((name, config.get('model', '')))
+            if stats is not None and stats.samples:
+                ejected = stats.is_ejected(now)
+                health_status[name]["routing"] = {
+                    "samples": stats.samples,
+                    "ewma_latency": round(stats.ewma_latency, 3),
+                    "p95_latency": round(stats.p95_latency(), 3),
+                    "error_rate": round(stats.ewma_error_rate, 3),
+                    "consecutive_failures": stats.consecutive_failures,
+                    "ejected": ejected,
+                    "ejected_for_seconds": round(stats.ejected_until - now, 1) if ejected else 0.0
+                }
+                if ejected and result is True:
+                    health_status[name]["status"] = "ejected"
+
         return health_status
 
+    def get_routing_stats(self) -> Dict[str, Any]:
+        """Get adaptive routing counters and per-provider latency statistics."""
+        now = time.monotonic()
+        return {
+            "strategy": self.routing_config["strategy"],
+            "counters": dict(self.routing_counters),
+            "providers": {
+                f"{provider}:{model}": {
+                    "samples": stats.samples,
+                    "ewma_latency": round(stats.ewma_latency, 3),
+                    "p95_latency": round(stats.p95_latency(), 3),
+                    "error_rate": round(stats.ewma_error_rate, 3),
+                    "ejected": stats.is_ejected(now)
+                }
+                for (provider, model), stats in self.provider_stats.items()
+            }
+        }
+
     async def generate_embeddings(self, text: str, model: str, provider: str) -> List[float]:
         """Generate embeddings for text (placeholder)."""
         # This would integrate with embedding providers
@@ -0,0 +1 @@
+"""LLM Gateway test suite."""
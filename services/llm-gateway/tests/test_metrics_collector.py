@@ -0,0 +1,127 @@
+"""Tests for the fixed-memory latency histogram and rolling metric windows."""
+
+import math
+import os
+import random
+import sys
+
+import pytest
+
+# Add the service directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules import metrics_collector as collector_module
+from modules.metrics_collector import LatencyHistogram, MetricsCollector, RequestMetrics, TimeBucketRing
+
+
+def request(timestamp, provider="ollama", response_time=0.5, tokens=10, success=True):
+    return RequestMetrics(timestamp=timestamp, provider=provider, response_time=response_time,
+                          tokens_used=tokens, cost=0.01, success=success)
+
+
+@pytest.mark.unit
+class TestLatencyHistogram:
+    """Test log-bucket layout and percentile accuracy."""
+
+    def test_bucket_boundaries(self):
+        histogram = LatencyHistogram(min_value=0.001, max_value=600.0, growth=1.05)
+
+        assert histogram._index(0.0) == 0
+        assert histogram._index(0.001) == 0
+        for i in range(1, histogram.bucket_count - 1):
+            upper = histogram.upper_bound(i)
+            # Upper edges are inclusive, anything just above moves on
+            assert histogram._index(upper) == i
+            assert histogram._index(upper * 1.0001) == min(i + 1, histogram.bucket_count - 1)
+            assert histogram._index(histogram.upper_bound(i - 1) * 1.0001) == i
+        assert histogram._index(1e9) == histogram.bucket_count - 1
+
+    def test_cumulative_counts_at_bucket_edges(self):
+        histogram = LatencyHistogram()
+        for value in (histogram.upper_bound(10), histogram.upper_bound(20), histogram.upper_bound(20) * 1.01):
+            histogram.record(value)
+
+        bounds = [histogram.upper_bound(10), histogram.upper_bound(20), histogram.upper_bound(30)]
+        assert histogram.cumulative_counts(bounds) == [1, 2, 3]
+
+    def test_percentiles_within_growth_error(self):
+        rng = random.Random(11)
+        histogram = LatencyHistogram(growth=1.05)
+        values = sorted(rng.lognormvariate(-1.0, 1.2) for _ in range(5000))
+        for value in values:
+            histogram.record(value)
+
+        for q in (0.5, 0.9, 0.95, 0.99, 0.999):
+            exact = values[int(math.ceil(q * len(values))) - 1]
+            estimate = histogram.percentile(q)
+            assert abs(estimate - exact) / exact <= histogram.growth - 1
+
+        assert histogram.percentile(1.0) <= histogram.max
+        assert histogram.mean() == pytest.approx(sum(values) / len(values))
+
+    def test_merge_matches_combined_recording(self):
+        rng = random.Random(5)
+        left, right, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for i in range(1000):
+            value = rng.expovariate(2.0)
+            (left if i % 2 else right).record(value)
+            combined.record(value)
+
+        left.merge(right)
+
+        assert left.counts == combined.counts
+        assert left.percentile(0.95) == combined.percentile(0.95)
+
+
+@pytest.mark.unit
+class TestTimeBucketRing:
+    """Test slot reuse in the rolling windows."""
+
+    def test_slots_wrap_around(self):
+        ring = TimeBucketRing(bucket_seconds=3600, size=24)
+        start = 1_700_000_000 // 3600 * 3600
+
+        for hour in range(30):
+            for _ in range(hour + 1):
+                ring.record(request(start + hour * 3600 + 60))
+
+        now = start + 29 * 3600 + 120
+        snapshot = ring.snapshot(now)
+        assert len(ring.buckets) == 24
+        assert sorted(snapshot) == [start // 3600 + hour for hour in range(6, 30)]
+        # Reused slots start from zero instead of adding to the stale hour
+        assert [snapshot[epoch]["requests"] for epoch in sorted(snapshot)] == list(range(7, 31))
+
+    def test_stale_slots_drop_out_of_the_window(self):
+        ring = TimeBucketRing(bucket_seconds=3600, size=24)
+        start = 1_700_000_000 // 3600 * 3600
+        ring.record(request(start))
+        ring.record(request(start + 5 * 3600))
+
+        assert len(ring.live_buckets(start + 23 * 3600)) == 2
+        assert [b.epoch for b in ring.live_buckets(start + 24 * 3600)] == [start // 3600 + 5]
+        assert [b.epoch for b in ring.live_buckets(start + 6 * 3600, span=2)] == [start // 3600 + 5]
+        assert ring.live_buckets(start + 40 * 3600) == []
+
+
+@pytest.mark.unit
+class TestMetricsCollector:
+    """Test collector windows over simulated time."""
+
+    @pytest.mark.asyncio
+    async def test_hourly_window_wraps_after_a_day(self, monkeypatch):
+        now = [1_700_000_000 // 3600 * 3600 + 10.0]
+        monkeypatch.setattr(collector_module.time, "time", lambda: now[0])
+        monkeypatch.setattr(collector_module, "fire_and_forget", lambda *args, **kwargs: None)
+        collector = MetricsCollector()
+
+        await collector.record_request("completion", "ollama", 0.2, 10)
+        now[0] += 24 * 3600
+        await collector.record_request("completion", "ollama", 0.4, 10, success=False)
+
+        hourly = collector.hourly_metrics
+        assert len(hourly) == 1
+        assert list(hourly.values())[0]["requests"] == 1
+        assert list(hourly.values())[0]["errors"] == 1
+        assert len(collector.daily_metrics) == 2
+        assert collector.total_recorded == 2
@@ -0,0 +1,171 @@
+"""Tests for adaptive routing, hedged requests and outlier ejection."""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add the service directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules import provider_router as router_module
+from modules.provider_router import ProviderResponse, ProviderRouter
+
+
+class FakeProviders:
+    """Stands in for the provider dispatch with per-provider delays."""
+
+    def __init__(self, delays, failing=()):
+        self.delays = delays
+        self.failing = set(failing)
+        self.started = []
+        self.finished = []
+        self.cancelled = []
+
+    async def __call__(self, request, provider_config):
+        name = provider_config['name']
+        self.started.append(name)
+        try:
+            await asyncio.sleep(self.delays[name])
+        except asyncio.CancelledError:
+            self.cancelled.append(name)
+            raise
+        self.finished.append(name)
+        if name in self.failing:
+            return ProviderResponse("", name, success=False, error="provider error")
+        return ProviderResponse(f"answer from {name}", name, tokens_used=10)
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def router(monkeypatch):
+    router = ProviderRouter()
+    router.routing_config.update({
+        "hedging_enabled": True,
+        "hedge_default_delay": 0.05,
+        "ejection_consecutive_failures": 3,
+        "ejection_base_seconds": 30,
+        "ejection_max_seconds": 300
+    })
+    monkeypatch.setattr(router_module, "fire_and_forget", lambda *args, **kwargs: None)
+    return router
+
+
+@pytest.mark.unit
+class TestHedgedRequests:
+    """Test hedging to a backup provider."""
+
+    @pytest.mark.asyncio
+    async def test_hedge_fires_after_latency_threshold(self, router):
+        providers = FakeProviders({"ollama": 1.0, "openai": 0.01})
+        router._dispatch_to_provider = providers
+
+        result = await router._execute_hedged(None, router.providers["ollama"], router.providers["openai"])
+
+        assert result.provider == "openai"
+        assert providers.started == ["ollama", "openai"]
+        assert router.routing_counters["hedged"] == 1
+        assert router.routing_counters["hedge_wins"] == 1
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_before_threshold(self, router):
+        providers = FakeProviders({"ollama": 0.01, "openai": 0.01})
+        router._dispatch_to_provider = providers
+        router.routing_config["hedge_default_delay"] = 0.5
+
+        result = await router._execute_hedged(None, router.providers["ollama"], router.providers["openai"])
+
+        assert result.provider == "ollama"
+        assert providers.started == ["ollama"]
+        assert router.routing_counters["hedged"] == 0
+
+    @pytest.mark.asyncio
+    async def test_losing_request_is_cancelled(self, router):
+        providers = FakeProviders({"ollama": 1.0, "openai": 0.01})
+        router._dispatch_to_provider = providers
+
+        await router._execute_hedged(None, router.providers["ollama"], router.providers["openai"])
+        await asyncio.sleep(0)
+
+        assert providers.cancelled == ["ollama"]
+        assert providers.finished == ["openai"]
+
+    def test_hedge_delay_follows_observed_p95(self, router):
+        primary = router.providers["ollama"]
+        router.routing_config["hedge_min_samples"] = 5
+        assert router._hedge_delay(primary) == 0.05
+
+        for latency in (0.2, 0.2, 0.2, 0.2, 0.2):
+            router.record_outcome("ollama", primary["model"], latency, True)
+
+        assert router._hedge_delay(primary) == pytest.approx(0.2)
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_failure_fails_over(self, router):
+        providers = FakeProviders({"ollama": 0.0, "openai": 0.01}, failing={"ollama"})
+        router._dispatch_to_provider = providers
+        router.routing_config["hedge_default_delay"] = 0.5
+
+        result = await router._execute_hedged(None, router.providers["ollama"], router.providers["openai"])
+
+        assert result.provider == "openai"
+        assert router.routing_counters["failovers"] == 1
+        assert router.routing_counters["hedged"] == 0
+
+
+@pytest.mark.unit
+class TestOutlierEjection:
+    """Test ejection and re-admission of failing providers."""
+
+    def test_failing_provider_is_ejected_and_readmitted(self, router, monkeypatch):
+        clock = Clock()
+        monkeypatch.setattr(router_module.time, "monotonic", clock)
+        ollama, openai = router.providers["ollama"], router.providers["openai"]
+
+        for _ in range(3):
+            router.record_outcome("ollama", ollama["model"], 0.1, False)
+
+        assert router.routing_counters["ejections"] == 1
+        assert router._filter_ejected([ollama, openai]) == [openai]
+        assert router._select_backup_provider([ollama, openai], openai) is None
+
+        # The first request after the backoff is the recovery probe
+        clock.now += 31
+        assert router._filter_ejected([ollama, openai]) == [ollama, openai]
+        router.record_outcome("ollama", ollama["model"], 0.1, True)
+
+        stats = router.provider_stats[("ollama", ollama["model"])]
+        assert stats.ejection_count == 0
+        assert router.routing_counters["recoveries"] == 1
+        assert router._select_backup_provider([ollama, openai], openai) is ollama
+
+    def test_failed_probe_doubles_the_backoff(self, router, monkeypatch):
+        clock = Clock()
+        monkeypatch.setattr(router_module.time, "monotonic", clock)
+        model = router.providers["ollama"]["model"]
+
+        for _ in range(3):
+            router.record_outcome("ollama", model, 0.1, False)
+        clock.now += 31
+        router.record_outcome("ollama", model, 0.1, False)
+
+        stats = router.provider_stats[("ollama", model)]
+        assert stats.ejection_count == 2
+        assert stats.ejected_until == clock.now + 60
+
+    def test_all_ejected_keeps_every_candidate(self, router, monkeypatch):
+        monkeypatch.setattr(router_module.time, "monotonic", Clock())
+        candidates = [router.providers["ollama"], router.providers["openai"]]
+        for provider in candidates:
+            for _ in range(3):
+                router.record_outcome(provider["name"], provider["model"], 0.1, False)
+
+        assert router._filter_ejected(candidates) == candidates
@@ -1,6 +1,11 @@
 """Tracing Service Domain Service"""
 
-from typing import List, Dict, Any, Optional
+import gzip
+import json
+import math
+import zlib
+from collections import OrderedDict, deque
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 from datetime import datetime, timedelta
 
 from ..value_objects.distributed_trace import DistributedTrace
@@ -8,13 +13,117 @@ from ..value_objects.trace_span import TraceSpan
 from ..value_objects.trace_status import TraceStatus
 
 
-class TracingService:
-    """Domain service for managing distributed tracing."""
+class SpanLatencyHistogram:
+    """Fixed-size log-bucketed histogram of span durations in microseconds."""
+
+    GROWTH = 1.1
+    MIN_US = 10.0
+    MAX_US = 3_600_000_000.0
 
     def __init__(self):
+        self._log_growth = math.log(self.GROWTH)
+        bucket_count = int(math.log(self.MAX_US / self.MIN_US) / self._log_growth) + 2
+        self.buckets = [0] * bucket_count
+        self.count = 0
+        self.total = 0
+
+    def _bucket(self, value: float) -> int:
+        if value <= self.MIN_US:
+            return 0
+        index = int(math.log(value / self.MIN_US) / self._log_growth) + 1
+        return min(index, len(self.buckets) - 1)
+
+    def record(self, duration_us: int):
+        self.buckets[self._bucket(max(duration_us, 0))] += 1
+        self.count += 1
+        self.total += max(duration_us, 0)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Approximate percentile (upper bound of the matching bucket)."""
+        if self.count == 0:
+            return None
+        target = max(1, math.ceil(self.count * fraction))
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= target:
+                return self.MIN_US * (self.GROWTH ** index)
+        return self.MAX_US
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_microseconds": self.total / self.count if self.count else None,
+            "p50_microseconds": self.percentile(0.50),
+            "p95_microseconds": self.percentile(0.95),
+            "p99_microseconds": self.percentile(0.99)
+        }
+
+
+class TracingService:
+    """Domain service for managing distributed tracing.
+
+    Active traces keep a span-id index so spans are finished in O(1). Completed
+    traces go through tail-based sampling: failed, timed-out and slow traces are
+    always retained, others are kept for ``sample_rate`` of trace IDs. Retained
+    traces live in two fixed-capacity rings (one for errors/slow traces, one for
+    sampled traces) so ordinary traffic never evicts the interesting ones. Per
+    service/operation latency histograms and stats counters are maintained
+    incrementally over every trace, sampled or not.
+    """
+
+    OTHER_OPERATION = ("other", "other")
+
+    def __init__(
+        self,
+        max_completed_traces: int = 5000,
+        max_retained_traces: int = 5000,
+        max_active_traces: int = 10000,
+        sample_rate: float = 1.0,
+        slow_trace_threshold_ms: float = 1000.0,
+        max_operations: int = 1000,
+        export_path: Optional[str] = None,
+        export_batch_size: int = 100
+    ):
         """Initialize tracing service."""
-        self._active_traces: Dict[str, DistributedTrace] = {}
-        self._completed_traces: Dict[str, DistributedTrace] = {}
+        self.max_completed_traces = max(1, max_completed_traces)
+        self.max_retained_traces = max(1, max_retained_traces)
+        self.max_active_traces = max(1, max_active_traces)
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self.slow_trace_threshold_us = int(slow_trace_threshold_ms * 1000)
+        self.max_operations = max(1, max_operations)
+        self.export_path = export_path
+        self.export_batch_size = max(1, export_batch_size)
+
+        self._active_traces: "OrderedDict[str, DistributedTrace]" = OrderedDict()
+        self._active_spans: Dict[str, Dict[str, TraceSpan]] = {}
+        self._active_by_service: Dict[str, "OrderedDict[str, None]"] = {}
+
+        # Completed traces in completion order; the rings decide what is evicted
+        self._completed_traces: "OrderedDict[str, DistributedTrace]" = OrderedDict()
+        self._sampled_ring: deque = deque()
+        self._retained_ring: deque = deque()
+        self._completed_by_service: Dict[str, "OrderedDict[str, None]"] = {}
+        self._completed_by_root: Dict[str, "OrderedDict[str, None]"] = {}
+        self._completed_services: Dict[str, Tuple[str, ...]] = {}
+
+        self._latency: Dict[Tuple[str, str], SpanLatencyHistogram] = {}
+        self._export_buffer: List[str] = []
+        self._counters = {
+            "active_spans": 0,
+            "completed_spans": 0,
+            "completed_by_status": {status: 0 for status in TraceStatus},
+            "duration_total": 0,
+            "duration_count": 0,
+            "traces_completed_total": 0,
+            "traces_sampled_out": 0,
+            "traces_evicted": 0,
+            "active_traces_expired": 0
+        }
+
+    # ------------------------------------------------------------------
+    # Trace lifecycle
+    # ------------------------------------------------------------------
 
     def start_trace(
         self,
@@ -33,6 +142,14 @@ class TracingService:
         )
 
         self._active_traces[trace.trace_id] = trace
+        self._active_spans[trace.trace_id] = {}
+
+        # Bound active traces: the oldest abandoned trace is closed as timed out
+        while len(self._active_traces) > self.max_active_traces:
+            oldest_id = next(iter(self._active_traces))
+            self._counters["active_traces_expired"] += 1
+            self.complete_trace(oldest_id, TraceStatus.TIMEOUT)
+
         return trace
 
     def create_span(
@@ -56,20 +173,22 @@ class TracingService:
         )
 
         trace.add_span(span)
+        self._active_spans[trace_id][span.span_id] = span
+        self._counters["active_spans"] += 1
+        if span.service_name:
+            self._active_by_service.setdefault(span.service_name, OrderedDict())[trace_id] = None
         return span
 
     def finish_span(self, trace_id: str, span_id: str) -> bool:
         """Finish a span in a trace."""
-        trace = self._active_traces.get(trace_id)
-        if not trace:
+        span = self._active_spans.get(trace_id, {}).get(span_id)
+        if span is None:
             return False
 
-        for span in trace.spans:
-            if span.span_id == span_id:
-                span.finish()
-                return True
-
-        return False
+        if span.end_time is None:
+            span.finish()
+            self._record_latency(span)
+        return True
 
     def complete_trace(
         self,
@@ -81,36 +200,136 @@ class TracingService:
         if not trace:
             return False
 
+        spans = self._active_spans.pop(trace_id, {})
+        unfinished = [span for span in spans.values() if span.end_time is None]
         trace.complete(status)
+        for span in unfinished:
+            self._record_latency(span)
 
         # Move to completed traces
         del self._active_traces[trace_id]
-        self._completed_traces[trace_id] = trace
-
+        services = tuple({span.service_name for span in spans.values() if span.service_name})
+        for service in services:
+            index = self._active_by_service.get(service)
+            if index is not None:
+                index.pop(trace_id, None)
+                if not index:
+                    del self._active_by_service[service]
+        self._counters["active_spans"] -= len(spans)
+        self._counters["traces_completed_total"] += 1
+
+        self._export(trace)
+        self._admit_completed(trace, services)
         return True
 
+    # ------------------------------------------------------------------
+    # Tail sampling and retention
+    # ------------------------------------------------------------------
+
+    def _should_retain(self, trace: DistributedTrace) -> bool:
+        """Errors, timeouts and slow traces are always retained."""
+        if trace.status != TraceStatus.COMPLETED:
+            return True
+        duration = trace.duration_microseconds
+        return duration is not None and duration >= self.slow_trace_threshold_us
+
+    def _is_sampled(self, trace_id: str) -> bool:
+        """Deterministic per-trace-ID sampling decision."""
+        if self.sample_rate >= 1.0:
+            return True
+        return (zlib.crc32(trace_id.encode("utf-8")) % 10000) < self.sample_rate * 10000
+
+    def _admit_completed(self, trace: DistributedTrace, services: Tuple[str, ...]):
+        if self._should_retain(trace):
+            ring, capacity = self._retained_ring, self.max_retained_traces
+        elif self._is_sampled(trace.trace_id):
+            ring, capacity = self._sampled_ring, self.max_completed_traces
+        else:
+            self._counters["traces_sampled_out"] += 1
+            return
+
+        if len(ring) >= capacity:
+            self._counters["traces_evicted"] += 1
+            self._remove_completed(ring.popleft())
+        ring.append(trace.trace_id)
+
+        trace_id = trace.trace_id
+        self._completed_traces[trace_id] = trace
+        self._completed_services[trace_id] = services
+        for service in services:
+            self._completed_by_service.setdefault(service, OrderedDict())[trace_id] = None
+        self._completed_by_root.setdefault(trace.root_service, OrderedDict())[trace_id] = None
+
+        self._counters["completed_spans"] += trace.span_count
+        self._counters["completed_by_status"][trace.status] += 1
+        duration = trace.duration_microseconds
+        if duration is not None:
+            self._counters["duration_total"] += duration
+            self._counters["duration_count"] += 1
+
+    def _remove_completed(self, trace_id: str):
+        """Drop a completed trace and its index entries."""
+        trace = self._completed_traces.pop(trace_id, None)
+        if trace is None:
+            return
+
+        for service in self._completed_services.pop(trace_id, ()):
+            self._discard_index_entry(self._completed_by_service, service, trace_id)
+        self._discard_index_entry(self._completed_by_root, trace.root_service, trace_id)
+
+        self._counters["completed_spans"] -= trace.span_count
+        self._counters["completed_by_status"][trace.status] -= 1
+        duration = trace.duration_microseconds
+        if duration is not None:
+            self._counters["duration_total"] -= duration
+            self._counters["duration_count"] -= 1
+
+    @staticmethod
+    def _discard_index_entry(index: Dict[str, "OrderedDict[str, None]"], key: str, trace_id: str):
+        entries = index.get(key)
+        if entries is not None:
+            entries.pop(trace_id, None)
+            if not entries:
+                del index[key]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
     def get_trace(self, trace_id: str) -> Optional[DistributedTrace]:
         """Get a trace by ID."""
         return self._active_traces.get(trace_id) or self._completed_traces.get(trace_id)
 
+    @staticmethod
+    def _page(trace_ids: Iterator[str], lookup: Dict[str, DistributedTrace], limit: int, offset: int,
+              status_filter: Optional[TraceStatus] = None) -> List[DistributedTrace]:
+        """Take ``limit`` traces after ``offset`` matches from an ordered ID iterator."""
+        traces = []
+        skipped = 0
+        for trace_id in trace_ids:
+            trace = lookup.get(trace_id)
+            if trace is None or (status_filter and trace.status != status_filter):
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            traces.append(trace)
+            if len(traces) >= limit:
+                break
+        return traces
+
     def list_active_traces(
         self,
         service_filter: Optional[str] = None,
         limit: int = 50,
         offset: int = 0
     ) -> List[DistributedTrace]:
-        """List active traces with optional filtering."""
-        traces = list(self._active_traces.values())
-
-        if service_filter:
-            traces = [t for t in traces if t.root_service == service_filter]
-
-        # Sort by creation time (newest first)
-        traces.sort(key=lambda t: t.created_at, reverse=True)
-
-        start_idx = offset
-        end_idx = start_idx + limit
-        return traces[start_idx:end_idx]
+        """List active traces with optional filtering, newest first."""
+        candidates = (
+            t.trace_id for t in reversed(self._active_traces.values())
+            if not service_filter or t.root_service == service_filter
+        )
+        return self._page(candidates, self._active_traces, limit, offset)
 
     def list_completed_traces(
         self,
@@ -119,21 +338,12 @@ class TracingService:
         limit: int = 50,
         offset: int = 0
     ) -> List[DistributedTrace]:
-        """List completed traces with optional filtering."""
-        traces = list(self._completed_traces.values())
-
+        """List retained completed traces with optional filtering, most recently completed first."""
         if service_filter:
-            traces = [t for t in traces if t.root_service == service_filter]
-
-        if status_filter:
-            traces = [t for t in traces if t.status == status_filter]
-
-        # Sort by completion time (newest first)
-        traces.sort(key=lambda t: t.completed_at or t.created_at, reverse=True)
-
-        start_idx = offset
-        end_idx = start_idx + limit
-        return traces[start_idx:end_idx]
+            candidates = reversed(self._completed_by_root.get(service_filter, OrderedDict()))
+        else:
+            candidates = reversed(self._completed_traces)
+        return self._page(candidates, self._completed_traces, limit, offset, status_filter)
 
     def get_service_traces(
         self,
@@ -141,56 +351,105 @@ class TracingService:
         active_only: bool = False,
         limit: int = 50
     ) -> List[DistributedTrace]:
-        """Get traces for a specific service."""
-        traces = []
-
-        # Check active traces
-        for trace in self._active_traces.values():
-            if any(span.service_name == service_name for span in trace.spans):
-                traces.append(trace)
+        """Get traces with at least one span from a specific service."""
+        traces = self._page(reversed(self._active_by_service.get(service_name, OrderedDict())),
+                            self._active_traces, limit, 0)
 
-        # Check completed traces if not active_only
         if not active_only:
-            for trace in self._completed_traces.values():
-                if any(span.service_name == service_name for span in trace.spans):
-                    traces.append(trace)
+            traces.extend(self._page(reversed(self._completed_by_service.get(service_name, OrderedDict())),
+                                     self._completed_traces, limit, 0))
 
         # Sort by creation time (newest first)
         traces.sort(key=lambda t: t.created_at, reverse=True)
 
         return traces[:limit]
 
-    def get_tracing_stats(self) -> Dict[str, Any]:
-        """Get tracing statistics."""
-        active_traces = list(self._active_traces.values())
-        completed_traces = list(self._completed_traces.values())
+    # ------------------------------------------------------------------
+    # Statistics
+    # ------------------------------------------------------------------
+
+    def _record_latency(self, span: TraceSpan):
+        duration = span.duration_microseconds
+        if duration is None:
+            return
+        key = (span.service_name, span.operation_name)
+        histogram = self._latency.get(key)
+        if histogram is None:
+            if len(self._latency) >= self.max_operations:
+                key = self.OTHER_OPERATION
+                histogram = self._latency.get(key)
+            if histogram is None:
+                histogram = self._latency[key] = SpanLatencyHistogram()
+        histogram.record(duration)
+
+    def get_latency_stats(self, service_name: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Span latency percentiles per ``service/operation``, optionally for one service."""
+        return {
+            f"{service}/{operation}": histogram.to_dict()
+            for (service, operation), histogram in self._latency.items()
+            if service_name is None or service == service_name
+        }
 
-        total_completed = len(completed_traces)
-        successful_traces = len([t for t in completed_traces if t.status == TraceStatus.COMPLETED])
-        failed_traces = len([t for t in completed_traces if t.status == TraceStatus.FAILED])
+    def get_tracing_stats(self) -> Dict[str, Any]:
+        """Get tracing statistics over active and retained completed traces."""
+        counters = self._counters
+        by_status = counters["completed_by_status"]
 
-        # Calculate average spans per trace
-        total_spans = sum(len(t.spans) for t in active_traces + completed_traces)
-        total_traces = len(active_traces) + len(completed_traces)
+        total_spans = counters["active_spans"] + counters["completed_spans"]
+        total_traces = len(self._active_traces) + len(self._completed_traces)
         avg_spans_per_trace = total_spans / total_traces if total_traces > 0 else 0
-
-        # Calculate average trace duration
-        completed_durations = [
-            t.duration_microseconds for t in completed_traces
-            if t.duration_microseconds is not None
-        ]
-        avg_duration = sum(completed_durations) / len(completed_durations) if completed_durations else None
+        avg_duration = (
+            counters["duration_total"] / counters["duration_count"] if counters["duration_count"] else None
+        )
 
         return {
-            "active_traces": len(active_traces),
-            "completed_traces": total_completed,
-            "successful_traces": successful_traces,
-            "failed_traces": failed_traces,
+            "active_traces": len(self._active_traces),
+            "completed_traces": len(self._completed_traces),
+            "successful_traces": by_status[TraceStatus.COMPLETED],
+            "failed_traces": by_status[TraceStatus.FAILED],
+            "timed_out_traces": by_status[TraceStatus.TIMEOUT],
             "total_spans": total_spans,
             "avg_spans_per_trace": avg_spans_per_trace,
-            "avg_trace_duration_microseconds": avg_duration
+            "avg_trace_duration_microseconds": avg_duration,
+            "traces_completed_total": counters["traces_completed_total"],
+            "traces_sampled_out": counters["traces_sampled_out"],
+            "traces_evicted": counters["traces_evicted"],
+            "active_traces_expired": counters["active_traces_expired"],
+            "sample_rate": self.sample_rate,
+            "retention": {
+                "sampled": {"size": len(self._sampled_ring), "capacity": self.max_completed_traces},
+                "errors_and_slow": {"size": len(self._retained_ring), "capacity": self.max_retained_traces}
+            }
         }
 
+    # ------------------------------------------------------------------
+    # Export and cleanup
+    # ------------------------------------------------------------------
+
+    def _export(self, trace: DistributedTrace):
+        if not self.export_path:
+            return
+        self._export_buffer.append(json.dumps(trace.to_dict(), separators=(",", ":"), default=str))
+        if len(self._export_buffer) >= self.export_batch_size:
+            self.flush_export()
+
+    def flush_export(self) -> int:
+        """Append buffered finished traces to the export file as one gzip member of JSON lines."""
+        if not self.export_path or not self._export_buffer:
+            return 0
+        lines, self._export_buffer = self._export_buffer, []
+        with gzip.open(self.export_path, "at", encoding="utf-8") as export_file:
+            export_file.write("\n".join(lines) + "\n")
+        return len(lines)
+
+    @staticmethod
+    def read_exported_traces(path: str) -> Iterator[Dict[str, Any]]:
+        """Iterate over trace dictionaries previously exported to ``path``."""
+        with gzip.open(path, "rt", encoding="utf-8") as export_file:
+            for line in export_file:
+                if line.strip():
+                    yield json.loads(line)
+
     def cleanup_old_traces(self, max_age_hours: int = 24) -> int:
         """Clean up old completed traces. Returns count removed."""
         cutoff_time = datetime.utcnow() - timedelta(hours=max_age_hours)
@@ -201,6 +460,11 @@ class TracingService:
                 traces_to_remove.append(trace_id)
 
         for trace_id in traces_to_remove:
-            del self._completed_traces[trace_id]
+            self._remove_completed(trace_id)
+
+        if traces_to_remove:
+            removed = set(traces_to_remove)
+            self._sampled_ring = deque(t for t in self._sampled_ring if t not in removed)
+            self._retained_ring = deque(t for t in self._retained_ring if t not in removed)
 
         return len(traces_to_remove)
@@ -1,6 +1,9 @@
 """Workflow Executor Domain Service"""
 
 import asyncio
+import heapq
+import time
+from collections import defaultdict
 from typing import Dict, Any, List, Optional, Callable
 from datetime import datetime
 
@@ -13,9 +16,25 @@ from ..value_objects.action_result import ActionResult, ActionStatus
 class WorkflowExecutor:
     """Domain service for executing workflows."""
 
-    def __init__(self, action_executor_factory: Callable = None):
-        """Initialize with optional action executor factory."""
+    def __init__(
+        self,
+        action_executor_factory: Callable = None,
+        max_concurrency: int = 16,
+        service_concurrency: Optional[Dict[str, int]] = None,
+        default_service_concurrency: int = 8
+    ):
+        """Initialize with optional action executor factory and concurrency limits.
+
+        ``max_concurrency`` caps actions running at once across the workflow;
+        ``service_concurrency`` caps actions per target service (``config["service"]``),
+        falling back to ``default_service_concurrency``.
+        """
         self.action_executor_factory = action_executor_factory or self._default_action_executor
+        self.max_concurrency = max(1, max_concurrency)
+        self.service_concurrency = dict(service_concurrency or {})
+        self.default_service_concurrency = max(1, default_service_concurrency)
+        # Moving-average execution time per action kind, used for critical-path priority
+        self.duration_estimates: Dict[str, float] = {}
 
     async def execute_workflow(
         self,
@@ -51,81 +70,201 @@ class WorkflowExecutor:
         parameters: Dict[str, Any],
         external_services: Optional[Dict[str, Any]] = None
     ) -> Dict[str, ActionResult]:
-        """Execute all actions in the workflow."""
-        results = {}
-        pending_actions = {action.action_id: action for action in workflow.actions}
-
-        # Execute actions in topological order
-        while pending_actions:
-            # Find actions that can be executed (no pending dependencies)
-            executable_actions = self._get_executable_actions(pending_actions, results)
-
-            if not executable_actions:
-                # Circular dependency or dependency issue
-                remaining_ids = list(pending_actions.keys())
-                for action_id in remaining_ids:
-                    results[action_id] = ActionResult.skipped(action_id)
-                break
-
-            # Execute actions concurrently
-            execution_tasks = []
-            for action in executable_actions:
-                task = asyncio.create_task(
-                    self._execute_action(action, parameters, results, external_services)
-                )
-                execution_tasks.append((action.action_id, task))
-
-            # Wait for all to complete
-            for action_id, task in execution_tasks:
-                try:
-                    result = await task
-                    results[action_id] = result
-                except Exception as e:
-                    results[action_id] = ActionResult.failure(
-                        action_id,
-                        f"Execution failed: {str(e)}",
-                        0
-                    )
-                finally:
-                    del pending_actions[action_id]
+        """Execute all actions in the workflow as an eagerly scheduled DAG.
+
+        Each action starts as soon as its own dependencies have completed, subject
+        to the global and per-service concurrency limits. Among ready actions, the
+        one heading the longest remaining (estimated) path runs first. Actions whose
+        dependencies failed, were skipped or do not exist are skipped.
+        """
+        actions = {action.action_id: action for action in workflow.actions}
+        cycle = self._find_cycle(actions)
+        if cycle:
+            raise ValueError(f"Workflow contains circular dependencies: {' -> '.join(cycle)}")
+
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        remaining_deps: Dict[str, int] = {}
+        for action_id, action in actions.items():
+            remaining_deps[action_id] = len(set(action.depends_on))
+            for dep_id in set(action.depends_on):
+                dependents[dep_id].append(action_id)
+
+        priorities = self._critical_path_priorities(actions, dependents)
+        order = {action_id: index for index, action_id in enumerate(actions)}
+
+        results: Dict[str, ActionResult] = {}
+        ready: List[tuple] = []
+        ready_at: Dict[str, float] = {}
+        running: Dict[asyncio.Task, str] = {}
+        service_running: Dict[str, int] = defaultdict(int)
+
+        def mark_ready(action_id: str):
+            ready_at[action_id] = time.perf_counter()
+            heapq.heappush(ready, (-priorities[action_id], order[action_id], action_id))
+
+        def skip_downstream(action_id: str):
+            # Skip every transitive dependent of an unsuccessful action
+            stack = list(dependents.get(action_id, ()))
+            while stack:
+                dependent_id = stack.pop()
+                if dependent_id in results:
+                    continue
+                results[dependent_id] = ActionResult.skipped(dependent_id)
+                stack.extend(dependents.get(dependent_id, ()))
+
+        for action_id, action in actions.items():
+            if any(dep_id not in actions for dep_id in action.depends_on):
+                results[action_id] = ActionResult.skipped(action_id)
+        for action_id in list(results):
+            skip_downstream(action_id)
+        for action_id in actions:
+            if action_id not in results and remaining_deps[action_id] == 0:
+                mark_ready(action_id)
 
-        return results
+        try:
+            while ready or running:
+                # Start as many ready actions as the concurrency limits allow
+                blocked = []
+                while ready and len(running) < self.max_concurrency:
+                    entry = heapq.heappop(ready)
+                    action = actions[entry[2]]
+                    service = self._service_key(action)
+                    if service is not None and service_running[service] >= self._service_limit(service):
+                        blocked.append(entry)
+                        continue
+
+                    if service is not None:
+                        service_running[service] += 1
+                    queue_time_ms = int((time.perf_counter() - ready_at[action.action_id]) * 1000)
+                    task = asyncio.create_task(
+                        self._execute_action(action, parameters, results, external_services, queue_time_ms)
+                    )
+                    running[task] = action.action_id
+                for entry in blocked:
+                    heapq.heappush(ready, entry)
 
-    def _get_executable_actions(
-        self,
-        pending_actions: Dict[str, WorkflowAction],
-        results: Dict[str, ActionResult]
-    ) -> List[WorkflowAction]:
-        """Get actions that can be executed (all dependencies satisfied)."""
-        executable = []
-
-        for action in pending_actions.values():
-            can_execute = True
-
-            # Check dependencies
-            for dep_id in action.depends_on:
-                if dep_id not in results:
-                    can_execute = False
+                if not running:
                     break
-                dep_result = results[dep_id]
-                if not dep_result.is_successful:
-                    can_execute = False
-                    break
-
-            if can_execute:
-                executable.append(action)
 
-        return executable
+                done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    action_id = running.pop(task)
+                    service = self._service_key(actions[action_id])
+                    if service is not None:
+                        service_running[service] -= 1
+
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        result = ActionResult.failure(action_id, f"Execution failed: {str(e)}", 0)
+                    results[action_id] = result
+                    self._record_duration(actions[action_id], result)
+
+                    if not result.is_successful:
+                        skip_downstream(action_id)
+                        continue
+
+                    for dependent_id in dependents.get(action_id, ()):
+                        remaining_deps[dependent_id] -= 1
+                        if remaining_deps[dependent_id] == 0 and dependent_id not in results:
+                            mark_ready(dependent_id)
+        finally:
+            for task in running:
+                task.cancel()
+
+        return {action_id: results.get(action_id, ActionResult.skipped(action_id)) for action_id in actions}
+
+    @staticmethod
+    def _find_cycle(actions: Dict[str, WorkflowAction]) -> Optional[List[str]]:
+        """Return one dependency cycle as a list of action IDs, or None if the graph is acyclic."""
+        WHITE, GREY, BLACK = 0, 1, 2
+        color = {action_id: WHITE for action_id in actions}
+
+        for root in actions:
+            if color[root] != WHITE:
+                continue
+            # Iterative DFS over dependency edges; path holds the current GREY chain
+            path = [root]
+            iterators = [iter(actions[root].depends_on)]
+            color[root] = GREY
+            while iterators:
+                dep_id = next(iterators[-1], None)
+                if dep_id is None:
+                    color[path.pop()] = BLACK
+                    iterators.pop()
+                    continue
+                if dep_id not in actions or color[dep_id] == BLACK:
+                    continue
+                if color[dep_id] == GREY:
+                    return path[path.index(dep_id):] + [dep_id]
+                color[dep_id] = GREY
+                path.append(dep_id)
+                iterators.append(iter(actions[dep_id].depends_on))
+
+        return None
+
+    def _critical_path_priorities(
+        self,
+        actions: Dict[str, WorkflowAction],
+        dependents: Dict[str, List[str]]
+    ) -> Dict[str, float]:
+        """Estimated duration of the longest path from each action to the end of the workflow."""
+        priorities: Dict[str, float] = {}
+
+        # Reverse topological order: an action is resolved once all its dependents are
+        pending = {action_id: len(dependents.get(action_id, ())) for action_id in actions}
+        stack = [action_id for action_id, count in pending.items() if count == 0]
+        while stack:
+            action_id = stack.pop()
+            downstream = max((priorities[d] for d in dependents.get(action_id, ()) if d in priorities), default=0.0)
+            priorities[action_id] = self._estimated_duration(actions[action_id]) + downstream
+            for dep_id in set(actions[action_id].depends_on):
+                if dep_id in pending:
+                    pending[dep_id] -= 1
+                    if pending[dep_id] == 0:
+                        stack.append(dep_id)
+
+        return priorities
+
+    def _estimated_duration(self, action: WorkflowAction) -> float:
+        """Expected duration in ms: explicit hint, learned average, or a neutral default."""
+        hint = action.config.get("estimated_duration_ms")
+        if isinstance(hint, (int, float)) and hint > 0:
+            return float(hint)
+        return self.duration_estimates.get(self._duration_key(action), 1.0)
+
+    def _record_duration(self, action: WorkflowAction, result: ActionResult):
+        """Fold an observed execution time into the per-action-kind moving average."""
+        if result.execution_time_ms is None or result.status == ActionStatus.SKIPPED:
+            return
+        key = self._duration_key(action)
+        previous = self.duration_estimates.get(key)
+        observed = float(max(result.execution_time_ms, 1))
+        self.duration_estimates[key] = observed if previous is None else previous * 0.8 + observed * 0.2
+
+    @staticmethod
+    def _duration_key(action: WorkflowAction) -> str:
+        return f"{action.action_type.value}:{action.config.get('service') or action.config.get('prompt_id') or action.name}"
+
+    @staticmethod
+    def _service_key(action: WorkflowAction) -> Optional[str]:
+        """Service an action occupies a concurrency slot on, if any."""
+        return action.config.get("service")
+
+    def _service_limit(self, service: str) -> int:
+        return self.service_concurrency.get(service, self.default_service_concurrency)
 
     async def _execute_action(
         self,
         action: WorkflowAction,
         parameters: Dict[str, Any],
         previous_results: Dict[str, ActionResult],
-        external_services: Optional[Dict[str, Any]] = None
+        external_services: Optional[Dict[str, Any]] = None,
+        queue_time_ms: Optional[int] = None
     ) -> ActionResult:
         """Execute a single action."""
         start_time = datetime.utcnow()
+        start_clock = time.perf_counter()
 
         try:
             # Check if action should be skipped based on condition
@@ -135,12 +274,12 @@ class WorkflowExecutor:
             # Execute the action
             result = await self.action_executor_factory(action, parameters, external_services)
 
-            execution_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
-            return ActionResult.success(action.action_id, result, execution_time)
+            execution_time = int((time.perf_counter() - start_clock) * 1000)
+            return ActionResult.success(action.action_id, result, execution_time, start_time, queue_time_ms)
 
         except Exception as e:
-            execution_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
-            return ActionResult.failure(action.action_id, str(e), execution_time)
+            execution_time = int((time.perf_counter() - start_clock) * 1000)
+            return ActionResult.failure(action.action_id, str(e), execution_time, start_time, queue_time_ms)
 
     async def _default_action_executor(
         self,
@@ -26,7 +26,8 @@ class ActionResult:
         error_message: Optional[str] = None,
         execution_time_ms: Optional[int] = None,
         started_at: Optional[datetime] = None,
-        completed_at: Optional[datetime] = None
+        completed_at: Optional[datetime] = None,
+        queue_time_ms: Optional[int] = None
     ):
         self._action_id = action_id
         self._status = status
@@ -35,6 +36,7 @@ class ActionResult:
         self._execution_time_ms = execution_time_ms
         self._started_at = started_at or datetime.utcnow()
         self._completed_at = completed_at
+        self._queue_time_ms = queue_time_ms
 
         if status in [ActionStatus.COMPLETED, ActionStatus.FAILED, ActionStatus.CANCELLED]:
             self._completed_at = completed_at or datetime.utcnow()
@@ -74,6 +76,11 @@ class ActionResult:
         """Get the completion time."""
         return self._completed_at
 
+    @property
+    def queue_time_ms(self) -> Optional[int]:
+        """Get the time spent ready but waiting for a scheduler slot, in milliseconds."""
+        return self._queue_time_ms
+
     @property
     def is_successful(self) -> bool:
         """Check if the action was successful."""
@@ -93,27 +100,34 @@ class ActionResult:
             "error_message": self._error_message,
             "execution_time_ms": self._execution_time_ms,
             "started_at": self._started_at.isoformat(),
-            "completed_at": self._completed_at.isoformat() if self._completed_at else None
+            "completed_at": self._completed_at.isoformat() if self._completed_at else None,
+            "queue_time_ms": self._queue_time_ms
         }
 
     @classmethod
-    def success(cls, action_id: str, output: Any, execution_time_ms: int) -> 'ActionResult':
+    def success(cls, action_id: str, output: Any, execution_time_ms: int,
+                started_at: Optional[datetime] = None, queue_time_ms: Optional[int] = None) -> 'ActionResult':
         """Create a successful action result."""
         return cls(
             action_id=action_id,
             status=ActionStatus.COMPLETED,
             output=output,
-            execution_time_ms=execution_time_ms
+            execution_time_ms=execution_time_ms,
+            started_at=started_at,
+            queue_time_ms=queue_time_ms
         )
 
     @classmethod
-    def failure(cls, action_id: str, error_message: str, execution_time_ms: int) -> 'ActionResult':
+    def failure(cls, action_id: str, error_message: str, execution_time_ms: int,
+                started_at: Optional[datetime] = None, queue_time_ms: Optional[int] = None) -> 'ActionResult':
         """Create a failed action result."""
         return cls(
             action_id=action_id,
             status=ActionStatus.FAILED,
             error_message=error_message,
-            execution_time_ms=execution_time_ms
+            execution_time_ms=execution_time_ms,
+            started_at=started_at,
+            queue_time_ms=queue_time_ms
         )
 
     @classmethod
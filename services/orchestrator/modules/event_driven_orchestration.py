@@ -12,11 +12,11 @@ This module provides event-driven workflow orchestration capabilities including:
 import asyncio
 import json
 import uuid
-from typing import Dict, Any, List, Optional, Callable, Type, Union
+from typing import Dict, Any, List, Optional, Callable, Tuple, Type, Union
 from datetime import datetime
 from dataclasses import dataclass, field
 from enum import Enum
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict, deque
 import aio_pika
 import redis.asyncio as redis
 
@@ -101,39 +101,81 @@ class WorkflowEvent:
 
 
 class EventStore:
-    """Event store for event sourcing pattern."""
-
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
+    """Event store for event sourcing pattern.
+
+    Redis layout (all writes for one event go out in a single pipeline):
+
+    - ``events:{aggregate_type}:{aggregate_id}``: list of inline event payloads in
+      append order; an event's position + 1 is its aggregate version
+    - ``event:{event_id}``: event payload, for lookups from the indexes
+    - ``events:type:{event_type}`` / ``events:timeline``: sorted sets of event IDs
+      scored by timestamp
+    - ``snapshot:{aggregate_type}:{aggregate_id}``: replayed state at a version,
+      written every ``snapshot_interval`` events so replay only reads the tail
+
+    Without Redis, events are kept in memory; either way the in-memory copy is
+    bounded to ``max_memory_streams`` aggregates of ``max_memory_events`` events.
+    In-memory versions and snapshots are kept, like the single Redis snapshot key,
+    as one entry per aggregate for the ``max_memory_aggregates`` most recently
+    written aggregates; older aggregates are forgotten.
+    """
+
+    TIMESTAMP_STATE_KEYS = ("started_at", "completed_at", "failed_at", "last_event_timestamp")
+
+    def __init__(self, redis_url: str = "redis://localhost:6379", snapshot_interval: int = 100,
+                 max_memory_streams: int = 1000, max_memory_events: int = 500, read_batch_size: int = 5000,
+                 max_memory_aggregates: int = 10000):
         self.redis_url = redis_url
         self.redis: Optional[redis.Redis] = None
-        self.event_streams: Dict[str, List[WorkflowEvent]] = {}
+        self.snapshot_interval = max(1, snapshot_interval)
+        self.max_memory_streams = max(1, max_memory_streams)
+        # Without Redis, replay needs every event since the last snapshot in memory
+        self.max_memory_events = max(max_memory_events, self.snapshot_interval)
+        self.read_batch_size = max(1, read_batch_size)
+        # Streams still in memory must keep their version and snapshot
+        self.max_memory_aggregates = max(max_memory_aggregates, self.max_memory_streams)
+        # aggregate_id -> recent (version, event) pairs, least recently used first
+        self.event_streams: "OrderedDict[str, deque]" = OrderedDict()
+        # aggregate_id -> latest version / snapshot, least recently written first
+        self._memory_versions: "OrderedDict[str, int]" = OrderedDict()
+        self._memory_snapshots: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self.event_handlers: Dict[EventType, List[Callable]] = defaultdict(list)
 
     async def connect(self):
         """Connect to Redis for event storage."""
         self.redis = redis.from_url(self.redis_url)
 
+    @staticmethod
+    def _aggregate_key(aggregate_type: str, aggregate_id: str) -> str:
+        return f"events:{aggregate_type}:{aggregate_id}"
+
+    @staticmethod
+    def _snapshot_key(aggregate_type: str, aggregate_id: str) -> str:
+        return f"snapshot:{aggregate_type}:{aggregate_id}"
+
     async def store_event(self, event: WorkflowEvent) -> bool:
         """Store event in event store."""
         try:
-            # Store in Redis
             if self.redis:
-                event_key = f"event:{event.aggregate_type}:{event.aggregate_id}"
                 event_data = json.dumps(event.to_dict())
+                score = event.timestamp.timestamp()
 
-                # Store individual event
-                await self.redis.set(f"event:{event.event_id}", event_data)
-
-                # Add to aggregate stream
-                await self.redis.rpush(event_key, event.event_id)
+                async with self.redis.pipeline(transaction=True) as pipe:
+                    pipe.rpush(self._aggregate_key(event.aggregate_type, event.aggregate_id), event_data)
+                    pipe.set(f"event:{event.event_id}", event_data)
+                    pipe.zadd(f"events:type:{event.event_type.value}", {event.event_id: score})
+                    pipe.zadd("events:timeline", {event.event_id: score})
+                    version = (await pipe.execute())[0]
+            else:
+                version = self._memory_versions.get(event.aggregate_id, 0) + 1
+                self._memory_versions[event.aggregate_id] = version
+                self._memory_versions.move_to_end(event.aggregate_id)
+                self._trim_memory_aggregates()
 
-                # Add to event type index
-                await self.redis.sadd(f"events:{event.event_type.value}", event.event_id)
+            await self._remember_event(event, version)
 
-            # Store in memory
-            if event.aggregate_id not in self.event_streams:
-                self.event_streams[event.aggregate_id] = []
-            self.event_streams[event.aggregate_id].append(event)
+            if version % self.snapshot_interval == 0:
+                await self.replay_events(event.aggregate_id, event.aggregate_type)
 
             # Trigger event handlers
             await self._trigger_event_handlers(event)
@@ -144,25 +186,35 @@ class EventStore:
             fire_and_forget("error", f"Failed to store event {event.event_id}: {e}", ServiceNames.ORCHESTRATOR)
             return False
 
+    async def _remember_event(self, event: WorkflowEvent, version: int):
+        """Keep the event in the bounded in-memory stream for its aggregate."""
+        stream = self.event_streams.get(event.aggregate_id)
+        if stream is None:
+            stream = self.event_streams[event.aggregate_id] = deque(maxlen=self.max_memory_events)
+        else:
+            self.event_streams.move_to_end(event.aggregate_id)
+        stream.append((version, event))
+
+        while len(self.event_streams) > self.max_memory_streams:
+            evicted_id = next(iter(self.event_streams))
+            if not self.redis:
+                # Memory is the only record: fold the evicted tail into a snapshot first
+                evicted_type = self.event_streams[evicted_id][-1][1].aggregate_type
+                state = await self.replay_events(evicted_id, evicted_type)
+                await self._save_snapshot(evicted_id, evicted_type, state["event_count"], state)
+            del self.event_streams[evicted_id]
+
     async def get_aggregate_events(self, aggregate_id: str, aggregate_type: str = "workflow") -> List[WorkflowEvent]:
         """Get all events for an aggregate."""
         try:
             events = []
 
             if self.redis:
-                event_key = f"event:{aggregate_type}:{aggregate_id}"
-                event_ids = await self.redis.lrange(event_key, 0, -1)
-
-                for event_id_bytes in event_ids:
-                    event_id = event_id_bytes.decode('utf-8')
-                    event_data = await self.redis.get(f"event:{event_id}")
-                    if event_data:
-                        event_dict = json.loads(event_data)
-                        events.append(WorkflowEvent.from_dict(event_dict))
+                events = await self._read_aggregate_events(aggregate_type, aggregate_id, 0)
 
             # Fallback to memory
             if not events and aggregate_id in self.event_streams:
-                events = self.event_streams[aggregate_id]
+                events = [event for _, event in self.event_streams[aggregate_id]]
 
             return events
 
@@ -170,21 +222,41 @@ class EventStore:
             fire_and_forget("error", f"Failed to get aggregate events for {aggregate_id}: {e}", ServiceNames.ORCHESTRATOR)
             return []
 
+    async def _read_aggregate_events(self, aggregate_type: str, aggregate_id: str, start: int) -> List[WorkflowEvent]:
+        """Read inline payloads from ``start`` to the end of the aggregate list in large pages."""
+        key = self._aggregate_key(aggregate_type, aggregate_id)
+        events = []
+        while True:
+            page = await self.redis.lrange(key, start, start + self.read_batch_size - 1)
+            events.extend(WorkflowEvent.from_dict(json.loads(raw)) for raw in page)
+            if len(page) < self.read_batch_size:
+                return events
+            start += len(page)
+
+    async def _get_events_by_ids(self, event_ids: List[Any]) -> List[WorkflowEvent]:
+        """Fetch indexed events with a single MGET, preserving order."""
+        if not event_ids:
+            return []
+        payloads = await self.redis.mget([
+            f"event:{event_id.decode('utf-8') if isinstance(event_id, bytes) else event_id}"
+            for event_id in event_ids
+        ])
+        return [WorkflowEvent.from_dict(json.loads(payload)) for payload in payloads if payload]
+
     async def get_events_by_type(self, event_type: EventType, limit: int = 100) -> List[WorkflowEvent]:
-        """Get events by type."""
+        """Get the most recent events of a type, oldest first."""
         try:
             events = []
 
             if self.redis:
-                event_ids = await self.redis.smembers(f"events:{event_type.value}")
-                event_ids = list(event_ids)[:limit]
-
-                for event_id_bytes in event_ids:
-                    event_id = event_id_bytes.decode('utf-8')
-                    event_data = await self.redis.get(f"event:{event_id}")
-                    if event_data:
-                        event_dict = json.loads(event_data)
-                        events.append(WorkflowEvent.from_dict(event_dict))
+                event_ids = await self.redis.zrange(f"events:type:{event_type.value}", -limit, -1)
+                events = await self._get_events_by_ids(event_ids)
+            else:
+                events = [
+                    event for stream in self.event_streams.values()
+                    for _, event in stream if event.event_type == event_type
+                ]
+                events = sorted(events, key=lambda e: e.timestamp)[-limit:]
 
             return events
 
@@ -192,28 +264,126 @@ class EventStore:
             fire_and_forget("error", f"Failed to get events by type {event_type.value}: {e}", ServiceNames.ORCHESTRATOR)
             return []
 
+    async def get_events_in_range(self, start: datetime, end: datetime, limit: int = 1000) -> List[WorkflowEvent]:
+        """Get events of any type whose timestamp falls within ``[start, end]``, oldest first."""
+        try:
+            if self.redis:
+                event_ids = await self.redis.zrangebyscore(
+                    "events:timeline", start.timestamp(), end.timestamp(), start=0, num=limit
+                )
+                return await self._get_events_by_ids(event_ids)
+
+            events = [
+                event for stream in self.event_streams.values()
+                for _, event in stream if start <= event.timestamp <= end
+            ]
+            return sorted(events, key=lambda e: e.timestamp)[:limit]
+
+        except Exception as e:
+            fire_and_forget("error", f"Failed to get events between {start} and {end}: {e}", ServiceNames.ORCHESTRATOR)
+            return []
+
     async def replay_events(self, aggregate_id: str, aggregate_type: str = "workflow") -> Dict[str, Any]:
-        """Replay events to reconstruct aggregate state."""
-        events = await self.get_aggregate_events(aggregate_id, aggregate_type)
+        """Replay events to reconstruct aggregate state.
+
+        Starts from the latest snapshot and applies only the events after it, so a
+        replay costs one round-trip for the snapshot plus one per ``read_batch_size``
+        tail events. A new snapshot is written when the tail reaches ``snapshot_interval``.
+        """
+        snapshot, events = await self._load_snapshot_and_tail(aggregate_id, aggregate_type)
 
         # Sort events by timestamp
         events.sort(key=lambda e: e.timestamp)
 
         # Reconstruct state
-        state = {
-            "aggregate_id": aggregate_id,
-            "aggregate_type": aggregate_type,
-            "current_state": "initialized",
-            "event_count": len(events),
-            "last_event_timestamp": events[-1].timestamp if events else None
-        }
+        if snapshot:
+            base_version = snapshot["version"]
+            state = self._deserialize_state(snapshot["state"])
+        else:
+            base_version = 0
+            state = {
+                "aggregate_id": aggregate_id,
+                "aggregate_type": aggregate_type,
+                "current_state": "initialized"
+            }
+        state["event_count"] = base_version + len(events)
+        if events:
+            state["last_event_timestamp"] = events[-1].timestamp
+        else:
+            state.setdefault("last_event_timestamp", None)
 
         # Apply events to state
         for event in events:
             state = await self._apply_event_to_state(state, event)
 
+        if len(events) >= self.snapshot_interval:
+            await self._save_snapshot(aggregate_id, aggregate_type, state["event_count"], state)
+
         return state
 
+    async def _load_snapshot_and_tail(self, aggregate_id: str,
+                                      aggregate_type: str) -> Tuple[Optional[Dict[str, Any]], List[WorkflowEvent]]:
+        """Return the latest snapshot (if any) and the events recorded after it."""
+        if self.redis:
+            try:
+                snapshot_key = self._snapshot_key(aggregate_type, aggregate_id)
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    pipe.get(snapshot_key)
+                    pipe.llen(self._aggregate_key(aggregate_type, aggregate_id))
+                    raw_snapshot, length = await pipe.execute()
+
+                snapshot = json.loads(raw_snapshot) if raw_snapshot else None
+                version = snapshot["version"] if snapshot else 0
+                if snapshot and version > length:
+                    # Stale snapshot from a deleted/recreated stream
+                    snapshot, version = None, 0
+                if version == length:
+                    return snapshot, []
+                return snapshot, await self._read_aggregate_events(aggregate_type, aggregate_id, version)
+            except Exception as e:
+                fire_and_forget("error", f"Failed to load events for replay of {aggregate_id}: {e}", ServiceNames.ORCHESTRATOR)
+
+        snapshot = self._memory_snapshots.get(aggregate_id)
+        version = snapshot["version"] if snapshot else 0
+        stream = self.event_streams.get(aggregate_id, ())
+        return snapshot, [event for event_version, event in stream if event_version > version]
+
+    async def _save_snapshot(self, aggregate_id: str, aggregate_type: str, version: int, state: Dict[str, Any]):
+        """Persist replayed state at ``version`` (Redis when connected, memory otherwise)."""
+        snapshot = {"version": version, "state": self._serialize_state(state)}
+        if self.redis:
+            try:
+                await self.redis.set(self._snapshot_key(aggregate_type, aggregate_id), json.dumps(snapshot))
+                return
+            except Exception as e:
+                fire_and_forget("error", f"Failed to save snapshot for {aggregate_id}: {e}", ServiceNames.ORCHESTRATOR)
+        self._memory_snapshots[aggregate_id] = snapshot
+        self._memory_snapshots.move_to_end(aggregate_id)
+        self._trim_memory_aggregates()
+
+    def _trim_memory_aggregates(self):
+        """Forget versions and snapshots of the least recently written aggregates."""
+        while len(self._memory_versions) > self.max_memory_aggregates:
+            evicted_id, _ = self._memory_versions.popitem(last=False)
+            self._memory_snapshots.pop(evicted_id, None)
+            self.event_streams.pop(evicted_id, None)
+        while len(self._memory_snapshots) > self.max_memory_aggregates:
+            self._memory_snapshots.popitem(last=False)
+
+    def _serialize_state(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        serialized = dict(state)
+        for key in self.TIMESTAMP_STATE_KEYS:
+            if isinstance(serialized.get(key), datetime):
+                serialized[key] = serialized[key].isoformat()
+        return serialized
+
+    def _deserialize_state(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        deserialized = dict(state)
+        for key in self.TIMESTAMP_STATE_KEYS:
+            if isinstance(deserialized.get(key), str):
+                deserialized[key] = datetime.fromisoformat(deserialized[key])
+        return deserialized
+
     async def _apply_event_to_state(self, state: Dict[str, Any], event: WorkflowEvent) -> Dict[str, Any]:
         """Apply event to aggregate state."""
         if event.event_type == EventType.WORKFLOW_STARTED:
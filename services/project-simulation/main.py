@@ -529,6 +529,9 @@ async def shutdown_event():
     """Application shutdown event handler."""
     logger.info("Shutting down Project Simulation Service")
 
+    if _shared_simulation_analyzer is not None:
+        await _shared_simulation_analyzer.close()
+
     # Stop service discovery
     if is_development():
         await stop_service_discovery()
@@ -1423,6 +1426,18 @@ async def get_simulation_analysis_markdown(simulation_id: str, req: Request):
             logger.error("Failed to get markdown analysis report", error=str(e), simulation_id=simulation_id)
             raise HTTPException(status_code=500, detail="Failed to retrieve markdown analysis report")
 
+_shared_simulation_analyzer = None
+
+
+def _get_shared_simulation_analyzer():
+    """Get the process-wide analyzer so its connection pool and report cache are reused."""
+    global _shared_simulation_analyzer
+    if _shared_simulation_analyzer is None:
+        from simulation.application.analysis.simulation_analyzer import SimulationAnalyzer
+        _shared_simulation_analyzer = SimulationAnalyzer()
+    return _shared_simulation_analyzer
+
+
 @app.post("/api/v1/simulations/{simulation_id}/timeline/place-documents")
 async def place_documents_on_simulation_timeline(simulation_id: str, request: Dict[str, Any], req: Request):
     """Place documents on the simulation timeline based on timestamps."""
@@ -1443,9 +1458,8 @@ async def place_documents_on_simulation_timeline(simulation_id: str, request: Di
             analyzer = application_service._simulation_analyzer if hasattr(application_service, '_simulation_analyzer') else None
 
             if not analyzer:
-                # Fallback: create analyzer directly
-                from simulation.application.analysis.simulation_analyzer import SimulationAnalyzer
-                analyzer = SimulationAnalyzer()
+                # Fallback: shared analyzer (pooled HTTP client and report cache)
+                analyzer = _get_shared_simulation_analyzer()
 
             placement_result = await analyzer.place_documents_on_timeline(simulation_id, documents, timeline)
 
@@ -1512,9 +1526,8 @@ async def generate_comprehensive_summary_report(simulation_id: str, request: Dic
             analyzer = application_service._simulation_analyzer if hasattr(application_service, '_simulation_analyzer') else None
 
             if not analyzer:
-                # Fallback: create analyzer directly
-                from simulation.application.analysis.simulation_analyzer import SimulationAnalyzer
-                analyzer = SimulationAnalyzer()
+                # Fallback: shared analyzer (pooled HTTP client and report cache)
+                analyzer = _get_shared_simulation_analyzer()
 
             summary_result = await analyzer.generate_comprehensive_summary_report(
                 simulation_id, documents, timeline_data
@@ -1589,9 +1602,8 @@ async def analyze_pull_request(simulation_id: str, request: Dict[str, Any], req:
             analyzer = application_service._simulation_analyzer if hasattr(application_service, '_simulation_analyzer') else None
 
             if not analyzer:
-                # Fallback: create analyzer directly
-                from simulation.application.analysis.simulation_analyzer import SimulationAnalyzer
-                analyzer = SimulationAnalyzer()
+                # Fallback: shared analyzer (pooled HTTP client and report cache)
+                analyzer = _get_shared_simulation_analyzer()
 
             analysis_result = await analyzer.analyze_pull_request(simulation_id, pr_data)
 
@@ -3203,8 +3215,13 @@ async def get_simulation_events(simulation_id: str,
                               tags: Optional[str] = None,
                               limit: int = 50,
                               offset: int = 0,
+                              cursor: Optional[str] = None,
                               req: Request = None):
-    """Get events for a simulation with filtering."""
+    """Get events for a simulation with filtering.
+
+    Events are returned in timestamp order. Pass ``next_cursor`` from a
+    response as ``cursor`` to page through large histories efficiently.
+    """
     correlation_id = getattr(req.state, "correlation_id", generate_correlation_id())
 
     with with_correlation_id(correlation_id):
@@ -3241,15 +3258,35 @@ async def get_simulation_events(simulation_id: str,
             tag_list = tags.split(",") if tags else None
 
             # Get events
-            events = await event_store.get_events(
-                simulation_id=simulation_id,
-                event_types=event_type_list,
-                start_time=start_dt,
-                end_time=end_dt,
-                tags=tag_list,
-                limit=limit,
-                offset=offset
-            )
+            next_cursor = None
+            if offset and not cursor:
+                events = await event_store.get_events(
+                    simulation_id=simulation_id,
+                    event_types=event_type_list,
+                    start_time=start_dt,
+                    end_time=end_dt,
+                    tags=tag_list,
+                    limit=limit,
+                    offset=offset
+                )
+            else:
+                try:
+                    page = await event_store.query_events(
+                        simulation_id=simulation_id,
+                        event_types=event_type_list,
+                        start_time=start_dt,
+                        end_time=end_dt,
+                        tags=tag_list,
+                        limit=limit,
+                        cursor=cursor
+                    )
+                except ValueError as e:
+                    return create_error_response(
+                        message=str(e),
+                        error_code="invalid_cursor",
+                        request_id=correlation_id
+                    )
+                events, next_cursor = page.events, page.next_cursor
 
             # Convert to response format
             event_data = []
@@ -3272,6 +3309,7 @@ async def get_simulation_events(simulation_id: str,
                     "total_count": len(event_data),
                     "limit": limit,
                     "offset": offset,
+                    "next_cursor": next_cursor,
                     "filters": {
                         "event_types": event_types,
                         "start_time": start_time,
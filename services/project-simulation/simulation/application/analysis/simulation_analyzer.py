@@ -4,25 +4,77 @@ Following DDD principles with clean separation of concerns.
 Integrates with ecosystem services for comprehensive analysis.
 """
 
+import asyncio
+import hashlib
 import time
 import httpx
 import os
 import json
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 from simulation.domain.analysis.analysis_result import AnalysisResult, AnalysisType
+from simulation.application.analysis.timeline_index import TimelineIndex, TimestampParser
 
 
 class SimulationAnalyzer:
     """Analyzer for simulation data and execution results."""
 
-    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
-        """Initialize the analyzer with optional HTTP client."""
-        self.http_client = http_client or httpx.AsyncClient(timeout=30.0)
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None,
+                 call_timeout_seconds: float = 30.0,
+                 report_timeout_seconds: float = 60.0,
+                 analysis_timeout_seconds: float = 90.0,
+                 max_connections: int = 20,
+                 report_cache_size: int = 64):
+        """Initialize the analyzer.
+
+        Args:
+            http_client: Shared client for ecosystem calls; a pooled client is created when omitted
+            call_timeout_seconds: Overall deadline for a single ecosystem service call
+            report_timeout_seconds: Overall deadline for report generation calls
+            analysis_timeout_seconds: Deadline for each analysis of a comprehensive analysis
+            max_connections: Connection pool size of the client created by the analyzer
+            report_cache_size: Number of comprehensive summary reports kept in memory
+        """
+        self._owns_http_client = http_client is None
+        self.http_client = http_client or httpx.AsyncClient(
+            timeout=call_timeout_seconds,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections)
+        )
+        self.call_timeout_seconds = call_timeout_seconds
+        self.report_timeout_seconds = report_timeout_seconds
+        self.analysis_timeout_seconds = analysis_timeout_seconds
+        self.report_cache_size = report_cache_size
+        self._report_cache: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._report_generations: Dict[Tuple[str, str], "asyncio.Task[Dict[str, Any]]"] = {}
+        self._timestamp_parser = TimestampParser()
         self._is_docker_environment = self._detect_docker_environment()
         self.service_urls = self._configure_service_urls()
 
+    async def close(self) -> None:
+        """Stop report generations still running and close the HTTP client if the analyzer created it."""
+        generations = list(self._report_generations.values())
+        for generation in generations:
+            generation.cancel()
+        await asyncio.gather(*generations, return_exceptions=True)
+        if self._owns_http_client:
+            await self.http_client.aclose()
+
+    async def _post(self, url: str, payload: Dict[str, Any], timeout: Optional[float] = None,
+                    headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """POST over the shared client, bounded by an overall deadline.
+
+        httpx timeouts apply per phase (connect, read, ...); the outer deadline
+        bounds the whole call so a slow dependency cannot stall a fan-out.
+        """
+        timeout = timeout or self.call_timeout_seconds
+        return await asyncio.wait_for(
+            self.http_client.post(url, json=payload, headers=headers, timeout=timeout),
+            timeout
+        )
+
     def _detect_docker_environment(self) -> bool:
         """Detect if the service is running in a Docker container."""
         # Multiple indicators for Docker environment
@@ -111,8 +163,14 @@ class SimulationAnalyzer:
         if len(documents) == 0:
             result.add_finding("No documents found in simulation")
         else:
-            # Get recommendations report from summarizer-hub
-            recommendations_report = await self._get_recommendations_report_from_summarizer_hub(simulation_id, documents)
+            # Summarizer-hub recommendations, analysis-service report and doc-store
+            # quality analysis are independent, so request them concurrently
+            recommendations_report, analysis_report, doc_store_analysis = await asyncio.gather(
+                self._get_recommendations_report_from_summarizer_hub(simulation_id, documents),
+                self._get_analysis_report_from_analysis_service(simulation_id, documents),
+                self._analyze_with_doc_store(documents)
+            )
+
             if recommendations_report:
                 result.add_metric("recommendations_report_id", recommendations_report["report_id"])
                 result.add_metric("recommendations_summary", recommendations_report["summary"])
@@ -120,8 +178,6 @@ class SimulationAnalyzer:
             else:
                 result.add_finding("No recommendations report generated")
 
-            # Get comprehensive analysis report from analysis-service
-            analysis_report = await self._get_analysis_report_from_analysis_service(simulation_id, documents)
             if analysis_report:
                 result.add_metric("analysis_report_id", analysis_report["report_id"])
                 result.add_metric("analysis_summary", analysis_report["summary"])
@@ -129,8 +185,7 @@ class SimulationAnalyzer:
             else:
                 result.add_finding("No analysis report received")
 
-            # Use doc-store for document quality analysis (without local recommendations)
-            doc_store_analysis = await self._analyze_with_doc_store(documents)
+            # Doc-store document quality analysis (without local recommendations)
             if doc_store_analysis:
                 result.findings.extend(doc_store_analysis.get("findings", []))
                 result.add_metric("doc_store_analysis", doc_store_analysis)
@@ -360,27 +415,28 @@ class SimulationAnalyzer:
         return result
 
     async def perform_comprehensive_analysis(self, simulation_id: str, simulation_data: Dict[str, Any]) -> List[AnalysisResult]:
-        """Perform comprehensive analysis of all simulation aspects."""
-        results = []
+        """Perform comprehensive analysis of all simulation aspects.
+
+        The analyses are independent and run concurrently, each bounded by
+        ``analysis_timeout_seconds``. An analysis that times out or fails is
+        reported as a result with a finding instead of failing the others;
+        results keep the document, timeline, team, risk, cost order.
+        """
+        analyses = []
 
-        # Analyze documents
         if "documents" in simulation_data:
-            doc_result = await self.analyze_documents(simulation_id, simulation_data["documents"])
-            results.append(doc_result)
+            analyses.append((AnalysisType.DOCUMENT_ANALYSIS,
+                             self.analyze_documents(simulation_id, simulation_data["documents"])))
 
-        # Analyze timeline
         if "timeline" in simulation_data:
-            timeline_result = await self.analyze_timeline(simulation_id, simulation_data["timeline"])
-            results.append(timeline_result)
+            analyses.append((AnalysisType.TIMELINE_ANALYSIS,
+                             self.analyze_timeline(simulation_id, simulation_data["timeline"])))
 
-        # Analyze team dynamics
         if "team_members" in simulation_data:
-            team_result = await self.analyze_team_dynamics(simulation_id, simulation_data["team_members"])
-            results.append(team_result)
+            analyses.append((AnalysisType.TEAM_DYNAMICS,
+                             self.analyze_team_dynamics(simulation_id, simulation_data["team_members"])))
 
-        # Perform risk assessment
-        risk_result = await self.assess_risks(simulation_id, simulation_data)
-        results.append(risk_result)
+        analyses.append((AnalysisType.RISK_ASSESSMENT, self.assess_risks(simulation_id, simulation_data)))
 
         # Perform cost-benefit analysis if cost data available
         if any(key in simulation_data for key in ["budget", "team_cost_per_month", "infrastructure_cost"]):
@@ -388,8 +444,29 @@ class SimulationAnalyzer:
                 key: simulation_data.get(key, 0)
                 for key in ["budget", "team_cost_per_month", "infrastructure_cost", "estimated_duration_months"]
             }
-            cost_result = await self.analyze_cost_benefit(simulation_id, cost_data)
-            results.append(cost_result)
+            analyses.append((AnalysisType.COST_BENEFIT_ANALYSIS, self.analyze_cost_benefit(simulation_id, cost_data)))
+
+        outcomes = await asyncio.gather(*(
+            asyncio.wait_for(analysis, self.analysis_timeout_seconds) for _, analysis in analyses
+        ), return_exceptions=True)
+
+        results = []
+        for (analysis_type, _), outcome in zip(analyses, outcomes):
+            if isinstance(outcome, AnalysisResult):
+                results.append(outcome)
+                continue
+            if isinstance(outcome, asyncio.CancelledError):
+                raise outcome
+
+            # Partial result: keep the slot so callers see which analysis is missing
+            result = AnalysisResult(simulation_id=simulation_id, analysis_type=analysis_type)
+            if isinstance(outcome, asyncio.TimeoutError):
+                result.add_finding(f"Analysis timed out after {self.analysis_timeout_seconds:g}s")
+                result.add_metric("timed_out", True)
+            else:
+                result.add_finding(f"Analysis failed: {outcome}")
+                result.add_metric("error", str(outcome))
+            results.append(result)
 
         return results
 
@@ -440,25 +517,24 @@ class SimulationAnalyzer:
         try:
             summarizer_url = self.service_urls.get('summarizer_hub', 'http://localhost:5160')
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{summarizer_url}/api/v1/recommendations",
-                    json={
-                        "documents": documents,
-                        "recommendation_types": ["consolidation", "duplicate", "outdated", "quality"]
-                    }
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get("success"):
-                        return result.get("recommendations", [])
-                    else:
-                        print(f"Summarizer Hub error: {result.get('error', 'Unknown error')}")
-                        return []
+            response = await self._post(
+                f"{summarizer_url}/api/v1/recommendations",
+                {
+                    "documents": documents,
+                    "recommendation_types": ["consolidation", "duplicate", "outdated", "quality"]
+                }
+            )
+
+            if response.status_code == 200:
+                result = response.json()
+                if result.get("success"):
+                    return result.get("recommendations", [])
                 else:
-                    print(f"Summarizer Hub request failed: {response.status_code}")
+                    print(f"Summarizer Hub error: {result.get('error', 'Unknown error')}")
                     return []
+            else:
+                print(f"Summarizer Hub request failed: {response.status_code}")
+                return []
 
         except Exception as e:
             print(f"Error communicating with Summarizer Hub: {e}")
@@ -490,28 +566,28 @@ class SimulationAnalyzer:
         try:
             analysis_url = self.service_urls.get('analysis_service', 'http://localhost:5020')
 
-            async with httpx.AsyncClient(timeout=60.0) as client:  # Longer timeout for report generation
-                response = await client.post(
-                    f"{analysis_url}/api/v1/analyze/generate-report",
-                    json={
-                        "simulation_id": simulation_id,
-                        "documents": documents,
-                        "report_type": "comprehensive_simulation_analysis",
-                        "include_markdown": True,
-                        "include_json": True
-                    }
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get("success") and result.get("report"):
-                        return result["report"]
-                    else:
-                        print(f"Analysis service report generation failed: {result.get('error', 'Unknown error')}")
-                        return None
+            response = await self._post(
+                f"{analysis_url}/api/v1/analyze/generate-report",
+                {
+                    "simulation_id": simulation_id,
+                    "documents": documents,
+                    "report_type": "comprehensive_simulation_analysis",
+                    "include_markdown": True,
+                    "include_json": True
+                },
+                timeout=self.report_timeout_seconds  # Longer deadline for report generation
+            )
+
+            if response.status_code == 200:
+                result = response.json()
+                if result.get("success") and result.get("report"):
+                    return result["report"]
                 else:
-                    print(f"Analysis service report request failed: {response.status_code} - {response.text}")
+                    print(f"Analysis service report generation failed: {result.get('error', 'Unknown error')}")
                     return None
+            else:
+                print(f"Analysis service report request failed: {response.status_code} - {response.text}")
+                return None
 
         except Exception as e:
             print(f"Error requesting analysis report from analysis-service: {e}")
@@ -618,15 +694,14 @@ class SimulationAnalyzer:
         try:
             doc_store_url = self.service_urls.get("doc_store", "http://localhost:5000")
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{doc_store_url}/api/documents",
-                    json=document,
-                    headers={"Content-Type": "application/json"}
-                )
+            response = await self._post(
+                f"{doc_store_url}/api/documents",
+                document,
+                headers={"Content-Type": "application/json"}
+            )
 
-                if response.status_code not in [200, 201]:
-                    print(f"Failed to save to doc-store: {response.status_code} - {response.text}")
+            if response.status_code not in [200, 201]:
+                print(f"Failed to save to doc-store: {response.status_code} - {response.text}")
 
         except Exception as e:
             print(f"Error saving to doc-store: {e}")
@@ -809,47 +884,44 @@ class SimulationAnalyzer:
             }
 
     async def _analyze_document_timestamps(self, documents: List[Dict[str, Any]], timeline_phases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Analyze document timestamps and determine timeline placement."""
-
-        placements = []
-
-        for doc in documents:
-            try:
-                # Extract timestamp information
-                created_date = None
-                updated_date = None
-
-                # Try to parse dateCreated and dateUpdated fields
-                if "dateCreated" in doc:
-                    created_date = self._parse_timestamp(doc["dateCreated"])
-                if "dateUpdated" in doc:
-                    updated_date = self._parse_timestamp(doc["dateUpdated"])
+        """Analyze document timestamps and determine timeline placement.
 
-                # Use updated_date if available, otherwise created_date
-                primary_date = updated_date or created_date
-
-                if not primary_date:
-                    # Skip documents without timestamp information
-                    continue
+        Timestamps are parsed once per distinct value and the phases indexed once,
+        so each document is placed with a single bisect; placements keep
+        document order.
+        """
+        parse = self._timestamp_parser.parse
+        created_dates = [parse(doc.get("dateCreated")) for doc in documents]
+        updated_dates = [parse(doc.get("dateUpdated")) for doc in documents]
 
-                # Find the most relevant timeline phase
-                relevant_phase = self._find_relevant_timeline_phase(primary_date, timeline_phases)
+        # Use updated_date if available, otherwise created_date; undated documents are skipped
+        primary_dates = [updated or created for created, updated in zip(created_dates, updated_dates)]
 
-                if relevant_phase:
-                    placement = {
-                        "document_id": doc.get("id", ""),
-                        "title": doc.get("title", ""),
-                        "type": doc.get("type", ""),
-                        "primary_date": primary_date.isoformat(),
-                        "created_date": created_date.isoformat() if created_date else None,
-                        "updated_date": updated_date.isoformat() if updated_date else None,
-                        "timeline_phase": relevant_phase["id"],
-                        "phase_name": relevant_phase["name"],
-                        "placement_reason": self._determine_placement_reason(primary_date, relevant_phase),
-                        "relevance_score": self._calculate_timeline_relevance(primary_date, relevant_phase)
-                    }
-                    placements.append(placement)
+        index = TimelineIndex(timeline_phases, self._timestamp_parser)
+        positions = index.place_positions(primary_dates)
 
+        placements = []
+        for doc, created_date, updated_date, primary_date, position in zip(
+                documents, created_dates, updated_dates, primary_dates, positions):
+            if position is None:
+                continue
+            relevant_phase = timeline_phases[position]
+            start_date, end_date = index.spans[position]
+            try:
+                created_iso = created_date.isoformat() if created_date else None
+                updated_iso = updated_date.isoformat() if updated_date else None
+                placements.append({
+                    "document_id": doc.get("id", ""),
+                    "title": doc.get("title", ""),
+                    "type": doc.get("type", ""),
+                    "primary_date": updated_iso or created_iso,
+                    "created_date": created_iso,
+                    "updated_date": updated_iso,
+                    "timeline_phase": relevant_phase["id"],
+                    "phase_name": relevant_phase["name"],
+                    "placement_reason": self._placement_reason_for_span(primary_date, start_date, end_date),
+                    "relevance_score": self._timeline_relevance_for_span(primary_date, start_date, end_date)
+                })
             except Exception as e:
                 print(f"Error analyzing timestamps for document {doc.get('id', 'unknown')}: {e}")
                 continue
@@ -857,80 +929,34 @@ class SimulationAnalyzer:
         return placements
 
     def _parse_timestamp(self, timestamp_str: str) -> Optional[datetime]:
-        """Parse timestamp string into datetime object."""
-        from datetime import datetime
-
+        """Parse timestamp string into a naive (UTC) datetime object."""
         if not timestamp_str:
             return None
 
-        try:
-            # Try ISO format first
-            return datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-        except (ValueError, AttributeError):
-            pass
-
-        # Try common timestamp formats
-        formats = [
-            "%Y-%m-%d %H:%M:%S",
-            "%Y-%m-%dT%H:%M:%S",
-            "%Y-%m-%d",
-            "%m/%d/%Y %H:%M:%S",
-            "%m/%d/%Y"
-        ]
-
-        for fmt in formats:
-            try:
-                return datetime.strptime(timestamp_str, fmt)
-            except ValueError:
-                continue
-
-        print(f"Could not parse timestamp: {timestamp_str}")
-        return None
+        parsed = self._timestamp_parser.parse(timestamp_str)
+        if parsed is None:
+            print(f"Could not parse timestamp: {timestamp_str}")
+        return parsed
 
     def _find_relevant_timeline_phase(self, doc_date: datetime, timeline_phases: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        """Find the most relevant timeline phase for a document date."""
+        """Find the most relevant timeline phase for a document date.
+
+        Overlapping phases win (in-progress first); otherwise the phase starting
+        closest to the date, within 30 days.
+        """
         if not timeline_phases:
             return None
-
-        # Find phases that overlap with the document date
-        relevant_phases = []
-
-        for phase in timeline_phases:
-            start_date = self._parse_timestamp(phase.get("start_date"))
-            end_date = self._parse_timestamp(phase.get("end_date")) or self._parse_timestamp(phase.get("planned_end_date"))
-
-            if start_date and end_date:
-                if start_date <= doc_date <= end_date:
-                    relevant_phases.append(phase)
-
-        # If no overlapping phases, find the closest phase
-        if not relevant_phases:
-            closest_phase = None
-            min_distance = float('inf')
-
-            for phase in timeline_phases:
-                start_date = self._parse_timestamp(phase.get("start_date"))
-                if start_date:
-                    distance = abs((doc_date - start_date).days)
-                    if distance < min_distance:
-                        min_distance = distance
-                        closest_phase = phase
-
-            if closest_phase and min_distance <= 30:  # Within 30 days
-                relevant_phases.append(closest_phase)
-
-        # Return the most relevant phase (prefer in-progress phases)
-        for phase in relevant_phases:
-            if phase.get("status") == "in_progress":
-                return phase
-
-        return relevant_phases[0] if relevant_phases else None
+        index = TimelineIndex(timeline_phases, self._timestamp_parser)
+        return index.find(self._timestamp_parser.parse(doc_date))
 
     def _determine_placement_reason(self, doc_date: datetime, phase: Dict[str, Any]) -> str:
         """Determine why a document was placed in a particular timeline phase."""
         start_date = self._parse_timestamp(phase.get("start_date"))
         end_date = self._parse_timestamp(phase.get("end_date")) or self._parse_timestamp(phase.get("planned_end_date"))
+        return self._placement_reason_for_span(doc_date, start_date, end_date)
 
+    @staticmethod
+    def _placement_reason_for_span(doc_date: datetime, start_date: Optional[datetime], end_date: Optional[datetime]) -> str:
         if start_date and end_date:
             if start_date <= doc_date <= end_date:
                 return "within_phase_dates"
@@ -947,7 +973,10 @@ class SimulationAnalyzer:
         """Calculate how relevant a document is to a timeline phase."""
         start_date = self._parse_timestamp(phase.get("start_date"))
         end_date = self._parse_timestamp(phase.get("end_date")) or self._parse_timestamp(phase.get("planned_end_date"))
+        return self._timeline_relevance_for_span(doc_date, start_date, end_date)
 
+    @staticmethod
+    def _timeline_relevance_for_span(doc_date: datetime, start_date: Optional[datetime], end_date: Optional[datetime]) -> float:
         if not start_date:
             return 0.0
 
@@ -1089,20 +1118,73 @@ class SimulationAnalyzer:
 
         This keeps the simulation service pure by orchestrating report generation
         across multiple specialized services.
+
+        Generated reports are cached per (simulation id, document-set hash), so
+        requesting the report again for unchanged documents does not recompute
+        it; concurrent requests for the same report share one generation.
+        The generation runs as a task of its own, so a request that is
+        cancelled stops waiting for the report without aborting it for the
+        other requests.
         """
-        try:
-            print(f"Generating comprehensive summary report for simulation {simulation_id}")
+        cache_key = (simulation_id, self._document_set_hash(documents, timeline))
+        cached = self._report_cache.get(cache_key)
+        if cached is not None:
+            self._report_cache.move_to_end(cache_key)
+            return {**cached, "cached": True}
+
+        generation = self._report_generations.get(cache_key)
+        if generation is not None:
+            return {**await asyncio.shield(generation), "cached": True}
+
+        generation = asyncio.ensure_future(
+            self._generate_and_cache_report(cache_key, simulation_id, documents, timeline)
+        )
+        self._report_generations[cache_key] = generation
+        generation.add_done_callback(lambda task: self._report_generation_done(cache_key, task))
+        return await asyncio.shield(generation)
+
+    async def _generate_and_cache_report(self, cache_key: Tuple[str, str], simulation_id: str,
+                                         documents: List[Dict[str, Any]],
+                                         timeline: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Generate the report and keep it in the report cache if it was generated."""
+        result = await self._generate_comprehensive_summary_report(simulation_id, documents, timeline)
+        if result.get("report_generated"):
+            self._report_cache[cache_key] = result
+            while len(self._report_cache) > self.report_cache_size:
+                self._report_cache.popitem(last=False)
+        return result
 
-            # Step 1: Get recommendations from summarizer-hub
-            recommendations_report = await self._get_recommendations_report_from_summarizer_hub(simulation_id, documents)
+    def _report_generation_done(self, cache_key: Tuple[str, str], generation: "asyncio.Task[Dict[str, Any]]") -> None:
+        """Forget a finished report generation."""
+        if self._report_generations.get(cache_key) is generation:
+            del self._report_generations[cache_key]
+        # Every request may have stopped waiting; consume the error so it is not logged as unhandled
+        if not generation.cancelled():
+            generation.exception()
 
-            # Step 2: Get analysis report from analysis-service
-            analysis_report = await self._get_analysis_report_from_analysis_service(simulation_id, documents)
+    async def _generate_comprehensive_summary_report(self, simulation_id: str, documents: List[Dict[str, Any]], timeline: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build and store the comprehensive summary report (uncached)."""
+        try:
+            print(f"Generating comprehensive summary report for simulation {simulation_id}")
 
-            # Step 3: Generate timeline placement if timeline provided
-            timeline_placement = None
-            if timeline:
-                timeline_placement = await self.place_documents_on_timeline(simulation_id, documents, timeline)
+            # Steps 1-3: summarizer-hub recommendations, analysis-service report and
+            # timeline placement are independent; each call carries its own deadline
+            # and a missing section is reported rather than failing the report
+            timeline_placement_call = (
+                self.place_documents_on_timeline(simulation_id, documents, timeline)
+                if timeline else asyncio.sleep(0)
+            )
+            recommendations_report, analysis_report, timeline_placement = await asyncio.gather(
+                self._with_deadline(
+                    self._get_recommendations_report_from_summarizer_hub(simulation_id, documents),
+                    self.call_timeout_seconds, "summarizer-hub recommendations"
+                ),
+                self._with_deadline(
+                    self._get_analysis_report_from_analysis_service(simulation_id, documents),
+                    self.report_timeout_seconds, "analysis-service report"
+                ),
+                self._with_deadline(timeline_placement_call, self.call_timeout_seconds, "timeline placement")
+            )
 
             # Step 4: Combine all reports into comprehensive summary
             comprehensive_report = await self._combine_reports_into_summary(
@@ -1133,6 +1215,37 @@ class SimulationAnalyzer:
                 "report_generated": False
             }
 
+    async def _with_deadline(self, call, timeout: float, description: str) -> Optional[Any]:
+        """Await a dependency call, returning None if it misses its deadline."""
+        try:
+            return await asyncio.wait_for(call, timeout)
+        except asyncio.TimeoutError:
+            print(f"Timed out waiting for {description} after {timeout:g}s")
+            return None
+
+    @staticmethod
+    def _document_set_hash(documents: List[Dict[str, Any]], timeline: Optional[Dict[str, Any]] = None) -> str:
+        """Order-independent hash of a document set (and the timeline it is placed on)."""
+        document_digests = sorted(
+            hashlib.blake2b(
+                json.dumps(doc, sort_keys=True, default=str).encode("utf-8"), digest_size=16
+            ).hexdigest()
+            for doc in documents
+        )
+        digest = hashlib.blake2b(digest_size=16)
+        for document_digest in document_digests:
+            digest.update(document_digest.encode("ascii"))
+        digest.update(json.dumps(timeline or {}, sort_keys=True, default=str).encode("utf-8"))
+        return digest.hexdigest()
+
+    def invalidate_report_cache(self, simulation_id: Optional[str] = None) -> None:
+        """Drop cached comprehensive reports for one simulation, or all of them."""
+        if simulation_id is None:
+            self._report_cache.clear()
+            return
+        for key in [key for key in self._report_cache if key[0] == simulation_id]:
+            del self._report_cache[key]
+
     async def _get_recommendations_report_from_summarizer_hub(self, simulation_id: str, documents: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """Get recommendations report from summarizer-hub service."""
         try:
@@ -1169,6 +1282,32 @@ class SimulationAnalyzer:
             print(f"Error getting recommendations from summarizer-hub: {e}")
             return None
 
+    async def _request_recommendations_from_summarizer_hub(self, simulation_id: str, documents: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Request the full recommendations result from summarizer-hub."""
+        try:
+            summarizer_url = self.service_urls.get('summarizer_hub', 'http://localhost:5160')
+
+            response = await self._post(
+                f"{summarizer_url}/api/v1/recommendations",
+                {
+                    "documents": documents,
+                    "recommendation_types": ["consolidation", "duplicate", "outdated", "quality"]
+                }
+            )
+
+            if response.status_code == 200:
+                result = response.json()
+                if result.get("success"):
+                    return result
+                print(f"Summarizer Hub error for simulation {simulation_id}: {result.get('error', 'Unknown error')}")
+            else:
+                print(f"Summarizer Hub request failed: {response.status_code}")
+            return None
+
+        except Exception as e:
+            print(f"Error requesting recommendations from Summarizer Hub: {e}")
+            return None
+
     async def _get_analysis_report_from_analysis_service(self, simulation_id: str, documents: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """Get analysis report from analysis-service."""
         try:
@@ -1715,23 +1854,23 @@ class SimulationAnalyzer:
         try:
             analysis_service_url = self.service_urls.get('analysis_service', 'http://localhost:5020')
 
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{analysis_service_url}/analyze/pull-request",
-                    json=analysis_request,
-                    headers={"Content-Type": "application/json"}
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get("success"):
-                        return result.get("data")
-                    else:
-                        print(f"Analysis service returned error: {result}")
-                        return None
+            response = await self._post(
+                f"{analysis_service_url}/analyze/pull-request",
+                analysis_request,
+                timeout=self.report_timeout_seconds,
+                headers={"Content-Type": "application/json"}
+            )
+
+            if response.status_code == 200:
+                result = response.json()
+                if result.get("success"):
+                    return result.get("data")
                 else:
-                    print(f"Analysis service request failed with status {response.status_code}: {response.text}")
+                    print(f"Analysis service returned error: {result}")
                     return None
+            else:
+                print(f"Analysis service request failed with status {response.status_code}: {response.text}")
+                return None
 
         except Exception as e:
             print(f"Error calling analysis service for PR analysis: {e}")
@@ -1842,9 +1981,9 @@ class SimulationAnalyzer:
                 "include_recommendations": True
             }
 
-            response = await self.http_client.post(
+            response = await self._post(
                 summarizer_url,
-                json=analysis_request,
+                analysis_request,
                 headers={"Content-Type": "application/json"}
             )
 
@@ -1868,9 +2007,9 @@ class SimulationAnalyzer:
                 "analysis_type": "quality_check"
             }
 
-            response = await self.http_client.post(
+            response = await self._post(
                 doc_store_url,
-                json=analysis_request,
+                analysis_request,
                 headers={"Content-Type": "application/json"}
             )
 
@@ -1887,9 +2026,9 @@ class SimulationAnalyzer:
         try:
             analysis_url = f"{self.service_urls['analysis_service']}/api/v1/analyze/{analysis_type}"
 
-            response = await self.http_client.post(
+            response = await self._post(
                 analysis_url,
-                json=data,
+                data,
                 headers={"Content-Type": "application/json"}
             )
 
@@ -1911,9 +2050,9 @@ class SimulationAnalyzer:
                 "analysis_type": "quality_metrics"
             }
 
-            response = await self.http_client.post(
+            response = await self._post(
                 code_analyzer_url,
-                json=analysis_request,
+                analysis_request,
                 headers={"Content-Type": "application/json"}
             )
 
@@ -1955,7 +2094,10 @@ class SimulationAnalyzer:
                 return False
 
             health_url = f"{service_url}/health"
-            response = await self.http_client.get(health_url)
+            response = await asyncio.wait_for(
+                self.http_client.get(health_url, timeout=self.call_timeout_seconds),
+                self.call_timeout_seconds
+            )
 
             return response.status_code == 200
         except Exception:
@@ -0,0 +1,218 @@
+"""Interval index for placing documents on timeline phases.
+
+Phases are resolved once into sorted boundary points; the phase that owns
+every point and every gap between points is precomputed, so placing a
+document is a single ``bisect`` instead of a scan over all phases. Timestamps
+go through a parser that remembers the format that last matched instead of
+trying a chain of formats per value.
+"""
+
+import bisect
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+ISO_FORMAT = "iso"
+
+TIMESTAMP_FORMATS = (
+    ISO_FORMAT,
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y",
+    "%Y/%m/%d"
+)
+
+
+class TimestampParser:
+    """Timestamp parser that caches the detected format and parsed values.
+
+    Documents from one source share a timestamp format, so the format that
+    matched last is tried first and a batch usually parses with one attempt
+    per distinct value. Timezone-aware values are converted to naive UTC so
+    they compare with naive phase dates.
+    """
+
+    def __init__(self, formats: Sequence[str] = TIMESTAMP_FORMATS, cache_size: int = 65536):
+        self.formats = tuple(formats)
+        self.cache_size = cache_size
+        self._detected_format = self.formats[0]
+        self._cache: Dict[str, Optional[datetime]] = {}
+
+    def parse(self, value: Any) -> Optional[datetime]:
+        """Parse one timestamp; returns None when no format matches."""
+        if not value:
+            return None
+        if isinstance(value, datetime):
+            return _naive_utc(value)
+
+        text = value if isinstance(value, str) else str(value)
+        try:
+            return self._cache[text]
+        except KeyError:
+            pass
+
+        parsed = self._parse_with(text, self._detected_format)
+        if parsed is None:
+            for fmt in self.formats:
+                if fmt == self._detected_format:
+                    continue
+                parsed = self._parse_with(text, fmt)
+                if parsed is not None:
+                    self._detected_format = fmt
+                    break
+
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[text] = parsed
+        return parsed
+
+    def parse_many(self, values: Iterable[Any]) -> List[Optional[datetime]]:
+        """Parse a batch of timestamps, parsing each distinct value once."""
+        parse = self.parse
+        return [parse(value) for value in values]
+
+    @staticmethod
+    def _parse_with(text: str, fmt: str) -> Optional[datetime]:
+        try:
+            if fmt == ISO_FORMAT:
+                if text.endswith("Z"):
+                    # Already UTC: parse the naive part and skip the conversion
+                    return datetime.fromisoformat(text[:-1])
+                return _naive_utc(datetime.fromisoformat(text))
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            return None
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _phase_day_distance(doc_date: datetime, start: datetime) -> int:
+    """Whole-day distance used for closest-phase matching."""
+    return abs((doc_date - start).days)
+
+
+class TimelineIndex:
+    """Bisect-queryable index of timeline phases.
+
+    A phase covers ``[start, end]`` (both inclusive) where ``start`` is
+    ``start_date`` and ``end`` is ``end_date`` or ``planned_end_date``. Phases
+    given in weeks (``start_week``/``duration_weeks``) are resolved against
+    ``anchor``. When several phases cover a date the in-progress one wins,
+    otherwise the first in timeline order. A date covered by no phase falls
+    back to the phase whose start is closest, within ``max_distance_days``
+    (``None`` for no limit).
+    """
+
+    def __init__(self, phases: List[Dict[str, Any]], parser: Optional[TimestampParser] = None,
+                 anchor: Optional[datetime] = None, max_distance_days: Optional[int] = 30):
+        self.phases = phases
+        self.parser = parser or TimestampParser()
+        self.max_distance_days = max_distance_days
+        self.spans: List[Tuple[Optional[datetime], Optional[datetime]]] = [
+            self._resolve_span(phase, anchor) for phase in phases
+        ]
+
+        # Sorted distinct boundaries; slot 2i is the point bounds[i], slot 2i+1 the
+        # open gap (bounds[i], bounds[i+1]); the gaps before and after are handled
+        # by the closest-start fallback
+        points = set()
+        for start, end in self.spans:
+            if start is not None and end is not None:
+                points.add(start)
+                points.add(end)
+        self.bounds: List[datetime] = sorted(points)
+        self._slot_owner: List[Optional[int]] = []
+        for i, point in enumerate(self.bounds):
+            self._slot_owner.append(self._owner_at(point))
+            if i + 1 < len(self.bounds):
+                midpoint = point + (self.bounds[i + 1] - point) / 2
+                self._slot_owner.append(self._owner_at(midpoint))
+
+        # Phase starts sorted for closest-start lookup
+        self._starts: List[Tuple[datetime, int]] = sorted(
+            (start, position) for position, (start, _) in enumerate(self.spans) if start is not None
+        )
+        self._start_keys = [start for start, _ in self._starts]
+
+    def _resolve_span(self, phase: Dict[str, Any],
+                      anchor: Optional[datetime]) -> Tuple[Optional[datetime], Optional[datetime]]:
+        parse = self.parser.parse
+        start = parse(phase.get("start_date"))
+        end = parse(phase.get("end_date")) or parse(phase.get("planned_end_date"))
+        if start is None and anchor is not None and "start_week" in phase:
+            start = anchor + timedelta(weeks=phase.get("start_week") or 0)
+            end = start + timedelta(weeks=phase.get("duration_weeks") or 0)
+        return start, end
+
+    def _owner_at(self, moment: datetime) -> Optional[int]:
+        covering = [
+            position for position, (start, end) in enumerate(self.spans)
+            if start is not None and end is not None and start <= moment <= end
+        ]
+        for position in covering:
+            if self.phases[position].get("status") == "in_progress":
+                return position
+        return covering[0] if covering else None
+
+    def _closest_start(self, doc_date: datetime) -> Optional[int]:
+        """Position of the phase whose start is closest (first in timeline order on ties)."""
+        keys, starts = self._start_keys, self._starts
+        i = bisect.bisect_right(keys, doc_date)
+        distances = []
+        if i > 0:
+            distances.append(_phase_day_distance(doc_date, keys[i - 1]))
+        if i < len(keys):
+            distances.append(_phase_day_distance(doc_date, keys[i]))
+        if not distances:
+            return None
+        distance = min(distances)
+        if self.max_distance_days is not None and distance > self.max_distance_days:
+            return None
+
+        # Distance grows away from the insertion point, so equally close starts are adjacent
+        best = None
+        j = i - 1
+        while j >= 0 and _phase_day_distance(doc_date, keys[j]) == distance:
+            best = starts[j][1] if best is None else min(best, starts[j][1])
+            j -= 1
+        j = i
+        while j < len(keys) and _phase_day_distance(doc_date, keys[j]) == distance:
+            best = starts[j][1] if best is None else min(best, starts[j][1])
+            j += 1
+        return best
+
+    def find(self, doc_date: Optional[datetime]) -> Optional[Dict[str, Any]]:
+        """Phase for one document date, or None."""
+        return self.place_many([doc_date])[0]
+
+    def place_many(self, dates: Sequence[Optional[datetime]]) -> List[Optional[Dict[str, Any]]]:
+        """Phases for many document dates, in input order."""
+        return [self.phases[position] if position is not None else None
+                for position in self.place_positions(dates)]
+
+    def place_positions(self, dates: Sequence[Optional[datetime]]) -> List[Optional[int]]:
+        """Phase positions (indexes into ``phases``) for many document dates."""
+        bounds, slot_owner = self.bounds, self._slot_owner
+        bound_count = len(bounds)
+        bisect_left = bisect.bisect_left
+        positions: List[Optional[int]] = []
+        for doc_date in dates:
+            if doc_date is None:
+                positions.append(None)
+                continue
+            i = bisect_left(bounds, doc_date)
+            if i < bound_count and bounds[i] == doc_date:
+                position = slot_owner[2 * i]
+            elif 0 < i < bound_count:
+                position = slot_owner[2 * i - 1]
+            else:
+                position = None
+            if position is None:
+                position = self._closest_start(doc_date)
+            positions.append(position)
+        return positions
@@ -20,6 +20,7 @@ from datetime import datetime, timedelta
 import uuid
 import asyncio
 import json
+import time
 
 # Import from shared infrastructure
 sys.path.append(str(Path(__file__).parent.parent.parent.parent.parent / "services" / "shared"))
@@ -51,8 +52,15 @@ class SimulationExecutionEngine:
                  simulation_repository: Optional[ISimulationRepository] = None,
                  project_repository: Optional[IProjectRepository] = None,
                  timeline_repository: Optional[ITimelineRepository] = None,
-                 team_repository: Optional[ITeamRepository] = None):
-        """Initialize the simulation execution engine."""
+                 team_repository: Optional[ITeamRepository] = None,
+                 document_store_concurrency: int = 8,
+                 progress_interval_seconds: float = 0.5):
+        """Initialize the simulation execution engine.
+
+        Generated documents are stored up to ``document_store_concurrency`` at a
+        time, and progress events are coalesced to at most one per
+        ``progress_interval_seconds`` per simulation.
+        """
         self.content_pipeline = content_pipeline
         self.ecosystem_clients = ecosystem_clients
         self.workflow_orchestrator = workflow_orchestrator
@@ -69,6 +77,12 @@ class SimulationExecutionEngine:
         self.active_simulations: Dict[str, Simulation] = {}
         self.execution_tasks: Dict[str, asyncio.Task] = {}
 
+        # Phase persistence pipeline
+        self.document_store_concurrency = max(1, document_store_concurrency)
+        self.progress_interval_seconds = progress_interval_seconds
+        self._last_progress_publish: Dict[str, float] = {}
+        self._pending_progress: Dict[str, asyncio.Task] = {}
+
     async def execute_simulation(self, simulation_id: str) -> Dict[str, Any]:
         """Execute a simulation using the domain model and ecosystem integration."""
         try:
@@ -204,16 +218,38 @@ class SimulationExecutionEngine:
         if not project or not timeline:
             raise ValueError("Project or timeline not found")
 
-        # Execute each timeline phase
-        for phase in timeline.phases:
-            await self._execute_phase(simulation, phase, project, team)
+        # Execute each timeline phase, generating the next phase's content while
+        # the current phase is persisted and processed
+        phases = list(timeline.phases)
+        next_generation: Optional[asyncio.Task] = None
+        try:
+            if phases:
+                next_generation = asyncio.create_task(
+                    self._generate_phase_documents(simulation, phases[0], project, team)
+                )
 
-    async def _execute_phase(self, simulation: Simulation, phase: Any, project: Project, team: Team) -> None:
-        """Execute a single simulation phase."""
+            for index, phase in enumerate(phases):
+                documents = await next_generation
+                next_generation = None
+                if index + 1 < len(phases):
+                    next_generation = asyncio.create_task(
+                        self._generate_phase_documents(simulation, phases[index + 1], project, team)
+                    )
+
+                await self._process_phase(simulation, phase, project, team, documents)
+
+            await self._publish_progress_event(simulation, force=True)
+        finally:
+            if next_generation and not next_generation.done():
+                next_generation.cancel()
+            self._stop_progress_tracking(str(simulation.id.value))
+
+    async def _generate_phase_documents(self, simulation: Simulation, phase: Any,
+                                        project: Project, team: Team) -> List[Dict[str, Any]]:
+        """Generate the documents for a phase without persisting them."""
         phase_name = getattr(phase, 'name', str(phase))
-        simulation_id = str(simulation.id.value)
 
-        self.logger.info(f"Executing phase: {phase_name}", simulation_id=simulation_id)
+        self.logger.info(f"Generating content for phase: {phase_name}", simulation_id=str(simulation.id.value))
 
         # Generate documents for this phase using timeline-based generation
         from ..content.timeline_based_generation import TimelineAwareContentGenerator
@@ -284,31 +320,28 @@ class SimulationExecutionEngine:
 
         additional_documents = await self.content_pipeline.execute_document_generation(phase_config)
         documents.extend(additional_documents)
+        return documents
 
-        # Store documents in ecosystem and broadcast events
-        for doc in documents:
-            doc_id = await self._store_document(doc)
+    async def _process_phase(self, simulation: Simulation, phase: Any, project: Project, team: Team,
+                             documents: List[Dict[str, Any]]) -> None:
+        """Persist a phase's generated documents, then run its workflow and analysis."""
+        phase_name = getattr(phase, 'name', str(phase))
+        simulation_id = str(simulation.id.value)
 
-            # Determine document type
-            doc_type = DocumentType.CONFLUENCE_DOC
-            if "jira" in doc.get("type", "").lower():
-                doc_type = DocumentType.JIRA_TICKET
-            elif "github" in doc.get("type", "").lower():
-                doc_type = DocumentType.GITHUB_PR
+        self.logger.info(f"Executing phase: {phase_name}", simulation_id=simulation_id)
 
-            simulation.record_document_generation(
-                doc_type,
-                doc.get("title", "Untitled"),
-                len(doc.get("content", ""))
-            )
+        # Store documents in ecosystem and broadcast events
+        document_types = await self._store_phase_documents(simulation, documents)
 
-            # Publish document generation event
-            await self._publish_simulation_event(simulation, "document_generated", {
+        await self._publish_simulation_events(simulation, [
+            ("document_generated", {
                 "document_title": doc.get("title", "Untitled"),
                 "document_type": doc_type.value,
                 "word_count": len(doc.get("content", "")),
                 "phase": phase_name
             })
+            for doc, doc_type in zip(documents, document_types)
+        ])
 
         # Execute workflows for this phase
         workflow_config = {
@@ -353,6 +386,39 @@ class SimulationExecutionEngine:
         # Publish progress event
         await self._publish_progress_event(simulation)
 
+    @staticmethod
+    def _classify_document(document: Dict[str, Any]) -> DocumentType:
+        """Determine the domain document type of a generated document."""
+        doc_type = DocumentType.CONFLUENCE_PAGE
+        if "jira" in document.get("type", "").lower():
+            doc_type = DocumentType.JIRA_TICKET
+        elif "github" in document.get("type", "").lower():
+            doc_type = DocumentType.GITHUB_PR
+        return doc_type
+
+    async def _store_phase_documents(self, simulation: Simulation,
+                                     documents: List[Dict[str, Any]]) -> List[DocumentType]:
+        """Store documents with bounded concurrency, recording each as it is persisted.
+
+        Returns the document type of each document, in input order.
+        """
+        semaphore = asyncio.Semaphore(self.document_store_concurrency)
+        document_types = [self._classify_document(doc) for doc in documents]
+
+        async def store(doc: Dict[str, Any], doc_type: DocumentType) -> None:
+            async with semaphore:
+                await self._store_document(doc)
+
+            simulation.record_document_generation(
+                doc_type,
+                doc.get("title", "Untitled"),
+                len(doc.get("content", ""))
+            )
+            await self._publish_progress_event(simulation)
+
+        await asyncio.gather(*(store(doc, doc_type) for doc, doc_type in zip(documents, document_types)))
+        return document_types
+
     async def _run_phase_analysis(self, simulation: Simulation, phase_name: str, documents: List[Dict[str, Any]]) -> None:
         """Run analysis on documents generated in a specific phase."""
         simulation_id = str(simulation.id.value)
@@ -619,8 +685,43 @@ class SimulationExecutionEngine:
             self.logger.error(f"Failed to get simulation documents", error=str(e))
         return []
 
-    async def _publish_progress_event(self, simulation: Simulation) -> None:
-        """Publish simulation progress event."""
+    async def _publish_progress_event(self, simulation: Simulation, force: bool = False) -> None:
+        """Publish simulation progress, coalesced to one event per progress interval.
+
+        Calls inside the interval schedule a single trailing publish that carries
+        the latest state; ``force`` publishes immediately.
+        """
+        simulation_id = str(simulation.id.value)
+        now = time.monotonic()
+        elapsed = now - self._last_progress_publish.get(simulation_id, float("-inf"))
+
+        if not force and elapsed < self.progress_interval_seconds:
+            if simulation_id not in self._pending_progress:
+                self._pending_progress[simulation_id] = asyncio.create_task(
+                    self._publish_progress_later(simulation, self.progress_interval_seconds - elapsed)
+                )
+            return
+
+        pending = self._pending_progress.pop(simulation_id, None)
+        if pending and pending is not asyncio.current_task():
+            pending.cancel()
+        self._last_progress_publish[simulation_id] = now
+        await self._send_progress_event(simulation)
+
+    async def _publish_progress_later(self, simulation: Simulation, delay: float) -> None:
+        """Trailing publish for progress updates coalesced within an interval."""
+        await asyncio.sleep(delay)
+        await self._publish_progress_event(simulation, force=True)
+
+    def _stop_progress_tracking(self, simulation_id: str) -> None:
+        """Drop progress coalescing state for a finished simulation."""
+        pending = self._pending_progress.pop(simulation_id, None)
+        if pending:
+            pending.cancel()
+        self._last_progress_publish.pop(simulation_id, None)
+
+    async def _send_progress_event(self, simulation: Simulation) -> None:
+        """Send the current simulation progress to WebSocket clients and the terminal UI."""
         try:
             # Publish to WebSocket if available
             from simulation.presentation.websockets.simulation_websocket import notify_simulation_progress
@@ -646,6 +747,14 @@ class SimulationExecutionEngine:
 
     async def _publish_simulation_event(self, simulation: Simulation, event_type: str, event_data: Dict[str, Any] = None) -> None:
         """Publish simulation-specific event."""
+        await self._publish_simulation_events(simulation, [(event_type, event_data)])
+
+    async def _publish_simulation_events(self, simulation: Simulation,
+                                         events: List[tuple]) -> None:
+        """Publish ``(event_type, event_data)`` pairs, persisting them in one batch."""
+        if not events:
+            return
+
         try:
             from simulation.presentation.websockets.simulation_websocket import notify_simulation_event_dict
             from simulation.infrastructure.ui.terminal_progress_visualizer import update_simulation_ui
@@ -653,38 +762,47 @@ class SimulationExecutionEngine:
                 get_event_store, SimulationEvent, EventType, EventPriority
             )
 
-            event_payload = {
-                "simulation_id": str(simulation.id.value),
-                "event_type": event_type,
-                "timestamp": datetime.now().isoformat(),
-                "data": event_data or {},
-                "simulation_status": simulation.status.value,
-                "progress_percentage": simulation.get_progress_percentage()
-            }
-
-            # Create and store event in Redis
-            event = SimulationEvent(
-                event_id=str(uuid.uuid4()),
-                simulation_id=str(simulation.id.value),
-                event_type=EventType(event_type),
-                timestamp=datetime.now(),
-                data=event_payload,
-                priority=EventPriority.NORMAL,
-                correlation_id=getattr(asyncio.current_task(), 'correlation_id', None),
-                tags=[event_type, "simulation", f"phase_{event_data.get('phase', 'unknown')}" if event_data else "general"]
-            )
+            simulation_id = str(simulation.id.value)
+            correlation_id = getattr(asyncio.current_task(), 'correlation_id', None)
+            payloads = []
+            stored_events = []
 
+            for event_type, event_data in events:
+                event_payload = {
+                    "simulation_id": simulation_id,
+                    "event_type": event_type,
+                    "timestamp": datetime.now().isoformat(),
+                    "data": event_data or {},
+                    "simulation_status": simulation.status.value,
+                    "progress_percentage": simulation.get_progress_percentage()
+                }
+                payloads.append(event_payload)
+
+                stored_events.append(SimulationEvent(
+                    event_id=str(uuid.uuid4()),
+                    simulation_id=simulation_id,
+                    event_type=EventType(event_type),
+                    timestamp=datetime.now(),
+                    data=event_payload,
+                    priority=EventPriority.NORMAL,
+                    correlation_id=correlation_id,
+                    tags=[event_type, "simulation", f"phase_{event_data.get('phase', 'unknown')}" if event_data else "general"]
+                ))
+
+            # Store events in Redis
             event_store = get_event_store()
-            await event_store.store_event(event)
+            await event_store.store_events(stored_events)
 
             # Publish to WebSocket
-            await notify_simulation_event_dict(str(simulation.id.value), event_payload)
+            for event_payload in payloads:
+                await notify_simulation_event_dict(simulation_id, event_payload)
 
-            # Update terminal UI
-            update_simulation_ui(str(simulation.id.value), event_payload)
+            # Update terminal UI with the latest state
+            update_simulation_ui(simulation_id, payloads[-1])
 
         except Exception as e:
-            self.logger.error(f"Failed to publish simulation event", error=str(e), event_type=event_type)
+            self.logger.error(f"Failed to publish simulation events", error=str(e),
+                              event_types=sorted({event_type for event_type, _ in events}))
 
     async def get_simulation_status(self, simulation_id: str) -> Optional[Dict[str, Any]]:
         """Get current simulation status."""
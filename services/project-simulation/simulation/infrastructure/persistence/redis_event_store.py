@@ -8,6 +8,8 @@ Key Features:
 - Event persistence with TTL and compression
 - Event replay with filtering and time range selection
 - Event querying with advanced filtering capabilities
+- Time-ordered sorted-set indexes (per simulation, type and tag) queried
+  server-side by score range with cursor pagination
 - Stream management with partitioning and sharding
 - Integration with WebSocket broadcasting
 - Performance metrics and monitoring
@@ -16,15 +18,14 @@ Key Features:
 import sys
 import json
 import time
+import hashlib
 import uuid
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Union, Iterator, Callable
+from typing import Dict, Any, List, Optional, Union, Iterator, Callable, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
 import asyncio
-import threading
-from concurrent.futures import ThreadPoolExecutor
 
 # Import from shared infrastructure
 sys.path.append(str(Path(__file__).parent.parent.parent.parent.parent / "services" / "shared"))
@@ -114,6 +115,41 @@ class SimulationEvent:
         )
 
 
+@dataclass
+class EventPage:
+    """A page of events in timestamp order plus the cursor for the next page."""
+    events: List[SimulationEvent]
+    next_cursor: Optional[str] = None
+
+
+def _encode_cursor(score: float, ties: int) -> str:
+    """Encode a page position: last score returned and how many members at it were returned."""
+    return f"{score!r}:{ties}"
+
+
+def _decode_cursor(cursor: str) -> Tuple[float, int]:
+    """Decode a cursor produced by ``_encode_cursor``."""
+    try:
+        score, ties = cursor.rsplit(":", 1)
+        return float(score), int(ties)
+    except (AttributeError, ValueError):
+        raise ValueError(f"Invalid event cursor: {cursor!r}")
+
+
+def _next_cursor(scores: List[float], previous: Optional[Tuple[float, int]]) -> str:
+    """Cursor after a page whose (ascending) member scores are ``scores``."""
+    last = scores[-1]
+    ties = 0
+    for score in reversed(scores):
+        if score != last:
+            break
+        ties += 1
+    if previous and previous[0] == last and ties == len(scores):
+        # The whole page shared the previous cursor's score
+        ties += previous[1]
+    return _encode_cursor(last, ties)
+
+
 @dataclass
 class ReplayConfiguration:
     """Configuration for event replay."""
@@ -139,8 +175,15 @@ class RedisEventStore:
                  key_prefix: str = "simulation:events",
                  compression: CompressionType = CompressionType.NONE,
                  ttl_seconds: int = 86400 * 7,  # 7 days
-                 max_connections: int = 10):
-        """Initialize Redis event store."""
+                 max_connections: int = 10,
+                 query_temp_ttl_seconds: int = 30):
+        """Initialize Redis event store.
+
+        Events are indexed in sorted sets scored by event timestamp, so queries
+        touch only the index range they return. ``query_temp_ttl_seconds`` bounds
+        the lifetime of the keys built for combined type/tag filters; a combined
+        key is named after its filter, so later pages of the same query reuse it.
+        """
         self.redis_host = redis_host
         self.redis_port = redis_port
         self.redis_db = redis_db
@@ -149,10 +192,12 @@ class RedisEventStore:
         self.compression = compression
         self.ttl_seconds = ttl_seconds
         self.max_connections = max_connections
+        self.query_temp_ttl_seconds = query_temp_ttl_seconds
+        # Combined filter keys built by this store -> monotonic time until which they are reused
+        self._query_keys: Dict[str, float] = {}
 
         self.logger = get_simulation_logger()
         self._redis_client = None
-        self._executor = ThreadPoolExecutor(max_workers=max_connections)
         self._running = False
 
         # Statistics
@@ -167,25 +212,22 @@ class RedisEventStore:
         """Initialize Redis connection and setup."""
         try:
             # Import redis here to make it optional
-            import redis
-            from redis import ConnectionPool
+            import redis.asyncio as aioredis
 
-            # Create connection pool
-            pool = ConnectionPool(
+            # Create connection pool; compressed payloads must stay as bytes
+            pool = aioredis.ConnectionPool(
                 host=self.redis_host,
                 port=self.redis_port,
                 db=self.redis_db,
                 password=self.redis_password,
                 max_connections=self.max_connections,
-                decode_responses=True
+                decode_responses=self.compression == CompressionType.NONE
             )
 
-            self._redis_client = redis.Redis(connection_pool=pool)
+            self._redis_client = aioredis.Redis(connection_pool=pool)
 
             # Test connection
-            await asyncio.get_event_loop().run_in_executor(
-                self._executor, self._redis_client.ping
-            )
+            await self._redis_client.ping()
 
             # Setup indexes and streams
             await self._setup_indexes()
@@ -203,66 +245,111 @@ class RedisEventStore:
 
     async def store_event(self, event: SimulationEvent) -> bool:
         """Store an event in Redis."""
-        try:
-            if not self._redis_client:
-                return await self._store_fallback(event)
+        return await self.store_events([event]) == 1
 
-            # Serialize event
-            event_data = event.to_dict()
-            serialized_data = json.dumps(event_data)
+    async def store_events(self, events: List[SimulationEvent]) -> int:
+        """Store a batch of events in one Redis pipeline round-trip.
 
-            # Apply compression if configured
-            if self.compression == CompressionType.GZIP:
-                import gzip
-                serialized_data = gzip.compress(serialized_data.encode())
-            elif self.compression == CompressionType.LZ4:
-                try:
-                    import lz4.frame
-                    serialized_data = lz4.frame.compress(serialized_data.encode())
-                except ImportError:
-                    self.logger.warning("LZ4 not available, storing uncompressed")
-
-            # Store in Redis with TTL
-            keys = [
-                f"{self.key_prefix}:simulation:{event.simulation_id}",
-                f"{self.key_prefix}:type:{event.event_type.value}",
-                f"{self.key_prefix}:time:{int(event.timestamp.timestamp())}",
-                f"{self.key_prefix}:event:{event.event_id}"
-            ]
+        Returns the number of events stored (all or nothing for Redis).
+        """
+        if not events:
+            return 0
+
+        try:
+            if not self._redis_client:
+                for event in events:
+                    await self._store_fallback(event)
+                return len(events)
 
             # Use pipeline for atomic operations
             pipeline = self._redis_client.pipeline()
+            index_keys = set()
+            for event in events:
+                index_keys.update(self._queue_event_writes(pipeline, event))
 
-            # Store event data
-            event_key = f"{self.key_prefix}:event:{event.event_id}"
-            pipeline.setex(event_key, self.ttl_seconds, serialized_data)
-
-            # Add to simulation stream
-            sim_stream = f"{self.key_prefix}:stream:{event.simulation_id}"
-            pipeline.xadd(sim_stream, {"event_id": event.event_id, "timestamp": event.timestamp.isoformat()})
-
-            # Add to indexes
-            for key in keys[:-1]:  # Exclude the event key itself
-                pipeline.sadd(key, event.event_id)
-
-            # Set TTL on keys
-            for key in keys:
+            # Drop index entries whose event data has expired
+            expired_before = time.time() - self.ttl_seconds
+            for key in index_keys:
+                pipeline.zremrangebyscore(key, "-inf", f"({expired_before}")
                 pipeline.expire(key, self.ttl_seconds)
 
             # Execute pipeline
-            await asyncio.get_event_loop().run_in_executor(self._executor, pipeline.execute)
-
-            self.stats["events_stored"] += 1
-
-            # Publish to Redis pub/sub for real-time listeners
-            await self._publish_event(event)
+            await pipeline.execute()
+            # Rebuild combined filter keys so our own writes show up in the next query
+            self._query_keys.clear()
 
-            return True
+            self.stats["events_stored"] += len(events)
+            return len(events)
 
         except Exception as e:
-            self.logger.error(f"Failed to store event {event.event_id}: {e}")
+            self.logger.error(f"Failed to store {len(events)} event(s): {e}")
             self.stats["errors"] += 1
-            return False
+            return 0
+
+    def _serialize_event(self, event: SimulationEvent, serialized_data: Optional[str] = None) -> Union[str, bytes]:
+        """Serialize an event, applying the configured compression."""
+        if serialized_data is None:
+            serialized_data = json.dumps(event.to_dict())
+
+        # Apply compression if configured
+        if self.compression == CompressionType.GZIP:
+            import gzip
+            serialized_data = gzip.compress(serialized_data.encode())
+        elif self.compression == CompressionType.LZ4:
+            try:
+                import lz4.frame
+                serialized_data = lz4.frame.compress(serialized_data.encode())
+            except ImportError:
+                self.logger.warning("LZ4 not available, storing uncompressed")
+
+        return serialized_data
+
+    def _index_keys(self, event: SimulationEvent) -> List[str]:
+        """Sorted-set index keys an event is added to."""
+        return [
+            self._all_index_key(),
+            self._simulation_index_key(event.simulation_id),
+            self._type_index_key(event.event_type.value),
+            *(self._tag_index_key(tag) for tag in event.tags)
+        ]
+
+    def _all_index_key(self) -> str:
+        return f"{self.key_prefix}:idx:all"
+
+    def _simulation_index_key(self, simulation_id: str) -> str:
+        return f"{self.key_prefix}:idx:simulation:{simulation_id}"
+
+    def _type_index_key(self, event_type: str) -> str:
+        return f"{self.key_prefix}:idx:type:{event_type}"
+
+    def _tag_index_key(self, tag: str) -> str:
+        return f"{self.key_prefix}:idx:tag:{tag}"
+
+    def _queue_event_writes(self, pipeline, event: SimulationEvent) -> List[str]:
+        """Queue the data, stream, index and pub/sub commands for one event.
+
+        Returns the index keys the event was added to.
+        """
+        event_json = json.dumps(event.to_dict())
+        serialized_data = self._serialize_event(event, event_json)
+
+        # Store event data with TTL
+        event_key = f"{self.key_prefix}:event:{event.event_id}"
+        pipeline.setex(event_key, self.ttl_seconds, serialized_data)
+
+        # Add to simulation stream
+        sim_stream = f"{self.key_prefix}:stream:{event.simulation_id}"
+        pipeline.xadd(sim_stream, {"event_id": event.event_id, "timestamp": event.timestamp.isoformat()})
+
+        # Add to time-ordered indexes
+        index_keys = self._index_keys(event)
+        score = event.timestamp.timestamp()
+        for key in index_keys:
+            pipeline.zadd(key, {event.event_id: score})
+
+        # Publish to Redis pub/sub for real-time listeners
+        pipeline.publish(f"{self.key_prefix}:pubsub:{event.simulation_id}", event_json)
+        return index_keys
 
     async def get_events(self,
                         simulation_id: Optional[str] = None,
@@ -272,90 +359,141 @@ class RedisEventStore:
                         tags: List[str] = None,
                         limit: int = 100,
                         offset: int = 0) -> List[SimulationEvent]:
-        """Retrieve events with filtering."""
-        try:
-            if not self._redis_client:
-                return await self._get_fallback_events(simulation_id, event_types, start_time, end_time, limit, offset)
+        """Retrieve events with filtering, in timestamp order.
 
-            # Build query
-            event_ids = await self._build_event_query(
-                simulation_id, event_types, start_time, end_time, tags, limit, offset
+        Tags match events carrying any of the given tags.
+        """
+        try:
+            page = await self._query_events(
+                simulation_id, event_types, start_time, end_time, tags, limit, offset=offset
             )
-
-            if not event_ids:
-                return []
-
-            # Retrieve event data
-            pipeline = self._redis_client.pipeline()
-            for event_id in event_ids:
-                pipeline.get(f"{self.key_prefix}:event:{event_id}")
-
-            results = await asyncio.get_event_loop().run_in_executor(self._executor, pipeline.execute)
-
-            events = []
-            for result in results:
-                if result:
-                    try:
-                        # Handle compression
-                        data = result
-                        if isinstance(data, bytes):
-                            if self.compression == CompressionType.GZIP:
-                                import gzip
-                                data = gzip.decompress(data).decode()
-                            elif self.compression == CompressionType.LZ4:
-                                import lz4.frame
-                                data = lz4.frame.decompress(data).decode()
-
-                        event_data = json.loads(data)
-                        event = SimulationEvent.from_dict(event_data)
-                        events.append(event)
-                    except Exception as e:
-                        self.logger.error(f"Failed to deserialize event: {e}")
-
-            self.stats["events_retrieved"] += len(events)
-            return events
+            return page.events
 
         except Exception as e:
             self.logger.error(f"Failed to retrieve events: {e}")
             self.stats["errors"] += 1
             return []
 
-    async def replay_events(self, config: ReplayConfiguration, callback: Callable[[SimulationEvent], None]) -> int:
-        """Replay events with the specified configuration."""
+    async def query_events(self,
+                           simulation_id: Optional[str] = None,
+                           event_types: List[EventType] = None,
+                           start_time: Optional[datetime] = None,
+                           end_time: Optional[datetime] = None,
+                           tags: List[str] = None,
+                           limit: int = 100,
+                           cursor: Optional[str] = None) -> EventPage:
+        """Retrieve a page of events in timestamp order with cursor pagination.
+
+        Pass the returned ``next_cursor`` to fetch the following page; it is
+        None once the last page has been returned. Unlike offsets, a cursor
+        costs the same for every page.
+        """
         try:
-            self.stats["replay_sessions"] += 1
+            return await self._query_events(
+                simulation_id, event_types, start_time, end_time, tags, limit, cursor=cursor
+            )
 
-            # Get events for replay
-            events = await self.get_events(
-                simulation_id=config.simulation_id,
-                event_types=config.event_types if config.event_types else None,
-                start_time=config.start_time,
-                end_time=config.end_time,
-                tags=config.tags if config.tags else None,
-                limit=config.max_events or 1000
+        except ValueError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Failed to query events: {e}")
+            self.stats["errors"] += 1
+            return EventPage(events=[])
+
+    async def _query_events(self,
+                            simulation_id: Optional[str],
+                            event_types: Optional[List[EventType]],
+                            start_time: Optional[datetime],
+                            end_time: Optional[datetime],
+                            tags: Optional[List[str]],
+                            limit: int,
+                            offset: int = 0,
+                            cursor: Optional[str] = None) -> EventPage:
+        """Run an event query against Redis, or the in-memory fallback."""
+        position = _decode_cursor(cursor) if cursor else None
+
+        if not self._redis_client:
+            return await self._query_fallback_events(
+                simulation_id, event_types, start_time, end_time, tags, limit, offset, position
             )
 
-            # Sort events by timestamp
-            events.sort(key=lambda e: e.timestamp)
+        # Build query
+        entries = await self._build_event_query(
+            simulation_id, event_types, start_time, end_time, tags, limit, offset, position
+        )
+
+        if not entries:
+            return EventPage(events=[])
+
+        # Retrieve event data
+        event_ids = [event_id for event_id, _ in entries]
+        results = await self._redis_client.mget(
+            [f"{self.key_prefix}:event:{event_id}" for event_id in event_ids]
+        )
+
+        events = []
+        for result in results:
+            if result:
+                try:
+                    events.append(SimulationEvent.from_dict(json.loads(self._deserialize_event(result))))
+                except Exception as e:
+                    self.logger.error(f"Failed to deserialize event: {e}")
+
+        self.stats["events_retrieved"] += len(events)
+        next_cursor = None
+        if len(entries) >= limit:
+            next_cursor = _next_cursor([score for _, score in entries], position)
+        return EventPage(events=events, next_cursor=next_cursor)
+
+    def _deserialize_event(self, data: Union[str, bytes]) -> str:
+        """Undo the configured compression of a stored event payload."""
+        if isinstance(data, bytes):
+            if self.compression == CompressionType.GZIP:
+                import gzip
+                return gzip.decompress(data).decode()
+            if self.compression == CompressionType.LZ4:
+                import lz4.frame
+                return lz4.frame.decompress(data).decode()
+            return data.decode()
+        return data
+
+    async def replay_events(self, config: ReplayConfiguration, callback: Callable[[SimulationEvent], None]) -> int:
+        """Replay events with the specified configuration."""
+        try:
+            self.stats["replay_sessions"] += 1
 
+            max_events = config.max_events or 1000
             replayed_count = 0
             last_timestamp = None
+            cursor = None
+
+            # Stream events in timestamp order, one page of batch_size at a time
+            while replayed_count < max_events:
+                page = await self.query_events(
+                    simulation_id=config.simulation_id,
+                    event_types=config.event_types if config.event_types else None,
+                    start_time=config.start_time,
+                    end_time=config.end_time,
+                    tags=config.tags if config.tags else None,
+                    limit=min(config.batch_size, max_events - replayed_count),
+                    cursor=cursor
+                )
 
-            for event in events:
-                # Apply speed multiplier for timing
-                if last_timestamp and config.speed_multiplier != 1.0:
-                    time_diff = (event.timestamp - last_timestamp).total_seconds()
-                    adjusted_diff = time_diff / config.speed_multiplier
-                    if adjusted_diff > 0:
-                        await asyncio.sleep(adjusted_diff)
-
-                # Call callback with event
-                callback(event)
-                replayed_count += 1
-                last_timestamp = event.timestamp
-
-                # Check max events limit
-                if config.max_events and replayed_count >= config.max_events:
+                for event in page.events:
+                    # Apply speed multiplier for timing
+                    if last_timestamp and config.speed_multiplier != 1.0:
+                        time_diff = (event.timestamp - last_timestamp).total_seconds()
+                        adjusted_diff = time_diff / config.speed_multiplier
+                        if adjusted_diff > 0:
+                            await asyncio.sleep(adjusted_diff)
+
+                    # Call callback with event
+                    callback(event)
+                    replayed_count += 1
+                    last_timestamp = event.timestamp
+
+                cursor = page.next_cursor
+                if not cursor:
                     break
 
             self.logger.info(f"Replayed {replayed_count} events for simulation {config.simulation_id}")
@@ -436,23 +574,39 @@ class RedisEventStore:
         try:
             cutoff_time = datetime.now() - timedelta(days=days_old)
 
-            # Find old events
-            old_events = await self.get_events(end_time=cutoff_time)
-
-            if not old_events:
-                return 0
-
-            # Delete old events
-            event_ids = [event.event_id for event in old_events]
-
-            if self._redis_client:
+            if not self._redis_client:
+                old_ids = [event_id for event_id, event in getattr(self, '_fallback_store', {}).items()
+                           if event.timestamp <= cutoff_time]
+                for event_id in old_ids:
+                    del self._fallback_store[event_id]
+                self.logger.info(f"Cleaned up {len(old_ids)} old events")
+                return len(old_ids)
+
+            cutoff_score = cutoff_time.timestamp()
+            removed = 0
+
+            # Delete old event payloads in batches from the global time index
+            while True:
+                old_ids = await self._redis_client.zrangebyscore(
+                    self._all_index_key(), "-inf", cutoff_score, start=0, num=1000
+                )
+                if not old_ids:
+                    break
                 pipeline = self._redis_client.pipeline()
-                for event_id in event_ids:
-                    pipeline.delete(f"{self.key_prefix}:event:{event_id}")
-                await asyncio.get_event_loop().run_in_executor(self._executor, pipeline.execute)
+                pipeline.delete(*(f"{self.key_prefix}:event:{self._as_str(event_id)}" for event_id in old_ids))
+                pipeline.zrem(self._all_index_key(), *old_ids)
+                await pipeline.execute()
+                removed += len(old_ids)
 
-            self.logger.info(f"Cleaned up {len(event_ids)} old events")
-            return len(event_ids)
+            # Trim the remaining indexes without blocking the server on KEYS
+            pipeline = self._redis_client.pipeline()
+            async for key in self._redis_client.scan_iter(match=f"{self.key_prefix}:idx:*", count=500):
+                pipeline.zremrangebyscore(key, "-inf", cutoff_score)
+            await pipeline.execute()
+            self._query_keys.clear()
+
+            self.logger.info(f"Cleaned up {removed} old events")
+            return removed
 
         except Exception as e:
             self.logger.error(f"Failed to cleanup old events: {e}")
@@ -461,8 +615,10 @@ class RedisEventStore:
     async def shutdown(self) -> None:
         """Shutdown the event store."""
         self._running = False
-        if self._executor:
-            self._executor.shutdown(wait=True)
+        if self._redis_client:
+            close = getattr(self._redis_client, "aclose", None) or self._redis_client.close
+            await close()
+            self._redis_client = None
         self.logger.info("Redis event store shut down")
 
     # Private methods
@@ -480,22 +636,6 @@ class RedisEventStore:
         except Exception as e:
             self.logger.error(f"Failed to setup indexes: {e}")
 
-    async def _publish_event(self, event: SimulationEvent) -> None:
-        """Publish event to Redis pub/sub."""
-        if not self._redis_client:
-            return
-
-        try:
-            channel = f"{self.key_prefix}:pubsub:{event.simulation_id}"
-            message = json.dumps(event.to_dict())
-
-            await asyncio.get_event_loop().run_in_executor(
-                self._executor,
-                lambda: self._redis_client.publish(channel, message)
-            )
-        except Exception as e:
-            self.logger.error(f"Failed to publish event: {e}")
-
     async def _build_event_query(self,
                                simulation_id: Optional[str],
                                event_types: Optional[List[EventType]],
@@ -503,69 +643,104 @@ class RedisEventStore:
                                end_time: Optional[datetime],
                                tags: Optional[List[str]],
                                limit: int,
-                               offset: int) -> List[str]:
-        """Build Redis query for event filtering."""
+                               offset: int = 0,
+                               position: Optional[Tuple[float, int]] = None) -> List[Tuple[str, float]]:
+        """Resolve filters to ``(event_id, timestamp_score)`` pairs in timestamp order.
+
+        Each filter maps to a sorted set scored by timestamp. Alternatives within
+        a filter (several types or tags) are combined with ZUNIONSTORE and the
+        filters with ZINTERSTORE, both server-side into a short-lived key; the
+        time window and page are then a single ZRANGEBYSCORE. The combined key
+        is reused by later pages of the same filter until it expires, so cursor
+        paging does not rebuild it per page.
+        """
         if not self._redis_client:
             return []
 
-        try:
-            # Start with all events if no simulation specified
-            if simulation_id:
-                base_key = f"{self.key_prefix}:simulation:{simulation_id}"
-                event_ids = await asyncio.get_event_loop().run_in_executor(
-                    self._executor, lambda: self._redis_client.smembers(base_key)
-                )
-            else:
-                # Get all simulation keys and union them
-                pattern = f"{self.key_prefix}:simulation:*"
-                sim_keys = await asyncio.get_event_loop().run_in_executor(
-                    self._executor, lambda: self._redis_client.keys(pattern)
-                )
+        filter_keys = [self._simulation_index_key(simulation_id) if simulation_id else self._all_index_key()]
+        if event_types:
+            filter_keys.append([self._type_index_key(EventType(et).value) for et in event_types])
+        if tags:
+            filter_keys.append([self._tag_index_key(tag) for tag in tags])
 
-                if not sim_keys:
-                    return []
+        min_score: Union[str, float] = start_time.timestamp() if start_time else "-inf"
+        max_score: Union[str, float] = end_time.timestamp() if end_time else "+inf"
+        if position:
+            # Resume at the cursor's score, skipping members already returned at it
+            min_score, offset = position
 
-                pipeline = self._redis_client.pipeline()
-                for key in sim_keys:
-                    pipeline.smembers(key)
-                results = await asyncio.get_event_loop().run_in_executor(self._executor, pipeline.execute)
-
-                event_ids = set()
-                for result in results:
-                    event_ids.update(result)
-
-            if not event_ids:
-                return []
-
-            # Apply filters
-            filtered_ids = set(event_ids)
-
-            # Filter by event types
-            if event_types:
-                type_ids = set()
-                for event_type in event_types:
-                    type_key = f"{self.key_prefix}:type:{event_type.value}"
-                    type_event_ids = await asyncio.get_event_loop().run_in_executor(
-                        self._executor, lambda: self._redis_client.smembers(type_key)
-                    )
-                    type_ids.update(type_event_ids)
-                filtered_ids = filtered_ids.intersection(type_ids)
-
-            # Apply time range filtering (simplified)
-            # In a real implementation, you'd use Redis sorted sets for time-based indexing
-
-            # Apply offset and limit
-            sorted_ids = sorted(list(filtered_ids))
-            if offset >= len(sorted_ids):
-                return []
-
-            end_index = min(offset + limit, len(sorted_ids))
-            return sorted_ids[offset:end_index]
+        try:
+            if len(filter_keys) == 1:
+                return await self._range_query_key(filter_keys[0], None, min_score, max_score, offset, limit)
+
+            query_key = self._combined_query_key(filter_keys)
+            if self._query_keys.get(query_key, 0.0) > time.monotonic():
+                entries = await self._range_query_key(query_key, None, min_score, max_score, offset, limit)
+                if entries:
+                    return entries
+                # Empty page: the key may have expired server-side, so rebuild and read again
+            return await self._range_query_key(query_key, filter_keys, min_score, max_score, offset, limit)
 
         except Exception as e:
             self.logger.error(f"Failed to build event query: {e}")
             return []
 
+    async def _range_query_key(self,
+                               query_key: str,
+                               filter_keys: Optional[List[Union[str, List[str]]]],
+                               min_score: Union[str, float],
+                               max_score: Union[str, float],
+                               offset: int,
+                               limit: int) -> List[Tuple[str, float]]:
+        """Read one page of ``query_key``, first building it from ``filter_keys`` when given."""
+        temp_keys: List[str] = []
+        pipeline = self._redis_client.pipeline()
+        if filter_keys:
+            intersect_keys = []
+            for keys in filter_keys:
+                if isinstance(keys, str):
+                    intersect_keys.append(keys)
+                elif len(keys) == 1:
+                    intersect_keys.append(keys[0])
+                else:
+                    union_key = self._temp_key(temp_keys)
+                    pipeline.zunionstore(union_key, keys, aggregate="MIN")
+                    pipeline.expire(union_key, self.query_temp_ttl_seconds)
+                    intersect_keys.append(union_key)
+
+            # Scores are identical across indexes; MIN keeps them unchanged
+            pipeline.zinterstore(query_key, intersect_keys, aggregate="MIN")
+            pipeline.expire(query_key, self.query_temp_ttl_seconds)
+
+        pipeline.zrangebyscore(query_key, min_score, max_score, start=offset, num=limit, withscores=True)
+        if temp_keys:
+            pipeline.delete(*temp_keys)
+
+        results = await pipeline.execute()
+        if filter_keys:
+            now = time.monotonic()
+            self._query_keys = {key: until for key, until in self._query_keys.items() if until > now}
+            # Stop reusing well before Redis expires the key
+            self._query_keys[query_key] = now + self.query_temp_ttl_seconds / 2
+        entries = results[-2] if temp_keys else results[-1]
+        return [(self._as_str(member), float(score)) for member, score in entries]
+
+    def _combined_query_key(self, filter_keys: List[Union[str, List[str]]]) -> str:
+        """Key for the intersection of ``filter_keys``, the same for every page of a query."""
+        canonical = [keys if isinstance(keys, str) else sorted(set(keys)) for keys in filter_keys]
+        digest = hashlib.sha1(json.dumps(canonical).encode()).hexdigest()
+        return f"{self.key_prefix}:tmp:query:{digest}"
+
+    def _temp_key(self, temp_keys: List[str]) -> str:
+        """Allocate a temporary query key and register it for deletion."""
+        key = f"{self.key_prefix}:tmp:{uuid.uuid4().hex}"
+        temp_keys.append(key)
+        return key
+
+    @staticmethod
+    def _as_str(value: Union[str, bytes]) -> str:
+        return value.decode() if isinstance(value, bytes) else value
+
     def _get_event_description(self, event: SimulationEvent) -> str:
         """Get human-readable description for an event."""
         descriptions = {
@@ -593,16 +768,18 @@ class RedisEventStore:
         self.stats["events_stored"] += 1
         return True
 
-    async def _get_fallback_events(self,
-                                 simulation_id: Optional[str],
-                                 event_types: Optional[List[EventType]],
-                                 start_time: Optional[datetime],
-                                 end_time: Optional[datetime],
-                                 limit: int,
-                                 offset: int) -> List[SimulationEvent]:
-        """Fallback event retrieval."""
+    async def _query_fallback_events(self,
+                                     simulation_id: Optional[str],
+                                     event_types: Optional[List[EventType]],
+                                     start_time: Optional[datetime],
+                                     end_time: Optional[datetime],
+                                     tags: Optional[List[str]],
+                                     limit: int,
+                                     offset: int,
+                                     position: Optional[Tuple[float, int]]) -> EventPage:
+        """Fallback event query with the same ordering and cursors as Redis."""
         if not hasattr(self, '_fallback_store'):
-            return []
+            return EventPage(events=[])
 
         events = list(self._fallback_store.values())
 
@@ -613,21 +790,28 @@ class RedisEventStore:
         if event_types:
             events = [e for e in events if e.event_type in event_types]
 
+        if tags:
+            wanted = set(tags)
+            events = [e for e in events if wanted.intersection(e.tags)]
+
         if start_time:
             events = [e for e in events if e.timestamp >= start_time]
 
         if end_time:
             events = [e for e in events if e.timestamp <= end_time]
 
-        # Sort by timestamp
-        events.sort(key=lambda e: e.timestamp)
-
-        # Apply pagination
-        start_idx = min(offset, len(events))
-        end_idx = min(start_idx + limit, len(events))
+        # Sort like a sorted set: by score, then member
+        scored = sorted(((e.timestamp.timestamp(), e.event_id, e) for e in events), key=lambda entry: entry[:2])
+        if position:
+            scored = [entry for entry in scored if entry[0] >= position[0]]
+            offset = position[1]
 
-        self.stats["events_retrieved"] += len(events[start_idx:end_idx])
-        return events[start_idx:end_idx]
+        page = scored[offset:offset + limit]
+        self.stats["events_retrieved"] += len(page)
+        next_cursor = None
+        if page and len(page) >= limit:
+            next_cursor = _next_cursor([entry[0] for entry in page], position)
+        return EventPage(events=[entry[2] for entry in page], next_cursor=next_cursor)
 
 
 class EventReplayManager:
@@ -729,6 +913,7 @@ __all__ = [
     'RedisEventStore',
     'EventReplayManager',
     'SimulationEvent',
+    'EventPage',
     'EventType',
     'EventPriority',
     'CompressionType',
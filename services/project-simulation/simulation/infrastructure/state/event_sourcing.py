@@ -3,15 +3,25 @@
 This module implements event sourcing patterns for simulation state management,
 providing complete audit trails, temporal queries, and reliable state reconstruction
 following Domain-Driven Design principles and leveraging existing ecosystem patterns.
+
+Events are persisted in an append-only SQLite log. Concurrent appends are group
+committed (one transaction and one fsync per batch), each aggregate stream is
+protected by sequence-number optimistic concurrency, and snapshots are taken
+automatically every N events or bytes so loading an aggregate reads only the
+latest snapshot plus the events after it.
 """
 
 import sys
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Type, TypeVar, Generic, Union
+from typing import Dict, Any, List, Optional, Tuple, Type, TypeVar, Generic, Union
 from datetime import datetime
 from uuid import uuid4
 import json
-import weakref
 
 # Import from shared infrastructure
 sys.path.append(str(Path(__file__).parent.parent.parent.parent.parent / "services" / "shared"))
@@ -21,11 +31,47 @@ from simulation.infrastructure.utilities.simulation_utilities import get_simulat
 
 # Import simulation domain
 from simulation.domain.value_objects import SimulationStatus
-from simulation.domain.events import DomainEvent
+from simulation.domain.events import DomainEvent, event_from_dict
 
 T = TypeVar('T')
 
 
+class ConcurrencyError(Exception):
+    """Raised when an append does not follow the aggregate's current version."""
+
+    def __init__(self, aggregate_id: str, expected_version: int, actual_version: int):
+        super().__init__(
+            f"Aggregate {aggregate_id} is at version {actual_version}, expected {expected_version}"
+        )
+        self.aggregate_id = aggregate_id
+        self.expected_version = expected_version
+        self.actual_version = actual_version
+
+
+class RecordedEvent:
+    """Stored event whose type is not registered as a domain event class."""
+
+    def __init__(self, event_type: str, payload: Dict[str, Any]):
+        self.__dict__.update(payload)
+        self.event_type = event_type
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+
+def _format_timestamp(timestamp: datetime) -> str:
+    """Fixed-width ISO timestamp, so stored values sort chronologically as text."""
+    return timestamp.isoformat(timespec="microseconds")
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
 class EventEnvelope:
     """Envelope for domain events with metadata."""
 
@@ -54,7 +100,7 @@ class EventEnvelope:
             "sequence_number": self.sequence_number,
             "timestamp": self.timestamp.isoformat(),
             "event_type": self.event.event_type,
-            "event_data": self.event.dict(),
+            "event_data": self.event.to_dict(),
             "metadata": self.metadata
         }
 
@@ -65,31 +111,13 @@ class EventEnvelope:
         event_type = data["event_type"]
 
         # Reconstruct the domain event
-        if event_type == "SimulationStarted":
-            from simulation.domain.events import SimulationStarted
-            event = SimulationStarted(**event_data)
-        elif event_type == "SimulationFinished":
-            from simulation.domain.events import SimulationFinished
-            event = SimulationFinished(**event_data)
-        elif event_type == "PhaseCompleted":
-            from simulation.domain.events import PhaseCompleted
-            event = PhaseCompleted(**event_data)
-        elif event_type == "DocumentGenerated":
-            from simulation.domain.events import DocumentGenerated
-            event = DocumentGenerated(**event_data)
-        elif event_type == "WorkflowExecuted":
-            from simulation.domain.events import WorkflowExecuted
-            event = WorkflowExecuted(**event_data)
-        else:
-            # Generic domain event for unknown types
-            event = DomainEvent(
-                event_type=event_type,
-                payload=event_data,
-                event_id=event_data.get("event_id", str(uuid4())),
-                timestamp=datetime.fromisoformat(data["timestamp"])
-            )
+        try:
+            event = event_from_dict({**event_data, "event_type": event_type})
+        except (ValueError, TypeError):
+            # Unregistered or changed event types keep their payload as attributes
+            event = RecordedEvent(event_type, event_data)
 
-        return cls(
+        envelope = cls(
             event=event,
             aggregate_id=data["aggregate_id"],
             aggregate_type=data["aggregate_type"],
@@ -97,24 +125,124 @@ class EventEnvelope:
             timestamp=datetime.fromisoformat(data["timestamp"]),
             metadata=data.get("metadata", {})
         )
+        envelope.event_id = data.get("event_id", envelope.event_id)
+        return envelope
 
 
 class EventStore:
-    """Event store for persisting domain events."""
+    """Append-only, SQLite-backed event store for domain events.
+
+    Appends from concurrent writers are queued and committed together in one
+    transaction, so a burst of saves costs a single fsync. Each append carries
+    the version it expects the aggregate to be at and fails with
+    ConcurrencyError otherwise. The store counts events and payload bytes since
+    each aggregate's latest snapshot; ``needs_snapshot`` reports when either
+    exceeds the configured policy.
+    """
+
+    def __init__(self,
+                 db_path: Optional[str] = None,
+                 snapshot_every_events: int = 100,
+                 snapshot_every_bytes: int = 256 * 1024,
+                 group_commit_delay_seconds: float = 0.0):
+        """Initialize event store.
+
+        Args:
+            db_path: SQLite database path (defaults to the project data directory;
+                ``":memory:"`` keeps the log in process)
+            snapshot_every_events: Events since the last snapshot that trigger a new one
+            snapshot_every_bytes: Serialized event bytes since the last snapshot that trigger a new one
+            group_commit_delay_seconds: Extra time to wait for more appends to join a batch
+        """
+        if db_path is None:
+            project_sim_root = Path(__file__).parent.parent.parent.parent
+            db_path = str(project_sim_root / "data" / "event_store.db")
+
+        self.db_path = db_path
+        self.snapshot_every_events = snapshot_every_events
+        self.snapshot_every_bytes = snapshot_every_bytes
+        self.group_commit_delay_seconds = group_commit_delay_seconds
 
-    def __init__(self):
-        """Initialize event store."""
         self.logger = get_simulation_logger()
         self.cache = get_simulation_cache()
-        self._events: Dict[str, List[EventEnvelope]] = {}
-        self._snapshots: Dict[str, Dict[str, Any]] = {}
 
-    async def save_events(self, aggregate_id: str, events: List[EventEnvelope]) -> None:
-        """Save events to the store."""
-        if aggregate_id not in self._events:
-            self._events[aggregate_id] = []
+        # A single connection serialized by a lock; async calls run on one worker thread
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="event-store")
+        self._conn = self._connect()
+
+        self._pending: List[Tuple[str, List[EventEnvelope], int, asyncio.Future]] = []
+        self._writer: Optional[asyncio.Task] = None
+        # aggregate_id -> [events, bytes] appended since the latest snapshot
+        self._since_snapshot: Dict[str, List[int]] = {}
+
+        self.stats = {"appends": 0, "events_written": 0, "commits": 0, "conflicts": 0, "snapshots": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        if self.db_path != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+        # Every commit is durable; group commit amortizes the fsync
+        conn.execute("PRAGMA synchronous=FULL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS events (
+                aggregate_id TEXT NOT NULL,
+                sequence_number INTEGER NOT NULL,
+                event_id TEXT NOT NULL,
+                aggregate_type TEXT NOT NULL,
+                event_type TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                payload TEXT NOT NULL,  -- JSON envelope
+                PRIMARY KEY (aggregate_id, sequence_number)
+            ) WITHOUT ROWID;
+
+            CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events (timestamp);
+
+            CREATE TABLE IF NOT EXISTS snapshots (
+                aggregate_id TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                timestamp TEXT NOT NULL,  -- timestamp of the event at this version
+                data TEXT NOT NULL,  -- JSON
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (aggregate_id, version)
+            ) WITHOUT ROWID;
+
+            CREATE INDEX IF NOT EXISTS idx_snapshots_time ON snapshots (aggregate_id, timestamp);
+        """)
+        return conn
+
+    async def _run(self, fn, *args):
+        """Run a blocking database call on the store's worker thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    # Appends
+
+    async def save_events(self, aggregate_id: str, events: List[EventEnvelope],
+                          expected_version: Optional[int] = None) -> None:
+        """Append events to an aggregate stream.
+
+        ``expected_version`` defaults to the sequence number before the first
+        event. Raises ConcurrencyError if the stream has moved on.
+        """
+        if not events:
+            return
+
+        if expected_version is None:
+            expected_version = events[0].sequence_number - 1
+        for offset, envelope in enumerate(events, start=1):
+            if envelope.sequence_number != expected_version + offset:
+                raise ValueError(
+                    f"Events for {aggregate_id} must be numbered consecutively from {expected_version + 1}"
+                )
 
-        self._events[aggregate_id].extend(events)
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((aggregate_id, events, expected_version, future))
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._flush_pending())
+        await future
 
         # Invalidate cache for this aggregate
         cache_key = f"aggregate:{aggregate_id}"
@@ -124,38 +252,262 @@ class EventStore:
             "Events saved",
             aggregate_id=aggregate_id,
             event_count=len(events),
-            last_sequence=events[-1].sequence_number if events else 0
+            last_sequence=events[-1].sequence_number
         )
 
-    async def get_events(self, aggregate_id: str, from_sequence: int = 0) -> List[EventEnvelope]:
-        """Get events for an aggregate."""
-        if aggregate_id not in self._events:
-            return []
-
-        all_events = self._events[aggregate_id]
-        return [e for e in all_events if e.sequence_number >= from_sequence]
+    async def _flush_pending(self) -> None:
+        """Commit queued appends in batches until the queue is empty."""
+        while self._pending:
+            if self.group_commit_delay_seconds:
+                await asyncio.sleep(self.group_commit_delay_seconds)
+
+            batch, self._pending = self._pending, []
+            try:
+                results = await self._run(self._commit_batch, [item[:3] for item in batch])
+            except Exception as e:
+                self.logger.error("Event batch commit failed", error=str(e), batch_size=len(batch))
+                results = [e] * len(batch)
+
+            for (_, _, _, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(None)
+
+    def _commit_batch(self, batch: List[Tuple[str, List[EventEnvelope], int]]) -> List[Optional[Exception]]:
+        """Write a batch of appends in one transaction; each append succeeds or fails alone."""
+        results: List[Optional[Exception]] = []
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for aggregate_id, events, expected_version in batch:
+                    conn.execute("SAVEPOINT append_events")
+                    try:
+                        current = self._current_version(aggregate_id)
+                        if current != expected_version:
+                            raise ConcurrencyError(aggregate_id, expected_version, current)
+                        counters = self._snapshot_counters(aggregate_id)
+
+                        rows = [
+                            (aggregate_id, e.sequence_number, e.event_id, e.aggregate_type,
+                             e.event.event_type, _format_timestamp(e.timestamp),
+                             json.dumps(e.to_dict(), default=_json_default))
+                            for e in events
+                        ]
+                        conn.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                        conn.execute("RELEASE append_events")
+                    except (ConcurrencyError, sqlite3.IntegrityError) as e:
+                        conn.execute("ROLLBACK TO append_events")
+                        conn.execute("RELEASE append_events")
+                        if isinstance(e, sqlite3.IntegrityError):
+                            e = ConcurrencyError(aggregate_id, expected_version, self._current_version(aggregate_id))
+                        self.stats["conflicts"] += 1
+                        results.append(e)
+                        continue
+
+                    counters[0] += len(rows)
+                    counters[1] += sum(len(row[-1]) for row in rows)
+                    self.stats["appends"] += 1
+                    self.stats["events_written"] += len(rows)
+                    results.append(None)
+
+                conn.execute("COMMIT")
+                self.stats["commits"] += 1
+            except BaseException:
+                conn.execute("ROLLBACK")
+                # Counters may include rolled-back appends; reload them lazily
+                self._since_snapshot.clear()
+                raise
+        return results
+
+    def _current_version(self, aggregate_id: str) -> int:
+        row = self._conn.execute(
+            "SELECT MAX(sequence_number) FROM events WHERE aggregate_id = ?", (aggregate_id,)
+        ).fetchone()
+        return row[0] or 0
+
+    def _snapshot_counters(self, aggregate_id: str) -> List[int]:
+        """Events and bytes since the latest snapshot, loaded from the log on first use."""
+        counters = self._since_snapshot.get(aggregate_id)
+        if counters is None:
+            snapshot_version = self._conn.execute(
+                "SELECT MAX(version) FROM snapshots WHERE aggregate_id = ?", (aggregate_id,)
+            ).fetchone()[0] or 0
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM events "
+                "WHERE aggregate_id = ? AND sequence_number > ?",
+                (aggregate_id, snapshot_version)
+            ).fetchone()
+            counters = self._since_snapshot[aggregate_id] = [count, size]
+        return counters
+
+    def needs_snapshot(self, aggregate_id: str) -> bool:
+        """Whether the aggregate has passed the event or byte snapshot threshold."""
+        counters = self._since_snapshot.get(aggregate_id)
+        if counters is None:
+            return False
+        events_since, bytes_since = counters
+        return events_since >= self.snapshot_every_events or bytes_since >= self.snapshot_every_bytes
+
+    # Reads
+
+    async def get_events(self, aggregate_id: str, from_sequence: int = 0,
+                         to_sequence: Optional[int] = None) -> List[EventEnvelope]:
+        """Get events for an aggregate, optionally bounded by sequence number."""
+        return await self._run(self._read_events, aggregate_id, from_sequence, to_sequence, None)
 
     async def get_all_events(self, aggregate_id: str) -> List[EventEnvelope]:
         """Get all events for an aggregate."""
-        return self._events.get(aggregate_id, [])
-
-    async def save_snapshot(self, aggregate_id: str, snapshot: Dict[str, Any], version: int) -> None:
-        """Save a snapshot of aggregate state."""
-        self._snapshots[aggregate_id] = {
-            "data": snapshot,
-            "version": version,
-            "timestamp": datetime.now()
-        }
-
+        return await self.get_events(aggregate_id)
+
+    async def get_events_in_range(self, aggregate_id: str, from_date: Optional[datetime] = None,
+                                  to_date: Optional[datetime] = None) -> List[EventEnvelope]:
+        """Get an aggregate's events with timestamps within an inclusive range."""
+        def read():
+            clauses, params = ["aggregate_id = ?"], [aggregate_id]
+            if from_date:
+                clauses.append("timestamp >= ?")
+                params.append(_format_timestamp(from_date))
+            if to_date:
+                clauses.append("timestamp <= ?")
+                params.append(_format_timestamp(to_date))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT payload FROM events WHERE {' AND '.join(clauses)} ORDER BY timestamp, sequence_number",
+                    params
+                ).fetchall()
+            return [EventEnvelope.from_dict(json.loads(row[0])) for row in rows]
+
+        return await self._run(read)
+
+    def _read_events(self, aggregate_id: str, from_sequence: int, to_sequence: Optional[int],
+                     until: Optional[datetime]) -> List[EventEnvelope]:
+        query = "SELECT payload FROM events WHERE aggregate_id = ? AND sequence_number >= ?"
+        params: List[Any] = [aggregate_id, from_sequence]
+        if to_sequence is not None:
+            query += " AND sequence_number <= ?"
+            params.append(to_sequence)
+        if until is not None:
+            query += " AND timestamp <= ?"
+            params.append(_format_timestamp(until))
+        query += " ORDER BY sequence_number"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [EventEnvelope.from_dict(json.loads(row[0])) for row in rows]
+
+    # Snapshots
+
+    async def save_snapshot(self, aggregate_id: str, snapshot: Dict[str, Any], version: int,
+                            timestamp: Optional[datetime] = None) -> None:
+        """Save a snapshot of aggregate state at ``version``.
+
+        ``timestamp`` defaults to the timestamp of the event at that version, so
+        point-in-time loads can select snapshots by event time.
+        """
+        def write():
+            with self._lock:
+                snapshot_time = _format_timestamp(timestamp) if timestamp else None
+                if snapshot_time is None:
+                    row = self._conn.execute(
+                        "SELECT timestamp FROM events WHERE aggregate_id = ? AND sequence_number = ?",
+                        (aggregate_id, version)
+                    ).fetchone()
+                    snapshot_time = row[0] if row else _format_timestamp(datetime.now())
+
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?)",
+                    (aggregate_id, version, snapshot_time, json.dumps(snapshot, default=_json_default),
+                     _format_timestamp(datetime.now()))
+                )
+                # Events after the snapshot version still count toward the next one
+                self._since_snapshot.pop(aggregate_id, None)
+                self._snapshot_counters(aggregate_id)
+                self.stats["snapshots"] += 1
+
+        await self._run(write)
         self.logger.info("Snapshot saved", aggregate_id=aggregate_id, version=version)
 
-    async def get_snapshot(self, aggregate_id: str) -> Optional[Dict[str, Any]]:
-        """Get the latest snapshot for an aggregate."""
-        return self._snapshots.get(aggregate_id)
+    async def get_snapshot(self, aggregate_id: str, at_time: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """Get the latest snapshot for an aggregate, or the latest taken at or before ``at_time``."""
+        return await self._run(self._read_snapshot, aggregate_id, at_time)
+
+    def _read_snapshot(self, aggregate_id: str, at_time: Optional[datetime]) -> Optional[Dict[str, Any]]:
+        # Index seek on (aggregate_id, timestamp) or the primary key
+        if at_time is None:
+            query = ("SELECT version, timestamp, data FROM snapshots WHERE aggregate_id = ? "
+                     "ORDER BY version DESC LIMIT 1")
+            params: Tuple[Any, ...] = (aggregate_id,)
+        else:
+            query = ("SELECT version, timestamp, data FROM snapshots WHERE aggregate_id = ? AND timestamp <= ? "
+                     "ORDER BY timestamp DESC, version DESC LIMIT 1")
+            params = (aggregate_id, _format_timestamp(at_time))
+
+        with self._lock:
+            row = self._conn.execute(query, params).fetchone()
+        if not row:
+            return None
+        return {"data": json.loads(row[2]), "version": row[0], "timestamp": datetime.fromisoformat(row[1])}
+
+    async def load_stream(self, aggregate_id: str,
+                          at_time: Optional[datetime] = None) -> Tuple[Optional[Dict[str, Any]], List[EventEnvelope]]:
+        """Load the latest snapshot (as of ``at_time``) and the events after it, in one call."""
+        def read():
+            snapshot = self._read_snapshot(aggregate_id, at_time)
+            from_sequence = snapshot["version"] + 1 if snapshot else 0
+            return snapshot, self._read_events(aggregate_id, from_sequence, None, at_time)
+
+        return await self._run(read)
+
+    # Aggregate-level queries
 
     def get_aggregate_ids(self) -> List[str]:
         """Get all aggregate IDs."""
-        return list(self._events.keys())
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT aggregate_id FROM events").fetchall()
+        return [row[0] for row in rows]
+
+    async def get_aggregate_ids_modified_since(self, since: datetime) -> List[str]:
+        """Get IDs of aggregates with events at or after ``since``."""
+        def read():
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT DISTINCT aggregate_id FROM events WHERE timestamp >= ?", (_format_timestamp(since),)
+                ).fetchall()
+            return [row[0] for row in rows]
+
+        return await self._run(read)
+
+    async def get_statistics(self) -> Dict[str, Any]:
+        """Event counts by type, aggregate counts and the stored time range."""
+        def read():
+            with self._lock:
+                event_types = dict(self._conn.execute(
+                    "SELECT event_type, COUNT(*) FROM events GROUP BY event_type"
+                ).fetchall())
+                total, aggregates, oldest, newest = self._conn.execute(
+                    "SELECT COUNT(*), COUNT(DISTINCT aggregate_id), MIN(timestamp), MAX(timestamp) FROM events"
+                ).fetchone()
+            return {
+                "total_events": total,
+                "event_types": event_types,
+                "aggregates_with_events": aggregates,
+                "oldest_event": oldest,
+                "newest_event": newest
+            }
+
+        return await self._run(read)
+
+    async def close(self) -> None:
+        """Flush pending appends and close the database."""
+        if self._writer and not self._writer.done():
+            await self._writer
+        with self._lock:
+            self._conn.close()
+        self._executor.shutdown(wait=True)
 
 
 class AggregateRoot(Generic[T]):
@@ -193,6 +545,15 @@ class AggregateRoot(Generic[T]):
         """Apply event to aggregate state - to be implemented by subclasses."""
         raise NotImplementedError("Subclasses must implement _apply_event")
 
+    def to_snapshot(self) -> Dict[str, Any]:
+        """Public state to persist in a snapshot."""
+        return {k: v for k, v in self.__dict__.items() if not k.startswith('_') and k != 'aggregate_id'}
+
+    def restore_snapshot(self, data: Dict[str, Any], version: int) -> None:
+        """Restore state saved by ``to_snapshot``."""
+        self.__dict__.update(data)
+        self._version = version
+
     @property
     def version(self) -> int:
         """Get current version."""
@@ -307,6 +668,15 @@ class SimulationAggregate(AggregateRoot):
             self.end_time = event.timestamp
             self.metrics.update(event.summary.get("final_metrics", {}))
 
+    def restore_snapshot(self, data: Dict[str, Any], version: int) -> None:
+        """Restore snapshot state, converting JSON values back to domain types."""
+        super().restore_snapshot(data, version)
+        self.status = SimulationStatus(self.status)
+        for attr in ("start_time", "end_time"):
+            value = getattr(self, attr)
+            if isinstance(value, str):
+                setattr(self, attr, datetime.fromisoformat(value))
+
 
 class EventSourcedRepository(Generic[T]):
     """Repository for event-sourced aggregates."""
@@ -336,12 +706,20 @@ class EventSourcedRepository(Generic[T]):
             )
             envelopes.append(envelope)
 
-        # Save events
-        await self.event_store.save_events(aggregate.aggregate_id, envelopes)
+        # Save events; raises ConcurrencyError if the stream moved since the aggregate was loaded
+        await self.event_store.save_events(
+            aggregate.aggregate_id, envelopes, expected_version=aggregate.version - len(changes)
+        )
 
         # Mark changes as committed
         aggregate.mark_changes_as_committed()
 
+        # Snapshot per the store's policy while the current state is at hand
+        if self.event_store.needs_snapshot(aggregate.aggregate_id):
+            await self.event_store.save_snapshot(
+                aggregate.aggregate_id, aggregate.to_snapshot(), aggregate.version, envelopes[-1].timestamp
+            )
+
         # Invalidate cache
         cache_key = f"aggregate:{aggregate.aggregate_id}"
         self.cache.delete(cache_key)
@@ -360,26 +738,10 @@ class EventSourcedRepository(Generic[T]):
         if cached:
             return cached
 
-        # Try snapshot first for performance
-        snapshot = await self.event_store.get_snapshot(aggregate_id)
-        if snapshot:
-            aggregate = self.aggregate_class(aggregate_id)
-            # Load from snapshot
-            aggregate.__dict__.update(snapshot["data"])
-            aggregate._version = snapshot["version"]
-
-            # Apply events after snapshot
-            events = await self.event_store.get_events(aggregate_id, snapshot["version"] + 1)
-        else:
-            # Load from all events
-            events = await self.event_store.get_all_events(aggregate_id)
-            if not events:
-                return None
-
-            aggregate = self.aggregate_class(aggregate_id)
-
-        # Apply events
-        aggregate.load_from_history(events)
+        # Latest snapshot plus the events after it
+        aggregate = await load_aggregate(self.event_store, self.aggregate_class, aggregate_id)
+        if aggregate is None:
+            return None
 
         # Cache the aggregate
         self.cache.set(cache_key, aggregate, ttl=300)  # 5 minutes
@@ -394,20 +756,30 @@ class EventSourcedRepository(Generic[T]):
         """Create a snapshot for an aggregate."""
         aggregate = await self.get_by_id(aggregate_id)
         if aggregate:
-            snapshot_data = {
-                k: v for k, v in aggregate.__dict__.items()
-                if not k.startswith('_')
-            }
-            await self.event_store.save_snapshot(aggregate_id, snapshot_data, aggregate.version)
+            await self.event_store.save_snapshot(aggregate_id, aggregate.to_snapshot(), aggregate.version)
+
+
+async def load_aggregate(event_store: EventStore, aggregate_class: Type[T], aggregate_id: str,
+                         at_time: Optional[datetime] = None) -> Optional[T]:
+    """Rebuild an aggregate from its latest snapshot (as of ``at_time``) and the events after it."""
+    snapshot, events = await event_store.load_stream(aggregate_id, at_time)
+    if not snapshot and not events:
+        return None
+
+    aggregate = aggregate_class(aggregate_id)
+    if snapshot:
+        aggregate.restore_snapshot(snapshot["data"], snapshot["version"])
+    aggregate.load_from_history(events)
+    return aggregate
 
 
 class EventSourcingService:
     """Service for managing event-sourced aggregates and temporal queries."""
 
-    def __init__(self):
+    def __init__(self, event_store: Optional[EventStore] = None):
         """Initialize event sourcing service."""
         self.logger = get_simulation_logger()
-        self.event_store = EventStore()
+        self.event_store = event_store or EventStore()
         self.repositories: Dict[str, EventSourcedRepository] = {}
 
     def get_repository(self, aggregate_class: Type[T]) -> EventSourcedRepository[T]:
@@ -424,83 +796,39 @@ class EventSourcingService:
 
     async def replay_events(self, aggregate_id: str, to_sequence: Optional[int] = None) -> List[EventEnvelope]:
         """Replay events for an aggregate up to a specific sequence."""
-        events = await self.event_store.get_all_events(aggregate_id)
-
-        if to_sequence is not None:
-            events = [e for e in events if e.sequence_number <= to_sequence]
-
-        return events
+        return await self.event_store.get_events(aggregate_id, to_sequence=to_sequence)
 
     async def get_event_history(self, aggregate_id: str, from_date: Optional[datetime] = None,
                                to_date: Optional[datetime] = None) -> List[EventEnvelope]:
         """Get event history for an aggregate within date range."""
-        events = await self.event_store.get_all_events(aggregate_id)
-
-        if from_date:
-            events = [e for e in events if e.timestamp >= from_date]
-        if to_date:
-            events = [e for e in events if e.timestamp <= to_date]
-
-        return sorted(events, key=lambda e: e.timestamp)
-
-    async def get_aggregate_at_time(self, aggregate_id: str, timestamp: datetime) -> Optional[SimulationAggregate]:
-        """Get aggregate state at a specific point in time."""
-        events = await self.event_store.get_all_events(aggregate_id)
-        events_before_time = [e for e in events if e.timestamp <= timestamp]
-
-        if not events_before_time:
-            return None
+        return await self.event_store.get_events_in_range(aggregate_id, from_date, to_date)
 
-        # Create aggregate and apply historical events
-        aggregate = SimulationAggregate(aggregate_id)
-        aggregate.load_from_history(events_before_time)
+    async def get_aggregate_at_time(self, aggregate_id: str, timestamp: datetime,
+                                    aggregate_class: Type[T] = SimulationAggregate) -> Optional[T]:
+        """Get aggregate state at a specific point in time.
 
-        return aggregate
+        Starts from the latest snapshot taken at or before ``timestamp`` and
+        replays only the events between it and ``timestamp``.
+        """
+        return await load_aggregate(self.event_store, aggregate_class, aggregate_id, at_time=timestamp)
 
     async def get_aggregates_modified_since(self, since: datetime) -> List[str]:
         """Get aggregate IDs that were modified since a specific time."""
-        modified_aggregates = set()
-
-        for aggregate_id in self.event_store.get_aggregate_ids():
-            events = await self.event_store.get_all_events(aggregate_id)
-            recent_events = [e for e in events if e.timestamp >= since]
-
-            if recent_events:
-                modified_aggregates.add(aggregate_id)
-
-        return list(modified_aggregates)
+        return await self.event_store.get_aggregate_ids_modified_since(since)
 
     async def get_event_statistics(self) -> Dict[str, Any]:
         """Get statistics about stored events."""
-        total_events = 0
-        event_types = {}
-        aggregates_with_events = 0
-        oldest_event = None
-        newest_event = None
-
-        for aggregate_id in self.event_store.get_aggregate_ids():
-            events = await self.event_store.get_all_events(aggregate_id)
-
-            if events:
-                aggregates_with_events += 1
-                total_events += len(events)
-
-                for event in events:
-                    event_type = event.event.event_type
-                    event_types[event_type] = event_types.get(event_type, 0) + 1
-
-                    if oldest_event is None or event.timestamp < oldest_event:
-                        oldest_event = event.timestamp
-                    if newest_event is None or event.timestamp > newest_event:
-                        newest_event = event.timestamp
+        stats = await self.event_store.get_statistics()
+        total_events = stats["total_events"]
+        aggregates_with_events = stats["aggregates_with_events"]
 
         return {
             "total_events": total_events,
-            "event_types": event_types,
+            "event_types": stats["event_types"],
             "aggregates_with_events": aggregates_with_events,
-            "total_aggregates": len(self.event_store.get_aggregate_ids()),
-            "oldest_event": oldest_event.isoformat() if oldest_event else None,
-            "newest_event": newest_event.isoformat() if newest_event else None,
+            "total_aggregates": aggregates_with_events,
+            "oldest_event": stats["oldest_event"],
+            "newest_event": stats["newest_event"],
             "average_events_per_aggregate": total_events / aggregates_with_events if aggregates_with_events > 0 else 0
         }
 
@@ -540,12 +868,15 @@ async def create_snapshot(aggregate_id: str) -> None:
 
 
 __all__ = [
+    'ConcurrencyError',
     'EventEnvelope',
     'EventStore',
+    'RecordedEvent',
     'AggregateRoot',
     'SimulationAggregate',
     'EventSourcedRepository',
     'EventSourcingService',
+    'load_aggregate',
     'get_event_sourcing_service',
     'save_aggregate',
     'get_aggregate',
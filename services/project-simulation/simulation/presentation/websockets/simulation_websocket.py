@@ -2,9 +2,16 @@
 
 This module implements WebSocket support for real-time simulation updates,
 allowing clients to receive live progress updates and event notifications.
+
+Each connection has a bounded outbound queue drained by its own writer task, so
+broadcasts never wait on a client and a slow client only delays itself. Progress
+updates are coalesced per simulation (latest value wins), clients that fall too
+far behind are disconnected, and queued messages can optionally be batched
+into a single frame.
 """
 
 import json
+from collections import deque
 from typing import Dict, Any, List, Optional, Set
 from datetime import datetime
 from enum import Enum
@@ -53,14 +60,147 @@ class EcosystemServiceStatus(WebSocketMessage):
     response_time_ms: Optional[float] = Field(None, description="Response time in milliseconds")
 
 
+class ConnectionSender:
+    """Bounded outbound queue and writer task for one WebSocket connection.
+
+    Frames are pre-serialized strings. Frames enqueued with a coalesce key
+    replace the pending frame with the same key instead of queueing behind it.
+    """
+
+    def __init__(self,
+                 websocket: WebSocket,
+                 on_failure,
+                 max_queue_size: int = 256,
+                 send_timeout_seconds: float = 10.0,
+                 batch_max_messages: int = 1,
+                 batch_window_seconds: float = 0.0):
+        """Initialize sender; ``on_failure(websocket, reason)`` is awaited when sending fails."""
+        self.websocket = websocket
+        self.on_failure = on_failure
+        self.max_queue_size = max_queue_size
+        self.send_timeout_seconds = send_timeout_seconds
+        self.batch_max_messages = max(1, batch_max_messages)
+        self.batch_window_seconds = batch_window_seconds
+
+        # Entries are [coalesce_key, frame] so coalescing can replace a frame in place
+        self._queue: deque = deque()
+        self._pending_keys: Dict[str, List[Optional[str]]] = {}
+        self._ready = asyncio.Event()
+        self._closed = False
+        self._task = asyncio.create_task(self._run())
+
+        self.frames_sent = 0
+        self.coalesced = 0
+
+    @property
+    def queue_size(self) -> int:
+        return len(self._queue)
+
+    def enqueue(self, frame: str, coalesce_key: Optional[str] = None) -> bool:
+        """Queue a frame without waiting; returns False if the queue is full."""
+        if self._closed:
+            return True
+
+        if coalesce_key is not None:
+            pending = self._pending_keys.get(coalesce_key)
+            if pending is not None:
+                pending[1] = frame
+                self.coalesced += 1
+                return True
+
+        if len(self._queue) >= self.max_queue_size:
+            return False
+
+        entry = [coalesce_key, frame]
+        self._queue.append(entry)
+        if coalesce_key is not None:
+            self._pending_keys[coalesce_key] = entry
+        self._ready.set()
+        return True
+
+    def _take_batch(self) -> List[str]:
+        frames = []
+        while self._queue and len(frames) < self.batch_max_messages:
+            coalesce_key, frame = self._queue.popleft()
+            if coalesce_key is not None:
+                self._pending_keys.pop(coalesce_key, None)
+            frames.append(frame)
+        if not self._queue:
+            self._ready.clear()
+        return frames
+
+    async def _run(self) -> None:
+        try:
+            while not self._closed:
+                await self._ready.wait()
+                if self.batch_max_messages > 1 and self.batch_window_seconds and len(self._queue) < self.batch_max_messages:
+                    # Give a burst a moment to fill the batch
+                    await asyncio.sleep(self.batch_window_seconds)
+
+                frames = self._take_batch()
+                if not frames:
+                    continue
+
+                if len(frames) == 1:
+                    payload = frames[0]
+                else:
+                    payload = '{"type": "batch", "messages": [' + ", ".join(frames) + ']}'
+
+                try:
+                    await asyncio.wait_for(self.websocket.send_text(payload), timeout=self.send_timeout_seconds)
+                except asyncio.CancelledError:
+                    raise
+                except asyncio.TimeoutError:
+                    await self.on_failure(self.websocket, "send_timeout")
+                    return
+                except Exception as e:
+                    await self.on_failure(self.websocket, str(e) or type(e).__name__)
+                    return
+
+                self.frames_sent += len(frames)
+        except asyncio.CancelledError:
+            pass
+
+    async def close(self) -> None:
+        """Stop the writer task; queued frames are discarded."""
+        self._closed = True
+        self._queue.clear()
+        self._pending_keys.clear()
+        if self._task is not asyncio.current_task():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
 class WebSocketConnectionManager:
     """WebSocket connection manager for simulation updates."""
 
-    def __init__(self):
-        """Initialize connection manager."""
+    def __init__(self,
+                 max_queue_size: int = 256,
+                 send_timeout_seconds: float = 10.0,
+                 batch_max_messages: int = 1,
+                 batch_window_seconds: float = 0.0):
+        """Initialize connection manager.
+
+        Args:
+            max_queue_size: Queued frames per connection before it is treated as a slow consumer
+            send_timeout_seconds: Time a single send may take before the connection is dropped
+            batch_max_messages: Queued messages sent together in one ``batch`` frame (1 disables batching)
+            batch_window_seconds: Time to wait for a batch to fill once a message is queued
+        """
         self.active_connections: Dict[str, Set[WebSocket]] = {}
         self.logger = get_simulation_logger()
 
+        self.max_queue_size = max_queue_size
+        self.send_timeout_seconds = send_timeout_seconds
+        self.batch_max_messages = batch_max_messages
+        self.batch_window_seconds = batch_window_seconds
+        self._senders: Dict[WebSocket, ConnectionSender] = {}
+
+        self.stats = {"broadcasts": 0, "frames_enqueued": 0, "dropped_progress": 0, "slow_consumer_disconnects": 0}
+
     async def connect(self, websocket: WebSocket, simulation_id: Optional[str] = None) -> None:
         """Connect a WebSocket client."""
         await websocket.accept()
@@ -72,6 +212,15 @@ class WebSocketConnectionManager:
             self.active_connections[key] = set()
 
         self.active_connections[key].add(websocket)
+        if websocket not in self._senders:
+            self._senders[websocket] = ConnectionSender(
+                websocket,
+                self._handle_send_failure,
+                max_queue_size=self.max_queue_size,
+                send_timeout_seconds=self.send_timeout_seconds,
+                batch_max_messages=self.batch_max_messages,
+                batch_window_seconds=self.batch_window_seconds
+            )
 
         self.logger.info(
             "WebSocket client connected",
@@ -99,6 +248,11 @@ class WebSocketConnectionManager:
             if not self.active_connections[key]:
                 del self.active_connections[key]
 
+        if not any(websocket in connections for connections in self.active_connections.values()):
+            sender = self._senders.pop(websocket, None)
+            if sender:
+                await sender.close()
+
         self.logger.info(
             "WebSocket client disconnected",
             simulation_id=simulation_id,
@@ -130,59 +284,99 @@ class WebSocketConnectionManager:
         await self._broadcast_to_connections(all_connections, message)
 
     async def _broadcast_to_connections(self, connections: Set[WebSocket], message: WebSocketMessage) -> None:
-        """Broadcast message to a set of connections."""
+        """Queue a message on a set of connections without waiting for any client.
+
+        The message is serialized once. Progress updates coalesce per simulation
+        and are dropped rather than queued when a client's queue is full; for
+        other messages a full queue disconnects the client as a slow consumer.
+        """
         if not connections:
             return
 
         # Create JSON message
-        message_dict = message.dict()
-        json_message = json.dumps(message_dict, default=str)
-
-        # Send to all connections
-        tasks = []
-        for connection in connections:
-            tasks.append(self._send_json_to_websocket(connection, json_message))
-
-        # Execute all sends concurrently
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        json_message = self._serialize(message)
+        coalesce_key = self._coalesce_key(message)
+        self.stats["broadcasts"] += 1
+
+        slow_consumers = []
+        for connection in list(connections):
+            sender = self._senders.get(connection)
+            if sender is None:
+                continue
+            if sender.enqueue(json_message, coalesce_key):
+                self.stats["frames_enqueued"] += 1
+            elif coalesce_key is not None:
+                self.stats["dropped_progress"] += 1
+            else:
+                slow_consumers.append(connection)
+
+        for connection in slow_consumers:
+            await self._drop_connection(connection, "slow_consumer")
+
+    @staticmethod
+    def _serialize(message: WebSocketMessage) -> str:
+        return json.dumps(message.dict(), default=str)
+
+    @staticmethod
+    def _coalesce_key(message: WebSocketMessage) -> Optional[str]:
+        """Messages with the same key supersede each other while queued."""
+        if message.type == "simulation_progress":
+            return f"progress:{message.simulation_id}"
+        return None
+
+    async def _handle_send_failure(self, websocket: WebSocket, reason: str) -> None:
+        """Called by a connection's writer task when a send fails or times out."""
+        self.logger.warning("Failed to send WebSocket message", error=reason)
+        await self._drop_connection(websocket, reason)
+
+    async def _drop_connection(self, websocket: WebSocket, reason: str) -> None:
+        """Remove a connection from every subscription and close it."""
+        for key in list(self.active_connections):
+            connections = self.active_connections[key]
+            connections.discard(websocket)
+            if not connections:
+                del self.active_connections[key]
 
-        # Log any failures
-        failed_count = sum(1 for result in results if isinstance(result, Exception))
-        if failed_count > 0:
-            self.logger.warning(
-                "Some WebSocket messages failed to send",
-                total_connections=len(connections),
-                failed_count=failed_count
-            )
-
-    async def _send_json_to_websocket(self, websocket: WebSocket, json_message: str) -> None:
-        """Send JSON message to a WebSocket."""
-        try:
-            await websocket.send_text(json_message)
-        except Exception as e:
-            self.logger.warning(
-                "Failed to send WebSocket message",
-                error=str(e)
-            )
-            # Remove failed connection
-            for key, connections in self.active_connections.items():
-                connections.discard(websocket)
-                if not connections:
-                    del self.active_connections[key]
-                    break
+        sender = self._senders.pop(websocket, None)
+        if sender:
+            await sender.close()
+
+        if reason == "slow_consumer":
+            self.stats["slow_consumer_disconnects"] += 1
+            self.logger.warning("Disconnecting slow WebSocket consumer", queue_limit=self.max_queue_size)
+            try:
+                # 1013: try again later
+                await websocket.close(code=1013)
+            except Exception:
+                pass
+
+    async def send_text(self, websocket: WebSocket, text: str) -> None:
+        """Queue a raw text frame for a single WebSocket."""
+        sender = self._senders.get(websocket)
+        if sender is None:
+            await websocket.send_text(text)
+        elif not sender.enqueue(text):
+            await self._drop_connection(websocket, "slow_consumer")
 
     async def _send_to_websocket(self, websocket: WebSocket, message: WebSocketMessage) -> None:
         """Send message to a single WebSocket."""
         try:
-            message_dict = message.dict()
-            json_message = json.dumps(message_dict, default=str)
-            await websocket.send_text(json_message)
+            await self.send_text(websocket, self._serialize(message))
         except Exception as e:
             self.logger.warning(
                 "Failed to send WebSocket message",
                 error=str(e)
             )
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Fan-out counters plus current connection and queue sizes."""
+        return {
+            **self.stats,
+            "connections": len(self._senders),
+            "queued_frames": sum(sender.queue_size for sender in self._senders.values()),
+            "coalesced": sum(sender.coalesced for sender in self._senders.values())
+        }
+
 
 class SimulationWebSocketHandler:
     """Handler for simulation WebSocket connections and events."""
@@ -215,7 +409,7 @@ class SimulationWebSocketHandler:
 
                 except asyncio.TimeoutError:
                     # Send ping to keep connection alive
-                    await websocket.send_text(json.dumps({"type": "ping"}))
+                    await self.connection_manager.send_text(websocket, json.dumps({"type": "ping"}))
                     continue
 
         except WebSocketDisconnect:
@@ -250,7 +444,7 @@ class SimulationWebSocketHandler:
                     await self._handle_client_message(websocket, "general", data)
 
                 except asyncio.TimeoutError:
-                    await websocket.send_text(json.dumps({"type": "ping"}))
+                    await self.connection_manager.send_text(websocket, json.dumps({"type": "ping"}))
                     continue
 
         except WebSocketDisconnect:
@@ -378,7 +572,7 @@ class SimulationWebSocketHandler:
 
             if message_type == "ping":
                 # Respond to ping
-                await websocket.send_text(json.dumps({"type": "pong"}))
+                await self.connection_manager.send_text(websocket, json.dumps({"type": "pong"}))
             elif message_type == "subscribe":
                 # Handle subscription changes
                 simulation_id = message_data.get("simulation_id")
@@ -388,7 +582,7 @@ class SimulationWebSocketHandler:
                     await self.connection_manager.connect(websocket, simulation_id)
             elif message_type == "unsubscribe":
                 # Handle unsubscribe
-                await websocket.send_text(json.dumps({
+                await self.connection_manager.send_text(websocket, json.dumps({
                     "type": "unsubscribed",
                     "context": context
                 }))
@@ -529,6 +723,7 @@ __all__ = [
     'SimulationProgressUpdate',
     'SimulationEventNotification',
     'EcosystemServiceStatus',
+    'ConnectionSender',
     'WebSocketConnectionManager',
     'SimulationWebSocketHandler',
     'SimulationWebSocketManager',
@@ -0,0 +1,161 @@
+"""Unit tests for the persistent event-sourcing store."""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from simulation.domain.events import DomainEvent
+from simulation.infrastructure.state.event_sourcing import (
+    AggregateRoot, ConcurrencyError, EventEnvelope, EventSourcedRepository, EventSourcingService, EventStore
+)
+
+
+@dataclass(frozen=True)
+class CounterIncremented(DomainEvent):
+    counter_id: str
+    amount: int
+
+    def get_aggregate_id(self) -> str:
+        return self.counter_id
+
+
+class CounterAggregate(AggregateRoot):
+    """Minimal aggregate used to exercise the store."""
+
+    def __init__(self, aggregate_id: str):
+        super().__init__(aggregate_id)
+        self.total = 0
+
+    def increment(self, amount: int = 1) -> None:
+        self.apply_event(CounterIncremented(counter_id=self.aggregate_id, amount=amount))
+
+    def _apply_event(self, event) -> None:
+        self.total += event.amount
+
+
+def new_id() -> str:
+    return f"counter-{uuid4().hex}"
+
+
+def make_envelopes(aggregate_id: str, start: int, count: int, base_time: datetime):
+    return [
+        EventEnvelope(
+            event=CounterIncremented(counter_id=aggregate_id, amount=1),
+            aggregate_id=aggregate_id,
+            aggregate_type="CounterAggregate",
+            sequence_number=start + i,
+            timestamp=base_time + timedelta(minutes=start + i)
+        )
+        for i in range(count)
+    ]
+
+
+class TestEventStorePersistence:
+    """Test cases for durable appends and loading."""
+
+    @pytest.mark.asyncio
+    async def test_events_survive_a_restart(self, tmp_path):
+        db_path = str(tmp_path / "events.db")
+        aggregate_id = new_id()
+
+        store = EventStore(db_path=db_path)
+        aggregate = CounterAggregate(aggregate_id)
+        for amount in (1, 2, 3):
+            aggregate.increment(amount)
+        await EventSourcedRepository(store, CounterAggregate).save(aggregate)
+        await store.close()
+
+        reopened = EventStore(db_path=db_path)
+        events = await reopened.get_all_events(aggregate_id)
+        assert [e.sequence_number for e in events] == [1, 2, 3]
+        assert [e.event.amount for e in events] == [1, 2, 3]
+        assert reopened.get_aggregate_ids() == [aggregate_id]
+        await reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_stale_append_raises_concurrency_error(self):
+        store = EventStore(db_path=":memory:")
+        aggregate_id = new_id()
+        base_time = datetime(2024, 1, 1)
+
+        await store.save_events(aggregate_id, make_envelopes(aggregate_id, 1, 2, base_time))
+
+        with pytest.raises(ConcurrencyError) as exc_info:
+            await store.save_events(aggregate_id, make_envelopes(aggregate_id, 2, 1, base_time))
+        assert exc_info.value.actual_version == 2
+
+        await store.save_events(aggregate_id, make_envelopes(aggregate_id, 3, 1, base_time))
+        assert len(await store.get_all_events(aggregate_id)) == 3
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_appends_are_group_committed(self):
+        store = EventStore(db_path=":memory:")
+        base_time = datetime(2024, 1, 1)
+        aggregate_ids = [new_id() for _ in range(50)]
+
+        await asyncio.gather(*(
+            store.save_events(aggregate_id, make_envelopes(aggregate_id, 1, 2, base_time))
+            for aggregate_id in aggregate_ids
+        ))
+
+        assert store.stats["events_written"] == 100
+        assert store.stats["commits"] < 50
+        await store.close()
+
+
+class TestSnapshots:
+    """Test cases for the automatic snapshot policy."""
+
+    @pytest.mark.asyncio
+    async def test_snapshots_are_taken_every_n_events(self):
+        store = EventStore(db_path=":memory:", snapshot_every_events=5)
+        repository = EventSourcedRepository(store, CounterAggregate)
+        aggregate = CounterAggregate(new_id())
+
+        for _ in range(12):
+            aggregate.increment()
+            await repository.save(aggregate)
+
+        snapshot, tail = await store.load_stream(aggregate.aggregate_id)
+        assert snapshot["version"] == 10
+        assert [e.sequence_number for e in tail] == [11, 12]
+
+        loaded = await repository.get_by_id(aggregate.aggregate_id)
+        assert loaded.total == 12
+        assert loaded.version == 12
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_byte_threshold_triggers_snapshot(self):
+        store = EventStore(db_path=":memory:", snapshot_every_events=1000, snapshot_every_bytes=1)
+        aggregate_id = new_id()
+
+        await store.save_events(aggregate_id, make_envelopes(aggregate_id, 1, 1, datetime(2024, 1, 1)))
+
+        assert store.needs_snapshot(aggregate_id)
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_aggregate_at_time_starts_from_earlier_snapshot(self):
+        store = EventStore(db_path=":memory:")
+        service = EventSourcingService(event_store=store)
+        aggregate_id = new_id()
+        base_time = datetime(2024, 1, 1)
+
+        await store.save_events(aggregate_id, make_envelopes(aggregate_id, 1, 20, base_time))
+        await store.save_snapshot(aggregate_id, {"total": 5}, 5)
+        await store.save_snapshot(aggregate_id, {"total": 15}, 15)
+
+        at_time = base_time + timedelta(minutes=12)
+        snapshot, tail = await store.load_stream(aggregate_id, at_time)
+        assert snapshot["version"] == 5
+        assert [e.sequence_number for e in tail] == list(range(6, 13))
+
+        aggregate = await service.get_aggregate_at_time(aggregate_id, at_time, CounterAggregate)
+        assert aggregate.total == 12
+        assert await service.get_aggregate_at_time(aggregate_id, base_time, CounterAggregate) is None
+        await store.close()
@@ -0,0 +1,172 @@
+"""Unit tests for RedisEventStore querying and cursor pagination."""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from simulation.infrastructure.persistence.redis_event_store import (
+    RedisEventStore, SimulationEvent, EventType, _decode_cursor, _encode_cursor, _next_cursor
+)
+
+BASE_TIME = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def make_events(count: int):
+    return [
+        SimulationEvent(
+            event_id=f"event-{i:03d}",
+            simulation_id="sim-1" if i % 2 == 0 else "sim-2",
+            event_type=EventType.DOCUMENT_GENERATED if i % 3 else EventType.PROGRESS_UPDATE,
+            # Two events per second so pages cross equal timestamps
+            timestamp=BASE_TIME + timedelta(seconds=i // 2),
+            data={"index": i},
+            tags=["important"] if i % 4 == 0 else []
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def store():
+    event_store = RedisEventStore()
+    event_store._fallback_store = {event.event_id: event for event in make_events(40)}
+    return event_store
+
+
+class TestEventCursors:
+    """Test cases for cursor encoding."""
+
+    def test_cursor_round_trip(self):
+        assert _decode_cursor(_encode_cursor(1704110400.5, 3)) == (1704110400.5, 3)
+
+    def test_invalid_cursor_raises(self):
+        with pytest.raises(ValueError):
+            _decode_cursor("not-a-cursor")
+
+    def test_next_cursor_accumulates_ties_across_pages(self):
+        assert _next_cursor([1.0, 2.0, 2.0], None) == _encode_cursor(2.0, 2)
+        assert _next_cursor([2.0, 2.0], (2.0, 2)) == _encode_cursor(2.0, 4)
+
+
+class TestFallbackQueries:
+    """Test cases for queries against the in-memory fallback."""
+
+    @pytest.mark.asyncio
+    async def test_events_are_returned_in_timestamp_order(self, store):
+        events = await store.get_events(simulation_id="sim-1", limit=100)
+
+        assert len(events) == 20
+        assert events == sorted(events, key=lambda e: e.timestamp)
+
+    @pytest.mark.asyncio
+    async def test_time_window_and_tag_filters(self, store):
+        events = await store.get_events(
+            start_time=BASE_TIME + timedelta(seconds=4),
+            end_time=BASE_TIME + timedelta(seconds=9),
+            tags=["important"],
+            limit=100
+        )
+
+        assert [e.data["index"] for e in events] == [8, 12, 16]
+
+    @pytest.mark.asyncio
+    async def test_cursor_pagination_visits_every_event_once(self, store):
+        seen = []
+        cursor = None
+        while True:
+            page = await store.query_events(event_types=[EventType.DOCUMENT_GENERATED], limit=3, cursor=cursor)
+            seen.extend(e.event_id for e in page.events)
+            cursor = page.next_cursor
+            if not cursor:
+                break
+
+        expected = [e.event_id for e in make_events(40) if e.event_type == EventType.DOCUMENT_GENERATED]
+        assert seen == expected
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_is_rejected(self, store):
+        with pytest.raises(ValueError):
+            await store.query_events(cursor="bogus")
+
+
+class TestRedisQueryPlan:
+    """Test cases for the Redis commands issued by event queries."""
+
+    @pytest.mark.asyncio
+    async def test_combined_filters_are_resolved_server_side(self):
+        event_store = RedisEventStore()
+        pipeline = MagicMock()
+        pipeline.execute = AsyncMock(return_value=[1, True, 1, True, 2, True, [("event-1", 1.0)], 3])
+        event_store._redis_client = MagicMock()
+        event_store._redis_client.pipeline.return_value = pipeline
+
+        entries = await event_store._build_event_query(
+            "sim-1", [EventType.DOCUMENT_GENERATED, EventType.PROGRESS_UPDATE],
+            BASE_TIME, None, ["a", "b"], limit=10
+        )
+
+        assert entries == [("event-1", 1.0)]
+        assert pipeline.zunionstore.call_count == 2
+        intersect_keys = pipeline.zinterstore.call_args.args[1]
+        assert intersect_keys[0] == "simulation:events:idx:simulation:sim-1"
+        args, kwargs = pipeline.zrangebyscore.call_args
+        assert args[1:] == (BASE_TIME.timestamp(), "+inf")
+        assert kwargs == {"start": 0, "num": 10, "withscores": True}
+        # Temporary union keys are dropped in the same round-trip; the intersection is kept for later pages
+        assert len(pipeline.delete.call_args.args) == 2
+        query_key = pipeline.zinterstore.call_args.args[0]
+        assert query_key not in pipeline.delete.call_args.args
+        pipeline.expire.assert_any_call(query_key, event_store.query_temp_ttl_seconds)
+
+    @pytest.mark.asyncio
+    async def test_cursor_pages_reuse_the_combined_key(self):
+        event_store = RedisEventStore()
+        pipeline = MagicMock()
+        pipeline.execute = AsyncMock(side_effect=[
+            [2, True, 1, True, [("event-1", 1.0)], 1],
+            [[("event-2", 2.0)]],
+            [[("event-3", 3.0)]],
+        ])
+        event_store._redis_client = MagicMock()
+        event_store._redis_client.pipeline.return_value = pipeline
+        event_types = [EventType.DOCUMENT_GENERATED, EventType.PROGRESS_UPDATE]
+
+        await event_store._build_event_query("sim-1", event_types, None, None, ["a"], limit=1)
+        query_key = pipeline.zinterstore.call_args.args[0]
+        # The same filter in another order maps to the same key
+        second = await event_store._build_event_query(
+            "sim-1", list(reversed(event_types)), None, None, ["a"], limit=1, position=(1.0, 1)
+        )
+        third = await event_store._build_event_query(
+            "sim-1", event_types, None, None, ["a"], limit=1, position=(2.0, 1)
+        )
+
+        assert second == [("event-2", 2.0)] and third == [("event-3", 3.0)]
+        assert pipeline.zinterstore.call_count == 1
+        assert pipeline.zunionstore.call_count == 1
+        assert pipeline.zrangebyscore.call_args.args[:3] == (query_key, 2.0, "+inf")
+
+    @pytest.mark.asyncio
+    async def test_combined_key_is_rebuilt_after_writes_or_when_missing(self):
+        event_store = RedisEventStore()
+        pipeline = MagicMock()
+        pipeline.execute = AsyncMock(side_effect=[
+            [1, True, [("event-1", 1.0)]],
+            [True] * 10,
+            [1, True, [("event-2", 2.0)]],
+            [[]],
+            [1, True, [("event-2", 2.0)]],
+        ])
+        event_store._redis_client = MagicMock()
+        event_store._redis_client.pipeline.return_value = pipeline
+        query = ("sim-1", [EventType.DOCUMENT_GENERATED], None, None, None)
+
+        await event_store._build_event_query(*query, limit=1)
+        await event_store.store_events(make_events(1))
+        assert await event_store._build_event_query(*query, limit=1) == [("event-2", 2.0)]
+        assert pipeline.zinterstore.call_count == 2
+
+        # An empty read from a reused key rebuilds it in case it expired server-side
+        assert await event_store._build_event_query(*query, limit=1) == [("event-2", 2.0)]
+        assert pipeline.zinterstore.call_count == 3
@@ -0,0 +1,210 @@
+"""Unit tests for concurrent analysis, deadlines and report caching in SimulationAnalyzer."""
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from simulation.application.analysis.simulation_analyzer import SimulationAnalyzer
+from simulation.domain.analysis.analysis_result import AnalysisResult, AnalysisType
+
+
+DOCUMENTS = [
+    {"id": "doc1", "title": "API Guide", "type": "api", "content": "API documentation content",
+     "dateCreated": "2024-01-02T10:00:00"},
+    {"id": "doc2", "title": "User Guide", "type": "guide", "content": "User guide content",
+     "dateCreated": "2024-01-20T10:00:00"}
+]
+
+TIMELINE = {
+    "phases": [
+        {"id": "phase1", "name": "Planning", "start_date": "2024-01-01T00:00:00", "end_date": "2024-01-15T00:00:00"},
+        {"id": "phase2", "name": "Development", "start_date": "2024-01-15T00:00:00", "end_date": "2024-02-15T00:00:00"}
+    ]
+}
+
+
+class FakeEcosystem:
+    """Mock transport for summarizer-hub, analysis-service and doc-store with per-path delays."""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.requests = []
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.requests.append(path)
+        delay = self.delays.get(path, 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if path == "/api/v1/recommendations":
+            return httpx.Response(200, json={"success": True, "recommendations": [{"type": "quality"}]})
+        if path == "/api/v1/analyze/generate-report":
+            body = json.loads(request.content)
+            return httpx.Response(200, json={"success": True, "report": {
+                "report_id": f"analysis_{body['simulation_id']}", "summary": {"total_analyses": 2}
+            }})
+        return httpx.Response(201, json={"success": True})
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+
+
+def make_result(simulation_id: str, analysis_type: AnalysisType) -> AnalysisResult:
+    return AnalysisResult(simulation_id=simulation_id, analysis_type=analysis_type)
+
+
+class TestComprehensiveAnalysisFanOut:
+    """Test concurrent execution of independent analyses."""
+
+    @pytest.mark.asyncio
+    async def test_analyses_run_concurrently_in_order(self):
+        analyzer = SimulationAnalyzer(http_client=FakeEcosystem().client())
+
+        def slow(analysis_type):
+            async def run(simulation_id, _data):
+                await asyncio.sleep(0.2)
+                return make_result(simulation_id, analysis_type)
+            return run
+
+        analyzer.analyze_documents = slow(AnalysisType.DOCUMENT_ANALYSIS)
+        analyzer.analyze_timeline = slow(AnalysisType.TIMELINE_ANALYSIS)
+        analyzer.analyze_team_dynamics = slow(AnalysisType.TEAM_DYNAMICS)
+        analyzer.assess_risks = slow(AnalysisType.RISK_ASSESSMENT)
+        analyzer.analyze_cost_benefit = slow(AnalysisType.COST_BENEFIT_ANALYSIS)
+
+        start = time.perf_counter()
+        results = await analyzer.perform_comprehensive_analysis("sim_1", {
+            "documents": [], "timeline": [], "team_members": [], "budget": 1000
+        })
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.6
+        assert [r.analysis_type for r in results] == [
+            AnalysisType.DOCUMENT_ANALYSIS, AnalysisType.TIMELINE_ANALYSIS, AnalysisType.TEAM_DYNAMICS,
+            AnalysisType.RISK_ASSESSMENT, AnalysisType.COST_BENEFIT_ANALYSIS
+        ]
+
+    @pytest.mark.asyncio
+    async def test_timed_out_and_failed_analyses_yield_partial_results(self):
+        analyzer = SimulationAnalyzer(http_client=FakeEcosystem().client(), analysis_timeout_seconds=0.1)
+
+        async def hang(simulation_id, _data):
+            await asyncio.Event().wait()
+
+        async def fail(simulation_id, _data):
+            raise RuntimeError("boom")
+
+        analyzer.analyze_timeline = hang
+        analyzer.analyze_team_dynamics = fail
+
+        results = await analyzer.perform_comprehensive_analysis("sim_1", {
+            "timeline": [], "team_members": []
+        })
+
+        assert [r.analysis_type for r in results] == [
+            AnalysisType.TIMELINE_ANALYSIS, AnalysisType.TEAM_DYNAMICS, AnalysisType.RISK_ASSESSMENT
+        ]
+        assert results[0].metrics["timed_out"] is True
+        assert "timed out" in results[0].findings[0]
+        assert results[1].metrics["error"] == "boom"
+        assert results[2].metrics.get("timed_out") is None
+
+
+class TestComprehensiveSummaryReport:
+    """Test concurrent dependency calls, deadlines and report caching."""
+
+    @pytest.mark.asyncio
+    async def test_dependencies_are_called_concurrently_over_shared_client(self):
+        ecosystem = FakeEcosystem(delays={
+            "/api/v1/recommendations": 0.3,
+            "/api/v1/analyze/generate-report": 0.3
+        })
+        analyzer = SimulationAnalyzer(http_client=ecosystem.client())
+
+        start = time.perf_counter()
+        result = await analyzer.generate_comprehensive_summary_report("sim_1", DOCUMENTS, TIMELINE)
+        elapsed = time.perf_counter() - start
+
+        assert result["report_generated"] is True
+        assert elapsed < 0.55
+        assert "/api/v1/recommendations" in ecosystem.requests
+        assert "/api/v1/analyze/generate-report" in ecosystem.requests
+
+    @pytest.mark.asyncio
+    async def test_slow_dependency_is_dropped_after_deadline(self):
+        ecosystem = FakeEcosystem(delays={"/api/v1/recommendations": 5.0})
+        analyzer = SimulationAnalyzer(http_client=ecosystem.client(), call_timeout_seconds=0.1)
+
+        start = time.perf_counter()
+        result = await analyzer.generate_comprehensive_summary_report("sim_1", DOCUMENTS)
+
+        assert time.perf_counter() - start < 1.0
+        assert result["report_generated"] is True
+
+    @pytest.mark.asyncio
+    async def test_report_is_cached_per_document_set(self):
+        ecosystem = FakeEcosystem()
+        analyzer = SimulationAnalyzer(http_client=ecosystem.client())
+
+        first = await analyzer.generate_comprehensive_summary_report("sim_1", DOCUMENTS, TIMELINE)
+        calls = len(ecosystem.requests)
+
+        # Same documents in a different order hit the cache
+        again = await analyzer.generate_comprehensive_summary_report("sim_1", list(reversed(DOCUMENTS)), TIMELINE)
+        assert again["cached"] is True
+        assert again["comprehensive_report_id"] == first["comprehensive_report_id"]
+        assert len(ecosystem.requests) == calls
+
+        # Changed content recomputes
+        edited = [dict(DOCUMENTS[0], content="Rewritten"), DOCUMENTS[1]]
+        recomputed = await analyzer.generate_comprehensive_summary_report("sim_1", edited, TIMELINE)
+        assert "cached" not in recomputed
+        assert len(ecosystem.requests) > calls
+
+        analyzer.invalidate_report_cache("sim_1")
+        assert "cached" not in await analyzer.generate_comprehensive_summary_report("sim_1", DOCUMENTS, TIMELINE)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_generation(self):
+        ecosystem = FakeEcosystem(delays={"/api/v1/recommendations": 0.1})
+        analyzer = SimulationAnalyzer(http_client=ecosystem.client())
+
+        results = await asyncio.gather(*(
+            analyzer.generate_comprehensive_summary_report("sim_1", DOCUMENTS) for _ in range(5)
+        ))
+
+        assert all(r["report_generated"] for r in results)
+        assert ecosystem.requests.count("/api/v1/recommendations") == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_request_does_not_abort_shared_generation(self):
+        ecosystem = FakeEcosystem(delays={"/api/v1/recommendations": 0.1})
+        analyzer = SimulationAnalyzer(http_client=ecosystem.client())
+        leader = asyncio.create_task(analyzer.generate_comprehensive_summary_report("sim_1", DOCUMENTS))
+        await asyncio.sleep(0.02)
+        waiters = asyncio.gather(*(
+            analyzer.generate_comprehensive_summary_report("sim_1", DOCUMENTS) for _ in range(3)
+        ))
+        await asyncio.sleep(0.02)
+
+        leader.cancel()
+        results = await waiters
+
+        assert leader.cancelled()
+        assert all(r["report_generated"] for r in results)
+        # The first request's generation finished for the requests still waiting
+        assert ecosystem.requests.count("/api/v1/recommendations") == 1
+
+    @pytest.mark.asyncio
+    async def test_close_only_closes_owned_client(self):
+        client = FakeEcosystem().client()
+        await SimulationAnalyzer(http_client=client).close()
+        assert not client.is_closed
+
+        analyzer = SimulationAnalyzer()
+        await analyzer.close()
+        assert analyzer.http_client.is_closed
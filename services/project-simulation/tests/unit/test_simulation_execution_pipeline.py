@@ -0,0 +1,185 @@
+"""Unit tests for the simulation execution engine phase pipeline."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from simulation.infrastructure.execution.simulation_execution_engine import SimulationExecutionEngine
+from simulation.domain.value_objects import DocumentType
+
+
+def make_engine(doc_store=None, **kwargs):
+    ecosystem_clients = Mock()
+    ecosystem_clients.get_client.return_value = doc_store
+    return SimulationExecutionEngine(
+        content_pipeline=Mock(),
+        ecosystem_clients=ecosystem_clients,
+        workflow_orchestrator=Mock(),
+        logger=Mock(),
+        monitoring_service=Mock(),
+        **kwargs
+    )
+
+
+def make_simulation(simulation_id="sim_1"):
+    simulation = Mock()
+    simulation.id = SimpleNamespace(value=simulation_id)
+    simulation.project_id = "proj_1"
+    return simulation
+
+
+class SlowDocStore:
+    """Doc store stand-in that tracks how many stores are in flight."""
+
+    def __init__(self, latency=0.01):
+        self.latency = latency
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.stored = []
+
+    async def store_document(self, title, content, metadata):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.latency)
+        self.in_flight -= 1
+        self.stored.append(title)
+        return f"id-{title}"
+
+
+class TestPhaseDocumentStorage:
+    """Test cases for concurrent document persistence."""
+
+    @pytest.mark.asyncio
+    async def test_stores_documents_with_bounded_concurrency(self):
+        doc_store = SlowDocStore()
+        engine = make_engine(doc_store, document_store_concurrency=4)
+        engine._publish_progress_event = AsyncMock()
+        simulation = make_simulation()
+        documents = [{"title": f"doc{i}", "content": "text", "type": "jira_ticket" if i % 2 else "confluence"}
+                     for i in range(12)]
+
+        document_types = await engine._store_phase_documents(simulation, documents)
+
+        assert len(doc_store.stored) == 12
+        assert doc_store.max_in_flight == 4
+        assert simulation.record_document_generation.call_count == 12
+        assert document_types[0] == DocumentType.CONFLUENCE_PAGE
+        assert document_types[1] == DocumentType.JIRA_TICKET
+
+    @pytest.mark.asyncio
+    async def test_events_are_stored_in_one_batch(self):
+        engine = make_engine()
+        simulation = make_simulation()
+        simulation.status = SimpleNamespace(value="running")
+        simulation.get_progress_percentage.return_value = 50.0
+        event_store = Mock()
+        event_store.store_events = AsyncMock(return_value=3)
+        notify = AsyncMock()
+
+        with patch("simulation.infrastructure.persistence.redis_event_store.get_event_store", return_value=event_store), \
+                patch("simulation.presentation.websockets.simulation_websocket.notify_simulation_event_dict", notify), \
+                patch("simulation.infrastructure.ui.terminal_progress_visualizer.update_simulation_ui") as update_ui:
+            await engine._publish_simulation_events(simulation, [
+                ("document_generated", {"document_title": f"doc{i}", "phase": "planning"}) for i in range(3)
+            ])
+
+        event_store.store_events.assert_awaited_once()
+        assert len(event_store.store_events.await_args.args[0]) == 3
+        assert notify.await_count == 3
+        update_ui.assert_called_once()
+
+
+class TestProgressCoalescing:
+    """Test cases for rate-limited progress events."""
+
+    @pytest.mark.asyncio
+    async def test_progress_is_coalesced_with_trailing_publish(self):
+        engine = make_engine(progress_interval_seconds=0.05)
+        engine._send_progress_event = AsyncMock()
+        simulation = make_simulation()
+
+        for _ in range(20):
+            await engine._publish_progress_event(simulation)
+        assert engine._send_progress_event.await_count == 1
+
+        await asyncio.sleep(0.1)
+        assert engine._send_progress_event.await_count == 2
+
+        engine._stop_progress_tracking("sim_1")
+        assert not engine._pending_progress
+
+    @pytest.mark.asyncio
+    async def test_forced_publish_replaces_pending_trailing_publish(self):
+        engine = make_engine(progress_interval_seconds=0.05)
+        engine._send_progress_event = AsyncMock()
+        simulation = make_simulation()
+
+        await engine._publish_progress_event(simulation)
+        await engine._publish_progress_event(simulation)
+        await engine._publish_progress_event(simulation, force=True)
+        await asyncio.sleep(0.1)
+
+        assert engine._send_progress_event.await_count == 2
+
+
+class TestPhaseOverlap:
+    """Test cases for overlapping generation with persistence."""
+
+    @pytest.mark.asyncio
+    async def test_next_phase_generates_while_current_phase_is_processed(self):
+        engine = make_engine(progress_interval_seconds=0)
+        engine._send_progress_event = AsyncMock()
+        engine._load_project = AsyncMock(return_value=Mock())
+        engine._load_timeline = AsyncMock(return_value=SimpleNamespace(phases=["p1", "p2", "p3"]))
+        engine._load_team = AsyncMock(return_value=Mock())
+        log = []
+
+        async def generate(simulation, phase, project, team):
+            log.append(("generate_start", phase))
+            await asyncio.sleep(0.01)
+            return [{"title": phase}]
+
+        async def process(simulation, phase, project, team, documents):
+            log.append(("process_start", phase))
+            await asyncio.sleep(0.02)
+            log.append(("process_end", phase))
+
+        engine._generate_phase_documents = generate
+        engine._process_phase = process
+
+        await engine._execute_simulation_phases(make_simulation())
+
+        assert log.index(("generate_start", "p2")) < log.index(("process_end", "p1"))
+        assert [entry[1] for entry in log if entry[0] == "process_start"] == ["p1", "p2", "p3"]
+
+    @pytest.mark.asyncio
+    async def test_pending_generation_is_cancelled_on_failure(self):
+        engine = make_engine()
+        engine._load_project = AsyncMock(return_value=Mock())
+        engine._load_timeline = AsyncMock(return_value=SimpleNamespace(phases=["p1", "p2"]))
+        engine._load_team = AsyncMock(return_value=Mock())
+        cancelled = asyncio.Event()
+
+        async def generate(simulation, phase, project, team):
+            if phase == "p2":
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+            return []
+
+        async def process(simulation, phase, project, team, documents):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        engine._generate_phase_documents = generate
+        engine._process_phase = process
+
+        with pytest.raises(RuntimeError):
+            await engine._execute_simulation_phases(make_simulation())
+        await asyncio.sleep(0)
+
+        assert cancelled.is_set()
@@ -0,0 +1,147 @@
+"""Unit tests for the interval-indexed timeline placement."""
+
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from simulation.application.analysis.simulation_analyzer import SimulationAnalyzer
+from simulation.application.analysis.timeline_index import TimelineIndex, TimestampParser
+
+
+BASE = datetime(2024, 1, 1)
+
+
+def make_phases(count: int = 12, in_progress: int = 3):
+    return [
+        {
+            "id": f"phase{i}",
+            "name": f"Phase {i}",
+            "start_date": (BASE + timedelta(days=14 * i)).isoformat(),
+            "end_date": (BASE + timedelta(days=14 * i + 14)).isoformat(),
+            "status": "in_progress" if i == in_progress else "pending"
+        }
+        for i in range(count)
+    ]
+
+
+def linear_find(doc_date, phases, parser):
+    """Reference: the per-phase scan the index replaces."""
+    covering = []
+    for phase in phases:
+        start = parser.parse(phase.get("start_date"))
+        end = parser.parse(phase.get("end_date")) or parser.parse(phase.get("planned_end_date"))
+        if start and end and start <= doc_date <= end:
+            covering.append(phase)
+    if not covering:
+        closest, min_distance = None, float("inf")
+        for phase in phases:
+            start = parser.parse(phase.get("start_date"))
+            if start and abs((doc_date - start).days) < min_distance:
+                min_distance = abs((doc_date - start).days)
+                closest = phase
+        if closest and min_distance <= 30:
+            covering.append(closest)
+    for phase in covering:
+        if phase.get("status") == "in_progress":
+            return phase
+    return covering[0] if covering else None
+
+
+class TestTimestampParser:
+    """Test cases for the format-caching timestamp parser."""
+
+    def test_parses_supported_formats_to_naive_utc(self):
+        parser = TimestampParser()
+
+        assert parser.parse("2024-01-15T10:00:00Z") == datetime(2024, 1, 15, 10)
+        assert parser.parse("2024-01-15T12:00:00+02:00") == datetime(2024, 1, 15, 10)
+        assert parser.parse("01/15/2024") == datetime(2024, 1, 15)
+        assert parser.parse("2024/01/15") == datetime(2024, 1, 15)
+        assert parser.parse("not a date") is None
+        assert parser.parse(None) is None
+
+    def test_detected_format_is_tried_first(self):
+        parser = TimestampParser()
+        parser.parse("01/15/2024")
+
+        assert parser._detected_format == "%m/%d/%Y"
+        assert parser.parse_many(["02/01/2024", "2024-02-01"]) == [datetime(2024, 2, 1), datetime(2024, 2, 1)]
+
+
+class TestTimelineIndex:
+    """Test cases for bisect-based phase lookup."""
+
+    def test_matches_linear_scan(self):
+        phases = make_phases()
+        # Overlapping phase and one without an end date
+        phases.append({"id": "overlap", "name": "Overlap", "start_date": "2024-02-01T00:00:00",
+                       "end_date": "2024-03-01T00:00:00"})
+        phases.append({"id": "open", "name": "Open", "start_date": "2024-09-01T00:00:00"})
+        parser = TimestampParser()
+        index = TimelineIndex(phases, parser)
+
+        random.seed(7)
+        dates = [BASE + timedelta(minutes=random.randint(-60 * 24 * 60, 60 * 24 * 260)) for _ in range(3000)]
+        dates += [parser.parse(phase["start_date"]) for phase in phases]
+
+        placed = index.place_many(dates)
+        for doc_date, phase in zip(dates, placed):
+            assert phase is linear_find(doc_date, phases, parser)
+
+    def test_in_progress_phase_wins_on_boundaries(self):
+        phases = make_phases(in_progress=1)
+        index = TimelineIndex(phases)
+
+        # Boundary shared by phase0 and the in-progress phase1
+        assert index.find(BASE + timedelta(days=14))["id"] == "phase1"
+        assert index.find(BASE + timedelta(days=1))["id"] == "phase0"
+
+    def test_week_based_phases_use_anchor(self):
+        phases = [
+            {"name": "Planning", "start_week": 0, "duration_weeks": 2},
+            {"name": "Development", "start_week": 2, "duration_weeks": 4}
+        ]
+        index = TimelineIndex(phases, anchor=BASE, max_distance_days=None)
+
+        assert index.find(BASE + timedelta(days=3))["name"] == "Planning"
+        assert index.find(BASE + timedelta(days=30))["name"] == "Development"
+        assert index.find(BASE + timedelta(days=400))["name"] == "Development"
+        assert index.find(None) is None
+
+
+class TestAnalyzerTimelinePlacement:
+    """Test SimulationAnalyzer placement through the index."""
+
+    @pytest.mark.asyncio
+    async def test_aware_timestamps_are_placed(self):
+        analyzer = SimulationAnalyzer()
+        documents = [
+            {"id": "doc1", "dateCreated": "2024-01-03T10:00:00Z"},
+            {"id": "doc2", "dateUpdated": "2024-01-20T10:00:00+00:00"},
+            {"id": "doc3"}
+        ]
+
+        placements = await analyzer._analyze_document_timestamps(documents, make_phases())
+
+        assert [p["document_id"] for p in placements] == ["doc1", "doc2"]
+        assert [p["timeline_phase"] for p in placements] == ["phase0", "phase1"]
+        assert placements[0]["placement_reason"] == "within_phase_dates"
+
+    @pytest.mark.asyncio
+    async def test_places_100k_documents_quickly(self):
+        analyzer = SimulationAnalyzer()
+        random.seed(3)
+        documents = [
+            {"id": f"doc{i}", "dateCreated": (BASE + timedelta(minutes=random.randint(0, 60 * 24 * 160))).isoformat()}
+            for i in range(100_000)
+        ]
+
+        start = time.perf_counter()
+        placements = await analyzer._analyze_document_timestamps(documents, make_phases())
+        elapsed = time.perf_counter() - start
+
+        assert len(placements) == 100_000
+        assert elapsed < 3.0
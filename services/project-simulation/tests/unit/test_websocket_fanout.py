@@ -0,0 +1,128 @@
+"""Unit tests for WebSocket fan-out with per-connection queues."""
+
+import asyncio
+import json
+
+import pytest
+
+from simulation.presentation.websockets.simulation_websocket import (
+    SimulationEventNotification, SimulationProgressUpdate, WebSocketConnectionManager
+)
+
+
+class FakeWebSocket:
+    """WebSocket stand-in recording frames; ``blocked`` clients never finish a send."""
+
+    def __init__(self, delay: float = 0.0, blocked: bool = False):
+        self.delay = delay
+        self.blocked = blocked
+        self.frames = []
+        self.closed_with = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        if self.blocked:
+            await asyncio.Event().wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.frames.append(json.loads(text))
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+def progress(simulation_id: str, percentage: float) -> SimulationProgressUpdate:
+    return SimulationProgressUpdate(simulation_id=simulation_id, progress_percentage=percentage, status="running")
+
+
+def event(simulation_id: str, index: int) -> SimulationEventNotification:
+    return SimulationEventNotification(
+        simulation_id=simulation_id, event_type="document_generated",
+        event_description="Document generated", data={"index": index}
+    )
+
+
+async def drain():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestFanOut:
+    """Test cases for non-blocking broadcasts."""
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_delay_broadcast_or_fast_clients(self):
+        manager = WebSocketConnectionManager()
+        fast, blocked = FakeWebSocket(), FakeWebSocket(blocked=True)
+        await manager.connect(fast, "sim-1")
+        await manager.connect(blocked, "sim-1")
+
+        await asyncio.wait_for(manager.broadcast_to_simulation("sim-1", event("sim-1", 1)), timeout=0.1)
+        await drain()
+
+        assert [f["type"] for f in fast.frames] == ["connection_established", "simulation_event"]
+
+    @pytest.mark.asyncio
+    async def test_progress_updates_coalesce_to_latest_value(self):
+        manager = WebSocketConnectionManager()
+        client = FakeWebSocket(delay=0.01)
+        await manager.connect(client, "sim-1")
+
+        for percentage in range(1, 21):
+            await manager.broadcast_to_simulation("sim-1", progress("sim-1", float(percentage)))
+        await asyncio.sleep(0.1)
+
+        updates = [f for f in client.frames if f["type"] == "simulation_progress"]
+        assert len(updates) < 20
+        assert updates[-1]["progress_percentage"] == 20.0
+        assert manager.get_stats()["coalesced"] > 0
+
+    @pytest.mark.asyncio
+    async def test_slow_consumer_is_disconnected_when_queue_overflows(self):
+        manager = WebSocketConnectionManager(max_queue_size=5)
+        fast, blocked = FakeWebSocket(), FakeWebSocket(blocked=True)
+        await manager.connect(fast, "sim-1")
+        await manager.connect(blocked, "sim-1")
+
+        for index in range(10):
+            await manager.broadcast_to_simulation("sim-1", event("sim-1", index))
+            await drain()
+
+        assert blocked.closed_with == 1013
+        assert manager.active_connections["sim-1"] == {fast}
+        assert manager.stats["slow_consumer_disconnects"] == 1
+        assert len([f for f in fast.frames if f["type"] == "simulation_event"]) == 10
+
+    @pytest.mark.asyncio
+    async def test_failed_send_removes_connection(self):
+        manager = WebSocketConnectionManager()
+        client = FakeWebSocket()
+        await manager.connect(client, "sim-1")
+        await drain()
+
+        async def broken_send(text):
+            raise RuntimeError("connection reset")
+
+        client.send_text = broken_send
+        await manager.broadcast_to_simulation("sim-1", event("sim-1", 1))
+        await drain()
+
+        assert "sim-1" not in manager.active_connections
+        assert manager.get_stats()["connections"] == 0
+
+    @pytest.mark.asyncio
+    async def test_queued_messages_can_be_batched_into_one_frame(self):
+        manager = WebSocketConnectionManager(batch_max_messages=10, batch_window_seconds=0.01)
+        client = FakeWebSocket()
+        await manager.connect(client, "sim-1")
+
+        for index in range(5):
+            await manager.broadcast_to_simulation("sim-1", event("sim-1", index))
+        await asyncio.sleep(0.05)
+
+        assert len(client.frames) == 1
+        batch = client.frames[0]
+        assert batch["type"] == "batch"
+        assert [m["type"] for m in batch["messages"]] == ["connection_established"] + ["simulation_event"] * 5
@@ -176,6 +176,7 @@ class ABTest(BaseEntity):
     winner: Optional[str] = None  # "A", "B", or None
     status: str = "active"  # active, completed, paused
     traffic_percentage: float = 50.0
+    allocation: str = "fixed"  # fixed or thompson
 
     def __post_init__(self):
         """Initialize BaseEntity fields."""
@@ -194,6 +195,7 @@ class ABTest(BaseEntity):
             "traffic_split": self.traffic_split,
             "traffic_percentage": self.traffic_percentage,
             "status": self.status,
+            "allocation": self.allocation,
             "start_date": self.start_date.isoformat(),
             "end_date": self.end_date.isoformat() if self.end_date else None,
             "target_audience": self.target_audience,
@@ -216,7 +218,8 @@ class ABTest(BaseEntity):
             traffic_split=data.get("traffic_split", 0.5),
             target_audience=data.get("target_audience", {}),
             created_by=data.get("created_by", ""),
-            winner=data.get("winner")
+            winner=data.get("winner"),
+            allocation=data.get("allocation") or "fixed"
         )
         test.id = data.get("id")
         if "start_date" in data:
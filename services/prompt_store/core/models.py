@@ -44,6 +44,8 @@ class ABTestCreate(BaseModel):
     test_metric: Optional[str] = "response_quality"
     traffic_split: Optional[float] = Field(0.5, ge=0.0, le=1.0)
     target_audience: Optional[Dict[str, Any]] = None
+    allocation: Optional[str] = "fixed"
+    additional_prompt_ids: Optional[List[str]] = None
 
 
 class PromptSearchFilters(BaseModel):
@@ -150,40 +150,76 @@ def execute_paged_query(table: str, filters: Optional[Dict[str, Any]] = None,
     }
 
 
+def build_tag_filter(any_tags: Optional[List[str]] = None, all_tags: Optional[List[str]] = None,
+                     none_tags: Optional[List[str]] = None, id_column: str = 'id') -> Tuple[str, Tuple]:
+    """Build tag conditions against the prompt_tags index.
+
+    ``any_tags`` keeps rows with at least one tag, ``all_tags`` rows with
+    every tag and ``none_tags`` drops rows with any of them.
+    """
+    conditions = []
+    params: List[Any] = []
+
+    any_tags = list(dict.fromkeys(any_tags or []))
+    all_tags = list(dict.fromkeys(all_tags or []))
+    none_tags = list(dict.fromkeys(none_tags or []))
+
+    if any_tags:
+        placeholders = ','.join('?' * len(any_tags))
+        conditions.append(f"{id_column} IN (SELECT prompt_id FROM prompt_tags WHERE tag IN ({placeholders}))")
+        params.extend(any_tags)
+    if all_tags:
+        placeholders = ','.join('?' * len(all_tags))
+        conditions.append(
+            f"{id_column} IN (SELECT prompt_id FROM prompt_tags WHERE tag IN ({placeholders}) "
+            f"GROUP BY prompt_id HAVING COUNT(*) = ?)"
+        )
+        params.extend(all_tags)
+        params.append(len(all_tags))
+    if none_tags:
+        placeholders = ','.join('?' * len(none_tags))
+        conditions.append(f"{id_column} NOT IN (SELECT prompt_id FROM prompt_tags WHERE tag IN ({placeholders}))")
+        params.extend(none_tags)
+
+    return " AND ".join(conditions), tuple(params)
+
+
+def build_fts_match(search_term: str, search_fields: Optional[List[str]] = None) -> str:
+    """FTS5 MATCH expression for ``search_term`` as a phrase, optionally limited to columns."""
+    phrase = '"' + search_term.replace('"', '""') + '"'
+    if search_fields:
+        return "{" + " ".join(search_fields) + "}: " + phrase
+    return phrase
+
+
 def execute_search_query(search_term: str, table: str = 'prompts',
                         search_fields: Optional[List[str]] = None,
                         filters: Optional[Dict[str, Any]] = None,
-                        limit: int = 50) -> List[Dict[str, Any]]:
-    """Execute a full-text search query."""
+                        limit: int = 50,
+                        conditions: Optional[Tuple[str, Tuple]] = None) -> List[Dict[str, Any]]:
+    """Execute a full-text search query.
+
+    ``filters`` and ``conditions`` (a clause and its parameters, e.g. from
+    ``build_tag_filter``) are applied in the same query, before the limit.
+    """
     if not search_term:
         return []
 
-    # Use FTS table for content search
     fts_table = f"{table}_fts"
-    search_fields = search_fields or ['name', 'category', 'description', 'content', 'tags']
-
-    # Build FTS query
-    fts_query = f"SELECT rowid FROM {fts_table} WHERE {' OR '.join([f'{field} MATCH ?' for field in search_fields])}"
-    search_params = [f'"{search_term}"'] * len(search_fields)
+    query = f"SELECT * FROM {table} WHERE rowid IN (SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH ?)"
+    params: List[Any] = [build_fts_match(search_term, search_fields)]
 
-    # Execute FTS query to get rowids
-    fts_results = execute_query(fts_query, tuple(search_params), fetch_all=True)
-    if not fts_results:
-        return []
-
-    rowids = [str(row['rowid']) for row in fts_results]
-
-    # Get actual records
-    placeholders = ','.join('?' * len(rowids))
-    data_query = f"SELECT * FROM {table} WHERE rowid IN ({placeholders})"
-
-    # Apply additional filters
     if filters:
         where_clause, filter_params = build_where_clause(filters)
         if where_clause:
-            data_query += f" AND {where_clause}"
-            search_params.extend(filter_params)
+            query += f" AND {where_clause}"
+            params.extend(filter_params)
+
+    if conditions and conditions[0]:
+        query += f" AND {conditions[0]}"
+        params.extend(conditions[1])
 
-    data_query += f" LIMIT {limit}"
+    query += " LIMIT ?"
+    params.append(limit)
 
-    return execute_query(data_query, tuple(rowids), fetch_all=True) or []
+    return execute_query(query, tuple(params), fetch_all=True) or []
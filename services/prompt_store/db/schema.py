@@ -7,6 +7,7 @@ import json
 from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
 from ..db.connection import get_prompt_store_connection, return_prompt_store_connection
+from ..db.queries import deserialize_json
 
 
 def create_prompts_table() -> str:
@@ -29,7 +30,8 @@ def create_prompts_table() -> str:
             version INTEGER DEFAULT 1,
             parent_id TEXT,
             performance_score REAL DEFAULT 0.0,
-            usage_count INTEGER DEFAULT 0
+            usage_count INTEGER DEFAULT 0,
+            content_hash TEXT  -- normalized content + variables, for duplicate detection
         )
     """
 
@@ -47,11 +49,32 @@ def create_prompt_versions_table() -> str:
             change_type TEXT DEFAULT 'update',
             created_by TEXT NOT NULL,
             created_at TEXT NOT NULL,
+            token_fingerprint BLOB,  -- MinHash of the content's word set
             FOREIGN KEY(prompt_id) REFERENCES prompts(id) ON DELETE CASCADE
         )
     """
 
 
+def migrate_prompts_tables(conn) -> None:
+    """Add and backfill the columns introduced after prompts and prompt_versions were first created."""
+    from ..infrastructure.utils import generate_prompt_hash
+
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(prompts)").fetchall()}
+    if "content_hash" not in columns:
+        conn.execute("ALTER TABLE prompts ADD COLUMN content_hash TEXT")
+    rows = conn.execute("SELECT id, content, variables FROM prompts WHERE content_hash IS NULL").fetchall()
+    if rows:
+        conn.executemany(
+            "UPDATE prompts SET content_hash = ? WHERE id = ?",
+            [(generate_prompt_hash(row[1], deserialize_json(row[2])), row[0]) for row in rows]
+        )
+
+    # Fingerprints of older versions are filled in when drift is first checked
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(prompt_versions)").fetchall()}
+    if "token_fingerprint" not in columns:
+        conn.execute("ALTER TABLE prompt_versions ADD COLUMN token_fingerprint BLOB")
+
+
 def create_ab_tests_table() -> str:
     """Create A/B tests table schema."""
     return """
@@ -69,6 +92,7 @@ def create_ab_tests_table() -> str:
             target_audience TEXT,  -- JSON object
             created_by TEXT NOT NULL,
             winner TEXT,
+            allocation TEXT DEFAULT 'fixed',
             created_at TEXT NOT NULL,
             updated_at TEXT NOT NULL,
             FOREIGN KEY(prompt_a_id) REFERENCES prompts(id) ON DELETE CASCADE,
@@ -95,6 +119,31 @@ def create_ab_test_results_table() -> str:
     """
 
 
+def create_ab_test_variants_table() -> str:
+    """Create A/B test variants table with per-variant running sums."""
+    return """
+        CREATE TABLE IF NOT EXISTS ab_test_variants (
+            test_id TEXT NOT NULL,
+            prompt_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            weight REAL NOT NULL DEFAULT 1.0,
+            sample_count INTEGER NOT NULL DEFAULT 0,
+            metric_sum REAL NOT NULL DEFAULT 0.0,
+            metric_sum_squares REAL NOT NULL DEFAULT 0.0,
+            result_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY(test_id, prompt_id),
+            FOREIGN KEY(test_id) REFERENCES ab_tests(id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+    """
+
+
+def migrate_ab_tests_table(conn) -> None:
+    """Add columns introduced after ab_tests was first created."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(ab_tests)").fetchall()}
+    if "allocation" not in columns:
+        conn.execute("ALTER TABLE ab_tests ADD COLUMN allocation TEXT DEFAULT 'fixed'")
+
+
 def create_prompt_usage_table() -> str:
     """Create prompt usage table schema."""
     return """
@@ -117,6 +166,75 @@ def create_prompt_usage_table() -> str:
     """
 
 
+def create_prompt_usage_hourly_table() -> str:
+    """Create per-prompt per-hour usage roll-up table schema."""
+    return """
+        CREATE TABLE IF NOT EXISTS prompt_usage_hourly (
+            prompt_id TEXT NOT NULL,
+            hour_start TEXT NOT NULL,
+            render_count INTEGER DEFAULT 0,
+            event_count INTEGER DEFAULT 0,
+            success_count INTEGER DEFAULT 0,
+            failure_count INTEGER DEFAULT 0,
+            input_tokens INTEGER DEFAULT 0,
+            output_tokens INTEGER DEFAULT 0,
+            total_response_time_ms REAL DEFAULT 0.0,
+            PRIMARY KEY(prompt_id, hour_start)
+        )
+    """
+
+
+def create_prompt_tags_table() -> str:
+    """Create normalized prompt tags table schema (maintained by triggers)."""
+    return """
+        CREATE TABLE IF NOT EXISTS prompt_tags (
+            prompt_id TEXT NOT NULL,
+            tag TEXT NOT NULL,
+            PRIMARY KEY(prompt_id, tag),
+            FOREIGN KEY(prompt_id) REFERENCES prompts(id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+    """
+
+
+def create_prompt_tags_triggers() -> List[str]:
+    """Keep prompt_tags in sync with the prompts.tags JSON array."""
+    insert_tags = """
+                INSERT OR IGNORE INTO prompt_tags (prompt_id, tag)
+                SELECT new.id, value FROM json_each(
+                    CASE WHEN json_valid(new.tags) THEN new.tags ELSE '[]' END
+                ) WHERE type = 'text' AND new.id IS NOT NULL;"""
+    return [
+        f"""
+            CREATE TRIGGER IF NOT EXISTS prompt_tags_insert AFTER INSERT ON prompts
+            BEGIN
+                DELETE FROM prompt_tags WHERE prompt_id = new.id;{insert_tags}
+            END
+        """,
+        f"""
+            CREATE TRIGGER IF NOT EXISTS prompt_tags_update AFTER UPDATE OF id, tags ON prompts
+            BEGIN
+                DELETE FROM prompt_tags WHERE prompt_id = old.id;{insert_tags}
+            END
+        """,
+        """
+            CREATE TRIGGER IF NOT EXISTS prompt_tags_delete AFTER DELETE ON prompts
+            BEGIN
+                DELETE FROM prompt_tags WHERE prompt_id = old.id;
+            END
+        """,
+    ]
+
+
+def backfill_prompt_tags() -> str:
+    """Populate prompt_tags from prompts.tags for databases created before it."""
+    return """
+        INSERT OR IGNORE INTO prompt_tags (prompt_id, tag)
+        SELECT p.id, j.value
+        FROM prompts p, json_each(CASE WHEN json_valid(p.tags) THEN p.tags ELSE '[]' END) j
+        WHERE j.type = 'text'
+    """
+
+
 def create_prompt_relationships_table() -> str:
     """Create prompt relationships table schema."""
     return """
@@ -159,6 +277,50 @@ def create_bulk_operations_table() -> str:
     """
 
 
+def create_orchestration_executions_table() -> str:
+    """Create chain and pipeline executions table schema."""
+    return """
+        CREATE TABLE IF NOT EXISTS orchestration_executions (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,  -- 'chain' or 'pipeline'
+            definition_id TEXT NOT NULL,
+            definition TEXT NOT NULL,  -- JSON snapshot of the chain or pipeline
+            initial_context TEXT NOT NULL,  -- JSON object
+            status TEXT NOT NULL,
+            error TEXT,
+            started_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            completed_at TEXT
+        )
+    """
+
+
+def create_orchestration_step_checkpoints_table() -> str:
+    """Create per-step execution checkpoints table schema."""
+    return """
+        CREATE TABLE IF NOT EXISTS orchestration_step_checkpoints (
+            execution_id TEXT NOT NULL,
+            step_index INTEGER NOT NULL,
+            status TEXT NOT NULL,  -- 'completed' or 'skipped'
+            result TEXT,  -- JSON object
+            completed_at TEXT NOT NULL,
+            PRIMARY KEY(execution_id, step_index),
+            FOREIGN KEY(execution_id) REFERENCES orchestration_executions(id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+    """
+
+
+def create_orchestration_step_memo_table() -> str:
+    """Create memoized deterministic step results table schema."""
+    return """
+        CREATE TABLE IF NOT EXISTS orchestration_step_memo (
+            input_hash TEXT PRIMARY KEY,
+            result TEXT NOT NULL,  -- JSON object
+            created_at TEXT NOT NULL
+        )
+    """
+
+
 def create_webhooks_table() -> str:
     """Create webhooks table schema."""
     return """
@@ -224,9 +386,15 @@ def get_all_table_schemas() -> List[str]:
         create_prompt_versions_table(),
         create_ab_tests_table(),
         create_ab_test_results_table(),
+        create_ab_test_variants_table(),
         create_prompt_usage_table(),
+        create_prompt_usage_hourly_table(),
+        create_prompt_tags_table(),
         create_prompt_relationships_table(),
         create_bulk_operations_table(),
+        create_orchestration_executions_table(),
+        create_orchestration_step_checkpoints_table(),
+        create_orchestration_step_memo_table(),
         create_webhooks_table(),
         create_webhook_deliveries_table(),
         create_notifications_table(),
@@ -253,6 +421,10 @@ def create_indexes() -> List[str]:
         "CREATE INDEX IF NOT EXISTS idx_prompts_performance ON prompts(performance_score)",
         "CREATE INDEX IF NOT EXISTS idx_prompts_usage ON prompts(usage_count)",
         "CREATE INDEX IF NOT EXISTS idx_prompts_created_by ON prompts(created_by)",
+        "CREATE INDEX IF NOT EXISTS idx_prompts_content_hash ON prompts(content_hash)",
+
+        # Prompt tags indexes (primary key covers prompt_id lookups)
+        "CREATE INDEX IF NOT EXISTS idx_prompt_tags_tag ON prompt_tags(tag, prompt_id)",
 
         # Prompt versions indexes
         "CREATE INDEX IF NOT EXISTS idx_prompt_versions_prompt_id ON prompt_versions(prompt_id)",
@@ -275,6 +447,7 @@ def create_indexes() -> List[str]:
         "CREATE INDEX IF NOT EXISTS idx_prompt_usage_service ON prompt_usage(service_name)",
         "CREATE INDEX IF NOT EXISTS idx_prompt_usage_created ON prompt_usage(created_at)",
         "CREATE INDEX IF NOT EXISTS idx_prompt_usage_success ON prompt_usage(success)",
+        "CREATE INDEX IF NOT EXISTS idx_prompt_usage_hourly_hour ON prompt_usage_hourly(hour_start)",
 
         # Prompt relationships indexes
         "CREATE INDEX IF NOT EXISTS idx_prompt_relationships_source ON prompt_relationships(source_prompt_id)",
@@ -287,6 +460,10 @@ def create_indexes() -> List[str]:
         "CREATE INDEX IF NOT EXISTS idx_bulk_operations_type ON bulk_operations(operation_type)",
         "CREATE INDEX IF NOT EXISTS idx_bulk_operations_created ON bulk_operations(created_at)",
 
+        # Orchestration execution indexes
+        "CREATE INDEX IF NOT EXISTS idx_orchestration_executions_status ON orchestration_executions(status, completed_at)",
+        "CREATE INDEX IF NOT EXISTS idx_orchestration_step_memo_created ON orchestration_step_memo(created_at)",
+
         # Webhooks indexes
         "CREATE INDEX IF NOT EXISTS idx_webhooks_active ON webhooks(is_active)",
         "CREATE INDEX IF NOT EXISTS idx_webhooks_events ON webhooks(events)",
@@ -475,6 +652,8 @@ def init_database() -> None:
         # Create tables
         for schema in get_all_table_schemas():
             conn.execute(schema)
+        migrate_prompts_tables(conn)
+        migrate_ab_tests_table(conn)
 
         # Create indexes
         for index_sql in create_indexes():
@@ -516,6 +695,12 @@ def init_database() -> None:
             END
         """)
 
+        # Keep normalized tags in sync with prompts.tags
+        for trigger_sql in create_prompt_tags_triggers():
+            conn.execute(trigger_sql)
+        if conn.execute("SELECT 1 FROM prompt_tags LIMIT 1").fetchone() is None:
+            conn.execute(backfill_prompt_tags())
+
         conn.commit()
         print("✅ Prompt Store database initialized successfully")
 
@@ -1,10 +1,15 @@
 """A/B testing domain for Prompt Store service."""
 
+from .engine import Experiment, ExperimentRegistry, VariantStats, experiment_registry
 from .repository import ABTestRepository, ABTestResultRepository
 from .service import ABTestService
 from .handlers import ABTestHandlers
 
 __all__ = [
+    'Experiment',
+    'ExperimentRegistry',
+    'VariantStats',
+    'experiment_registry',
     'ABTestRepository',
     'ABTestResultRepository',
     'ABTestService',
@@ -0,0 +1,444 @@
+"""In-memory experimentation engine for prompt A/B tests.
+
+Each running test is held as an ``Experiment``: its variants, allocation
+weights and per-variant running sums (n, sum of x, sum of x squared). With
+those sums the engine can:
+
+- assign users to variants with a keyed BLAKE2 hash of the user id, which is
+  deterministic across processes and needs no database read
+- optionally allocate traffic by Thompson sampling across any number of
+  variants instead of fixed weights
+- update statistics and check for a winner in O(variants) per result using a
+  mixture sequential probability ratio test (mSPRT), whose always-valid
+  p-value may be inspected after every result without inflating error rates
+- report a Welch t-test between the leader and the runner-up
+
+The database keeps the same running sums (``ab_test_variants``) so an
+experiment can be rebuilt after a restart without rescanning results.
+"""
+
+import bisect
+import hashlib
+import math
+import random
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+ALLOCATION_MODES = ("fixed", "thompson")
+
+# Metrics where a smaller value wins
+LOWER_IS_BETTER_METRICS = {"response_time", "latency", "cost", "error_rate"}
+
+# Metrics that are rates or scores in [0, 1]
+RATE_METRICS = {"response_quality", "success_rate", "conversion_rate", "click_through_rate", "accuracy",
+                "error_rate"}
+
+# Variance floor so constant-valued variants still produce finite statistics
+_MIN_VARIANCE = 1e-12
+
+_BUCKET_SCALE = float(1 << 64)
+
+
+def variant_label(position: int) -> str:
+    """Winner label for the variant at ``position`` ("A", "B", ...)."""
+    return chr(ord("A") + position) if position < 26 else f"V{position + 1}"
+
+
+def assignment_bucket(salt: bytes, user_id: str) -> float:
+    """Deterministic position of ``user_id`` in [0, 1) for the experiment keyed by ``salt``."""
+    digest = hashlib.blake2b(user_id.encode("utf-8"), digest_size=8, key=salt).digest()
+    return int.from_bytes(digest, "big") / _BUCKET_SCALE
+
+
+def experiment_salt(test_id: str) -> bytes:
+    """Per-experiment hash key, so one user lands independently in different tests."""
+    return hashlib.blake2b(test_id.encode("utf-8"), digest_size=16).digest()
+
+
+@dataclass
+class VariantStats:
+    """Running sums of one variant's metric."""
+
+    prompt_id: str
+    label: str
+    weight: float = 1.0
+    count: int = 0
+    total: float = 0.0
+    total_squares: float = 0.0
+    results: int = 0
+    # Whether the metric is a rate in [0, 1]; cleared if a value falls outside it
+    bounded: bool = False
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Add one result: the mean ``value`` of ``count`` samples."""
+        self.count += count
+        self.total += value * count
+        self.total_squares += value * value * count
+        self.results += 1
+        if value < 0.0 or value > 1.0:
+            self.bounded = False
+
+    def remove(self, value: float, count: int = 1) -> None:
+        """Undo a previous ``add`` (used when persisting it failed)."""
+        self.count -= count
+        self.total -= value * count
+        self.total_squares -= value * value * count
+        self.results -= 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def variance(self) -> float:
+        """Per-sample variance estimate.
+
+        Rates use the binomial variance p(1 - p) of the pooled mean. Otherwise
+        each result is one observation of a mean over its samples, so the
+        spread between results, weighted by sample size, estimates the
+        per-sample variance; a result covering many samples is not mistaken
+        for many identical observations.
+        """
+        if self.bounded:
+            rate = min(max(self.mean, 0.0), 1.0)
+            return rate * (1.0 - rate)
+        if self.results < 2:
+            return 0.0
+        return max(0.0, (self.total_squares - self.total * self.total / self.count) / (self.results - 1))
+
+    @property
+    def degrees_of_freedom(self) -> int:
+        """Degrees of freedom of ``variance``."""
+        return (self.count if self.bounded else self.results) - 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "prompt_id": self.prompt_id,
+            "variant": self.label,
+            "weight": self.weight,
+            "average_metric": self.mean,
+            "variance": self.variance,
+            "total_samples": self.count,
+            "result_count": self.results,
+        }
+
+
+def _betacf(a: float, b: float, x: float) -> float:
+    """Continued fraction for the regularized incomplete beta function (Lentz)."""
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c, d = 1.0, 1.0 - qab * x / qap
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = 1.0 + aa / c
+        c = c if abs(c) > tiny else tiny
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = 1.0 + aa / c
+        c = c if abs(c) > tiny else tiny
+        delta = d * c
+        h *= delta
+        if abs(delta - 1.0) < 1e-12:
+            break
+    return h
+
+
+def regularized_beta(a: float, b: float, x: float) -> float:
+    """Regularized incomplete beta function I_x(a, b)."""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    log_front = (math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+                 + a * math.log(x) + b * math.log1p(-x))
+    if x < (a + 1.0) / (a + b + 2.0):
+        return math.exp(log_front) * _betacf(a, b, x) / a
+    return 1.0 - math.exp(log_front) * _betacf(b, a, 1.0 - x) / b
+
+
+def welch_t_test(first: VariantStats, second: VariantStats) -> Optional[Dict[str, float]]:
+    """Two-sided Welch t-test on two variants' running sums; None until both have a variance estimate."""
+    if first.degrees_of_freedom < 1 or second.degrees_of_freedom < 1:
+        return None
+
+    error_a = first.variance / first.count
+    error_b = second.variance / second.count
+    standard_error_sq = error_a + error_b
+    difference = first.mean - second.mean
+
+    if standard_error_sq <= _MIN_VARIANCE:
+        p_value = 1.0 if difference == 0 else 0.0
+        return {"t_statistic": math.copysign(math.inf, difference) if difference else 0.0,
+                "degrees_of_freedom": float(first.degrees_of_freedom + second.degrees_of_freedom),
+                "p_value": p_value, "difference": difference}
+
+    t_statistic = difference / math.sqrt(standard_error_sq)
+    dof = standard_error_sq ** 2 / (
+        error_a ** 2 / first.degrees_of_freedom + error_b ** 2 / second.degrees_of_freedom
+    )
+    p_value = regularized_beta(dof / 2.0, 0.5, dof / (dof + t_statistic * t_statistic))
+    return {"t_statistic": t_statistic, "degrees_of_freedom": dof,
+            "p_value": min(1.0, max(0.0, p_value)), "difference": difference}
+
+
+def msprt_p_value(first: VariantStats, second: VariantStats, effect_size: float) -> float:
+    """Normal-mixture SPRT p-value for a difference in means.
+
+    ``effect_size`` is the standardized effect the mixture is tuned to; the
+    mixing variance is ``effect_size**2`` times the pooled variance.
+    """
+    pooled = max((first.variance + second.variance) / 2.0, _MIN_VARIANCE)
+    standard_error_sq = max(first.variance, _MIN_VARIANCE) / first.count + \
+        max(second.variance, _MIN_VARIANCE) / second.count
+    mixing = effect_size * effect_size * pooled
+    difference = first.mean - second.mean
+
+    log_likelihood_ratio = 0.5 * math.log(standard_error_sq / (standard_error_sq + mixing)) + \
+        difference * difference * mixing / (2.0 * standard_error_sq * (standard_error_sq + mixing))
+    if log_likelihood_ratio <= 0.0:
+        return 1.0
+    return math.exp(-log_likelihood_ratio)
+
+
+@dataclass
+class RecordOutcome:
+    """Statistics after recording one result."""
+
+    confidence_level: float
+    statistical_significance: bool
+    winner: Optional[str]
+    p_value: float
+    # State before the result, restored by ``Experiment.discard``
+    previous_winner: Optional[str] = None
+    previous_p_value: float = 1.0
+
+
+class Experiment:
+    """Definition and running statistics of one A/B test.
+
+    Fixed allocation is sticky: a user id always maps to the same variant.
+    Thompson allocation draws per request from each variant's posterior
+    (Beta for rate-like metrics in [0, 1], Normal otherwise), so traffic
+    shifts towards the better variant as evidence accumulates.
+    """
+
+    def __init__(self, test_id: str, variants: List[VariantStats], allocation: str = "fixed",
+                 lower_is_better: bool = False, is_active: bool = True, winner: Optional[str] = None,
+                 alpha: float = 0.05, min_samples: int = 10, effect_size: float = 0.2,
+                 rng: Optional[random.Random] = None):
+        if len(variants) < 2:
+            raise ValueError("An experiment needs at least two variants")
+        if allocation not in ALLOCATION_MODES:
+            raise ValueError(f"Allocation must be one of: {', '.join(ALLOCATION_MODES)}")
+        if any(variant.weight < 0 for variant in variants) or not any(variant.weight > 0 for variant in variants):
+            raise ValueError("Variant weights must be non-negative and not all zero")
+
+        self.test_id = test_id
+        self.variants = variants
+        self.allocation = allocation
+        self.lower_is_better = lower_is_better
+        self.is_active = is_active
+        self.winner = winner
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.effect_size = effect_size
+        self.sequential_p_value = 1.0
+
+        self._salt = experiment_salt(test_id)
+        self._by_prompt = {variant.prompt_id: variant for variant in variants}
+        self._by_label = {variant.label: variant for variant in variants}
+        total_weight = sum(variant.weight for variant in variants)
+        self._cumulative: List[float] = []
+        running = 0.0
+        for variant in variants:
+            running += variant.weight / total_weight
+            self._cumulative.append(running)
+        self._cumulative[-1] = 1.0
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+
+    def variant_for(self, prompt_id: str) -> Optional[VariantStats]:
+        return self._by_prompt.get(prompt_id)
+
+    def variant_by_label(self, label: str) -> Optional[VariantStats]:
+        return self._by_label.get(label)
+
+    @property
+    def labels(self) -> List[str]:
+        return [variant.label for variant in self.variants]
+
+    def assign(self, user_id: Optional[str] = None) -> VariantStats:
+        """Pick the variant to serve; no I/O."""
+        if self.allocation == "thompson":
+            with self._lock:
+                return max(self.variants, key=self._posterior_draw)
+
+        point = assignment_bucket(self._salt, user_id) if user_id else self._rng.random()
+        return self.variants[bisect.bisect_right(self._cumulative, point)]
+
+    def record(self, prompt_id: str, value: float, count: int = 1) -> RecordOutcome:
+        """Add a result to the running sums and re-run the sequential test."""
+        variant = self._by_prompt.get(prompt_id)
+        if variant is None:
+            raise ValueError(f"Prompt {prompt_id} is not part of test {self.test_id}")
+        if count < 1:
+            raise ValueError("Sample size must be at least 1")
+
+        with self._lock:
+            previous_winner, previous_p_value = self.winner, self.sequential_p_value
+            variant.add(value, count)
+            p_value, leader = self._sequential_check()
+            significant = self.sequential_p_value < self.alpha
+            if significant and self.winner is None and leader is not None:
+                self.winner = leader.label
+            return RecordOutcome(
+                confidence_level=1.0 - p_value,
+                statistical_significance=significant,
+                winner=self.winner,
+                p_value=p_value,
+                previous_winner=previous_winner,
+                previous_p_value=previous_p_value
+            )
+
+    def discard(self, prompt_id: str, value: float, count: int, outcome: RecordOutcome) -> None:
+        """Roll back a recorded result whose persistence failed, including its test outcome."""
+        with self._lock:
+            self._by_prompt[prompt_id].remove(value, count)
+            self.winner = outcome.previous_winner
+            self.sequential_p_value = outcome.previous_p_value
+
+    def comparison(self) -> Optional[Dict[str, Any]]:
+        """Welch t-test between the current leader and runner-up."""
+        with self._lock:
+            ranked = self._ranked()
+            test = welch_t_test(ranked[0], ranked[1])
+        if test is None:
+            return None
+        comparisons = len(self.variants) - 1
+        return {
+            "leader": ranked[0].label,
+            "runner_up": ranked[1].label,
+            **test,
+            "adjusted_p_value": min(1.0, test["p_value"] * comparisons),
+        }
+
+    def final_winner(self) -> Optional[str]:
+        """Sequential winner, else the leader if the fixed-horizon Welch test is significant."""
+        if self.winner:
+            return self.winner
+        comparison = self.comparison()
+        if comparison is None or comparison["adjusted_p_value"] >= self.alpha:
+            return None
+        leader = self._by_label[comparison["leader"]]
+        runner_up = self._by_label[comparison["runner_up"]]
+        if leader.count < self.min_samples or runner_up.count < self.min_samples:
+            return None
+        return leader.label
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            variants = [variant.to_dict() for variant in self.variants]
+            sequential_p = self.sequential_p_value
+        return {
+            "allocation": self.allocation,
+            "variants": variants,
+            "sequential_p_value": sequential_p,
+            "significant": sequential_p < self.alpha,
+            "welch": self.comparison(),
+            "winner": self.winner,
+        }
+
+    def _ranked(self) -> List[VariantStats]:
+        """Variants from best to worst mean (caller holds the lock)."""
+        return sorted(self.variants, key=lambda variant: variant.mean, reverse=not self.lower_is_better)
+
+    def _sequential_check(self) -> Tuple[float, Optional[VariantStats]]:
+        """Update the always-valid p-value for leader vs runner-up (caller holds the lock).
+
+        Only variants with ``min_samples`` take part; returns the p-value and the
+        leader among them (None while fewer than two are eligible).
+        """
+        eligible = [variant for variant in self.variants
+                    if variant.count >= self.min_samples and variant.degrees_of_freedom >= 1]
+        if len(eligible) < 2:
+            return self.sequential_p_value, None
+
+        if self.lower_is_better:
+            first, second = sorted(eligible, key=lambda variant: variant.mean)[:2]
+        else:
+            first, second = sorted(eligible, key=lambda variant: variant.mean, reverse=True)[:2]
+        p_value = min(1.0, msprt_p_value(first, second, self.effect_size) * (len(self.variants) - 1))
+        self.sequential_p_value = min(self.sequential_p_value, p_value)
+        return self.sequential_p_value, first
+
+    def _posterior_draw(self, variant: VariantStats) -> float:
+        """One Thompson sample of a variant's mean, oriented so larger wins.
+
+        Variants without data draw from the uniform Beta(1, 1) prior.
+        """
+        if variant.bounded:
+            successes = min(variant.total, variant.count)
+            draw = self._rng.betavariate(1.0 + successes, 1.0 + variant.count - successes)
+        else:
+            spread = math.sqrt(variant.variance / variant.count) if variant.count > 1 else abs(variant.mean) or 1.0
+            draw = self._rng.gauss(variant.mean, spread)
+        return -draw if self.lower_is_better else draw
+
+
+class ExperimentRegistry:
+    """Process-wide map of test id to ``Experiment``."""
+
+    def __init__(self):
+        self._experiments: Dict[str, Experiment] = {}
+        self._lock = threading.Lock()
+
+    def get(self, test_id: str) -> Optional[Experiment]:
+        return self._experiments.get(test_id)
+
+    def put(self, experiment: Experiment) -> Experiment:
+        """Register ``experiment`` unless another thread already did; returns the winner."""
+        with self._lock:
+            return self._experiments.setdefault(experiment.test_id, experiment)
+
+    def remove(self, test_id: str) -> None:
+        with self._lock:
+            self._experiments.pop(test_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._experiments.clear()
+
+    def __len__(self) -> int:
+        return len(self._experiments)
+
+
+def build_variants(prompt_ids: List[str], weights: Optional[List[float]] = None,
+                   sums: Optional[Dict[str, Tuple[int, float, float, int]]] = None,
+                   bounded: bool = False) -> List[VariantStats]:
+    """Variant list labelled by position, optionally seeded with stored sums.
+
+    ``bounded`` marks the test metric as a rate in [0, 1] (see ``RATE_METRICS``).
+    """
+    weights = weights or [1.0] * len(prompt_ids)
+    sums = sums or {}
+    variants = []
+    for position, (prompt_id, weight) in enumerate(zip(prompt_ids, weights)):
+        count, total, total_squares, results = sums.get(prompt_id, (0, 0.0, 0.0, 0))
+        variants.append(VariantStats(
+            prompt_id=prompt_id, label=variant_label(position), weight=weight,
+            count=count, total=total, total_squares=total_squares, results=results,
+            bounded=bounded
+        ))
+    return variants
+
+
+# Global experiment registry instance
+experiment_registry = ExperimentRegistry()
@@ -6,7 +6,9 @@ Handles database operations for A/B testing entities.
 from typing import List, Optional, Dict, Any, Tuple
 from services.prompt_store.core.repository import BaseRepository
 from services.prompt_store.core.entities import ABTest, ABTestResult
+from services.prompt_store.db.connection import prompt_store_db_connection
 from services.prompt_store.db.queries import execute_query, serialize_json, deserialize_json
+from services.prompt_store.domain.ab_testing.engine import assignment_bucket, experiment_salt, variant_label
 
 
 class ABTestRepository(BaseRepository[ABTest]):
@@ -31,6 +33,7 @@ class ABTestRepository(BaseRepository[ABTest]):
             "target_audience": deserialize_json(row["target_audience"]),
             "created_by": row["created_by"],
             "winner": row["winner"],
+            "allocation": row.get("allocation"),
             "created_at": row["created_at"],
             "updated_at": row["updated_at"]
         })
@@ -51,6 +54,7 @@ class ABTestRepository(BaseRepository[ABTest]):
             "target_audience": serialize_json(entity.target_audience),
             "created_by": entity.created_by,
             "winner": entity.winner,
+            "allocation": entity.allocation,
             "created_at": entity.created_at.isoformat(),
             "updated_at": entity.updated_at.isoformat()
         }
@@ -162,14 +166,11 @@ class ABTestRepository(BaseRepository[ABTest]):
             return None
 
         # Use user_id for consistent assignment, fallback to random
-        import hashlib
         import random
 
         if user_id:
-            # Consistent hashing based on user_id
-            hash_value = int(hashlib.md5(f"{test_id}:{user_id}".encode()).hexdigest(), 16)
-            # Normalize to 0-1 range
-            normalized = (hash_value % 1000) / 1000.0
+            # Same keyed hash as the in-memory experiment engine
+            normalized = assignment_bucket(experiment_salt(test_id), user_id)
             selected = "A" if normalized < test.traffic_split else "B"
         else:
             # Random selection
@@ -177,6 +178,79 @@ class ABTestRepository(BaseRepository[ABTest]):
 
         return test.prompt_a_id if selected == "A" else test.prompt_b_id
 
+    def save_variants(self, test_id: str, prompt_ids: List[str], weights: List[float]) -> None:
+        """Store a test's variants with empty running sums."""
+        rows = [(test_id, prompt_id, position, weight)
+                for position, (prompt_id, weight) in enumerate(zip(prompt_ids, weights))]
+        with prompt_store_db_connection() as conn:
+            try:
+                conn.executemany("""
+                    INSERT OR IGNORE INTO ab_test_variants (test_id, prompt_id, position, weight)
+                    VALUES (?, ?, ?, ?)
+                """, rows)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def get_variants(self, test: ABTest) -> List[Dict[str, Any]]:
+        """Get a test's variants and running sums in position order.
+
+        Tests created before variants were stored are seeded once from
+        prompt A/B and their recorded results.
+        """
+        query = "SELECT * FROM ab_test_variants WHERE test_id = ? ORDER BY position"
+        rows = execute_query(query, (test.id,), fetch_all=True)
+        if rows:
+            return rows
+
+        self.save_variants(test.id, [test.prompt_a_id, test.prompt_b_id],
+                           [test.traffic_split, 1.0 - test.traffic_split])
+        execute_query("""
+            UPDATE ab_test_variants SET
+                sample_count = agg.sample_count,
+                metric_sum = agg.metric_sum,
+                metric_sum_squares = agg.metric_sum_squares,
+                result_count = agg.result_count
+            FROM (
+                SELECT prompt_id,
+                       SUM(sample_size) AS sample_count,
+                       SUM(metric_value * sample_size) AS metric_sum,
+                       SUM(metric_value * metric_value * sample_size) AS metric_sum_squares,
+                       COUNT(*) AS result_count
+                FROM ab_test_results
+                WHERE test_id = ?
+                GROUP BY prompt_id
+            ) AS agg
+            WHERE ab_test_variants.test_id = ? AND ab_test_variants.prompt_id = agg.prompt_id
+        """, (test.id, test.id))
+        return execute_query(query, (test.id,), fetch_all=True)
+
+    def get_decided_outcomes(self) -> List[Tuple[str, List[str]]]:
+        """``(winner_prompt_id, loser_prompt_ids)`` for every test with a winner."""
+        legacy = "t.winner IS NOT NULL AND NOT EXISTS (SELECT 1 FROM ab_test_variants v WHERE v.test_id = t.id)"
+        query = f"""
+            SELECT t.id AS test_id, t.winner, v.prompt_id, v.position
+            FROM {self.table_name} t
+            JOIN ab_test_variants v ON v.test_id = t.id
+            WHERE t.winner IS NOT NULL
+            UNION ALL
+            SELECT t.id, t.winner, t.prompt_a_id, 0 FROM {self.table_name} t WHERE {legacy}
+            UNION ALL
+            SELECT t.id, t.winner, t.prompt_b_id, 1 FROM {self.table_name} t WHERE {legacy}
+        """
+        variants: Dict[str, List[Tuple[int, str, str]]] = {}
+        for row in execute_query(query, fetch_all=True):
+            variants.setdefault(row["test_id"], []).append((row["position"], row["prompt_id"], row["winner"]))
+
+        outcomes = []
+        for rows in variants.values():
+            labels = {variant_label(position): prompt_id for position, prompt_id, _ in rows}
+            winner_id = labels.get(rows[0][2])
+            if winner_id:
+                outcomes.append((winner_id, [prompt_id for prompt_id in labels.values() if prompt_id != winner_id]))
+        return outcomes
+
     def create_ab_test(self, test_data: Dict[str, Any]) -> ABTest:
         """Create a new A/B test."""
         from services.prompt_store.core.entities import ABTest
@@ -240,20 +314,20 @@ class ABTestResultRepository:
 
     def _row_to_entity(self, row: Dict[str, Any]) -> ABTestResult:
         """Convert database row to ABTestResult entity."""
-        return ABTestResult(
-            id=row["id"],
-            test_id=row["test_id"],
-            prompt_id=row["prompt_id"],
-            metric_value=row["metric_value"],
-            sample_size=row["sample_size"],
-            confidence_level=row["confidence_level"],
-            statistical_significance=row["statistical_significance"],
-            recorded_at=row["recorded_at"]
-        )
+        return ABTestResult.from_dict({
+            "id": row["id"],
+            "test_id": row["test_id"],
+            "prompt_id": row["prompt_id"],
+            "metric_value": row["metric_value"],
+            "sample_size": row["sample_size"],
+            "confidence_level": row["confidence_level"],
+            "statistical_significance": bool(row["statistical_significance"]),
+            "recorded_at": row["recorded_at"]
+        })
 
-    def save(self, entity: ABTestResult) -> ABTestResult:
-        """Save A/B test result to database."""
-        row = {
+    def _entity_to_row(self, entity: ABTestResult) -> Dict[str, Any]:
+        """Convert ABTestResult entity to database row."""
+        return {
             "id": entity.id,
             "test_id": entity.test_id,
             "prompt_id": entity.prompt_id,
@@ -261,20 +335,44 @@ class ABTestResultRepository:
             "sample_size": entity.sample_size,
             "confidence_level": entity.confidence_level,
             "statistical_significance": entity.statistical_significance,
-            "recorded_at": entity.recorded_at.isoformat()
+            "recorded_at": entity.created_at.isoformat()
         }
 
-        columns = list(row.keys())
+    def _insert_query(self, columns: List[str]) -> str:
         placeholders = ",".join("?" * len(columns))
-        values = [row[col] for col in columns]
-
-        query = f"""
+        return f"""
             INSERT OR REPLACE INTO {self.table_name}
             ({','.join(columns)})
             VALUES ({placeholders})
         """
 
-        execute_query(query, values)
+    def save(self, entity: ABTestResult) -> ABTestResult:
+        """Save A/B test result to database."""
+        row = self._entity_to_row(entity)
+        columns = list(row.keys())
+        execute_query(self._insert_query(columns), [row[col] for col in columns])
+        return entity
+
+    def save_with_stats(self, entity: ABTestResult) -> ABTestResult:
+        """Save a result and add it to its variant's running sums in one transaction."""
+        row = self._entity_to_row(entity)
+        columns = list(row.keys())
+        value, count = entity.metric_value, entity.sample_size
+        with prompt_store_db_connection() as conn:
+            try:
+                conn.execute(self._insert_query(columns), [row[col] for col in columns])
+                conn.execute("""
+                    UPDATE ab_test_variants SET
+                        sample_count = sample_count + ?,
+                        metric_sum = metric_sum + ?,
+                        metric_sum_squares = metric_sum_squares + ?,
+                        result_count = result_count + 1
+                    WHERE test_id = ? AND prompt_id = ?
+                """, (count, value * count, value * value * count, entity.test_id, entity.prompt_id))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
         return entity
 
     def get_results_for_test(self, test_id: str) -> List[ABTestResult]:
@@ -4,13 +4,16 @@ Handles business logic for A/B testing operations.
 """
 
 import asyncio
-import statistics
 from typing import List, Optional, Dict, Any, Tuple
 from services.prompt_store.core.service import BaseService
 from services.prompt_store.core.entities import ABTest, ABTestResult, Prompt
+from services.prompt_store.domain.ab_testing.engine import (
+    ALLOCATION_MODES, LOWER_IS_BETTER_METRICS, RATE_METRICS, Experiment, build_variants, experiment_registry
+)
 from services.prompt_store.domain.ab_testing.repository import ABTestRepository, ABTestResultRepository
 from services.prompt_store.domain.prompts.service import PromptService
 from services.prompt_store.infrastructure.cache import prompt_store_cache
+from services.prompt_store.infrastructure.selection import prompt_selection_index
 from services.shared.utilities import generate_id, utc_now
 
 
@@ -21,6 +24,7 @@ class ABTestService(BaseService[ABTest]):
         super().__init__(ABTestRepository())
         self.result_repository = ABTestResultRepository()
         self.prompt_service = PromptService()
+        self.experiments = experiment_registry
 
     def create_entity(self, data: Dict[str, Any], entity_id: Optional[str] = None) -> ABTest:
         """Create a new A/B test with validation."""
@@ -31,20 +35,25 @@ class ABTestService(BaseService[ABTest]):
             raise ValueError(f"Missing required fields: {', '.join(missing)}")
 
         # Validate prompts exist and are different
-        prompt_a = self.prompt_service.get_entity(data["prompt_a_id"])
-        prompt_b = self.prompt_service.get_entity(data["prompt_b_id"])
+        prompt_ids = [data["prompt_a_id"], data["prompt_b_id"]] + list(data.get("additional_prompt_ids") or [])
+        for prompt_id in prompt_ids:
+            if not self.prompt_service.get_entity(prompt_id):
+                raise ValueError("Both prompts must exist" if len(prompt_ids) == 2 else "All prompts must exist")
 
-        if not prompt_a or not prompt_b:
-            raise ValueError("Both prompts must exist")
-
-        if prompt_a.id == prompt_b.id:
+        if data["prompt_a_id"] == data["prompt_b_id"]:
             raise ValueError("Prompt A and Prompt B must be different")
+        if len(set(prompt_ids)) != len(prompt_ids):
+            raise ValueError("Test variants must use different prompts")
 
         # Validate traffic split
         traffic_split = data.get("traffic_split", 0.5)
         if not (0.0 < traffic_split < 1.0):
             raise ValueError("Traffic split must be between 0.0 and 1.0")
 
+        allocation = data.get("allocation") or "fixed"
+        if allocation not in ALLOCATION_MODES:
+            raise ValueError(f"Allocation must be one of: {', '.join(ALLOCATION_MODES)}")
+
         # Check for duplicate test name
         existing = self._get_by_name(data["name"])
         if existing:
@@ -52,7 +61,6 @@ class ABTestService(BaseService[ABTest]):
 
         # Create A/B test entity
         ab_test = ABTest(
-            id=entity_id or generate_id(),
             name=data["name"],
             description=data.get("description", ""),
             prompt_a_id=data["prompt_a_id"],
@@ -60,11 +68,19 @@ class ABTestService(BaseService[ABTest]):
             test_metric=data.get("test_metric", "response_quality"),
             traffic_split=traffic_split,
             target_audience=data.get("target_audience", {}),
-            created_by=data.get("created_by", "api_user")
+            created_by=data.get("created_by", "api_user"),
+            allocation=allocation
         )
+        ab_test.id = entity_id or generate_id()
 
-        # Save to database
+        # Save to database; extra variants share traffic equally
         saved_test = self.repository.save(ab_test)
+        if len(prompt_ids) == 2:
+            weights = [traffic_split, 1.0 - traffic_split]
+        else:
+            weights = [1.0] * len(prompt_ids)
+        self.repository.save_variants(saved_test.id, prompt_ids, weights)
+        self.experiments.put(self._build_experiment(saved_test, prompt_ids, weights))
 
         # Cache the test
         asyncio.create_task(self._cache_test(saved_test))
@@ -73,29 +89,26 @@ class ABTestService(BaseService[ABTest]):
 
     def select_prompt_for_test(self, test_id: str, user_id: Optional[str] = None,
                               session_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
-        """Select a prompt variant for A/B testing."""
-        test = self.get_entity(test_id)
-        if not test or not test.is_active:
-            return None
+        """Select a prompt variant for A/B testing.
 
-        # Get the selected prompt ID
-        selected_prompt_id = self.repository.select_prompt_for_test(test_id, user_id)
-
-        if not selected_prompt_id:
+        Assignment is served from the in-memory experiment; only the first
+        call for a test after a restart reads its definition from the database.
+        """
+        experiment = self._get_experiment(test_id)
+        if not experiment or not experiment.is_active:
             return None
 
-        # Get the full prompt details
-        selected_prompt = self.prompt_service.get_entity(selected_prompt_id)
+        variant = experiment.assign(user_id)
+
+        # Get the full prompt details (served by the prompt resolution cache)
+        selected_prompt = self.prompt_service.get_entity(variant.prompt_id)
         if not selected_prompt:
             return None
 
-        # Record the selection for analytics
-        asyncio.create_task(self._record_test_usage(test_id, selected_prompt_id, user_id, session_id))
-
         return {
             "test_id": test_id,
             "selected_prompt": selected_prompt.to_dict(),
-            "variant": "A" if selected_prompt_id == test.prompt_a_id else "B",
+            "variant": variant.label,
             "user_id": user_id,
             "session_id": session_id
         }
@@ -106,62 +119,69 @@ class ABTestService(BaseService[ABTest]):
         if not test:
             raise ValueError(f"A/B test {test_id} not found")
 
-        # Get aggregated results
-        aggregated_results = self.result_repository.get_aggregated_results(test_id)
+        experiment = self._get_experiment(test_id)
+        summary = experiment.summary()
 
         # Get prompt details
-        prompt_a = self.prompt_service.get_entity(test.prompt_a_id)
-        prompt_b = self.prompt_service.get_entity(test.prompt_b_id)
-
-        if not prompt_a or not prompt_b:
+        prompts = {variant["prompt_id"]: self.prompt_service.get_entity(variant["prompt_id"])
+                   for variant in summary["variants"]}
+        if not all(prompts.values()):
             raise ValueError("Test prompts not found")
 
-        # Calculate winner if we have enough data
-        winner = self._determine_winner(test, aggregated_results)
+        results = {variant["prompt_id"]: variant for variant in summary["variants"]}
 
         return {
             "test": test.to_dict(),
-            "prompt_a": prompt_a.to_dict(),
-            "prompt_b": prompt_b.to_dict(),
-            "results": aggregated_results,
-            "winner": winner,
-            "confidence_assessment": self._assess_confidence(aggregated_results)
+            "prompt_a": prompts[test.prompt_a_id].to_dict(),
+            "prompt_b": prompts[test.prompt_b_id].to_dict(),
+            "variants": [{**variant, "prompt": prompts[variant["prompt_id"]].to_dict()}
+                         for variant in summary["variants"]],
+            "results": results,
+            "statistics": {
+                "sequential_p_value": summary["sequential_p_value"],
+                "significant": summary["significant"],
+                "welch": summary["welch"]
+            },
+            "winner": experiment.final_winner(),
+            "confidence_assessment": self._assess_confidence(summary, experiment)
         }
 
     def record_test_result(self, test_id: str, prompt_id: str, metric_value: float,
                           sample_size: int = 1, metadata: Optional[Dict[str, Any]] = None) -> ABTestResult:
-        """Record a result for an A/B test."""
-        test = self.get_entity(test_id)
-        if not test:
+        """Record a result for an A/B test.
+
+        Updates the variant's running sums in memory and in the database, then
+        runs the sequential test; no aggregate query over past results is needed.
+        """
+        experiment = self._get_experiment(test_id)
+        if not experiment:
             raise ValueError(f"A/B test {test_id} not found")
 
-        if prompt_id not in [test.prompt_a_id, test.prompt_b_id]:
+        if experiment.variant_for(prompt_id) is None:
             raise ValueError(f"Prompt {prompt_id} is not part of test {test_id}")
 
-        # Calculate confidence level (simplified statistical significance)
-        confidence_level = self._calculate_confidence_level(metric_value, sample_size)
-
-        # Determine statistical significance (basic implementation)
-        statistical_significance = confidence_level > 0.95
+        outcome = experiment.record(prompt_id, metric_value, sample_size)
 
         result = ABTestResult(
-            id=generate_id(),
             test_id=test_id,
             prompt_id=prompt_id,
             metric_value=metric_value,
             sample_size=sample_size,
-            confidence_level=confidence_level,
-            statistical_significance=statistical_significance
+            confidence_level=outcome.confidence_level,
+            statistical_significance=outcome.statistical_significance
         )
+        result.id = generate_id()
 
-        saved_result = self.result_repository.save(result)
+        try:
+            saved_result = self.result_repository.save_with_stats(result)
+        except Exception:
+            experiment.discard(prompt_id, metric_value, sample_size, outcome)
+            raise
 
-        # Check if we should auto-determine winner
-        if statistical_significance and not test.winner:
-            aggregated = self.result_repository.get_aggregated_results(test_id)
-            winner = self._determine_winner(test, aggregated)
-            if winner:
-                self.update_entity(test_id, {"winner": winner})
+        # Persist the winner the first time the sequential test declares one
+        if outcome.winner and outcome.previous_winner is None:
+            self.update_entity(test_id, {"winner": outcome.winner})
+            self._publish_outcome(experiment, outcome.winner)
 
         return saved_result
 
@@ -174,21 +194,25 @@ class ABTestService(BaseService[ABTest]):
         if not test.is_active:
             raise ValueError(f"A/B test {test_id} is already ended")
 
-        updates = {"is_active": False, "end_date": utc_now()}
+        experiment = self._get_experiment(test_id)
+        updates = {"is_active": False, "end_date": utc_now().isoformat()}
 
         if winner:
-            if winner not in ["A", "B"]:
-                raise ValueError("Winner must be 'A' or 'B'")
+            if winner not in experiment.labels:
+                raise ValueError(f"Winner must be one of: {', '.join(experiment.labels)}")
             updates["winner"] = winner
 
         # Auto-determine winner if not provided and we have results
         if not winner:
-            aggregated = self.result_repository.get_aggregated_results(test_id)
-            auto_winner = self._determine_winner(test, aggregated)
+            auto_winner = experiment.final_winner()
             if auto_winner:
                 updates["winner"] = auto_winner
 
         updated_test = self.update_entity(test_id, updates)
+        experiment.is_active = False
+        experiment.winner = updates.get("winner", experiment.winner)
+        if not test.winner and experiment.winner:
+            self._publish_outcome(experiment, experiment.winner)
 
         # Invalidate cache
         asyncio.create_task(self._invalidate_test_cache(test_id))
@@ -213,81 +237,61 @@ class ABTestService(BaseService[ABTest]):
                 return test
         return None
 
-    def _determine_winner(self, test: ABTest, aggregated_results: Dict[str, Any]) -> Optional[str]:
-        """Determine the winner of an A/B test based on results."""
-        if len(aggregated_results) < 2:
-            return None
-
-        prompt_a_results = aggregated_results.get(test.prompt_a_id)
-        prompt_b_results = aggregated_results.get(test.prompt_b_id)
-
-        if not prompt_a_results or not prompt_b_results:
-            return None
-
-        # Check if we have statistical significance
-        a_significant = prompt_a_results.get("has_statistical_significance", False)
-        b_significant = prompt_b_results.get("has_statistical_significance", False)
+    def _get_experiment(self, test_id: str) -> Optional[Experiment]:
+        """In-memory experiment for a test, loaded from the database on first use."""
+        experiment = self.experiments.get(test_id)
+        if experiment is not None:
+            return experiment
 
-        if not (a_significant or b_significant):
+        test = self.repository.get_by_id(test_id)
+        if not test:
             return None
 
-        # Compare average metrics (higher is better for most metrics)
-        a_metric = prompt_a_results.get("average_metric", 0)
-        b_metric = prompt_b_results.get("average_metric", 0)
-
-        # For metrics where lower is better (like response_time), invert the comparison
-        if test.test_metric == "response_time":
-            return "A" if a_metric < b_metric else "B"
-        else:
-            return "A" if a_metric > b_metric else "B"
-
-    def _calculate_confidence_level(self, metric_value: float, sample_size: int) -> float:
-        """Calculate confidence level for a metric (simplified implementation)."""
-        # This is a simplified confidence calculation
-        # In a real implementation, you'd use proper statistical methods
-
-        if sample_size < 10:
-            return 0.5  # Low confidence with small sample
-
-        # Assume normal distribution and calculate based on sample size
-        # This is not statistically rigorous but provides a basic implementation
-        base_confidence = min(0.95, sample_size / 100)  # Max 95% confidence
-
-        # Adjust based on metric value stability (simplified)
-        if metric_value < 0.1 or metric_value > 0.9:
-            base_confidence *= 0.8  # Reduce confidence for extreme values
+        rows = self.repository.get_variants(test)
+        sums = {row["prompt_id"]: (row["sample_count"], row["metric_sum"],
+                                   row["metric_sum_squares"], row["result_count"]) for row in rows}
+        experiment = self._build_experiment(
+            test, [row["prompt_id"] for row in rows], [row["weight"] for row in rows], sums
+        )
+        return self.experiments.put(experiment)
+
+    def _build_experiment(self, test: ABTest, prompt_ids: List[str], weights: List[float],
+                          sums: Optional[Dict[str, Tuple[int, float, float, int]]] = None) -> Experiment:
+        return Experiment(
+            test.id,
+            build_variants(prompt_ids, weights, sums, bounded=test.test_metric in RATE_METRICS),
+            allocation=test.allocation,
+            lower_is_better=test.test_metric in LOWER_IS_BETTER_METRICS,
+            is_active=bool(test.is_active),
+            winner=test.winner
+        )
 
-        return base_confidence
+    def _publish_outcome(self, experiment: Experiment, winner: str) -> None:
+        """Let prompt selection favour the winner of a decided test."""
+        winner_id = experiment.variant_by_label(winner).prompt_id
+        loser_ids = [variant.prompt_id for variant in experiment.variants if variant.prompt_id != winner_id]
+        prompt_selection_index.record_ab_outcome(winner_id, loser_ids)
 
-    def _assess_confidence(self, aggregated_results: Dict[str, Any]) -> Dict[str, Any]:
+    def _assess_confidence(self, summary: Dict[str, Any], experiment: Experiment) -> Dict[str, Any]:
         """Assess overall confidence in test results."""
-        if not aggregated_results:
+        total_samples = sum(variant["total_samples"] for variant in summary["variants"])
+        if not total_samples:
             return {"level": "insufficient_data", "description": "Not enough data to assess confidence"}
 
-        total_samples = sum(r.get("total_samples", 0) for r in aggregated_results.values())
-        avg_confidence = sum(r.get("average_confidence", 0) for r in aggregated_results.values()) / len(aggregated_results)
-
-        if total_samples < 100:
+        assessment = {
+            "total_samples": total_samples,
+            "sequential_p_value": summary["sequential_p_value"],
+            "alpha": experiment.alpha
+        }
+        if summary["significant"]:
+            return {"level": "high", "description": "Sequential test is significant", **assessment}
+        if any(variant["total_samples"] < experiment.min_samples for variant in summary["variants"]):
             return {
                 "level": "low",
-                "description": f"Low confidence: only {total_samples} total samples",
-                "total_samples": total_samples,
-                "average_confidence": avg_confidence
-            }
-        elif avg_confidence > 0.8:
-            return {
-                "level": "high",
-                "description": "High confidence in results",
-                "total_samples": total_samples,
-                "average_confidence": avg_confidence
-            }
-        else:
-            return {
-                "level": "medium",
-                "description": "Medium confidence: more data recommended",
-                "total_samples": total_samples,
-                "average_confidence": avg_confidence
+                "description": f"Low confidence: fewer than {experiment.min_samples} samples for some variants",
+                **assessment
             }
+        return {"level": "medium", "description": "Medium confidence: more data recommended", **assessment}
 
     async def _cache_test(self, test: ABTest) -> None:
         """Cache A/B test."""
@@ -299,13 +303,6 @@ class ABTestService(BaseService[ABTest]):
         cache_key = f"ab_test:{test_id}"
         await prompt_store_cache.delete(cache_key)
 
-    async def _record_test_usage(self, test_id: str, prompt_id: str,
-                               user_id: Optional[str], session_id: Optional[str]) -> None:
-        """Record test usage for analytics."""
-        # This would integrate with the usage tracking system
-        # For now, just increment counters
-        pass
-
     def create_ab_test(self, test_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new A/B test (convenience method)."""
         ab_test = self.create_entity(test_data)
@@ -13,23 +13,32 @@ class AnalyticsRepository(BaseRepository[PromptPerformanceMetrics]):
     def __init__(self):
         super().__init__("prompt_performance_metrics")
 
+    _SAVE_QUERY = """
+        INSERT OR REPLACE INTO prompt_performance_metrics
+        (id, prompt_id, version, total_requests, successful_requests, failed_requests,
+         average_response_time_ms, median_response_time_ms, p95_response_time_ms, p99_response_time_ms,
+         total_tokens_used, average_tokens_per_request, cost_estimate_usd, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
     def save(self, entity: PromptPerformanceMetrics) -> PromptPerformanceMetrics:
         """Save entity to database."""
-        row = self._entity_to_row(entity)
-        execute_query(f"""
-            INSERT OR REPLACE INTO {self.table_name}
-            (id, prompt_id, version, total_requests, successful_requests, failed_requests,
-             average_response_time_ms, median_response_time_ms, p95_response_time_ms, p99_response_time_ms,
-             total_tokens_used, average_tokens_per_request, cost_estimate_usd, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        execute_query(self._SAVE_QUERY, self._save_params(self._entity_to_row(entity)))
+        return entity
+
+    def save_rows(self, conn, rows: List[Dict[str, Any]]) -> None:
+        """Save many metrics rows on ``conn`` without committing."""
+        conn.executemany(self._SAVE_QUERY, [self._save_params(row) for row in rows])
+
+    @staticmethod
+    def _save_params(row: Dict[str, Any]) -> tuple:
+        return (
             row['id'], row['prompt_id'], row['version'], row['total_requests'],
             row['successful_requests'], row['failed_requests'], row['average_response_time_ms'],
             row['median_response_time_ms'], row['p95_response_time_ms'], row['p99_response_time_ms'],
             row['total_tokens_used'], row['average_tokens_per_request'], row['cost_estimate_usd'],
             row['created_at'], row['updated_at']
-        ))
-        return entity
+        )
 
     def get_by_id(self, entity_id: str) -> Optional[PromptPerformanceMetrics]:
         """Get entity by ID."""
@@ -2,7 +2,8 @@
 
 import asyncio
 import statistics
-from typing import Dict, Any, List, Optional
+import threading
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict
 
@@ -10,9 +11,54 @@ from .entities import PromptPerformanceMetrics, UserSatisfactionScore
 from .repository import AnalyticsRepository
 from ...core.service import BaseService
 from ...infrastructure.cache import prompt_store_cache
+from ...infrastructure.usage import UsageEvent, usage_aggregator
 from services.shared.integrations.clients.clients import ServiceClients
 from services.shared.utilities import generate_id, utc_now
 
+# Metrics changed since the last usage flush, keyed by (prompt_id, version). The
+# objects are only updated on the event loop; the flush, which may run in a worker
+# thread, reads the rows serialized alongside them. Both maps change under the lock.
+_pending_metrics: Dict[Tuple[str, int], PromptPerformanceMetrics] = {}
+_pending_rows: Dict[Tuple[str, int], Dict[str, Any]] = {}
+_pending_lock = threading.Lock()
+
+
+def _mark_pending(metrics: PromptPerformanceMetrics) -> None:
+    """Queue a snapshot of ``metrics`` for the next usage flush."""
+    key = (metrics.prompt_id, metrics.version)
+    row = AnalyticsRepository()._entity_to_row(metrics)
+    with _pending_lock:
+        _pending_metrics[key] = metrics
+        _pending_rows[key] = row
+
+
+def _get_pending(prompt_id: str, version: int) -> Optional[PromptPerformanceMetrics]:
+    with _pending_lock:
+        return _pending_metrics.get((prompt_id, version))
+
+
+def _write_pending_metrics(conn):
+    """Usage flush hook: persist changed metrics in the flush transaction."""
+    with _pending_lock:
+        written = dict(_pending_rows)
+    if not written:
+        return None
+
+    AnalyticsRepository().save_rows(conn, list(written.values()))
+
+    def forget_written():
+        # Metrics updated again while the flush ran have a newer row and stay pending
+        with _pending_lock:
+            for key, row in written.items():
+                if _pending_rows.get(key) is row:
+                    del _pending_rows[key]
+                    _pending_metrics.pop(key, None)
+
+    return forget_written
+
+
+usage_aggregator.register_flush_hook("analytics.performance_metrics", _write_pending_metrics)
+
 
 class AnalyticsService(BaseService[PromptPerformanceMetrics]):
     """Advanced analytics service for prompt ecosystem insights."""
@@ -52,8 +98,21 @@ class AnalyticsService(BaseService[PromptPerformanceMetrics]):
         # Recalculate averages
         self._recalculate_averages(metrics)
 
-        # Save updated metrics
-        self.update_entity(metrics.id, metrics.__dict__)
+        # Saved with the next usage flush instead of one UPDATE per event
+        _mark_pending(metrics)
+        usage_aggregator.record(UsageEvent(
+            prompt_id=prompt_id,
+            service_name=usage_data.get("llm_service", "unknown"),
+            operation=usage_data.get("operation", "generate"),
+            session_id=usage_data.get("session_id"),
+            user_id=usage_data.get("user_id"),
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            response_time_ms=response_time,
+            success=usage_data.get("success", True),
+            error_message=usage_data.get("error_message"),
+            metadata={"version": version, "cost_estimate_usd": cost_estimate}
+        ))
 
         # Cache for performance
         cache_key = f"analytics:metrics:{prompt_id}:{version}"
@@ -61,6 +120,10 @@ class AnalyticsService(BaseService[PromptPerformanceMetrics]):
 
     async def _get_or_create_metrics(self, prompt_id: str, version: int) -> PromptPerformanceMetrics:
         """Get existing metrics or create new ones."""
+        pending = _get_pending(prompt_id, version)
+        if pending is not None:
+            return pending
+
         cache_key = f"analytics:metrics:{prompt_id}:{version}"
         cached = await prompt_store_cache.get(cache_key)
         if cached:
@@ -75,7 +138,7 @@ class AnalyticsService(BaseService[PromptPerformanceMetrics]):
             prompt_id=prompt_id,
             version=version
         )
-        self.create_entity(metrics.__dict__)
+        self.repository.save(metrics)
         return metrics
 
     async def _update_response_time_metrics(self, metrics: PromptPerformanceMetrics, response_time: float) -> None:
@@ -9,6 +9,7 @@ from datetime import datetime
 from services.prompt_store.domain.lifecycle.repository import LifecycleRepository
 from services.prompt_store.domain.prompts.service import PromptService
 from services.prompt_store.infrastructure.cache import prompt_store_cache
+from services.prompt_store.infrastructure.resolution import prompt_resolution_cache
 from services.shared.utilities import generate_id, utc_now
 
 
@@ -40,6 +41,7 @@ class LifecycleService:
 
         if success:
             # Invalidate cache for this prompt
+            prompt_resolution_cache.invalidate(prompt_id)
             await prompt_store_cache.delete(f"prompt:{prompt_id}")
             await prompt_store_cache.delete(f"prompt_versions:{prompt_id}")
 
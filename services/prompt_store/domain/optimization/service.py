@@ -7,13 +7,18 @@ from datetime import datetime, timedelta
 from collections import defaultdict
 
 from ...core.service import BaseService
+from ..ab_testing.engine import Experiment, build_variants
 from services.shared.integrations.clients.clients import ServiceClients
 from services.shared.utilities import generate_id, utc_now
 from ...infrastructure.cache import prompt_store_cache
 
 
 class ABTest(BaseService):
-    """A/B testing entity for prompt optimization."""
+    """A/B testing entity for prompt optimization.
+
+    Assignment and winner detection are delegated to an ``Experiment`` that
+    tracks each variant's success rate; the counters here only feed reports.
+    """
 
     def __init__(self, test_id: str, prompt_a_id: str, prompt_b_id: str,
                  traffic_percentage: float = 50.0):
@@ -21,32 +26,34 @@ class ABTest(BaseService):
         self.prompt_a_id = prompt_a_id
         self.prompt_b_id = prompt_b_id
         self.traffic_percentage = traffic_percentage
-        self.results_a = {"requests": 0, "successes": 0, "total_score": 0}
-        self.results_b = {"requests": 0, "successes": 0, "total_score": 0}
+        self.results_a = {"requests": 0, "successes": 0, "failed_requests": 0, "total_score": 0}
+        self.results_b = {"requests": 0, "successes": 0, "failed_requests": 0, "total_score": 0}
         self.start_time = utc_now()
         self.status = "running"
+        self.experiment = Experiment(test_id, build_variants(
+            [prompt_a_id, prompt_b_id], [traffic_percentage, 100.0 - traffic_percentage], bounded=True
+        ))
 
     def assign_prompt(self, user_id: str) -> str:
-        """Assign a prompt variant to a user."""
-        # Simple A/B assignment based on user ID hash
-        user_hash = hash(user_id) % 100
-        if user_hash < self.traffic_percentage:
-            return self.prompt_a_id
-        else:
-            return self.prompt_b_id
+        """Assign a prompt variant to a user (stable across processes)."""
+        return self.experiment.assign(user_id).prompt_id
 
     def record_result(self, prompt_id: str, success: bool, score: float = 0.0):
         """Record the result of using a prompt variant."""
         if prompt_id == self.prompt_a_id:
-            self.results_a["requests"] += 1
-            if success:
-                self.results_a["successes"] += 1
-            self.results_a["total_score"] += score
+            results = self.results_a
         elif prompt_id == self.prompt_b_id:
-            self.results_b["requests"] += 1
-            if success:
-                self.results_b["successes"] += 1
-            self.results_b["total_score"] += score
+            results = self.results_b
+        else:
+            return
+
+        results["requests"] += 1
+        if success:
+            results["successes"] += 1
+        else:
+            results["failed_requests"] += 1
+        results["total_score"] += score
+        self.experiment.record(prompt_id, 1.0 if success else 0.0)
 
     def get_results(self) -> Dict[str, Any]:
         """Get current test results."""
@@ -76,19 +83,11 @@ class ABTest(BaseService):
         }
 
     def determine_winner(self) -> Optional[str]:
-        """Determine which prompt is performing better."""
-        if self.results_a["requests"] < 10 or self.results_b["requests"] < 10:
-            return None  # Need more data
-
-        rate_a = self.results_a["successes"] / self.results_a["requests"]
-        rate_b = self.results_b["successes"] / self.results_b["requests"]
-
-        if rate_a > rate_b:
-            return self.prompt_a_id
-        elif rate_b > rate_a:
-            return self.prompt_b_id
-        else:
-            return None  # Tie
+        """Winning prompt id once the success rates differ significantly."""
+        label = self.experiment.final_winner()
+        if label is None:
+            return None
+        return self.experiment.variant_by_label(label).prompt_id
 
 
 class OptimizationService:
@@ -0,0 +1,169 @@
+"""Checkpointed step execution for chains and pipelines.
+
+- Steps form a dependency graph. A step depends on the earlier steps whose
+  outputs it reads (or on the steps it lists in ``depends_on``), so steps
+  without a data dependency run concurrently.
+- Each step sees the initial context plus the outputs of its ancestors
+  applied in step order. The final context is the same as a sequential
+  run's.
+- Every finished step is checkpointed. A step whose result reports an error
+  is checkpointed as failed. A resumed execution runs the steps without a
+  checkpoint and the failed ones again.
+- Steps marked ``"deterministic": true`` are memoized by a hash of the step
+  and the inputs it reads.
+"""
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from .repository import OrchestrationExecutionRepository
+
+DEFAULT_MAX_PARALLEL_STEPS = 8
+
+# Fields a step reads and writes; None means any field
+FieldSet = Optional[FrozenSet[str]]
+StepIO = Callable[[Dict[str, Any]], Tuple[FieldSet, FieldSet]]
+
+
+def _overlaps(reads: FieldSet, writes: FieldSet) -> bool:
+    if reads is None:
+        return writes is None or bool(writes)
+    if writes is None:
+        return bool(reads)
+    return not reads.isdisjoint(writes)
+
+
+def plan_dependencies(steps: List[Dict[str, Any]], step_io: StepIO) -> List[FrozenSet[int]]:
+    """Direct dependencies (earlier step indexes) of every step."""
+    ids = {step["id"]: index for index, step in enumerate(steps) if step.get("id") is not None}
+    fields = [step_io(step) for step in steps]
+    dependencies = []
+    for index, step in enumerate(steps):
+        declared = step.get("depends_on")
+        if declared is None:
+            reads = fields[index][0]
+            parents = {earlier for earlier in range(index) if _overlaps(reads, fields[earlier][1])}
+        else:
+            parents = set()
+            for ref in declared:
+                parent = ids.get(ref, ref)
+                if not isinstance(parent, int) or not 0 <= parent < index:
+                    raise ValueError(f"Step {index} depends on unknown or later step {ref!r}")
+                parents.add(parent)
+        dependencies.append(frozenset(parents))
+    return dependencies
+
+
+def _ancestors(dependencies: List[FrozenSet[int]]) -> List[List[int]]:
+    closure: List[Set[int]] = []
+    for parents in dependencies:
+        ancestors = set(parents)
+        for parent in parents:
+            ancestors |= closure[parent]
+        closure.append(ancestors)
+    return [sorted(ancestors) for ancestors in closure]
+
+
+def step_input_hash(kind: str, step: Dict[str, Any], context: Dict[str, Any], reads: FieldSet) -> str:
+    inputs = context if reads is None else {field: context[field] for field in reads if field in context}
+    encoded = json.dumps([kind, step, inputs], sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def step_outputs(checkpoint: Dict[str, Any]) -> Dict[str, Any]:
+    result = checkpoint.get("result") or {}
+    return result.get("outputs") or {}
+
+
+def _succeeded(result: Dict[str, Any]) -> bool:
+    return result.get("success", True) and "error" not in result
+
+
+def terminated_at(checkpoints: Dict[int, Dict[str, Any]]) -> Optional[int]:
+    """First step that ended the chain early, if any."""
+    return min((index for index, checkpoint in checkpoints.items()
+                if (checkpoint.get("result") or {}).get("terminate_chain")), default=None)
+
+
+class CheckpointedStepExecutor:
+    """Runs the steps of one execution, checkpointing each finished step."""
+
+    def __init__(self, repository: Optional[OrchestrationExecutionRepository] = None,
+                 max_parallel_steps: int = DEFAULT_MAX_PARALLEL_STEPS):
+        self.repository = repository or OrchestrationExecutionRepository()
+        self.max_parallel_steps = max_parallel_steps
+
+    async def run(self, execution_id: str, kind: str, steps: List[Dict[str, Any]],
+                  initial_context: Dict[str, Any], checkpoints: Dict[int, Dict[str, Any]],
+                  step_io: StepIO,
+                  should_run: Callable[[Dict[str, Any], Dict[str, Any]], Awaitable[bool]],
+                  execute: Callable[[Dict[str, Any], Dict[str, Any]], Awaitable[Dict[str, Any]]]
+                  ) -> Dict[int, Dict[str, Any]]:
+        """Run every step without a successful checkpoint; returns all checkpoints by step index.
+
+        A step that raises fails the execution: steps still running are
+        cancelled and the finished ones keep their checkpoints. Steps after
+        one that returns ``terminate_chain`` are not started; any already
+        running alongside it finish but are left out of the results.
+        """
+        dependencies = plan_dependencies(steps, step_io)
+        ancestors = _ancestors(dependencies)
+        done = {index: checkpoint for index, checkpoint in checkpoints.items()
+                if checkpoint["status"] != "failed"}
+        stop_at = terminated_at(done)
+        pending = [index for index in range(len(steps)) if index not in done]
+        running: Dict["asyncio.Task[Dict[str, Any]]", int] = {}
+
+        try:
+            while pending or running:
+                if stop_at is not None:
+                    pending = [index for index in pending if index < stop_at]
+                for index in [index for index in pending if dependencies[index].issubset(done)]:
+                    if len(running) >= self.max_parallel_steps:
+                        break
+                    pending.remove(index)
+                    context = dict(initial_context)
+                    for ancestor in ancestors[index]:
+                        context.update(step_outputs(done[ancestor]))
+                    task = asyncio.create_task(self._run_step(
+                        execution_id, kind, index, steps[index], context, step_io, should_run, execute
+                    ))
+                    running[task] = index
+                if not running:
+                    break
+
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(finished, key=running.get):
+                    index = running.pop(task)
+                    done[index] = task.result()
+                    if (done[index].get("result") or {}).get("terminate_chain"):
+                        stop_at = index if stop_at is None else min(stop_at, index)
+        finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+        return done
+
+    async def _run_step(self, execution_id: str, kind: str, index: int, step: Dict[str, Any],
+                        context: Dict[str, Any], step_io: StepIO,
+                        should_run: Callable[[Dict[str, Any], Dict[str, Any]], Awaitable[bool]],
+                        execute: Callable[[Dict[str, Any], Dict[str, Any]], Awaitable[Dict[str, Any]]]
+                        ) -> Dict[str, Any]:
+        if not await should_run(step, context):
+            checkpoint = {"status": "skipped", "result": None}
+        else:
+            memo_key = step_input_hash(kind, step, context, step_io(step)[0]) if step.get("deterministic") else None
+            result = self.repository.get_memo(memo_key) if memo_key else None
+            if result is not None:
+                result["memoized"] = True
+            else:
+                result = await execute(step, context)
+                if memo_key and _succeeded(result):
+                    self.repository.save_memo(memo_key, result)
+            checkpoint = {"status": "completed" if _succeeded(result) else "failed", "result": result}
+
+        self.repository.save_checkpoint(execution_id, index, checkpoint["status"], checkpoint["result"])
+        return checkpoint
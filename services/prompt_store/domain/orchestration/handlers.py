@@ -56,6 +56,34 @@ class OrchestrationHandlers(BaseHandler):
         except Exception as e:
             return create_error_response(f"Failed to execute pipeline: {str(e)}", "INTERNAL_ERROR").model_dump()
 
+    async def handle_get_execution(self, execution_id: str) -> Dict[str, Any]:
+        """Get a chain or pipeline execution."""
+        try:
+            execution = await self.service.get_execution(execution_id)
+            if not execution:
+                return create_error_response("Execution not found", "NOT_FOUND").model_dump()
+            return create_success_response(
+                message="Execution retrieved",
+                data=execution
+            ).model_dump()
+        except Exception as e:
+            return create_error_response(f"Failed to get execution: {str(e)}", "INTERNAL_ERROR").model_dump()
+
+    async def handle_resume_execution(self, execution_id: str) -> Dict[str, Any]:
+        """Resume a failed or interrupted execution."""
+        try:
+            execution = await self.service.resume_execution(execution_id)
+            if not execution:
+                return create_error_response("Execution not found", "NOT_FOUND").model_dump()
+            return create_success_response(
+                message="Execution resumed",
+                data=execution
+            ).model_dump()
+        except ValueError as e:
+            return create_error_response(str(e), "VALIDATION_ERROR").model_dump()
+        except Exception as e:
+            return create_error_response(f"Failed to resume execution: {str(e)}", "INTERNAL_ERROR").model_dump()
+
     async def handle_select_optimal_prompt(self, task_description: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Select optimal prompt for a task."""
         try:
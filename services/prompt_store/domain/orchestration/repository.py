@@ -0,0 +1,111 @@
+"""Orchestration execution repository.
+
+Persists chain and pipeline executions, their per-step checkpoints and
+memoized results of deterministic steps.
+"""
+
+from typing import Any, Dict, Optional
+from services.prompt_store.db.connection import prompt_store_db_connection
+from services.prompt_store.db.queries import execute_query, serialize_json, deserialize_json
+from services.shared.utilities import utc_now
+
+FINISHED_STATUSES = ("completed", "failed")
+
+
+class OrchestrationExecutionRepository:
+    """Repository for orchestration executions and step checkpoints."""
+
+    def create_execution(self, execution_id: str, kind: str, definition_id: str, definition: Dict[str, Any],
+                         initial_context: Dict[str, Any], started_at: str) -> None:
+        """Record a new running execution with a snapshot of its definition."""
+        execute_query(
+            """
+            INSERT INTO orchestration_executions
+                (id, kind, definition_id, definition, initial_context, status, started_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, 'running', ?, ?)
+            """,
+            (execution_id, kind, definition_id, serialize_json(definition),
+             serialize_json(initial_context), started_at, started_at)
+        )
+
+    def update_status(self, execution_id: str, status: str, error: Optional[str] = None,
+                      completed_at: Optional[str] = None) -> None:
+        execute_query(
+            "UPDATE orchestration_executions SET status = ?, error = ?, updated_at = ?, completed_at = ? WHERE id = ?",
+            (status, error, utc_now().isoformat(), completed_at, execution_id)
+        )
+
+    def get_execution(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        row = execute_query("SELECT * FROM orchestration_executions WHERE id = ?", (execution_id,), fetch_one=True)
+        if not row:
+            return None
+        row["definition"] = deserialize_json(row["definition"]) or {}
+        row["initial_context"] = deserialize_json(row["initial_context"]) or {}
+        return row
+
+    def save_checkpoint(self, execution_id: str, step_index: int, status: str,
+                        result: Optional[Dict[str, Any]]) -> None:
+        now = utc_now().isoformat()
+        with prompt_store_db_connection() as conn:
+            try:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO orchestration_step_checkpoints
+                        (execution_id, step_index, status, result, completed_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (execution_id, step_index, status, serialize_json(result), now)
+                )
+                conn.execute("UPDATE orchestration_executions SET updated_at = ? WHERE id = ?", (now, execution_id))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def get_checkpoints(self, execution_id: str) -> Dict[int, Dict[str, Any]]:
+        """Checkpoints by step index."""
+        rows = execute_query(
+            "SELECT step_index, status, result FROM orchestration_step_checkpoints WHERE execution_id = ?",
+            (execution_id,), fetch_all=True
+        )
+        return {
+            row["step_index"]: {"status": row["status"], "result": deserialize_json(row["result"])}
+            for row in rows
+        }
+
+    def get_memo(self, input_hash: str) -> Optional[Dict[str, Any]]:
+        row = execute_query("SELECT result FROM orchestration_step_memo WHERE input_hash = ?",
+                            (input_hash,), fetch_one=True)
+        return deserialize_json(row["result"]) if row else None
+
+    def save_memo(self, input_hash: str, result: Dict[str, Any]) -> None:
+        execute_query(
+            "INSERT OR REPLACE INTO orchestration_step_memo (input_hash, result, created_at) VALUES (?, ?, ?)",
+            (input_hash, serialize_json(result), utc_now().isoformat())
+        )
+
+    def prune(self, max_finished_executions: int, max_memo_entries: int) -> None:
+        """Keep only the newest finished executions and memo entries; running executions are never pruned."""
+        placeholders = ",".join("?" * len(FINISHED_STATUSES))
+        expired = f"""
+            SELECT id FROM orchestration_executions WHERE status IN ({placeholders})
+            ORDER BY completed_at DESC LIMIT -1 OFFSET ?
+        """
+        params = (*FINISHED_STATUSES, max_finished_executions)
+        with prompt_store_db_connection() as conn:
+            try:
+                conn.execute(f"DELETE FROM orchestration_step_checkpoints WHERE execution_id IN ({expired})", params)
+                conn.execute(f"DELETE FROM orchestration_executions WHERE id IN ({expired})", params)
+                conn.execute(
+                    """
+                    DELETE FROM orchestration_step_memo WHERE input_hash IN (
+                        SELECT input_hash FROM orchestration_step_memo ORDER BY created_at DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (max_memo_entries,)
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
@@ -1,17 +1,45 @@
-"""Dynamic prompt orchestration service for conditional chains and pipelines."""
+"""Dynamic prompt orchestration service for conditional chains and pipelines.
+
+Chain and pipeline executions are checkpointed step by step in SQLite (see
+``executor``): a failed or interrupted execution can be resumed without
+recomputing finished steps, and steps without a data dependency on each
+other run concurrently.
+"""
 
 import asyncio
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Tuple
 from services.shared.integrations.clients.clients import ServiceClients
 from services.shared.utilities import generate_id, utc_now
 from ...infrastructure.cache import prompt_store_cache
+from ...infrastructure.templates import compile_template
+from ...infrastructure.selection import PromptMatch, prompt_selection_index
+from ..prompts.repository import PromptRepository
+from ..ab_testing.repository import ABTestRepository
+from .executor import CheckpointedStepExecutor, FieldSet, step_outputs, terminated_at
+from .repository import OrchestrationExecutionRepository
+
+DEFAULT_MAX_FINISHED_EXECUTIONS = 1000
+DEFAULT_MAX_MEMO_ENTRIES = 10_000
+
+# Per execution kind: definition id field, steps key, current step field, context field, results field
+_EXECUTION_FIELDS = {
+    "chain": ("chain_id", "steps", "current_step", "context", "step_results"),
+    "pipeline": ("pipeline_id", "stages", "current_stage", "data", "stage_results"),
+}
 
 
 class PromptOrchestrator:
     """Service for orchestrating complex prompt workflows."""
 
-    def __init__(self):
+    def __init__(self, repository: Optional[OrchestrationExecutionRepository] = None,
+                 max_finished_executions: int = DEFAULT_MAX_FINISHED_EXECUTIONS,
+                 max_memo_entries: int = DEFAULT_MAX_MEMO_ENTRIES):
         self.clients = ServiceClients()
+        self.repository = repository or OrchestrationExecutionRepository()
+        self.step_executor = CheckpointedStepExecutor(self.repository)
+        self.max_finished_executions = max_finished_executions
+        self.max_memo_entries = max_memo_entries
+        # Executions running in this process; finished ones live in the database
         self.active_pipelines: Dict[str, Dict[str, Any]] = {}
 
     async def create_conditional_chain(self, chain_definition: Dict[str, Any]) -> Dict[str, Any]:
@@ -40,50 +68,7 @@ class PromptOrchestrator:
         if not chain:
             return {"error": "Chain not found"}
 
-        execution_id = generate_id()
-        execution = {
-            "id": execution_id,
-            "chain_id": chain_id,
-            "status": "running",
-            "current_step": 0,
-            "context": initial_context.copy(),
-            "step_results": [],
-            "started_at": utc_now().isoformat()
-        }
-
-        self.active_pipelines[execution_id] = execution
-
-        try:
-            # Execute chain steps
-            for step_idx, step in enumerate(chain["steps"]):
-                execution["current_step"] = step_idx
-
-                # Check conditions for this step
-                if not await self._check_step_conditions(step, execution["context"]):
-                    continue  # Skip this step
-
-                # Execute the step
-                step_result = await self._execute_step(step, execution["context"])
-                execution["step_results"].append(step_result)
-
-                # Update context with step results
-                execution["context"].update(step_result.get("outputs", {}))
-
-                # Check for early termination conditions
-                if step_result.get("terminate_chain", False):
-                    break
-
-            execution["status"] = "completed"
-            execution["completed_at"] = utc_now().isoformat()
-
-        except Exception as e:
-            execution["status"] = "failed"
-            execution["error"] = str(e)
-
-        # Cache final execution state
-        await prompt_store_cache.set(f"execution:{execution_id}", execution, ttl=3600)
-
-        return execution
+        return await self._start_execution("chain", chain_id, chain, initial_context)
 
     async def _check_step_conditions(self, step: Dict[str, Any], context: Dict[str, Any]) -> bool:
         """Check if conditions are met for executing a step."""
@@ -258,12 +243,8 @@ class PromptOrchestrator:
         }
 
     def _fill_template(self, template: str, context: Dict[str, Any]) -> str:
-        """Fill template variables with context values."""
-        result = template
-        for key, value in context.items():
-            placeholder = f"{{{key}}}"
-            result = result.replace(placeholder, str(value))
-        return result
+        """Fill template variables with context values; unknown placeholders are kept."""
+        return compile_template(template).render(context)
 
     # Pipeline Management
     async def create_pipeline(self, pipeline_definition: Dict[str, Any]) -> Dict[str, Any]:
@@ -289,39 +270,7 @@ class PromptOrchestrator:
         if not pipeline:
             return {"error": "Pipeline not found"}
 
-        execution_id = generate_id()
-        execution = {
-            "id": execution_id,
-            "pipeline_id": pipeline_id,
-            "status": "running",
-            "current_stage": 0,
-            "data": input_data.copy(),
-            "stage_results": [],
-            "started_at": utc_now().isoformat()
-        }
-
-        try:
-            # Execute pipeline stages
-            for stage_idx, stage in enumerate(pipeline["stages"]):
-                execution["current_stage"] = stage_idx
-
-                # Execute stage
-                stage_result = await self._execute_pipeline_stage(stage, execution["data"])
-                execution["stage_results"].append(stage_result)
-
-                # Update data with stage outputs
-                if "outputs" in stage_result:
-                    execution["data"].update(stage_result["outputs"])
-
-            execution["status"] = "completed"
-            execution["completed_at"] = utc_now().isoformat()
-
-        except Exception as e:
-            execution["status"] = "failed"
-            execution["error"] = str(e)
-
-        await prompt_store_cache.set(f"pipeline_execution:{execution_id}", execution, ttl=3600)
-        return execution
+        return await self._start_execution("pipeline", pipeline_id, pipeline, input_data)
 
     async def _execute_pipeline_stage(self, stage: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a single pipeline stage."""
@@ -413,29 +362,197 @@ class PromptOrchestrator:
             "outputs": {"result": f"Executed {prompt_config.get('name', 'prompt')}"}
         }
 
+    # Checkpointed Execution
+    async def get_execution(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """Get a running or finished chain/pipeline execution from its checkpoints."""
+        row = self.repository.get_execution(execution_id)
+        if not row:
+            return None
+        checkpoints = self.repository.get_checkpoints(execution_id)
+        execution = self._build_execution(row["kind"], execution_id, row["definition_id"], row["definition"],
+                                          row["initial_context"], checkpoints, row["started_at"])
+        execution["status"] = row["status"]
+        if row["error"]:
+            execution["error"] = row["error"]
+        if row["completed_at"]:
+            execution["completed_at"] = row["completed_at"]
+        return execution
+
+    async def resume_execution(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """Resume a failed or interrupted execution from its last checkpoints."""
+        row = self.repository.get_execution(execution_id)
+        if not row:
+            return None
+        if execution_id in self.active_pipelines:
+            raise ValueError(f"Execution {execution_id} is already running")
+        if row["status"] == "completed":
+            return await self.get_execution(execution_id)
+
+        self.repository.update_status(execution_id, "running")
+        return await self._run_execution(row["kind"], execution_id, row["definition_id"], row["definition"],
+                                         row["initial_context"], row["started_at"])
+
+    async def _start_execution(self, kind: str, definition_id: str, definition: Dict[str, Any],
+                               initial_context: Dict[str, Any]) -> Dict[str, Any]:
+        execution_id = generate_id()
+        started_at = utc_now().isoformat()
+        self.repository.create_execution(execution_id, kind, definition_id, definition, initial_context, started_at)
+        return await self._run_execution(kind, execution_id, definition_id, definition, initial_context, started_at)
+
+    async def _run_execution(self, kind: str, execution_id: str, definition_id: str, definition: Dict[str, Any],
+                             initial_context: Dict[str, Any], started_at: str) -> Dict[str, Any]:
+        _, steps_key, _, _, _ = _EXECUTION_FIELDS[kind]
+        checkpoints = self.repository.get_checkpoints(execution_id)
+        execution = self._build_execution(kind, execution_id, definition_id, definition,
+                                          initial_context, checkpoints, started_at)
+        self.active_pipelines[execution_id] = execution
+
+        if kind == "chain":
+            step_io, should_run, execute = self._chain_step_io, self._check_step_conditions, self._execute_step
+        else:
+            step_io, should_run, execute = self._pipeline_stage_io, self._always_run, self._execute_pipeline_stage
+
+        try:
+            checkpoints = await self.step_executor.run(
+                execution_id, kind, definition.get(steps_key, []), initial_context, checkpoints,
+                step_io, should_run, execute
+            )
+            execution = self._build_execution(kind, execution_id, definition_id, definition,
+                                              initial_context, checkpoints, started_at)
+            execution["status"] = "completed"
+            execution["completed_at"] = utc_now().isoformat()
+
+        except Exception as e:
+            execution = self._build_execution(kind, execution_id, definition_id, definition, initial_context,
+                                              self.repository.get_checkpoints(execution_id), started_at)
+            execution["status"] = "failed"
+            execution["error"] = str(e)
+            execution["completed_at"] = utc_now().isoformat()
+
+        finally:
+            self.active_pipelines.pop(execution_id, None)
+
+        self.repository.update_status(execution_id, execution["status"], execution.get("error"),
+                                      execution["completed_at"])
+        self.repository.prune(self.max_finished_executions, self.max_memo_entries)
+
+        cache_key = "execution" if kind == "chain" else "pipeline_execution"
+        await prompt_store_cache.set(f"{cache_key}:{execution_id}", execution, ttl=3600)
+        return execution
+
+    @staticmethod
+    def _build_execution(kind: str, execution_id: str, definition_id: str, definition: Dict[str, Any],
+                         initial_context: Dict[str, Any], checkpoints: Dict[int, Dict[str, Any]],
+                         started_at: str) -> Dict[str, Any]:
+        """Execution state as a sequential run would have left it after the checkpointed steps."""
+        id_field, _, current_field, context_field, results_field = _EXECUTION_FIELDS[kind]
+        stop_at = terminated_at(checkpoints)
+        context = dict(initial_context)
+        results = []
+        for index in sorted(checkpoints):
+            if stop_at is not None and index > stop_at:
+                break
+            checkpoint = checkpoints[index]
+            if checkpoint["status"] in ("completed", "failed"):
+                results.append(checkpoint["result"])
+                context.update(step_outputs(checkpoint))
+
+        return {
+            "id": execution_id,
+            id_field: definition_id,
+            "status": "running",
+            current_field: max(checkpoints, default=0),
+            context_field: context,
+            results_field: results,
+            "completed_steps": len(checkpoints),
+            "started_at": started_at
+        }
+
+    @staticmethod
+    def _chain_step_io(step: Dict[str, Any]) -> Tuple[FieldSet, FieldSet]:
+        """Context fields a chain step reads and writes (None means any field)."""
+        step_type = step.get("type", "prompt")
+        condition_fields = {condition.get("field") for condition in step.get("conditions", [])}
+
+        if step_type == "llm_call":
+            variables = compile_template(step.get("prompt_template", "")).variables
+            return frozenset(condition_fields | set(variables)), frozenset({"response", "raw_response"})
+        if step_type == "condition_check":
+            checked = {condition.get("field") for condition in step.get("check_conditions", [])}
+            return frozenset(condition_fields | checked), frozenset({"condition_result"})
+        if step_type in ("prompt", "data_transformation"):
+            # Prompt steps receive the whole context; transformations return it
+            return None, (None if step_type == "data_transformation" else frozenset({"response", "execution_time"}))
+        return frozenset(condition_fields), frozenset()
+
+    @staticmethod
+    def _pipeline_stage_io(stage: Dict[str, Any]) -> Tuple[FieldSet, FieldSet]:
+        """Data fields a pipeline stage reads and writes (None means any field)."""
+        stage_type = stage.get("type")
+        if stage_type == "aggregation":
+            return (frozenset(stage.get("input_fields", [])),
+                    frozenset({stage.get("output_field", "aggregated_result")}))
+        if stage_type in ("parallel_prompts", "sequential_prompts"):
+            return None, None
+        return frozenset(), frozenset()
+
+    @staticmethod
+    async def _always_run(stage: Dict[str, Any], data: Dict[str, Any]) -> bool:
+        return True
+
     # Context-Aware Prompt Selection
     async def select_optimal_prompt(self, task_description: str, context: Dict[str, Any] = None) -> Optional[str]:
         """Select the optimal prompt for a given task based on context."""
-        context = context or {}
-
-        # This would analyze available prompts and select the best one
-        # For now, return a mock selection
-        return "default_prompt_id"
+        matches = await self._rank_prompts(task_description, context or {}, limit=1)
+        return matches[0].prompt_id if matches else None
 
     async def get_prompt_recommendations(self, task_description: str, context: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """Get prompt recommendations for a task."""
-        # Analyze task and context to recommend prompts
-        recommendations = [
-            {
-                "prompt_id": "code_generation_v1",
-                "confidence": 0.85,
-                "reason": "Best for code generation tasks"
-            },
+        context = context or {}
+        matches = await self._rank_prompts(task_description, context, limit=int(context.get("limit", 5)))
+
+        return [
             {
-                "prompt_id": "content_writing_v2",
-                "confidence": 0.72,
-                "reason": "Good alternative for structured content"
+                "prompt_id": match.prompt_id,
+                "name": match.name,
+                "category": match.category,
+                "confidence": round(match.score, 4),
+                "reason": self._explain_match(match),
+                "breakdown": match.breakdown
             }
+            for match in matches
         ]
 
-        return recommendations
+    async def _rank_prompts(self, task_description: str, context: Dict[str, Any], limit: int) -> List[PromptMatch]:
+        """Rank prompts from the in-memory selection index (built on first use)."""
+        if not prompt_selection_index.loaded:
+            await asyncio.to_thread(prompt_selection_index.ensure_loaded, self._load_selection_corpus)
+
+        tags = context.get("tags") or []
+        if isinstance(tags, str):
+            tags = [tags]
+        return prompt_selection_index.search(
+            task_description,
+            k=limit,
+            category=context.get("category"),
+            tags=tags,
+            exclude_ids=context.get("exclude_prompt_ids")
+        )
+
+    @staticmethod
+    def _load_selection_corpus():
+        return PromptRepository().get_selection_corpus(), ABTestRepository().get_decided_outcomes()
+
+    @staticmethod
+    def _explain_match(match: PromptMatch) -> str:
+        reasons = []
+        if match.matched_terms:
+            reasons.append(f"matches {', '.join(repr(term) for term in match.matched_terms[:5])}")
+        if match.breakdown.get("category"):
+            reasons.append(f"in category '{match.category}'")
+        if match.breakdown.get("tags"):
+            reasons.append("shares requested tags")
+        if match.breakdown.get("ab_outcome", 0.5) > 0.5:
+            reasons.append("won A/B tests")
+        reasons.append(f"performance {match.breakdown.get('performance', 0.0):.2f}")
+        return "; ".join(reasons)
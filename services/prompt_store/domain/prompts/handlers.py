@@ -131,24 +131,59 @@ class PromptHandlers(BaseHandler):
             return create_error_response(f"Failed to list prompts: {str(e)}", "INTERNAL_ERROR")
 
     async def handle_search_prompts(self, query: str, category: Optional[str] = None,
-                                   tags: Optional[List[str]] = None, limit: int = 50) -> Dict[str, Any]:
+                                   tags: Optional[List[str]] = None, limit: int = 50,
+                                   tag_match: str = "any",
+                                   exclude_tags: Optional[List[str]] = None) -> Dict[str, Any]:
         """Search prompts."""
         try:
-            prompts = self.service.search_prompts(query, category, tags, limit)
+            prompts = self.service.search_prompts(query, category, tags, limit, tag_match, exclude_tags)
             result = {
                 "items": [p.to_dict() for p in prompts],
                 "total": len(prompts),
                 "has_more": False,
                 "limit": limit,
-                "offset": 0
+                "offset": 0,
+                "facets": {
+                    "tags": self.service.get_tag_facets(tags, tag_match, exclude_tags, query, category)
+                }
             }
 
             return create_success_response(
                 message="Prompts searched successfully",
                 data=result
             )
+        except ValueError as e:
+            error_response = create_error_response(str(e), "VALIDATION_ERROR")
+            return error_response.model_dump()
         except Exception as e:
             error_response = create_error_response(f"Failed to search prompts: {str(e)}", "INTERNAL_ERROR")
+            return error_response.model_dump()
+
+    async def handle_get_prompts_by_tags(self, tags: List[str], match: str = "any",
+                                         exclude_tags: Optional[List[str]] = None,
+                                         limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+        """Get prompts by tags with tag facet counts."""
+        try:
+            prompts = self.service.get_prompts_by_tags(tags, limit, match, exclude_tags, offset)
+            result = {
+                "items": [p.to_dict() for p in prompts],
+                "total": len(prompts),
+                "limit": limit,
+                "offset": offset,
+                "facets": {"tags": self.service.get_tag_facets(tags, match, exclude_tags)}
+            }
+
+            response = create_success_response(
+                message="Prompts retrieved successfully",
+                data=result
+            )
+            return response.model_dump()
+        except ValueError as e:
+            error_response = create_error_response(str(e), "VALIDATION_ERROR")
+            return error_response.model_dump()
+        except Exception as e:
+            error_response = create_error_response(f"Failed to get prompts by tags: {str(e)}", "INTERNAL_ERROR")
+            return error_response.model_dump()
 
     async def handle_fork_prompt(self, prompt_id: str, new_name: str, created_by: str = "api_user",
                                 **changes) -> Dict[str, Any]:
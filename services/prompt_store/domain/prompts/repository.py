@@ -3,10 +3,17 @@
 Handles database operations for prompts following domain-driven design.
 """
 
+from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any, Tuple
 from services.prompt_store.core.repository import BaseRepository
 from services.prompt_store.core.entities import Prompt
-from services.prompt_store.db.queries import execute_paged_query, execute_query, serialize_json, deserialize_json
+from services.prompt_store.db.queries import (
+    execute_paged_query, execute_query, execute_search_query, serialize_json, deserialize_json,
+    build_tag_filter, build_fts_match
+)
+from services.prompt_store.infrastructure.utils import generate_prompt_hash
+
+TAG_MATCH_MODES = ("any", "all")
 
 
 class PromptRepository(BaseRepository[Prompt]):
@@ -56,7 +63,8 @@ class PromptRepository(BaseRepository[Prompt]):
             "version": entity.version,
             "parent_id": entity.parent_id,
             "performance_score": entity.performance_score,
-            "usage_count": entity.usage_count
+            "usage_count": entity.usage_count,
+            "content_hash": generate_prompt_hash(entity.content, entity.variables)
         }
 
     def save(self, entity: Prompt) -> Prompt:
@@ -90,6 +98,18 @@ class PromptRepository(BaseRepository[Prompt]):
         if not updates:
             return self.get_by_id(entity_id)
 
+        # Keep the duplicate-detection hash in step with content and variables
+        if "content" in updates or "variables" in updates:
+            current = None
+            if not {"content", "variables"} <= updates.keys():
+                current = self.get_by_id(entity_id)
+                if current is None:
+                    return None
+            updates = {**updates, "content_hash": generate_prompt_hash(
+                updates["content"] if "content" in updates else current.content,
+                updates["variables"] if "variables" in updates else current.variables
+            )}
+
         # Build update query
         set_parts = []
         values = []
@@ -108,7 +128,7 @@ class PromptRepository(BaseRepository[Prompt]):
             SET {', '.join(set_parts)}, updated_at = ?
             WHERE id = ?
         """
-        values.insert(-1, "CURRENT_TIMESTAMP")  # Insert updated_at before id
+        values.insert(-1, datetime.now(timezone.utc).isoformat())  # Insert updated_at before id
 
         execute_query(query, values)
         return self.get_by_id(entity_id)
@@ -156,6 +176,12 @@ class PromptRepository(BaseRepository[Prompt]):
         result = execute_query(query, tuple(params), fetch_one=True)
         return result["count"] if result else 0
 
+    def get_by_content_hash(self, content_hash: str) -> Optional[Prompt]:
+        """Get an active prompt by its content hash."""
+        query = f"SELECT * FROM {self.table_name} WHERE content_hash = ? AND is_active = 1 LIMIT 1"
+        row = execute_query(query, (content_hash,), fetch_one=True)
+        return self._row_to_entity(row) if row else None
+
     def get_by_name(self, category: str, name: str) -> Optional[Prompt]:
         """Get prompt by category and name."""
         query = f"SELECT * FROM {self.table_name} WHERE category = ? AND name = ? AND is_active = 1"
@@ -163,28 +189,15 @@ class PromptRepository(BaseRepository[Prompt]):
         return self._row_to_entity(row) if row else None
 
     def search_prompts(self, query: str, category: Optional[str] = None,
-                      tags: Optional[List[str]] = None, limit: int = 50) -> List[Prompt]:
-        """Search prompts using FTS and filters."""
-        from services.prompt_store.db.queries import execute_search_query
-
-        # Build filters
-        filters = {}
-        if category:
-            filters["category"] = category
-        if tags:
-            # For tags, we need to check if any of the search tags are in the prompt's tags
-            # This is a simplified implementation - could be enhanced
-            pass
-
-        # Use FTS search
-        results = execute_search_query(query, "prompts", limit=limit)
-        prompts = [self._row_to_entity(row) for row in results]
-
-        # Apply additional filters
-        if tags:
-            prompts = [p for p in prompts if any(tag in p.tags for tag in tags)]
-
-        return prompts
+                      tags: Optional[List[str]] = None, limit: int = 50,
+                      tag_match: str = "any", exclude_tags: Optional[List[str]] = None) -> List[Prompt]:
+        """Search active prompts using FTS with category and tag filters applied before the limit."""
+        filters = {"is_active": 1, "category": category}
+        results = execute_search_query(
+            query, self.table_name, filters=filters, limit=limit,
+            conditions=self._tag_conditions(tags, tag_match, exclude_tags)
+        )
+        return [self._row_to_entity(row) for row in results]
 
     def get_by_category(self, category: str, limit: int = 50, offset: int = 0) -> List[Prompt]:
         """Get prompts by category."""
@@ -192,26 +205,68 @@ class PromptRepository(BaseRepository[Prompt]):
         rows = execute_query(query, (category, limit, offset), fetch_all=True)
         return [self._row_to_entity(row) for row in rows]
 
-    def get_by_tags(self, tags: List[str], limit: int = 50) -> List[Prompt]:
-        """Get prompts containing any of the specified tags."""
-        # This is a simplified implementation - in practice, you'd use JSON functions
-        all_prompts = []
-        for tag in tags:
-            query = f"SELECT * FROM {self.table_name} WHERE tags LIKE ? AND is_active = 1 ORDER BY created_at DESC LIMIT ?"
-            rows = execute_query(query, (f"%{tag}%", limit), fetch_all=True)
-            all_prompts.extend([self._row_to_entity(row) for row in rows])
-
-        # Remove duplicates and limit
-        seen_ids = set()
-        unique_prompts = []
-        for prompt in all_prompts:
-            if prompt.id not in seen_ids:
-                seen_ids.add(prompt.id)
-                unique_prompts.append(prompt)
-                if len(unique_prompts) >= limit:
-                    break
-
-        return unique_prompts
+    def get_by_tags(self, tags: List[str], limit: int = 50, match: str = "any",
+                    exclude_tags: Optional[List[str]] = None, offset: int = 0) -> List[Prompt]:
+        """Get active prompts matching ``tags`` (``match`` is "any" or "all"), minus ``exclude_tags``."""
+        if not tags and not exclude_tags:
+            return []
+
+        tag_clause, params = self._tag_conditions(tags, match, exclude_tags)
+        # "+is_active" keeps the planner on the tag index instead of idx_prompts_active
+        where = f"+is_active = 1 AND {tag_clause}" if tag_clause else "is_active = 1"
+        query = f"SELECT * FROM {self.table_name} WHERE {where} ORDER BY created_at DESC LIMIT ? OFFSET ?"
+        rows = execute_query(query, params + (limit, offset), fetch_all=True)
+        return [self._row_to_entity(row) for row in rows]
+
+    def get_tag_facets(self, tags: Optional[List[str]] = None, match: str = "any",
+                       exclude_tags: Optional[List[str]] = None, query: Optional[str] = None,
+                       category: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Tag counts over every prompt matching the filters (not just one page)."""
+        conditions = ["+p.is_active = 1"]
+        params: List[Any] = []
+        if query:
+            conditions.append("p.rowid IN (SELECT rowid FROM prompts_fts WHERE prompts_fts MATCH ?)")
+            params.append(build_fts_match(query))
+        if category:
+            conditions.append("p.category = ?")
+            params.append(category)
+        tag_clause, tag_params = self._tag_conditions(tags, match, exclude_tags, id_column="p.id")
+        if tag_clause:
+            conditions.append(tag_clause)
+            params.extend(tag_params)
+
+        rows = execute_query(f"""
+            SELECT t.tag AS tag, COUNT(*) AS count
+            FROM prompt_tags t JOIN {self.table_name} p ON p.id = t.prompt_id
+            WHERE {' AND '.join(conditions)}
+            GROUP BY t.tag
+            ORDER BY count DESC, t.tag
+            LIMIT ?
+        """, tuple(params) + (limit,), fetch_all=True)
+        return [{"tag": row["tag"], "count": row["count"]} for row in rows or []]
+
+    def _tag_conditions(self, tags: Optional[List[str]], match: str,
+                        exclude_tags: Optional[List[str]], id_column: str = "id") -> Tuple[str, Tuple]:
+        if match not in TAG_MATCH_MODES:
+            raise ValueError(f"Invalid tag match mode: {match}. Use one of: {', '.join(TAG_MATCH_MODES)}")
+        return build_tag_filter(
+            any_tags=tags if match == "any" else None,
+            all_tags=tags if match == "all" else None,
+            none_tags=exclude_tags,
+            id_column=id_column
+        )
+
+    def get_selection_corpus(self) -> List[Dict[str, Any]]:
+        """Active prompts with the fields the selection index ranks on."""
+        query = f"""
+            SELECT id, name, category, description, content, tags, performance_score, usage_count
+            FROM {self.table_name}
+            WHERE is_active = 1
+        """
+        rows = execute_query(query, fetch_all=True)
+        for row in rows:
+            row["tags"] = deserialize_json(row["tags"]) or []
+        return rows
 
     def increment_usage_count(self, prompt_id: str) -> bool:
         """Increment usage count for a prompt."""
@@ -3,18 +3,21 @@
 Handles business logic for prompts following domain-driven design.
 """
 
-import asyncio
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Callable
 from services.prompt_store.core.service import BaseService
 from services.prompt_store.core.entities import Prompt
 from services.prompt_store.domain.prompts.repository import PromptRepository
-from services.prompt_store.infrastructure.cache import prompt_store_cache
+from services.prompt_store.infrastructure.diff import token_fingerprint, fingerprint_similarity
+from services.prompt_store.infrastructure.resolution import prompt_resolution_cache
+from services.prompt_store.infrastructure.selection import prompt_selection_index
+from services.prompt_store.infrastructure.templates import compile_template
+from services.prompt_store.infrastructure.usage import usage_aggregator
 from services.prompt_store.infrastructure.utils import (
     generate_prompt_hash,
     validate_template_variables,
     calculate_prompt_complexity,
     sanitize_prompt_content,
-    detect_prompt_drift,
+    summarize_prompt_drift,
     generate_prompt_suggestions
 )
 from services.shared.utilities import generate_id, utc_now
@@ -46,11 +49,12 @@ class PromptService(BaseService[Prompt]):
             if not validation["valid"]:
                 raise ValueError(f"Template validation failed: {', '.join(validation['errors'])}")
 
-        # Check for duplicate prompt by content hash
-        content_hash = generate_prompt_hash(content, variables)
-        existing = self._find_by_content_hash(content_hash)
-        if existing:
-            raise ValueError(f"Similar prompt already exists: {existing.name} in {existing.category}")
+        # Check for duplicate prompt by content hash; forks start as copies of their parent
+        if not data.get("parent_id"):
+            content_hash = generate_prompt_hash(content, variables)
+            existing = self._find_by_content_hash(content_hash)
+            if existing:
+                raise ValueError(f"Similar prompt already exists: {existing.name} in {existing.category}")
 
         # Check for duplicate name in category
         category = data["category"]
@@ -79,66 +83,81 @@ class PromptService(BaseService[Prompt]):
         # Save to database
         saved_prompt = self.repository.save(prompt)
 
-        # Cache the prompt (only if event loop is running)
-        try:
-            loop = asyncio.get_running_loop()
-            loop.create_task(self._cache_prompt(saved_prompt))
-        except RuntimeError:
-            # No event loop running (e.g., in tests), skip async caching
-            pass
+        # Cache a snapshot of the new prompt and make it selectable
+        prompt_resolution_cache.put(saved_prompt)
+        prompt_selection_index.upsert(saved_prompt)
 
         return saved_prompt
 
+    def get_entity(self, entity_id: str) -> Optional[Prompt]:
+        """Get prompt by ID through the resolution cache."""
+        return prompt_resolution_cache.get_by_id(entity_id, lambda: self.repository.get_by_id(entity_id))
+
     def get_prompt_by_name(self, category: str, name: str) -> Optional[Prompt]:
         """Get prompt by category and name with caching."""
-        cache_key = f"prompt:{category}:{name}"
-
-        # Try cache first
-        cached = asyncio.run(prompt_store_cache.get(cache_key))
-        if cached:
-            return cached
-
-        # Get from database
-        prompt = self.repository.get_by_name(category, name)
-        if prompt:
-            # Cache for future use
-            asyncio.create_task(prompt_store_cache.set(cache_key, prompt, ttl=3600))
-
-        return prompt
+        return prompt_resolution_cache.get_by_name(
+            category, name, lambda: self.repository.get_by_name(category, name)
+        )
 
-    def fill_template(self, prompt: Prompt, variables: Dict[str, Any]) -> str:
+    def update_entity(self, entity_id: str, updates: Dict[str, Any]) -> Optional[Prompt]:
+        """Update prompt and refresh its cached snapshot."""
+        prompt_resolution_cache.invalidate(entity_id)
+        updated = super().update_entity(entity_id, updates)
+        if updated:
+            prompt_resolution_cache.put(updated)
+            prompt_selection_index.upsert(updated)
+        return updated
+
+    def delete_entity(self, entity_id: str) -> bool:
+        """Delete prompt and drop its cached snapshot."""
+        deleted = super().delete_entity(entity_id)
+        prompt_resolution_cache.invalidate(entity_id)
+        prompt_selection_index.remove(entity_id)
+        return deleted
+
+    def fill_template(self, prompt: Prompt, variables: Dict[str, Any],
+                      escape: Optional[Callable[[str], str]] = None) -> str:
         """Fill template variables in prompt content."""
         if not prompt.is_template:
             return prompt.content
 
-        # Validate that all required variables are provided
-        required_vars = set(prompt.variables)
-        provided_vars = set(variables.keys())
-        missing = required_vars - provided_vars
+        # Parsed once per prompt version
+        compiled = compile_template(prompt.content, (prompt.id, prompt.version))
+
+        # Validate that all required variables are provided (template defaults count)
+        missing = compiled.missing_variables(prompt.variables, variables)
         if missing:
             raise ValueError(f"Missing required variables: {', '.join(missing)}")
 
         # Fill template
-        from services.prompt_store.infrastructure.utils import format_prompt_template
-        filled_content = format_prompt_template(prompt.content, variables)
+        filled_content = compiled.render(variables, escape)
 
-        # Increment usage count
-        asyncio.create_task(self._increment_usage_async(prompt.id))
+        # Counted in memory; usage_count is written in batches
+        usage_aggregator.increment(prompt.id)
+        prompt_selection_index.note_usage(prompt.id)
 
         return filled_content
 
     def search_prompts(self, query: str, category: Optional[str] = None,
-                      tags: Optional[List[str]] = None, limit: int = 50) -> List[Prompt]:
+                      tags: Optional[List[str]] = None, limit: int = 50,
+                      tag_match: str = "any", exclude_tags: Optional[List[str]] = None) -> List[Prompt]:
         """Search prompts with enhanced filtering."""
-        return self.repository.search_prompts(query, category, tags, limit)
+        return self.repository.search_prompts(query, category, tags, limit, tag_match, exclude_tags)
 
     def get_prompts_by_category(self, category: str, limit: int = 50, offset: int = 0) -> List[Prompt]:
         """Get prompts by category."""
         return self.repository.get_by_category(category, limit, offset)
 
-    def get_prompts_by_tags(self, tags: List[str], limit: int = 50) -> List[Prompt]:
+    def get_prompts_by_tags(self, tags: List[str], limit: int = 50, match: str = "any",
+                            exclude_tags: Optional[List[str]] = None, offset: int = 0) -> List[Prompt]:
         """Get prompts by tags."""
-        return self.repository.get_by_tags(tags, limit)
+        return self.repository.get_by_tags(tags, limit, match, exclude_tags, offset)
+
+    def get_tag_facets(self, tags: Optional[List[str]] = None, match: str = "any",
+                       exclude_tags: Optional[List[str]] = None, query: Optional[str] = None,
+                       category: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Get tag counts for the prompts matching a search or tag filter."""
+        return self.repository.get_tag_facets(tags, match, exclude_tags, query, category, limit)
 
     def fork_prompt(self, prompt_id: str, new_name: str, created_by: str,
                    changes: Optional[Dict[str, Any]] = None) -> Prompt:
@@ -164,7 +183,12 @@ class PromptService(BaseService[Prompt]):
         if changes:
             fork_data.update(changes)
 
-        return self.create_entity(fork_data)
+        forked = self.create_entity(fork_data)
+
+        # Lineage lookups of the original must see the new fork
+        prompt_resolution_cache.invalidate(prompt_id)
+
+        return forked
 
     def update_prompt_content(self, prompt_id: str, content: str, variables: Optional[List[str]] = None,
                              change_summary: str = "", updated_by: str = "api_user") -> Prompt:
@@ -176,8 +200,8 @@ class PromptService(BaseService[Prompt]):
         # Create version record
         self._create_version_record(prompt, change_summary, updated_by)
 
-        # Update content
-        updates = {"content": sanitize_prompt_content(content)}
+        # Update content; the previous content is kept in the version record
+        updates = {"content": sanitize_prompt_content(content), "version": prompt.version + 1}
         if variables is not None:
             updates["variables"] = variables
 
@@ -185,17 +209,17 @@ class PromptService(BaseService[Prompt]):
         complexity = calculate_prompt_complexity(content, variables or prompt.variables)
         updates["performance_score"] = complexity
 
+        # Replaces the cached snapshot with the new version
         updated_prompt = self.update_entity(prompt_id, updates)
 
-        # Invalidate cache
-        asyncio.create_task(self._invalidate_prompt_cache(prompt.category, prompt.name))
-
         return updated_prompt
 
     def detect_drift(self, prompt_id: str) -> Dict[str, Any]:
         """Detect prompt drift over time."""
-        # Get prompt versions history
-        versions = self._get_prompt_versions(prompt_id)
+        from services.prompt_store.domain.prompts.versioning_repository import PromptVersioningRepository
+
+        # Compare stored version fingerprints instead of reloading every version's content
+        versions = PromptVersioningRepository().get_version_fingerprints(prompt_id)
         if not versions:
             return {"drift_detected": False, "drift_score": 0.0, "significant_changes": []}
 
@@ -203,10 +227,14 @@ class PromptService(BaseService[Prompt]):
         if not current_prompt:
             raise ValueError(f"Prompt {prompt_id} not found")
 
-        historical_versions = [{"content": v.content, "version": v.version, "created_at": v.created_at.isoformat()}
-                              for v in versions]
+        current_fingerprint = token_fingerprint(current_prompt.content)
+        similarities = [{
+            "version": v["version"],
+            "similarity": fingerprint_similarity(current_fingerprint, v["token_fingerprint"]),
+            "created_at": v["created_at"]
+        } for v in versions]
 
-        return detect_prompt_drift(current_prompt.content, historical_versions)
+        return summarize_prompt_drift(similarities)
 
     def get_suggestions(self, prompt_id: str) -> List[str]:
         """Get improvement suggestions for a prompt."""
@@ -241,10 +269,8 @@ class PromptService(BaseService[Prompt]):
         return updated_count
 
     def _find_by_content_hash(self, content_hash: str) -> Optional[Prompt]:
-        """Find prompt by content hash (simplified implementation)."""
-        # This would require a content_hash field in the database
-        # For now, return None (no duplicate checking)
-        return None
+        """Find an active prompt by content hash."""
+        return self.repository.get_by_content_hash(content_hash)
 
     def _create_version_record(self, prompt: Prompt, change_summary: str, created_by: str) -> None:
         """Create a version record for prompt changes."""
@@ -269,20 +295,6 @@ class PromptService(BaseService[Prompt]):
         version_repo = PromptVersioningRepository()
         return version_repo.get_versions_for_prompt(prompt_id)
 
-    async def _cache_prompt(self, prompt: Prompt) -> None:
-        """Cache prompt asynchronously."""
-        cache_key = f"prompt:{prompt.category}:{prompt.name}"
-        await prompt_store_cache.set(cache_key, prompt, ttl=3600)
-
-    async def _invalidate_prompt_cache(self, category: str, name: str) -> None:
-        """Invalidate prompt cache."""
-        cache_key = f"prompt:{category}:{name}"
-        await prompt_store_cache.delete(cache_key)
-
-    async def _increment_usage_async(self, prompt_id: str) -> None:
-        """Increment usage count asynchronously."""
-        self.repository.increment_usage_count(prompt_id)
-
     def get_generated_documents(self, prompt_id: str) -> List[Dict[str, Any]]:
         """Get all documents generated by this prompt through refinement."""
         try:
@@ -6,6 +6,8 @@ Handles database operations for prompt versions.
 from typing import List, Optional, Dict, Any
 from services.prompt_store.core.entities import PromptVersion
 from services.prompt_store.db.queries import execute_query, serialize_json, deserialize_json
+from services.prompt_store.db.connection import prompt_store_db_connection
+from services.prompt_store.infrastructure.diff import token_fingerprint
 
 
 class PromptVersioningRepository:
@@ -39,7 +41,8 @@ class PromptVersioningRepository:
             "change_summary": entity.change_summary,
             "change_type": entity.change_type,
             "created_by": entity.created_by,
-            "created_at": entity.created_at.isoformat()
+            "created_at": entity.created_at.isoformat(),
+            "token_fingerprint": token_fingerprint(entity.content)
         }
 
         columns = list(row.keys())
@@ -72,3 +75,35 @@ class PromptVersioningRepository:
         query = f"SELECT * FROM {self.table_name} WHERE prompt_id = ? ORDER BY version DESC LIMIT 1"
         row = execute_query(query, (prompt_id,), fetch_one=True)
         return self._row_to_entity(row) if row else None
+
+    def get_version_fingerprints(self, prompt_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Get token fingerprints of a prompt's versions, newest first.
+
+        Versions saved before fingerprints existed are fingerprinted from
+        their content once and stored.
+        """
+        query = f"""
+            SELECT version, created_at, token_fingerprint FROM {self.table_name}
+            WHERE prompt_id = ? ORDER BY version DESC LIMIT ?
+        """
+        rows = [dict(row) for row in execute_query(query, (prompt_id, limit), fetch_all=True)]
+
+        missing = [row["version"] for row in rows if row["token_fingerprint"] is None]
+        if missing:
+            placeholders = ",".join("?" * len(missing))
+            contents = execute_query(
+                f"SELECT version, content FROM {self.table_name} WHERE prompt_id = ? AND version IN ({placeholders})",
+                (prompt_id, *missing), fetch_all=True
+            )
+            backfill = {row["version"]: token_fingerprint(row["content"]) for row in contents}
+            with prompt_store_db_connection() as conn:
+                conn.executemany(
+                    f"UPDATE {self.table_name} SET token_fingerprint = ? WHERE prompt_id = ? AND version = ?",
+                    [(fingerprint, prompt_id, version) for version, fingerprint in backfill.items()]
+                )
+                conn.commit()
+            for row in rows:
+                if row["token_fingerprint"] is None:
+                    row["token_fingerprint"] = backfill.get(row["version"])
+
+        return rows
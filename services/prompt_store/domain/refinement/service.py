@@ -9,6 +9,7 @@ from datetime import datetime, timezone
 
 from services.prompt_store.domain.prompts.service import PromptService
 from services.prompt_store.infrastructure.cache import prompt_store_cache
+from services.prompt_store.infrastructure.diff import prompt_diff_cache
 from services.shared.utilities import generate_id, utc_now
 
 # Import LLM service clients
@@ -107,7 +108,7 @@ class PromptRefinementService:
         if version_b is None:
             version_b = max(1, prompt.version - 1)  # Previous version
 
-        # Get version details (this would need to be implemented in the versioning repository)
+        # Get version details
         version_a_data = await self._get_prompt_version_data(prompt_id, version_a)
         version_b_data = await self._get_prompt_version_data(prompt_id, version_b)
 
@@ -478,13 +479,22 @@ Provide only the refined prompt content, without additional explanation or forma
 
     async def _get_prompt_version_data(self, prompt_id: str, version: int) -> Optional[Dict[str, Any]]:
         """Get data for a specific prompt version."""
-        # This would need to be implemented in the versioning repository
-        # For now, return mock data
+        from services.prompt_store.domain.prompts.versioning_repository import PromptVersioningRepository
+
+        # The current version lives on the prompt; earlier ones in the version history
+        prompt = self.prompt_service.get_entity(prompt_id)
+        if prompt and prompt.version == version:
+            source = prompt
+        else:
+            source = PromptVersioningRepository().get_version_by_number(prompt_id, version)
+        if not source:
+            return None
+
         return {
             "version": version,
-            "content": f"Version {version} content",
-            "variables": ["var1", "var2"],
-            "created_at": utc_now().isoformat()
+            "content": source.content,
+            "variables": source.variables,
+            "created_at": source.created_at.isoformat()
         }
 
     def _calculate_prompt_differences(self, version_a: Dict[str, Any],
@@ -494,11 +504,12 @@ Provide only the refined prompt content, without additional explanation or forma
             "content_changed": version_a.get("content") != version_b.get("content"),
             "variables_added": [],
             "variables_removed": [],
-            "content_diff": self._simple_text_diff(
+            "content_diff": prompt_diff_cache.diff(
                 version_a.get("content", ""),
                 version_b.get("content", "")
             )
         }
+        differences["similarity"] = differences["content_diff"]["similarity"]
 
         # Compare variables
         vars_a = set(version_a.get("variables", []))
@@ -511,17 +522,10 @@ Provide only the refined prompt content, without additional explanation or forma
     def _calculate_document_differences(self, doc_a: Any, doc_b: Any) -> Dict[str, Any]:
         """Calculate differences between refinement result documents."""
         return {
-            "content_diff": self._simple_text_diff(doc_a.content, doc_b.content),
+            "content_diff": prompt_diff_cache.diff(doc_a.content, doc_b.content),
             "metadata_diff": self._compare_metadata(doc_a.metadata, doc_b.metadata)
         }
 
-    def _simple_text_diff(self, text_a: str, text_b: str) -> str:
-        """Simple text difference calculation."""
-        # This is a very basic diff - in production you'd use a proper diff library
-        if text_a == text_b:
-            return "No differences"
-        return f"Content changed from {len(text_a)} to {len(text_b)} characters"
-
     def _compare_metadata(self, meta_a: Dict[str, Any], meta_b: Dict[str, Any]) -> Dict[str, Any]:
         """Compare document metadata."""
         return {
@@ -100,11 +100,15 @@ class RelationshipsHandlers:
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to delete relationship: {str(e)}")
 
-    def handle_get_relationship_graph(self, prompt_id: str, depth: int = 2) -> Dict[str, Any]:
+    def handle_get_relationship_graph(self, prompt_id: str, depth: int = 2,
+                                      relationship_types: Optional[List[str]] = None,
+                                      min_strength: float = 0.0) -> Dict[str, Any]:
         """Handle request to get relationship graph."""
 
         try:
-            result = self.relationships_service.get_relationship_graph(prompt_id, depth)
+            result = self.relationships_service.get_relationship_graph(
+                prompt_id, depth, relationship_types, min_strength
+            )
 
             response = create_success_response(
                 data=result,
@@ -3,10 +3,63 @@
 Handles data access operations for prompt relationships and semantic connections.
 """
 
-from typing import List, Optional, Dict, Any
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Optional, Dict, Any, Tuple
 from services.prompt_store.db.queries import execute_query
 from services.prompt_store.core.entities import PromptRelationship
 
+MAX_GRAPH_DEPTH = 6
+
+
+class RelationshipGraphCache:
+    """Bounded cache of relationship graphs keyed by ``(root, depth, filters)``.
+
+    Any relationship write clears it, since one edge can belong to many
+    graphs. Node attributes (name, lifecycle status) may lag prompt edits
+    by up to ``ttl_seconds``.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self.clock() - entry[1] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(entry[0])
+
+    def put(self, key: Hashable, graph: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (copy.deepcopy(graph), self.clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Global relationship graph cache instance
+relationship_graph_cache = RelationshipGraphCache()
+
 
 class RelationshipsRepository:
     """Repository for prompt relationship operations."""
@@ -69,6 +122,7 @@ class RelationshipsRepository:
             relationship.created_at.isoformat(),
             relationship.updated_at.isoformat()
         ), fetch_all=False)
+        relationship_graph_cache.clear()
 
         return relationship
 
@@ -140,12 +194,14 @@ class RelationshipsRepository:
         """
 
         execute_query(query, (new_strength, relationship_id), fetch_all=False)
+        relationship_graph_cache.clear()
         return True
 
     def delete_relationship(self, relationship_id: str) -> bool:
         """Delete a relationship."""
         query = f"DELETE FROM {self.table_name} WHERE id = ?"
         execute_query(query, (relationship_id,), fetch_all=False)
+        relationship_graph_cache.clear()
         return True
 
     def delete_relationships_for_prompt(self, prompt_id: str) -> int:
@@ -155,46 +211,99 @@ class RelationshipsRepository:
             WHERE source_prompt_id = ? OR target_prompt_id = ?
         """
         execute_query(query, (prompt_id, prompt_id), fetch_all=False)
+        relationship_graph_cache.clear()
         # Note: execute_query doesn't return affected rows, so we return 0
         # In a real implementation, you'd want to track this
         return 0
 
-    def get_relationship_graph(self, prompt_id: str, depth: int = 2) -> Dict[str, Any]:
-        """Get a relationship graph starting from a prompt."""
-        # This is a simplified implementation
-        # In a real system, you'd want to build a proper graph structure
+    def get_relationship_graph(self, prompt_id: str, depth: int = 2,
+                               relationship_types: Optional[List[str]] = None,
+                               min_strength: float = 0.0) -> Dict[str, Any]:
+        """Get the relationship graph within ``depth`` hops of a prompt.
 
-        visited = set()
-        graph = {"nodes": [], "edges": []}
-
-        def add_to_graph(current_id: str, current_depth: int):
-            if current_id in visited or current_depth > depth:
-                return
-
-            visited.add(current_id)
-
-            # Add node
-            graph["nodes"].append({"id": current_id, "type": "prompt"})
-
-            # Get relationships
-            relationships = self.get_relationships_for_prompt(current_id)
+        Relationships are followed in both directions. Nodes carry their
+        hop distance and prompt attributes; edges are the filtered
+        relationships between returned nodes. Built by one recursive query
+        and cached until the next relationship write.
+        """
+        if not 0 <= depth <= MAX_GRAPH_DEPTH:
+            raise ValueError(f"Graph depth must be between 0 and {MAX_GRAPH_DEPTH}")
+        if not 0.0 <= min_strength <= 1.0:
+            raise ValueError("Relationship strength must be between 0.0 and 1.0")
+        types = tuple(sorted(set(relationship_types or [])))
+        invalid = [t for t in types if t not in self.VALID_RELATIONSHIP_TYPES]
+        if invalid:
+            raise ValueError(f"Invalid relationship type: {', '.join(invalid)}")
+
+        cache_key = (prompt_id, depth, types, min_strength)
+        cached = relationship_graph_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        edge_filter = "r.strength >= ?"
+        filter_params: Tuple[Any, ...] = (min_strength,)
+        if types:
+            edge_filter += f" AND r.relationship_type IN ({','.join('?' * len(types))})"
+            filter_params += types
+
+        # Each recursive branch follows one direction through its own index.
+        # UNION drops repeated (node, hops) rows, so cycles stop at the depth bound.
+        # "+target" keeps edge collection on the source index rather than
+        # probing the (source, target) key for every pair of nodes.
+        query = f"""
+            WITH RECURSIVE
+                walk(node_id, hops) AS (
+                    SELECT ?, 0
+                    UNION
+                    SELECT r.target_prompt_id, w.hops + 1
+                    FROM walk w JOIN {self.table_name} r ON r.source_prompt_id = w.node_id
+                    WHERE w.hops < ? AND {edge_filter}
+                    UNION
+                    SELECT r.source_prompt_id, w.hops + 1
+                    FROM walk w JOIN {self.table_name} r ON r.target_prompt_id = w.node_id
+                    WHERE w.hops < ? AND {edge_filter}
+                ),
+                nodes(node_id, hops) AS (
+                    SELECT w.node_id, MIN(w.hops)
+                    FROM walk w JOIN prompts p ON p.id = w.node_id
+                    GROUP BY w.node_id
+                )
+            SELECT 'node' AS kind, n.node_id AS id, n.hops AS depth,
+                   p.name AS name, p.category AS category, p.lifecycle_status AS lifecycle_status,
+                   NULL AS source, NULL AS target, NULL AS relationship_type, NULL AS strength
+            FROM nodes n JOIN prompts p ON p.id = n.node_id
+            UNION ALL
+            SELECT 'edge', r.id, NULL, NULL, NULL, NULL,
+                   r.source_prompt_id, r.target_prompt_id, r.relationship_type, r.strength
+            FROM nodes n JOIN {self.table_name} r ON r.source_prompt_id = n.node_id
+            WHERE +r.target_prompt_id IN (SELECT node_id FROM nodes)
+              AND {edge_filter}
+        """
+        params = (prompt_id, depth) + filter_params + (depth,) + filter_params + filter_params
+        rows = execute_query(query, params, fetch_all=True) or []
 
-            for rel in relationships:
-                # Add edge
+        graph = {"nodes": [], "edges": []}
+        for row in rows:
+            if row["kind"] == "node":
+                graph["nodes"].append({
+                    "id": row["id"],
+                    "type": "prompt",
+                    "depth": row["depth"],
+                    "name": row["name"],
+                    "category": row["category"],
+                    "lifecycle_status": row["lifecycle_status"]
+                })
+            else:
                 graph["edges"].append({
-                    "source": rel.source_prompt_id,
-                    "target": rel.target_prompt_id,
-                    "type": rel.relationship_type,
-                    "strength": rel.strength
+                    "id": row["id"],
+                    "source": row["source"],
+                    "target": row["target"],
+                    "type": row["relationship_type"],
+                    "strength": row["strength"]
                 })
+        graph["nodes"].sort(key=lambda node: (node["depth"], node["id"]))
 
-                # Recursively add related prompts
-                if rel.source_prompt_id == current_id:
-                    add_to_graph(rel.target_prompt_id, current_depth + 1)
-                else:
-                    add_to_graph(rel.source_prompt_id, current_depth + 1)
-
-        add_to_graph(prompt_id, 0)
+        relationship_graph_cache.put(cache_key, graph)
         return graph
 
     def get_relationship_types_count(self) -> Dict[str, int]:
@@ -126,7 +126,9 @@ class RelationshipsService:
             "deleted_at": utc_now().isoformat()
         }
 
-    def get_relationship_graph(self, prompt_id: str, depth: int = 2) -> Dict[str, Any]:
+    def get_relationship_graph(self, prompt_id: str, depth: int = 2,
+                               relationship_types: Optional[List[str]] = None,
+                               min_strength: float = 0.0) -> Dict[str, Any]:
         """Get a relationship graph starting from a prompt."""
 
         # Validate prompt exists
@@ -134,26 +136,19 @@ class RelationshipsService:
         if not prompt:
             raise ValueError(f"Prompt {prompt_id} not found")
 
-        graph = self.repo.get_relationship_graph(prompt_id, depth)
-
-        # Enhance graph with prompt details
-        enhanced_nodes = []
-        for node in graph["nodes"]:
-            prompt_details = self.prompt_service.get_entity(node["id"])
-            if prompt_details:
-                enhanced_nodes.append({
-                    "id": node["id"],
-                    "name": prompt_details.name,
-                    "category": prompt_details.category,
-                    "lifecycle_status": prompt_details.lifecycle_status
-                })
+        # Nodes come back with their prompt details from the same query
+        graph = self.repo.get_relationship_graph(prompt_id, depth, relationship_types, min_strength)
 
         return {
             "root_prompt_id": prompt_id,
-            "nodes": enhanced_nodes,
+            "nodes": graph["nodes"],
             "edges": graph["edges"],
             "depth": depth,
-            "total_nodes": len(enhanced_nodes),
+            "filters": {
+                "relationship_types": relationship_types,
+                "min_strength": min_strength
+            },
+            "total_nodes": len(graph["nodes"]),
             "total_edges": len(graph["edges"])
         }
 
@@ -1,6 +1,7 @@
 """Validation handlers for prompt testing and bias detection."""
 
-from typing import Dict, Any, List
+import json
+from typing import Dict, Any, List, AsyncIterator
 from ...core.handler import BaseHandler
 from .service import ValidationService
 from services.shared.core.responses.responses import create_success_response, create_error_response
@@ -20,9 +21,22 @@ class ValidationHandlers(BaseHandler):
                 message="Test suite completed successfully",
                 data=results
             ).model_dump()
+        except ValueError as e:
+            return create_error_response(str(e), "VALIDATION_ERROR").model_dump()
         except Exception as e:
             return create_error_response(f"Failed to run test suite: {str(e)}", "INTERNAL_ERROR").model_dump()
 
+    async def stream_test_suite(self, prompt_id: str, version: int, test_suite: Dict[str, Any]) -> AsyncIterator[str]:
+        """Run a test suite, yielding one NDJSON line per test case as it completes."""
+        try:
+            async for index, result in self.service.stream_test_suite(prompt_id, version, test_suite):
+                yield json.dumps({"index": index, **result.to_dict()}, default=str) + "\n"
+        except ValueError as e:
+            yield json.dumps(create_error_response(str(e), "VALIDATION_ERROR").model_dump(), default=str) + "\n"
+        except Exception as e:
+            error_response = create_error_response(f"Failed to run test suite: {str(e)}", "INTERNAL_ERROR")
+            yield json.dumps(error_response.model_dump(), default=str) + "\n"
+
     async def handle_lint_prompt(self, prompt_content: str) -> Dict[str, Any]:
         """Lint a prompt for issues."""
         try:
@@ -0,0 +1,132 @@
+"""Lint and bias rules for prompt validation.
+
+Every rule matches whole words or short phrases, so all rules are compiled
+into one word-level matcher: the text is tokenized once and each token is
+looked up in a table of phrase starts. Per rule, matches follow ``re.findall``
+semantics for the word-bounded patterns they come from (left to right,
+non-overlapping, first listed alternative wins); matches of different rules
+may overlap, so ``do`` and ``do not`` both match in "do not".
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+BIAS_PATTERNS: Dict[str, List[Dict[str, object]]] = {
+    "gender": [
+        {"pattern": r"\b(he|him|his)\b", "weight": 0.3},
+        {"pattern": r"\b(she|her)\b", "weight": 0.3},
+        {"pattern": r"\b(man|men|woman|women)\b", "weight": 0.2},
+        {"pattern": r"\b(male|female)\b", "weight": 0.4}
+    ],
+    "racial": [
+        {"pattern": r"\b(white|black|asian|hispanic)\b", "weight": 0.4},
+        {"pattern": r"\b(race|ethnic|minority)\b", "weight": 0.3}
+    ],
+    "cultural": [
+        {"pattern": r"\b(western|eastern|developed|developing|third.world)\b", "weight": 0.3},
+        {"pattern": r"\b(civilized|primitive|savage)\b", "weight": 0.6}
+    ],
+    "political": [
+        {"pattern": r"\b(liberal|conservative|left|right)\b", "weight": 0.4},
+        {"pattern": r"\b(political|ideology|party)\b", "weight": 0.2}
+    ],
+    "socioeconomic": [
+        {"pattern": r"\b(rich|poor|wealthy|impoverished)\b", "weight": 0.3},
+        {"pattern": r"\b(class|elite|working.class)\b", "weight": 0.3}
+    ]
+}
+
+UNCLEAR_REFERENCE_PATTERN = r"\b(it|they|them|this|that)\b"
+
+NEGATIVE_INSTRUCTIONS = ("don't", "do not", "avoid", "never")
+POSITIVE_INSTRUCTIONS = ("do", "should", "must", "always")
+
+
+_WORD_RE = re.compile(r"\w+")
+_SIMPLE_PATTERN_RE = re.compile(r"^\\b\(?([\w .'|-]+?)\)?\\b$")
+
+# A phrase is its first word plus (separator, word) steps; "." separates by any one character
+Phrase = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def pattern_phrases(pattern: str) -> List[str]:
+    """Alternatives of a word-bounded pattern such as ``\\b(he|him|his)\\b``."""
+    match = _SIMPLE_PATTERN_RE.match(pattern)
+    if not match:
+        raise ValueError(f"Unsupported rule pattern: {pattern}")
+    return match.group(1).split("|")
+
+
+def _parse_phrase(phrase: str) -> Phrase:
+    parts = re.split(r"(\W)", phrase.lower())
+    if any(not word for word in parts[::2]):
+        raise ValueError(f"Unsupported rule phrase: {phrase}")
+    return parts[0], tuple(zip(parts[1::2], parts[2::2]))
+
+
+class RuleMatcher:
+    """Phrase rules matched in one pass over the text."""
+
+    def __init__(self, rules: Sequence[Tuple[str, Sequence[str]]]):
+        self.rule_ids = [rule_id for rule_id, _ in rules]
+        self._starts: Dict[str, List[Tuple[str, Tuple[Tuple[str, str], ...]]]] = {}
+        for rule_id, phrases in rules:
+            for phrase in phrases:
+                first, rest = _parse_phrase(phrase)
+                self._starts.setdefault(first, []).append((rule_id, rest))
+        self._last: Optional[Tuple[str, Dict[str, List[str]]]] = None
+
+    def scan(self, text: str) -> Dict[str, List[str]]:
+        """Matched text per rule id, in order of appearance."""
+        last = self._last
+        if last is not None and last[0] == text:
+            return last[1]
+
+        tokens = [(match.start(), match.end(), match.group().lower()) for match in _WORD_RE.finditer(text)]
+        matches: Dict[str, List[str]] = {}
+        resume_at: Dict[str, int] = {}
+        for index, (start, end, word) in enumerate(tokens):
+            candidates = self._starts.get(word)
+            if not candidates:
+                continue
+            for rule_id, rest in candidates:
+                if resume_at.get(rule_id, 0) > start:
+                    continue
+                match_end = self._match_rest(text, tokens, index, end, rest)
+                if match_end is not None:
+                    resume_at[rule_id] = match_end
+                    matches.setdefault(rule_id, []).append(text[start:match_end])
+
+        self._last = (text, matches)
+        return matches
+
+    @staticmethod
+    def _match_rest(text: str, tokens: List[Tuple[int, int, str]], index: int, end: int,
+                    rest: Tuple[Tuple[str, str], ...]) -> Optional[int]:
+        for separator, word in rest:
+            index += 1
+            if index >= len(tokens):
+                return None
+            next_start, next_end, next_word = tokens[index]
+            if next_start - end != 1 or next_word != word or (separator != "." and text[end] != separator):
+                return None
+            end = next_end
+        return end
+
+
+def bias_rule_id(bias_type: str, index: int) -> str:
+    return f"bias:{bias_type}:{index}"
+
+
+def _build_rules() -> List[Tuple[str, Sequence[str]]]:
+    rules: List[Tuple[str, Sequence[str]]] = [("unclear_reference", pattern_phrases(UNCLEAR_REFERENCE_PATTERN))]
+    rules += [(f"negative:{word}", [word]) for word in NEGATIVE_INSTRUCTIONS]
+    rules += [(f"positive:{word}", [word]) for word in POSITIVE_INSTRUCTIONS]
+    for bias_type, patterns in BIAS_PATTERNS.items():
+        rules += [(bias_rule_id(bias_type, index), pattern_phrases(pattern_info["pattern"]))
+                  for index, pattern_info in enumerate(patterns)]
+    return rules
+
+
+# Global prompt rule matcher instance
+prompt_rule_matcher = RuleMatcher(_build_rules())
@@ -0,0 +1,142 @@
+"""Test-case execution support for prompt validation.
+
+- ``PromptExecutor`` is the model interface test cases run against;
+  ``LocalPromptExecutor`` is an offline stand-in and
+  ``InterpreterPromptExecutor`` goes through the Interpreter service
+- ``ValidationResultCache`` keeps case outcomes keyed by
+  ``(executor, prompt content hash, test case hash)``, so re-validating an
+  unchanged prompt against an unchanged case needs no model call
+"""
+
+import asyncio
+import difflib
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, Union
+
+from ...infrastructure.templates import compile_template
+
+DEFAULT_CASE_TIMEOUT_MS = 30_000.0
+DEFAULT_MAX_CONCURRENCY = 256
+DEFAULT_MIN_SIMILARITY = 0.6
+
+# Test case keys that label a case without changing how it executes
+_CASE_LABEL_KEYS = frozenset({"id", "name", "description", "timeout_ms"})
+
+Responder = Callable[[str, Dict[str, Any]], Union[str, Awaitable[str]]]
+
+
+class PromptExecutor(ABC):
+    """Produces model output for a rendered test prompt."""
+
+    name = "executor"
+
+    @abstractmethod
+    async def generate(self, prompt: str, test_case: Dict[str, Any]) -> str:
+        """Return the model output for ``prompt``."""
+
+
+class LocalPromptExecutor(PromptExecutor):
+    """Offline stand-in for an LLM.
+
+    Without a ``responder`` the output is the rendered prompt itself. A
+    responder (sync or async ``(prompt, test_case) -> str``) scripts outputs;
+    ``latency_ms`` simulates model time.
+    """
+
+    name = "local"
+
+    def __init__(self, responder: Optional[Responder] = None, latency_ms: float = 0.0):
+        self.responder = responder
+        self.latency_ms = latency_ms
+
+    async def generate(self, prompt: str, test_case: Dict[str, Any]) -> str:
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        if self.responder is None:
+            return prompt
+        output = self.responder(prompt, test_case)
+        if asyncio.iscoroutine(output):
+            output = await output
+        return output
+
+
+class InterpreterPromptExecutor(PromptExecutor):
+    """Runs test prompts through the Interpreter service."""
+
+    name = "interpreter"
+
+    def __init__(self, clients: Any):
+        self.clients = clients
+
+    async def generate(self, prompt: str, test_case: Dict[str, Any]) -> str:
+        response = await self.clients.interpret_query(prompt, "validation")
+        if not response.get("success"):
+            raise RuntimeError(f"Interpreter service error: {response.get('message', response)}")
+        return response.get("data", {}).get("response_text", "")
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def case_hash(test_case: Dict[str, Any]) -> str:
+    """Hash of everything in a test case that affects its outcome."""
+    relevant = {key: value for key, value in test_case.items() if key not in _CASE_LABEL_KEYS}
+    encoded = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def render_test_prompt(content: str, test_case: Dict[str, Any]) -> str:
+    """Fill the prompt with the case's variables; ``input`` is appended unless the prompt uses it."""
+    values = dict(test_case.get("variables") or {})
+    test_input = test_case.get("input")
+    if test_input is not None:
+        values.setdefault("input", test_input)
+
+    template = compile_template(content)
+    rendered = template.render(values)
+    if test_input is not None and "input" not in template.variables:
+        rendered = f"{rendered}\n\n{test_input}"
+    return rendered
+
+
+def output_similarity(output: str, expected: str) -> float:
+    """Word-level similarity ratio between an output and the expected output."""
+    return difflib.SequenceMatcher(None, output.split(), expected.split()).ratio()
+
+
+class ValidationResultCache:
+    """Bounded LRU of test case outcomes."""
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def key(executor: PromptExecutor, content: str, test_case: Dict[str, Any]) -> Tuple[str, str, str]:
+        return executor.name, content_hash(content), case_hash(test_case)
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        outcome = self._entries.get(key)
+        if outcome is None:
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return outcome
+
+    def put(self, key: Hashable, outcome: Dict[str, Any]) -> None:
+        self._entries[key] = outcome
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "entries": len(self._entries), "max_entries": self.max_entries}
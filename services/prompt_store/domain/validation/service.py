@@ -1,30 +1,55 @@
 """Quality assurance and validation service for prompt testing and bias detection."""
 
-import re
-from typing import Dict, Any, List, Optional
+import asyncio
+import time
+from typing import Dict, Any, List, Optional, AsyncIterator, Tuple
 from ...core.service import BaseService
 from services.shared.integrations.clients.clients import ServiceClients
 from services.shared.utilities import generate_id, utc_now
+from ..prompts.service import PromptService
+from ..prompts.versioning_repository import PromptVersioningRepository
 from .entities import PromptTestingResult, BiasDetectionResult
+from .rules import BIAS_PATTERNS, NEGATIVE_INSTRUCTIONS, POSITIVE_INSTRUCTIONS, bias_rule_id, prompt_rule_matcher
+from .runner import (
+    DEFAULT_CASE_TIMEOUT_MS, DEFAULT_MAX_CONCURRENCY, DEFAULT_MIN_SIMILARITY,
+    LocalPromptExecutor, PromptExecutor, ValidationResultCache, output_similarity, render_test_prompt
+)
 
 
 class ValidationService(BaseService[PromptTestingResult]):
     """Service for prompt quality assurance and validation."""
 
-    def __init__(self):
+    def __init__(self, executor: Optional[PromptExecutor] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 case_timeout_ms: float = DEFAULT_CASE_TIMEOUT_MS,
+                 result_cache: Optional[ValidationResultCache] = None):
         super().__init__(None)  # We'll implement repository methods as needed
         self.clients = ServiceClients()
+        self.executor = executor or LocalPromptExecutor()
+        self.max_concurrency = max_concurrency
+        self.case_timeout_ms = case_timeout_ms
+        self.result_cache = result_cache or ValidationResultCache()
+        self.prompt_service = PromptService()
 
     async def run_prompt_test(self, prompt_id: str, version: int, test_suite_id: str,
-                            test_case: Dict[str, Any]) -> PromptTestingResult:
-        """Run a single test case against a prompt."""
-        # This would execute the prompt with test inputs and validate outputs
-        # For now, return a mock result
-
-        execution_time = 1.5  # Mock execution time
-        passed = True  # Mock result
-        quality_score = 0.85  # Mock quality score
-        similarity = 0.92  # Mock similarity to expected output
+                            test_case: Dict[str, Any], timeout_ms: Optional[float] = None,
+                            content: Optional[str] = None) -> PromptTestingResult:
+        """Run a single test case against a prompt version.
+
+        ``content`` is the version's text when the caller already resolved it.
+        Outcomes are cached by prompt content and test case; failed executions
+        are not cached.
+        """
+        if content is None:
+            content = self._get_version_content(prompt_id, version)
+        cache_key = self.result_cache.key(self.executor, content, test_case)
+        outcome = self.result_cache.get(cache_key)
+        cached = outcome is not None
+        if outcome is None:
+            deadline_ms = test_case.get("timeout_ms") or timeout_ms or self.case_timeout_ms
+            outcome = await self._execute_case(content, test_case, deadline_ms)
+            if outcome["error_message"] is None:
+                self.result_cache.put(cache_key, outcome)
 
         result = PromptTestingResult(
             id=generate_id(),
@@ -33,28 +58,21 @@ class ValidationService(BaseService[PromptTestingResult]):
             test_suite_id=test_suite_id,
             test_case_id=test_case.get("id", "unknown"),
             test_name=test_case.get("name", "Unknown Test"),
-            passed=passed,
-            execution_time_ms=execution_time * 1000,
-            output_quality_score=quality_score,
-            expected_output_similarity=similarity,
-            test_metadata=test_case
+            test_metadata={**test_case, "cached": cached},
+            **outcome
         )
 
         return result
 
     async def run_test_suite(self, prompt_id: str, version: int, test_suite: Dict[str, Any]) -> Dict[str, Any]:
         """Run a complete test suite against a prompt."""
-        test_results = []
-        passed_count = 0
-        total_time = 0
-
-        for test_case in test_suite.get("test_cases", []):
-            result = await self.run_prompt_test(prompt_id, version, test_suite["id"], test_case)
-            test_results.append(result.to_dict())
+        started = time.perf_counter()
+        test_results: List[Optional[Dict[str, Any]]] = [None] * len(test_suite.get("test_cases", []))
+        async for index, result in self.stream_test_suite(prompt_id, version, test_suite):
+            test_results[index] = result.to_dict()
 
-            if result.passed:
-                passed_count += 1
-            total_time += result.execution_time_ms
+        passed_count = sum(1 for result in test_results if result["passed"])
+        total_time = sum(result["execution_time_ms"] for result in test_results)
 
         suite_result = {
             "test_suite_id": test_suite["id"],
@@ -63,14 +81,93 @@ class ValidationService(BaseService[PromptTestingResult]):
             "total_tests": len(test_results),
             "passed_tests": passed_count,
             "failed_tests": len(test_results) - passed_count,
+            "cached_tests": sum(1 for result in test_results if result["test_metadata"].get("cached")),
             "success_rate": passed_count / len(test_results) if test_results else 0,
             "total_execution_time_ms": total_time,
             "average_execution_time_ms": total_time / len(test_results) if test_results else 0,
+            "wall_time_ms": (time.perf_counter() - started) * 1000,
             "test_results": test_results
         }
 
         return suite_result
 
+    async def stream_test_suite(self, prompt_id: str, version: int,
+                                test_suite: Dict[str, Any]) -> AsyncIterator[Tuple[int, PromptTestingResult]]:
+        """Yield ``(case index, result)`` as test cases finish.
+
+        Cases run concurrently, at most ``max_concurrency`` (suite setting or
+        service default) at a time; ``case_timeout_ms`` sets the suite's
+        default per-case deadline. The version's content is looked up once
+        for the whole suite.
+        """
+        content = self._get_version_content(prompt_id, version)
+        limit = max(1, int(test_suite.get("max_concurrency") or self.max_concurrency))
+        timeout_ms = test_suite.get("case_timeout_ms")
+        semaphore = asyncio.Semaphore(limit)
+
+        async def run_case(index: int, test_case: Dict[str, Any]) -> Tuple[int, PromptTestingResult]:
+            async with semaphore:
+                result = await self.run_prompt_test(prompt_id, version, test_suite["id"], test_case,
+                                                    timeout_ms=timeout_ms, content=content)
+                return index, result
+
+        tasks = [asyncio.create_task(run_case(index, test_case))
+                 for index, test_case in enumerate(test_suite.get("test_cases", []))]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Stop outstanding cases if the consumer goes away or a case raised
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _execute_case(self, content: str, test_case: Dict[str, Any], deadline_ms: float) -> Dict[str, Any]:
+        """Execute one case with the executor and score its output."""
+        prompt = render_test_prompt(content, test_case)
+        started = time.perf_counter()
+        try:
+            output = await asyncio.wait_for(self.executor.generate(prompt, test_case), deadline_ms / 1000)
+        except asyncio.TimeoutError:
+            return self._failed_outcome(f"Timed out after {deadline_ms:g} ms", deadline_ms)
+        except Exception as e:
+            return self._failed_outcome(f"Execution failed: {str(e)}", (time.perf_counter() - started) * 1000)
+        execution_time_ms = (time.perf_counter() - started) * 1000
+
+        validation = await self.validate_output(output, test_case.get("expected_criteria", {}))
+        expected_output = test_case.get("expected_output")
+        similarity = output_similarity(output, expected_output) if expected_output else 1.0
+        min_similarity = test_case.get("min_similarity", DEFAULT_MIN_SIMILARITY)
+
+        return {
+            "passed": all(validation["criteria_results"].values()) and similarity >= min_similarity,
+            "execution_time_ms": execution_time_ms,
+            "output_quality_score": validation["overall_score"],
+            "expected_output_similarity": similarity,
+            "error_message": None
+        }
+
+    @staticmethod
+    def _failed_outcome(error_message: str, execution_time_ms: float) -> Dict[str, Any]:
+        return {
+            "passed": False,
+            "execution_time_ms": execution_time_ms,
+            "output_quality_score": 0.0,
+            "expected_output_similarity": 0.0,
+            "error_message": error_message
+        }
+
+    def _get_version_content(self, prompt_id: str, version: int) -> str:
+        """Content of a prompt at ``version`` (current version from the prompt cache)."""
+        prompt = self.prompt_service.get_entity(prompt_id)
+        if prompt and prompt.version == version:
+            return prompt.content
+
+        stored = PromptVersioningRepository().get_version_by_number(prompt_id, version)
+        if not stored:
+            raise ValueError(f"Prompt {prompt_id} version {version} not found")
+        return stored.content
+
     def lint_prompt(self, prompt_content: str) -> Dict[str, Any]:
         """Lint a prompt for common issues and anti-patterns."""
         issues = []
@@ -84,8 +181,11 @@ class ValidationService(BaseService[PromptTestingResult]):
                 "suggestion": "Add more specific instructions and context"
             })
 
+        # Pronoun and instruction rules come from one scan
+        matches = prompt_rule_matcher.scan(prompt_content)
+
         # Check for unclear pronouns
-        if re.search(r'\b(it|they|them|this|that)\b', prompt_content, re.IGNORECASE):
+        if "unclear_reference" in matches:
             issues.append({
                 "type": "unclear_reference",
                 "severity": "low",
@@ -94,11 +194,8 @@ class ValidationService(BaseService[PromptTestingResult]):
             })
 
         # Check for contradictory instructions
-        contradictions = ["don't", "do not", "avoid", "never"]
-        positive_indicators = ["do", "should", "must", "always"]
-
-        contradiction_count = sum(1 for word in contradictions if word in prompt_content.lower())
-        positive_count = sum(1 for word in positive_indicators if word in prompt_content.lower())
+        contradiction_count = sum(1 for word in NEGATIVE_INSTRUCTIONS if f"negative:{word}" in matches)
+        positive_count = sum(1 for word in POSITIVE_INSTRUCTIONS if f"positive:{word}" in matches)
 
         if contradiction_count > positive_count * 2:
             issues.append({
@@ -127,21 +224,18 @@ class ValidationService(BaseService[PromptTestingResult]):
         """Detect potential biases in prompt content."""
         results = []
 
-        # Pattern-based bias detection
-        bias_patterns = self._get_bias_patterns()
+        # Pattern-based bias detection over one scan of the content
+        matches = prompt_rule_matcher.scan(prompt_content)
 
-        for bias_type, patterns in bias_patterns.items():
+        for bias_type, patterns in self._get_bias_patterns().items():
             detected_phrases = []
             severity_score = 0
 
-            for pattern_info in patterns:
-                pattern = pattern_info["pattern"]
-                weight = pattern_info["weight"]
-
-                matches = re.findall(pattern, prompt_content, re.IGNORECASE)
-                if matches:
-                    detected_phrases.extend(matches)
-                    severity_score += weight * len(matches)
+            for index, pattern_info in enumerate(patterns):
+                found = matches.get(bias_rule_id(bias_type, index))
+                if found:
+                    detected_phrases.extend(found)
+                    severity_score += pattern_info["weight"] * len(found)
 
             if detected_phrases:
                 result = BiasDetectionResult(
@@ -161,30 +255,7 @@ class ValidationService(BaseService[PromptTestingResult]):
 
     def _get_bias_patterns(self) -> Dict[str, List[Dict[str, Any]]]:
         """Get bias detection patterns."""
-        return {
-            "gender": [
-                {"pattern": r"\b(he|him|his)\b", "weight": 0.3},
-                {"pattern": r"\b(she|her)\b", "weight": 0.3},
-                {"pattern": r"\b(man|men|woman|women)\b", "weight": 0.2},
-                {"pattern": r"\b(male|female)\b", "weight": 0.4}
-            ],
-            "racial": [
-                {"pattern": r"\b(white|black|asian|hispanic)\b", "weight": 0.4},
-                {"pattern": r"\b(race|ethnic|minority)\b", "weight": 0.3}
-            ],
-            "cultural": [
-                {"pattern": r"\b(western|eastern|developed|developing|third.world)\b", "weight": 0.3},
-                {"pattern": r"\b(civilized|primitive|savage)\b", "weight": 0.6}
-            ],
-            "political": [
-                {"pattern": r"\b(liberal|conservative|left|right)\b", "weight": 0.4},
-                {"pattern": r"\b(political|ideology|party)\b", "weight": 0.2}
-            ],
-            "socioeconomic": [
-                {"pattern": r"\b(rich|poor|wealthy|impoverished)\b", "weight": 0.3},
-                {"pattern": r"\b(class|elite|working.class)\b", "weight": 0.3}
-            ]
-        }
+        return BIAS_PATTERNS
 
     def _get_bias_alternatives(self, bias_type: str) -> List[str]:
         """Get suggested alternatives for biased language."""
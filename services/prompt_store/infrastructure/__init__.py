@@ -1,6 +1,11 @@
 """Infrastructure module for Prompt Store service."""
 
 from .cache import PromptStoreCache, prompt_store_cache
+from .templates import CompiledTemplate, TemplateCache, template_cache, compile_template
+from .resolution import PromptSnapshot, PromptResolutionCache, prompt_resolution_cache
+from .usage import UsageEvent, UsageAggregator, usage_aggregator
+from .selection import PromptMatch, PromptSelectionIndex, SelectionWeights, prompt_selection_index
+from .diff import TextDiff, PromptDiffCache, prompt_diff_cache, diff_texts, token_fingerprint, fingerprint_similarity
 from .utils import (
     generate_prompt_hash,
     extract_variables_from_template,
@@ -11,12 +16,33 @@ from .utils import (
     categorize_prompt_tags,
     calculate_usage_metrics,
     detect_prompt_drift,
+    summarize_prompt_drift,
     generate_prompt_suggestions
 )
 
 __all__ = [
     'PromptStoreCache',
     'prompt_store_cache',
+    'CompiledTemplate',
+    'TemplateCache',
+    'template_cache',
+    'compile_template',
+    'PromptSnapshot',
+    'PromptResolutionCache',
+    'prompt_resolution_cache',
+    'UsageEvent',
+    'UsageAggregator',
+    'usage_aggregator',
+    'PromptMatch',
+    'PromptSelectionIndex',
+    'SelectionWeights',
+    'prompt_selection_index',
+    'TextDiff',
+    'PromptDiffCache',
+    'prompt_diff_cache',
+    'diff_texts',
+    'token_fingerprint',
+    'fingerprint_similarity',
     'generate_prompt_hash',
     'extract_variables_from_template',
     'validate_template_variables',
@@ -26,5 +52,6 @@ __all__ = [
     'categorize_prompt_tags',
     'calculate_usage_metrics',
     'detect_prompt_drift',
+    'summarize_prompt_drift',
     'generate_prompt_suggestions'
 ]
@@ -0,0 +1,348 @@
+"""Text diffing and fingerprints for prompt versions.
+
+- ``diff_texts`` is a line diff (patience anchors, Myers between them) with
+  token-level detail for replaced lines. It returns compact hunks and
+  similarity scores derived from the matched tokens.
+- ``PromptDiffCache`` keeps diff results keyed by the content pair.
+- ``token_fingerprint`` is a fixed-size MinHash signature of a text's word
+  set. ``fingerprint_similarity`` estimates the Jaccard similarity of two
+  word sets from their signatures, so drift over many versions needs no
+  full-text comparison.
+"""
+
+import bisect
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_CONTEXT_LINES = 2
+
+# Beyond this many edits Myers stops and the rest of the range is one replacement
+MAX_EDIT_DISTANCE = 2000
+
+FINGERPRINT_SIZE = 128
+_PRIME = (1 << 31) - 1
+# Persisted fingerprints depend on these, so they come from a fixed legacy seed
+_state = np.random.RandomState(20240613)
+_HASH_A = _state.randint(1, _PRIME, size=FINGERPRINT_SIZE).astype(np.uint64)
+_HASH_B = _state.randint(0, _PRIME, size=FINGERPRINT_SIZE).astype(np.uint64)
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+Opcode = Tuple[str, int, int, int, int]
+
+
+def _myers_matches(a: Sequence[Hashable], alo: int, ahi: int, b: Sequence[Hashable], blo: int, bhi: int,
+                   matches: List[Tuple[int, int]]) -> None:
+    """Append the matched pairs of a shortest edit script between two ranges."""
+    n, m = ahi - alo, bhi - blo
+    offset = n + m + 1
+    v = [0] * (2 * offset + 1)
+    trace: List[List[int]] = []
+
+    for d in range(min(n + m, MAX_EDIT_DISTANCE) + 1):
+        trace.append(v[offset - d - 1:offset + d + 2])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                break
+        else:
+            continue
+        break
+    else:
+        return  # Too different to be worth aligning
+
+    found: List[Tuple[int, int]] = []
+    x, y = n, m
+    for d in range(len(trace) - 1, -1, -1):
+        previous = trace[d]
+        k = x - y
+        if k == -d or (k != d and previous[k - 1 + d + 1] < previous[k + 1 + d + 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = previous[prev_k + d + 1] if d else 0
+        prev_y = prev_x - prev_k if d else 0
+        while x > prev_x and y > prev_y:
+            x -= 1
+            y -= 1
+            found.append((alo + x, blo + y))
+        x, y = prev_x, prev_y
+    matches.extend(reversed(found))
+
+
+def _patience_matches(a: Sequence[Hashable], alo: int, ahi: int, b: Sequence[Hashable], blo: int, bhi: int,
+                      matches: List[Tuple[int, int]]) -> None:
+    """Append matched pairs, anchoring on elements that occur once on each side."""
+    while alo < ahi and blo < bhi and a[alo] == b[blo]:
+        matches.append((alo, blo))
+        alo += 1
+        blo += 1
+    suffix = []
+    while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+        ahi -= 1
+        bhi -= 1
+        suffix.append((ahi, bhi))
+    if alo < ahi and blo < bhi:
+        anchors = _unique_anchors(a, alo, ahi, b, blo, bhi)
+        if anchors:
+            last_a, last_b = alo, blo
+            for i, j in anchors:
+                _patience_matches(a, last_a, i, b, last_b, j, matches)
+                matches.append((i, j))
+                last_a, last_b = i + 1, j + 1
+            _patience_matches(a, last_a, ahi, b, last_b, bhi, matches)
+        else:
+            _myers_matches(a, alo, ahi, b, blo, bhi, matches)
+    matches.extend(reversed(suffix))
+
+
+def _unique_anchors(a: Sequence[Hashable], alo: int, ahi: int, b: Sequence[Hashable], blo: int,
+                    bhi: int) -> List[Tuple[int, int]]:
+    """Longest increasing run of elements unique in both ranges."""
+    counts: Dict[Hashable, List[int]] = {}
+    for i in range(alo, ahi):
+        entry = counts.setdefault(a[i], [0, i, 0, -1])
+        entry[0] += 1
+    for j in range(blo, bhi):
+        entry = counts.get(b[j])
+        if entry is not None:
+            entry[2] += 1
+            entry[3] = j
+    pairs = sorted((entry[1], entry[3]) for entry in counts.values() if entry[0] == 1 and entry[2] == 1)
+    if not pairs:
+        return []
+
+    # Patience sorting: longest subsequence increasing in b
+    tails: List[int] = []
+    tail_index: List[int] = []
+    parents: List[int] = []
+    for index, (_, j) in enumerate(pairs):
+        position = bisect.bisect_left(tails, j)
+        parents.append(tail_index[position - 1] if position else -1)
+        if position == len(tails):
+            tails.append(j)
+            tail_index.append(index)
+        else:
+            tails[position] = j
+            tail_index[position] = index
+    run = []
+    index = tail_index[-1]
+    while index != -1:
+        run.append(pairs[index])
+        index = parents[index]
+    return run[::-1]
+
+
+def diff_opcodes(a: Sequence[Hashable], b: Sequence[Hashable]) -> List[Opcode]:
+    """``difflib``-style opcodes (tag, i1, i2, j1, j2) turning ``a`` into ``b``."""
+    matches: List[Tuple[int, int]] = []
+    _patience_matches(a, 0, len(a), b, 0, len(b), matches)
+    matches.append((len(a), len(b)))
+
+    opcodes: List[Opcode] = []
+    i = j = 0
+    for match_i, match_j in matches:
+        if i < match_i and j < match_j:
+            opcodes.append(("replace", i, match_i, j, match_j))
+        elif i < match_i:
+            opcodes.append(("delete", i, match_i, j, j))
+        elif j < match_j:
+            opcodes.append(("insert", i, i, j, match_j))
+        if match_i < len(a):
+            if opcodes and opcodes[-1][0] == "equal":
+                tag, i1, _, j1, _ = opcodes.pop()
+                opcodes.append(("equal", i1, match_i + 1, j1, match_j + 1))
+            else:
+                opcodes.append(("equal", match_i, match_i + 1, match_j, match_j + 1))
+        i, j = match_i + 1, match_j + 1
+    return opcodes
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text)
+
+
+@dataclass
+class TextDiff:
+    """Result of comparing two texts."""
+
+    identical: bool
+    similarity: float
+    line_similarity: float
+    lines_added: int = 0
+    lines_removed: int = 0
+    tokens_added: int = 0
+    tokens_removed: int = 0
+    hunks: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def diff_texts(text_a: str, text_b: str, context_lines: int = DEFAULT_CONTEXT_LINES) -> TextDiff:
+    """Line diff of ``text_a`` -> ``text_b`` with token-level changes in replaced lines."""
+    lines_a, lines_b = text_a.splitlines(), text_b.splitlines()
+    tokens_a = [tokenize(line) for line in lines_a]
+    tokens_b = [tokenize(line) for line in lines_b]
+    total_tokens = sum(map(len, tokens_a)) + sum(map(len, tokens_b))
+
+    opcodes = diff_opcodes(lines_a, lines_b)
+    result = TextDiff(identical=text_a == text_b, similarity=1.0, line_similarity=1.0)
+    matched_lines = matched_tokens = 0
+    token_changes: Dict[int, List[Dict[str, str]]] = {}
+
+    for index, (tag, i1, i2, j1, j2) in enumerate(opcodes):
+        if tag == "equal":
+            matched_lines += i2 - i1
+            matched_tokens += sum(len(tokens) for tokens in tokens_a[i1:i2])
+            continue
+        result.lines_removed += i2 - i1
+        result.lines_added += j2 - j1
+        block_a = [token for tokens in tokens_a[i1:i2] for token in tokens]
+        block_b = [token for tokens in tokens_b[j1:j2] for token in tokens]
+        changes = []
+        for token_tag, t1, t2, u1, u2 in diff_opcodes(block_a, block_b):
+            if token_tag == "equal":
+                matched_tokens += t2 - t1
+                continue
+            result.tokens_removed += t2 - t1
+            result.tokens_added += u2 - u1
+            changes.append({"op": token_tag, "a": " ".join(block_a[t1:t2]), "b": " ".join(block_b[u1:u2])})
+        token_changes[index] = changes
+
+    if lines_a or lines_b:
+        result.line_similarity = round(2.0 * matched_lines / (len(lines_a) + len(lines_b)), 4)
+    if total_tokens:
+        result.similarity = round(2.0 * matched_tokens / total_tokens, 4)
+    elif not result.identical:
+        result.similarity = 0.0
+    result.hunks = _hunks(opcodes, lines_a, lines_b, token_changes, context_lines)
+    return result
+
+
+def _hunks(opcodes: List[Opcode], lines_a: List[str], lines_b: List[str],
+           token_changes: Dict[int, List[Dict[str, str]]], context_lines: int) -> List[Dict[str, Any]]:
+    """Unified-diff style hunks; changes closer than twice the context share a hunk."""
+    groups: List[List[int]] = []
+    for index, (tag, i1, i2, _, _) in enumerate(opcodes):
+        if tag == "equal":
+            continue
+        if groups:
+            gap = opcodes[index - 1]
+            if opcodes[groups[-1][-1] + 1] is gap and gap[2] - gap[1] <= 2 * context_lines:
+                groups[-1].append(index)
+                continue
+        groups.append([index])
+
+    hunks = []
+    for group in groups:
+        first, last = opcodes[group[0]], opcodes[group[-1]]
+        a_start = max(first[1] - context_lines, 0)
+        b_start = max(first[3] - context_lines, 0)
+        a_end = min(last[2] + context_lines, len(lines_a))
+        b_end = min(last[4] + context_lines, len(lines_b))
+
+        lines = [f"  {line}" for line in lines_a[a_start:first[1]]]
+        changes = []
+        for index in range(group[0], group[-1] + 1):
+            tag, i1, i2, j1, j2 = opcodes[index]
+            if tag == "equal":
+                lines.extend(f"  {line}" for line in lines_a[i1:i2])
+                continue
+            lines.extend(f"- {line}" for line in lines_a[i1:i2])
+            lines.extend(f"+ {line}" for line in lines_b[j1:j2])
+            changes.extend(token_changes.get(index, []))
+        lines.extend(f"  {line}" for line in lines_a[last[2]:a_end])
+
+        hunks.append({
+            "a_start": a_start + 1,
+            "a_lines": a_end - a_start,
+            "b_start": b_start + 1,
+            "b_lines": b_end - b_start,
+            "lines": lines,
+            "token_changes": changes
+        })
+    return hunks
+
+
+class PromptDiffCache:
+    """Bounded LRU of diff results keyed by the hashes of both texts."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, int], TextDiff]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(text_a: str, text_b: str, context_lines: int) -> Tuple[str, str, int]:
+        return (hashlib.sha256(text_a.encode("utf-8")).hexdigest(),
+                hashlib.sha256(text_b.encode("utf-8")).hexdigest(), context_lines)
+
+    def diff(self, text_a: str, text_b: str, context_lines: int = DEFAULT_CONTEXT_LINES) -> Dict[str, Any]:
+        key = self._key(text_a, text_b, context_lines)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached.to_dict()
+            self.misses += 1
+
+        result = diff_texts(text_a, text_b, context_lines)
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result.to_dict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries),
+                "max_entries": self.max_entries}
+
+
+def token_fingerprint(text: str) -> bytes:
+    """MinHash signature of the lowercased whitespace-separated words of ``text``."""
+    words = set(text.lower().split())
+    if not words:
+        return b""
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=4).digest(), "little") % _PRIME
+         for word in words),
+        dtype=np.uint64, count=len(words)
+    )
+    signature = ((hashes[:, None] * _HASH_A + _HASH_B) % _PRIME).min(axis=0)
+    return signature.astype("<u4").tobytes()
+
+
+def fingerprint_similarity(fingerprint_a: Optional[bytes], fingerprint_b: Optional[bytes]) -> float:
+    """Estimated Jaccard similarity of the word sets behind two fingerprints."""
+    if not fingerprint_a or not fingerprint_b:
+        return 0.0
+    signature_a = np.frombuffer(fingerprint_a, dtype="<u4")
+    signature_b = np.frombuffer(fingerprint_b, dtype="<u4")
+    return float(np.count_nonzero(signature_a == signature_b)) / FINGERPRINT_SIZE
+
+
+# Global prompt diff cache instance
+prompt_diff_cache = PromptDiffCache()
@@ -0,0 +1,242 @@
+"""Prompt resolution cache for Prompt Store service.
+
+Resolves ``(category, name)`` and ``id`` lookups from an in-process LRU of
+immutable prompt snapshots, so a hit needs no I/O and no event loop. An
+optional shared second tier (any client with the synchronous redis
+``get``/``setex``/``delete`` API) lets replicas warm each other. Concurrent
+misses for the same key share one load. Writers invalidate by prompt id;
+other replicas' local tiers converge within ``ttl_seconds``.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+from ..core.entities import Prompt
+
+
+@dataclass(frozen=True)
+class PromptSnapshot:
+    """Read-only copy of a prompt at one version."""
+
+    id: str
+    category: str
+    name: str
+    version: int
+    data: Mapping[str, Any]
+
+    @classmethod
+    def from_prompt(cls, prompt: Prompt) -> "PromptSnapshot":
+        return cls.from_dict(prompt.to_dict())
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PromptSnapshot":
+        frozen = {key: tuple(value) if isinstance(value, list) else value for key, value in data.items()}
+        return cls(
+            id=data["id"],
+            category=data["category"],
+            name=data["name"],
+            version=data.get("version", 1),
+            data=MappingProxyType(frozen)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: list(value) if isinstance(value, tuple) else value for key, value in self.data.items()}
+
+    def to_prompt(self) -> Prompt:
+        """Fresh Prompt entity; callers may mutate it without touching the cache."""
+        return Prompt.from_dict(self.to_dict())
+
+
+class _Flight:
+    """One in-progress load that concurrent callers wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[PromptSnapshot] = None
+        self.error: Optional[BaseException] = None
+
+
+class PromptResolutionCache:
+    """Two-level cache of prompt snapshots keyed by ``(prompt_id, version)``."""
+
+    def __init__(self, max_entries: int = 2048, ttl_seconds: float = 300.0,
+                 shared: Any = None, shared_ttl_seconds: int = 3600,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.shared = shared
+        self.shared_ttl_seconds = shared_ttl_seconds
+        self.clock = clock
+
+        self._snapshots: "OrderedDict[Tuple[str, int], Tuple[PromptSnapshot, float]]" = OrderedDict()
+        self._current_version: Dict[str, int] = {}
+        self._ids_by_name: Dict[Tuple[str, str], str] = {}
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "shared_hits": 0, "loads": 0, "invalidations": 0}
+
+    def configure_shared_tier(self, shared: Any) -> None:
+        """Attach or detach (``None``) the shared second tier."""
+        self.shared = shared
+
+    def get_by_name(self, category: str, name: str,
+                    loader: Callable[[], Optional[Prompt]]) -> Optional[Prompt]:
+        """Prompt for ``(category, name)``; ``loader`` reads the repository on a miss."""
+        with self._lock:
+            prompt_id = self._ids_by_name.get((category, name))
+            snapshot = self._local(prompt_id) if prompt_id else None
+        if snapshot is not None:
+            self.stats["hits"] += 1
+            return snapshot.to_prompt()
+
+        snapshot = self._resolve(("name", category, name), self._shared_name_key(category, name), loader)
+        return snapshot.to_prompt() if snapshot else None
+
+    def get_by_id(self, prompt_id: str, loader: Callable[[], Optional[Prompt]]) -> Optional[Prompt]:
+        """Prompt for ``prompt_id``; ``loader`` reads the repository on a miss."""
+        with self._lock:
+            snapshot = self._local(prompt_id)
+        if snapshot is not None:
+            self.stats["hits"] += 1
+            return snapshot.to_prompt()
+
+        snapshot = self._resolve(("id", prompt_id), self._shared_id_key(prompt_id), loader)
+        return snapshot.to_prompt() if snapshot else None
+
+    def put(self, prompt: Prompt) -> PromptSnapshot:
+        """Store a snapshot of a freshly written prompt in both tiers."""
+        snapshot = PromptSnapshot.from_prompt(prompt)
+        self._store_local(snapshot)
+        self._store_shared(snapshot)
+        return snapshot
+
+    def invalidate(self, prompt_id: str, category: Optional[str] = None, name: Optional[str] = None) -> None:
+        """Forget a prompt in both tiers after it changed."""
+        with self._lock:
+            self.stats["invalidations"] += 1
+            version = self._current_version.pop(prompt_id, None)
+            if version is not None:
+                self._snapshots.pop((prompt_id, version), None)
+            names = [key for key, cached_id in self._ids_by_name.items() if cached_id == prompt_id]
+            if category is not None and name is not None:
+                names.append((category, name))
+            for key in names:
+                self._ids_by_name.pop(key, None)
+
+        if self.shared is not None:
+            keys = [self._shared_id_key(prompt_id)] + [self._shared_name_key(c, n) for c, n in set(names)]
+            try:
+                self.shared.delete(*keys)
+            except Exception:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
+            self._current_version.clear()
+            self._ids_by_name.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "entries": len(self._snapshots), "shared_tier": self.shared is not None}
+
+    def _local(self, prompt_id: str) -> Optional[PromptSnapshot]:
+        version = self._current_version.get(prompt_id)
+        if version is None:
+            return None
+        key = (prompt_id, version)
+        entry = self._snapshots.get(key)
+        if entry is None or self.clock() - entry[1] > self.ttl_seconds:
+            return None
+        self._snapshots.move_to_end(key)
+        return entry[0]
+
+    def _resolve(self, flight_key: Hashable, shared_key: str,
+                 loader: Callable[[], Optional[Prompt]]) -> Optional[PromptSnapshot]:
+        with self._lock:
+            flight = self._flights.get(flight_key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[flight_key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            snapshot = self._read_shared(shared_key)
+            if snapshot is not None:
+                self.stats["shared_hits"] += 1
+                self._store_local(snapshot)
+            else:
+                self.stats["loads"] += 1
+                prompt = loader()
+                if prompt is not None:
+                    snapshot = PromptSnapshot.from_prompt(prompt)
+                    self._store_local(snapshot)
+                    self._store_shared(snapshot)
+            flight.result = snapshot
+            return snapshot
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[flight_key]
+            flight.done.set()
+
+    def _store_local(self, snapshot: PromptSnapshot) -> None:
+        with self._lock:
+            previous = self._current_version.get(snapshot.id)
+            if previous is not None and previous != snapshot.version:
+                self._snapshots.pop((snapshot.id, previous), None)
+            key = (snapshot.id, snapshot.version)
+            self._snapshots[key] = (snapshot, self.clock())
+            self._snapshots.move_to_end(key)
+            self._current_version[snapshot.id] = snapshot.version
+            self._ids_by_name[(snapshot.category, snapshot.name)] = snapshot.id
+
+            while len(self._snapshots) > self.max_entries:
+                (evicted_id, evicted_version), (evicted, _) = self._snapshots.popitem(last=False)
+                if self._current_version.get(evicted_id) == evicted_version:
+                    del self._current_version[evicted_id]
+                    if self._ids_by_name.get((evicted.category, evicted.name)) == evicted_id:
+                        del self._ids_by_name[(evicted.category, evicted.name)]
+
+    def _read_shared(self, shared_key: str) -> Optional[PromptSnapshot]:
+        if self.shared is None:
+            return None
+        try:
+            raw = self.shared.get(shared_key)
+            return PromptSnapshot.from_dict(json.loads(raw)) if raw else None
+        except Exception:
+            return None
+
+    def _store_shared(self, snapshot: PromptSnapshot) -> None:
+        if self.shared is None:
+            return
+        try:
+            payload = json.dumps(snapshot.to_dict())
+            self.shared.setex(self._shared_id_key(snapshot.id), self.shared_ttl_seconds, payload)
+            self.shared.setex(self._shared_name_key(snapshot.category, snapshot.name),
+                              self.shared_ttl_seconds, payload)
+        except Exception:
+            pass
+
+    @staticmethod
+    def _shared_id_key(prompt_id: str) -> str:
+        return f"prompt_store:resolve:id:{prompt_id}"
+
+    @staticmethod
+    def _shared_name_key(category: str, name: str) -> str:
+        return f"prompt_store:resolve:name:{category}:{name}"
+
+
+# Global resolution cache instance
+prompt_resolution_cache = PromptResolutionCache()
@@ -0,0 +1,494 @@
+"""Prompt selection index for Prompt Store service.
+
+Ranks prompts for a free-text task description entirely in memory:
+
+- BM25 over name, description and content (plus category and tag words),
+  with per-field term weights folded into one document
+- category and tag match features taken from the request context
+- priors from the stored ``performance_score``, ``usage_count`` and the
+  outcomes of decided A/B tests
+
+Postings live in dicts so single prompts can be added, changed or removed
+in O(terms). On first use each term's postings are compiled to numpy arrays
+of precomputed BM25 term weights, so a query costs one scatter-add per query
+term plus a top-k partition. Prompts changed since a term was compiled are
+marked dirty and rescored exactly at query time; once enough are dirty the
+compiled arrays are dropped and rebuilt lazily. The priors are kept as one
+dense vector that is patched in place. The index is built once from the
+database by ``ensure_loaded`` and then kept current by the prompt service;
+updates that race with the initial load are replayed after it.
+"""
+
+import math
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how i in into is it its of on or that the this "
+    "to was were will with you your me my we our please can could would should do does".split()
+)
+
+# Relative weight of one token occurrence per field
+FIELD_WEIGHTS = {"name": 3.0, "category": 2.0, "tags": 2.0, "description": 1.5, "content": 1.0}
+
+_INITIAL_CAPACITY = 1024
+
+# Changed prompts rescored per query before compiled postings are rebuilt
+_MAX_DIRTY_SLOTS = 256
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords, with a light plural strip."""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in _STOPWORDS or len(token) < 2:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+@dataclass
+class SelectionWeights:
+    """How the final score blends text relevance with features and priors."""
+
+    text: float = 0.55
+    category: float = 0.1
+    tags: float = 0.1
+    performance: float = 0.12
+    usage: float = 0.08
+    ab_outcome: float = 0.05
+
+
+@dataclass
+class PromptMatch:
+    """One ranked prompt with its score breakdown."""
+
+    prompt_id: str
+    name: str
+    category: str
+    score: float
+    breakdown: Dict[str, float]
+    matched_terms: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "prompt_id": self.prompt_id,
+            "name": self.name,
+            "category": self.category,
+            "score": self.score,
+            "breakdown": self.breakdown,
+            "matched_terms": self.matched_terms,
+        }
+
+
+class PromptSelectionIndex:
+    """In-memory BM25 + feature ranking over active prompts."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75,
+                 weights: Optional[SelectionWeights] = None,
+                 field_weights: Optional[Dict[str, float]] = None):
+        self.k1 = k1
+        self.b = b
+        self.weights = weights or SelectionWeights()
+        self.field_weights = field_weights or FIELD_WEIGHTS
+
+        self._lock = threading.RLock()
+        self._load_lock = threading.Lock()
+        self.stats = {"queries": 0, "upserts": 0, "removals": 0, "loads": 0, "load_seconds": 0.0}
+        self._reset()
+
+    def _reset(self) -> None:
+        self._loaded = False
+        self._loading = False
+        self._replay: List[Tuple[str, Any]] = []
+
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._ids: List[Optional[str]] = []
+        self._meta: List[Optional[Tuple[str, str]]] = []  # (name, category)
+        self._doc_terms: Dict[int, Dict[str, float]] = {}
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._compiled: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._dirty: set = set()
+        self._total_length = 0.0
+        self._categories: Dict[str, int] = {}
+        self._pending_ab: Dict[str, Tuple[int, int]] = {}
+
+        self._capacity = 0
+        self._lengths = np.zeros(0)
+        self._performance = np.zeros(0)
+        self._usage = np.zeros(0)
+        self._ab_wins = np.zeros(0)
+        self._ab_losses = np.zeros(0)
+        self._category_codes = np.zeros(0, dtype=np.int32)
+        self._prior = np.zeros(0)
+        self._prior_stale = True
+        self._usage_scale = 0.0
+        self._grow(_INITIAL_CAPACITY)
+
+    # ------------------------------------------------------------------
+    # Loading and incremental maintenance
+    # ------------------------------------------------------------------
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def ensure_loaded(self, loader: Callable[[], Tuple[Iterable[Dict[str, Any]],
+                                                      Iterable[Tuple[str, Sequence[str]]]]]) -> None:
+        """Build the index once from ``loader() -> (prompt_rows, ab_outcomes)``.
+
+        ``ab_outcomes`` yields ``(winner_prompt_id, loser_prompt_ids)`` per
+        decided test. Concurrent callers wait for the first load.
+        """
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            with self._lock:
+                self._loading = True
+
+            started = time.perf_counter()
+            try:
+                rows, outcomes = loader()
+                with self._lock:
+                    for row in rows:
+                        self._upsert_row(row)
+                    for winner_id, loser_ids in outcomes:
+                        self._apply_ab_outcome(winner_id, loser_ids)
+                    for operation, payload in self._replay:
+                        self._apply(operation, payload)
+                    # Nothing is compiled yet, so nothing needs rescoring
+                    self._dirty.clear()
+                    self._loaded = True
+                    self.stats["loads"] += 1
+                    self.stats["load_seconds"] = time.perf_counter() - started
+            finally:
+                with self._lock:
+                    self._loading = False
+                    self._replay = []
+
+    def upsert(self, prompt: Any) -> None:
+        """Index a prompt entity or row dict; inactive prompts are removed."""
+        row = prompt if isinstance(prompt, dict) else prompt.to_dict()
+        self._submit("upsert", row)
+
+    def remove(self, prompt_id: str) -> None:
+        self._submit("remove", prompt_id)
+
+    def note_usage(self, prompt_id: str, count: int = 1) -> None:
+        """Count renders towards the usage prior."""
+        self._submit("usage", (prompt_id, count))
+
+    def record_ab_outcome(self, winner_prompt_id: str, loser_prompt_ids: Sequence[str]) -> None:
+        """Credit the winner and debit the losers of a decided A/B test."""
+        self._submit("ab", (winner_prompt_id, list(loser_prompt_ids)))
+
+    def clear(self) -> None:
+        """Forget everything; the next ``ensure_loaded`` rebuilds from the database."""
+        with self._lock:
+            self._reset()
+
+    def _submit(self, operation: str, payload: Any) -> None:
+        with self._lock:
+            if self._loading:
+                self._replay.append((operation, payload))
+            elif self._loaded:
+                self._apply(operation, payload)
+
+    def _apply(self, operation: str, payload: Any) -> None:
+        if operation == "upsert":
+            self._upsert_row(payload)
+        elif operation == "remove":
+            self._remove(payload)
+        elif operation == "usage":
+            slot = self._slots.get(payload[0])
+            if slot is not None:
+                self._usage[slot] += payload[1]
+                self._update_prior(slot)
+        elif operation == "ab":
+            self._apply_ab_outcome(*payload)
+
+    def _upsert_row(self, row: Dict[str, Any]) -> None:
+        prompt_id = row["id"]
+        if not row.get("is_active", True):
+            self._remove(prompt_id)
+            return
+
+        slot = self._slots.get(prompt_id)
+        if slot is None:
+            slot = self._free.pop() if self._free else len(self._ids)
+            if slot == len(self._ids):
+                self._ids.append(None)
+                self._meta.append(None)
+            if slot >= self._capacity:
+                self._grow(self._capacity * 2)
+            self._slots[prompt_id] = slot
+            self._ids[slot] = prompt_id
+            pending_wins, pending_losses = self._pending_ab.pop(prompt_id, (0, 0))
+            self._ab_wins[slot] = pending_wins
+            self._ab_losses[slot] = pending_losses
+        else:
+            self._drop_terms(slot)
+
+        category = row.get("category") or ""
+        tags = row.get("tags") or []
+        if isinstance(tags, str):
+            tags = [tags]
+
+        weighted: Counter = Counter()
+        for field_name, text in (("name", row.get("name") or ""), ("category", category),
+                                 ("tags", " ".join(tags)), ("description", row.get("description") or ""),
+                                 ("content", row.get("content") or "")):
+            weight = self.field_weights.get(field_name, 1.0)
+            for token in tokenize(text.replace("_", " ").replace("-", " ")):
+                weighted[token] += weight
+        for tag in tags:
+            weighted[f"tag:{tag.lower()}"] += 0.0
+
+        terms = dict(weighted)
+        self._doc_terms[slot] = terms
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[slot] = frequency
+        self._mark_dirty(slot)
+
+        length = sum(terms.values())
+        self._total_length += length
+        self._lengths[slot] = length
+        self._meta[slot] = (row.get("name") or "", category)
+        self._category_codes[slot] = self._categories.setdefault(category.lower(), len(self._categories))
+        self._performance[slot] = min(1.0, max(0.0, float(row.get("performance_score") or 0.0)))
+        self._usage[slot] = float(row.get("usage_count") or 0)
+        self._update_prior(slot)
+        self.stats["upserts"] += 1
+
+    def _remove(self, prompt_id: str) -> None:
+        slot = self._slots.pop(prompt_id, None)
+        if slot is None:
+            return
+        self._drop_terms(slot)
+        self._ids[slot] = None
+        self._meta[slot] = None
+        self._lengths[slot] = 0.0
+        self._performance[slot] = 0.0
+        self._usage[slot] = 0.0
+        self._ab_wins[slot] = 0.0
+        self._ab_losses[slot] = 0.0
+        self._category_codes[slot] = -1
+        self._prior[slot] = 0.0
+        self._mark_dirty(slot)
+        self._free.append(slot)
+        self.stats["removals"] += 1
+
+    def _drop_terms(self, slot: int) -> None:
+        terms = self._doc_terms.pop(slot, {})
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(slot, None)
+                if not postings:
+                    del self._postings[term]
+                    self._compiled.pop(term, None)
+        self._total_length -= sum(terms.values())
+
+    def _apply_ab_outcome(self, winner_id: str, loser_ids: Sequence[str]) -> None:
+        for prompt_id, won in [(winner_id, True)] + [(loser_id, False) for loser_id in loser_ids]:
+            slot = self._slots.get(prompt_id)
+            if slot is None:
+                # Prompt not indexed (yet); keep the outcome for when it is
+                wins, losses = self._pending_ab.get(prompt_id, (0, 0))
+                self._pending_ab[prompt_id] = (wins + won, losses + (not won))
+            else:
+                if won:
+                    self._ab_wins[slot] += 1
+                else:
+                    self._ab_losses[slot] += 1
+                self._update_prior(slot)
+
+    def _mark_dirty(self, slot: int) -> None:
+        self._dirty.add(slot)
+        if len(self._dirty) > _MAX_DIRTY_SLOTS:
+            self._compiled.clear()
+            self._dirty.clear()
+
+    def _update_prior(self, slot: int) -> None:
+        """Patch one prompt's prior; a new usage maximum rescales all of them."""
+        if self._prior_stale:
+            return
+        if math.log1p(self._usage[slot]) > self._usage_scale:
+            self._prior_stale = True
+            return
+        weights = self.weights
+        self._prior[slot] = (weights.performance * self._performance[slot]
+                             + weights.usage * self._usage_part(self._usage[slot])
+                             + weights.ab_outcome * self._ab_part(self._ab_wins[slot], self._ab_losses[slot]))
+
+    def _refresh_priors(self) -> None:
+        weights = self.weights
+        self._usage_scale = math.log1p(max(float(self._usage.max()), 1.0))
+        self._prior = (weights.performance * self._performance
+                       + weights.usage * self._usage_part(self._usage)
+                       + weights.ab_outcome * self._ab_part(self._ab_wins, self._ab_losses))
+        self._prior_stale = False
+
+    def _usage_part(self, usage):
+        return np.log1p(usage) / self._usage_scale
+
+    @staticmethod
+    def _ab_part(wins, losses):
+        # Laplace-smoothed win rate; 0.5 without decided tests
+        return (wins + 1.0) / (wins + losses + 2.0)
+
+    def _grow(self, capacity: int) -> None:
+        def extend(array: np.ndarray, fill: float = 0.0) -> np.ndarray:
+            grown = np.full(capacity, fill, dtype=array.dtype)
+            grown[:len(array)] = array
+            return grown
+
+        self._lengths = extend(self._lengths)
+        self._performance = extend(self._performance)
+        self._usage = extend(self._usage)
+        self._ab_wins = extend(self._ab_wins)
+        self._ab_losses = extend(self._ab_losses)
+        self._category_codes = extend(self._category_codes, -1)
+        self._prior = extend(self._prior)
+        self._capacity = capacity
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, k: int = 5, category: Optional[str] = None,
+               tags: Optional[Sequence[str]] = None,
+               exclude_ids: Optional[Sequence[str]] = None) -> List[PromptMatch]:
+        """Top ``k`` prompts for ``query``; ``category``/``tags`` act as ranking features."""
+        with self._lock:
+            self.stats["queries"] += 1
+            document_count = len(self._slots)
+            if not document_count or k <= 0:
+                return []
+            if self._prior_stale:
+                self._refresh_priors()
+
+            size = len(self._ids)
+            average_length = self._total_length / document_count or 1.0
+            text = np.zeros(size)
+            idfs: Dict[str, float] = {}
+            for term in dict.fromkeys(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idfs[term] = math.log(1.0 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                slots, term_weights = self._compiled_postings(term, average_length)
+                text += np.bincount(slots, weights=idfs[term] * term_weights, minlength=size)
+
+            wanted_tags = [f"tag:{tag}" for tag in dict.fromkeys(tag.lower() for tag in tags or [])]
+            tag_match = None
+            if wanted_tags:
+                tag_match = np.zeros(size)
+                for tag_term in wanted_tags:
+                    if tag_term in self._postings:
+                        tag_match[self._compiled_postings(tag_term, average_length)[0]] += 1.0 / len(wanted_tags)
+
+            # Prompts changed since their terms were compiled are rescored exactly
+            for slot in self._dirty:
+                if slot >= size:
+                    continue
+                terms = self._doc_terms.get(slot, {})
+                text[slot] = sum(idf * self._term_weight(terms[term], self._lengths[slot], average_length)
+                                 for term, idf in idfs.items() if term in terms)
+                if tag_match is not None:
+                    tag_match[slot] = sum(tag_term in terms for tag_term in wanted_tags) / len(wanted_tags)
+
+            category_match = None
+            category_code = self._categories.get(category.lower()) if category else None
+            if category_code is not None:
+                category_match = (self._category_codes[:size] == category_code).astype(float)
+
+            best_text = text.max()
+            scores = self.weights.text * text / best_text if best_text > 0 else text
+            candidate_mask = text > 0
+            for feature, weight in ((tag_match, self.weights.tags), (category_match, self.weights.category)):
+                if feature is not None:
+                    scores = scores + weight * feature
+                    candidate_mask |= feature > 0
+
+            scores = scores + self._prior[:size]
+            if exclude_ids:
+                candidate_mask[[self._slots[prompt_id] for prompt_id in exclude_ids if prompt_id in self._slots]] = False
+            top = self._top_k(scores, candidate_mask, k)
+
+            matches = []
+            for slot in top.tolist():
+                name, doc_category = self._meta[slot]
+                terms = self._doc_terms.get(slot, {})
+                matches.append(PromptMatch(
+                    prompt_id=self._ids[slot],
+                    name=name,
+                    category=doc_category,
+                    score=float(scores[slot]),
+                    breakdown={
+                        "text": float(text[slot] / best_text) if best_text > 0 else 0.0,
+                        "category": float(category_match[slot]) if category_match is not None else 0.0,
+                        "tags": float(tag_match[slot]) if tag_match is not None else 0.0,
+                        "performance": float(self._performance[slot]),
+                        "usage": float(self._usage_part(self._usage[slot])),
+                        "ab_outcome": float(self._ab_part(self._ab_wins[slot], self._ab_losses[slot])),
+                    },
+                    matched_terms=[term for term in idfs if term in terms]
+                ))
+            return matches
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, candidate_mask: np.ndarray, k: int) -> np.ndarray:
+        """Best ``k`` candidate slots, best first."""
+        count = min(k, len(scores))
+        top = np.argpartition(-scores, count - 1)[:count]
+        if not candidate_mask[top].all():
+            # Priors of non-matching prompts reached the head; rank the candidates alone
+            candidates = np.flatnonzero(candidate_mask)
+            if len(candidates) > k:
+                candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+            top = candidates
+        return top[np.argsort(-scores[top], kind="stable")]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "loaded": self._loaded,
+                "documents": len(self._slots),
+                "terms": len(self._postings),
+                "compiled_terms": len(self._compiled),
+                "dirty_documents": len(self._dirty),
+            }
+
+    def _term_weight(self, frequency, lengths, average_length: float):
+        """BM25 saturation of a weighted term frequency (without idf)."""
+        norm = self.k1 * (1.0 - self.b + self.b * lengths / average_length)
+        return frequency * (self.k1 + 1.0) / (frequency + norm)
+
+    def _compiled_postings(self, term: str, average_length: float) -> Tuple[np.ndarray, np.ndarray]:
+        compiled = self._compiled.get(term)
+        if compiled is None:
+            postings = self._postings[term]
+            slots = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+            frequencies = np.fromiter(postings.values(), dtype=np.float64, count=len(postings))
+            compiled = (slots, self._term_weight(frequencies, self._lengths[slots], average_length))
+            self._compiled[term] = compiled
+        return compiled
+
+
+# Global prompt selection index instance
+prompt_selection_index = PromptSelectionIndex()
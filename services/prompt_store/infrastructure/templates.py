@@ -0,0 +1,147 @@
+"""Compiled prompt templates for Prompt Store service.
+
+Templates are parsed once into literal text and placeholder slots and cached,
+so rendering is a single ``join`` instead of one full-string replace per
+variable. Both placeholder syntaxes used across the service are understood:
+
+- ``{{name}}`` (prompt templates) and ``{name}`` (orchestration steps)
+- ``{{name|default}}`` / ``{name|default}`` fall back to ``default``
+- ``\\{{name}}`` / ``\\{name}`` render the braces literally
+
+Single-brace placeholders must be identifiers, so JSON examples in prompt
+text are left alone. Placeholders with no value and no default are rendered
+as written.
+"""
+
+import re
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Hashable, List, Optional, Tuple
+
+_TOKEN_RE = re.compile(
+    r"\\(\{\{?)"                                                    # escaped brace(s)
+    r"|\{\{([^{}|]+?)(?:\|([^{}]*))?\}\}"                           # {{name}} / {{name|default}}
+    r"|\{\s*([A-Za-z_][\w.\-]*)\s*(?:\|([^{}]*))?\}"                # {name} / {name|default}
+)
+
+_NO_DEFAULT = object()
+
+
+class CompiledTemplate:
+    """A template parsed into literal parts and placeholder slots."""
+
+    __slots__ = ("source", "variables", "defaults", "_parts", "_slots")
+
+    def __init__(self, source: str):
+        self.source = source
+        parts: List[Optional[str]] = []
+        slots: List[Tuple[int, str, Any, str]] = []
+        variables: Dict[str, None] = {}
+        defaults: Dict[str, str] = {}
+
+        position = 0
+        literal: List[str] = []
+        for match in _TOKEN_RE.finditer(source):
+            literal.append(source[position:match.start()])
+            position = match.end()
+
+            escaped, name, default = match.group(1), match.group(2), match.group(3)
+            if escaped is not None:
+                literal.append(escaped)
+                continue
+            if name is None:
+                name, default = match.group(4), match.group(5)
+            name = name.strip()
+            if not name:
+                literal.append(match.group())
+                continue
+
+            parts.append("".join(literal))
+            literal = []
+            slots.append((len(parts), name, _NO_DEFAULT if default is None else default, match.group()))
+            parts.append(None)
+            variables.setdefault(name, None)
+            if default is not None:
+                defaults.setdefault(name, default)
+
+        literal.append(source[position:])
+        parts.append("".join(literal))
+
+        self._parts = tuple(parts)
+        self._slots = tuple(slots)
+        self.variables: Tuple[str, ...] = tuple(variables)
+        self.defaults: Dict[str, str] = defaults
+
+    @property
+    def required_variables(self) -> FrozenSet[str]:
+        """Placeholders that have no default value."""
+        return frozenset(name for name in self.variables if name not in self.defaults)
+
+    def missing_variables(self, declared: List[str], provided: Dict[str, Any]) -> List[str]:
+        """Declared variables without a value or a template default, in declared order."""
+        return [name for name in declared if name not in provided and name not in self.defaults]
+
+    def render(self, values: Dict[str, Any], escape: Optional[Callable[[str], str]] = None) -> str:
+        """Fill placeholders from ``values``; ``escape`` is applied to supplied values."""
+        if not self._slots:
+            return self._parts[0]
+
+        parts = list(self._parts)
+        for index, name, default, raw in self._slots:
+            if name in values:
+                value = str(values[name])
+                parts[index] = escape(value) if escape else value
+            elif default is not _NO_DEFAULT:
+                parts[index] = default
+            else:
+                parts[index] = raw
+        return "".join(parts)
+
+
+class TemplateCache:
+    """Bounded LRU of compiled templates.
+
+    Keys are ``(prompt_id, version)`` for stored prompts or the template text
+    itself. A hit is only used when its source still equals the content, so
+    prompts edited in place without a version bump are recompiled.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CompiledTemplate]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, content: str, key: Optional[Hashable] = None) -> CompiledTemplate:
+        """Compiled form of ``content``, compiling it on a miss."""
+        key = content if key is None else key
+        compiled = self._entries.get(key)
+        if compiled is not None and (compiled.source is content or compiled.source == content):
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return compiled
+
+        self.misses += 1
+        compiled = CompiledTemplate(content)
+        self._entries[key] = compiled
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return compiled
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Global template cache instance
+template_cache = TemplateCache()
+
+
+def compile_template(content: str, key: Optional[Hashable] = None) -> CompiledTemplate:
+    """Compiled template for ``content`` from the shared cache."""
+    return template_cache.get(content, key)
@@ -0,0 +1,294 @@
+"""Batched usage accounting for Prompt Store service.
+
+Renders and usage reports are accumulated in memory and written in one
+transaction every ``flush_every`` events or ``flush_interval_seconds``,
+whichever comes first. Only the batch-size threshold flushes inline; the
+interval is handled by the periodic task, which runs the flush in a worker
+thread so a quiet trickle of renders never blocks the event loop on SQLite:
+
+- ``prompts.usage_count`` gets one aggregated ``UPDATE ... CASE`` per flush
+- detailed events go to ``prompt_usage`` through one ``executemany``
+- per-prompt per-hour roll-ups are upserted into ``prompt_usage_hourly``
+
+Counters are never dropped. A failed flush keeps everything for the next
+attempt; only detail rows beyond ``max_buffered_events`` are shed (and
+counted) while the database stays unavailable. ``close()`` drains the rest.
+"""
+
+import asyncio
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, ContextManager, Deque, Dict, List, Optional, Tuple
+
+from ..db.connection import prompt_store_db_connection
+from ..db.queries import serialize_json
+from services.shared.utilities import generate_id, utc_now
+
+# (id, WHEN ?, THEN ?) parameters per prompt stay well below SQLite's 999 limit
+_CASE_CHUNK_SIZE = 300
+
+# Flush hooks run inside the flush transaction and may return a callback
+# that is invoked once the transaction has committed.
+FlushHook = Callable[[Any], Optional[Callable[[], None]]]
+
+
+@dataclass
+class UsageEvent:
+    """One detailed usage record destined for ``prompt_usage``."""
+
+    prompt_id: str
+    service_name: str
+    operation: str = "generate"
+    session_id: Optional[str] = None
+    user_id: Optional[str] = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    response_time_ms: float = 0.0
+    success: bool = True
+    error_message: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    created_at: datetime = field(default_factory=utc_now)
+
+    def to_row(self) -> Tuple:
+        return (
+            generate_id(), self.prompt_id, self.session_id, self.user_id, self.service_name,
+            self.operation, self.input_tokens, self.output_tokens, self.response_time_ms,
+            1 if self.success else 0, self.error_message, serialize_json(self.metadata),
+            self.created_at.isoformat()
+        )
+
+
+@dataclass
+class HourlyUsage:
+    """Roll-up of one prompt's usage within one hour."""
+
+    renders: int = 0
+    events: int = 0
+    successes: int = 0
+    failures: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    total_response_time_ms: float = 0.0
+
+    def merge(self, other: "HourlyUsage") -> None:
+        self.renders += other.renders
+        self.events += other.events
+        self.successes += other.successes
+        self.failures += other.failures
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.total_response_time_ms += other.total_response_time_ms
+
+
+def hour_bucket(moment: datetime) -> str:
+    """ISO timestamp of the start of ``moment``'s hour."""
+    return moment.replace(minute=0, second=0, microsecond=0).isoformat()
+
+
+class UsageAggregator:
+    """In-memory usage counters flushed to SQLite in batches."""
+
+    def __init__(self, flush_every: int = 500, flush_interval_seconds: float = 1.0,
+                 max_buffered_events: int = 10000,
+                 connection_factory: Callable[[], ContextManager] = prompt_store_db_connection,
+                 clock: Callable[[], float] = time.monotonic):
+        self.flush_every = flush_every
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_buffered_events = max_buffered_events
+        self.connection_factory = connection_factory
+        self.clock = clock
+
+        self._usage_counts: Dict[str, int] = defaultdict(int)
+        self._hourly: Dict[Tuple[str, str], HourlyUsage] = defaultdict(HourlyUsage)
+        self._events: Deque[UsageEvent] = deque()
+        self._pending = 0
+        self._last_flush = clock()
+        self._hooks: Dict[str, FlushHook] = {}
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"recorded": 0, "flushes": 0, "failed_flushes": 0, "statements": 0, "dropped_events": 0}
+
+    def increment(self, prompt_id: str, count: int = 1) -> None:
+        """Count ``count`` renders of a prompt towards ``usage_count``."""
+        with self._lock:
+            self._usage_counts[prompt_id] += count
+            self._hourly[(prompt_id, hour_bucket(utc_now()))].renders += count
+            self._note_recorded(count)
+        self._maybe_flush()
+
+    def record(self, event: UsageEvent, count_usage: bool = False) -> None:
+        """Buffer a detailed usage event; ``count_usage`` also bumps ``usage_count``."""
+        with self._lock:
+            if count_usage:
+                self._usage_counts[event.prompt_id] += 1
+            rollup = self._hourly[(event.prompt_id, hour_bucket(event.created_at))]
+            rollup.renders += 1 if count_usage else 0
+            rollup.events += 1
+            rollup.successes += 1 if event.success else 0
+            rollup.failures += 0 if event.success else 1
+            rollup.input_tokens += event.input_tokens
+            rollup.output_tokens += event.output_tokens
+            rollup.total_response_time_ms += event.response_time_ms
+
+            self._events.append(event)
+            while len(self._events) > self.max_buffered_events:
+                self._events.popleft()
+                self.stats["dropped_events"] += 1
+            self._note_recorded(1)
+        self._maybe_flush()
+
+    def register_flush_hook(self, name: str, hook: FlushHook) -> None:
+        """Run ``hook(conn)`` inside every flush transaction; re-registering replaces it."""
+        with self._lock:
+            self._hooks[name] = hook
+
+    def pending_count(self) -> int:
+        return self._pending
+
+    def flush(self) -> int:
+        """Write everything buffered in one transaction; returns the events written."""
+        with self._flush_lock:
+            with self._lock:
+                usage_counts, self._usage_counts = self._usage_counts, defaultdict(int)
+                hourly, self._hourly = self._hourly, defaultdict(HourlyUsage)
+                events, self._events = self._events, deque()
+                pending, self._pending = self._pending, 0
+                hooks = list(self._hooks.values())
+                self._last_flush = self.clock()
+
+            if not pending and not hooks:
+                return 0
+
+            try:
+                with self.connection_factory() as conn:
+                    try:
+                        statements = self._write(conn, usage_counts, hourly, events)
+                        after_commit = [hook(conn) for hook in hooks]
+                        conn.commit()
+                    except Exception:
+                        conn.rollback()
+                        raise
+            except Exception:
+                self._restore(usage_counts, hourly, events, pending)
+                self.stats["failed_flushes"] += 1
+                return 0
+
+            for callback in after_commit:
+                if callback is not None:
+                    callback()
+            self.stats["flushes"] += 1
+            self.stats["statements"] += statements
+            return pending
+
+    async def start(self) -> None:
+        """Start the periodic flush task on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_periodically())
+
+    async def close(self) -> None:
+        """Stop the periodic task and drain everything still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "pending": self._pending,
+                "buffered_events": len(self._events),
+                "tracked_prompts": len(self._usage_counts),
+            }
+
+    def _note_recorded(self, count: int) -> None:
+        self._pending += count
+        self.stats["recorded"] += count
+
+    def _maybe_flush(self) -> None:
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            if self._pending and self.clock() - self._last_flush >= self.flush_interval_seconds:
+                await asyncio.to_thread(self.flush)
+
+    def _write(self, conn, usage_counts: Dict[str, int], hourly: Dict[Tuple[str, str], HourlyUsage],
+               events: Deque[UsageEvent]) -> int:
+        cursor = conn.cursor()
+        statements = 0
+
+        if events:
+            cursor.executemany("""
+                INSERT INTO prompt_usage
+                (id, prompt_id, session_id, user_id, service_name, operation, input_tokens, output_tokens,
+                 response_time_ms, success, error_message, metadata, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [event.to_row() for event in events])
+            statements += 1
+
+        counts = [(prompt_id, count) for prompt_id, count in usage_counts.items() if count]
+        for start in range(0, len(counts), _CASE_CHUNK_SIZE):
+            chunk = counts[start:start + _CASE_CHUNK_SIZE]
+            cases = " ".join("WHEN ? THEN ?" for _ in chunk)
+            placeholders = ", ".join("?" for _ in chunk)
+            params: List[Any] = [value for pair in chunk for value in pair]
+            params.extend(prompt_id for prompt_id, _ in chunk)
+            cursor.execute(
+                f"UPDATE prompts SET usage_count = usage_count + CASE id {cases} ELSE 0 END "
+                f"WHERE id IN ({placeholders})",
+                params
+            )
+            statements += 1
+
+        if hourly:
+            cursor.executemany("""
+                INSERT INTO prompt_usage_hourly
+                (prompt_id, hour_start, render_count, event_count, success_count, failure_count,
+                 input_tokens, output_tokens, total_response_time_ms)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(prompt_id, hour_start) DO UPDATE SET
+                    render_count = render_count + excluded.render_count,
+                    event_count = event_count + excluded.event_count,
+                    success_count = success_count + excluded.success_count,
+                    failure_count = failure_count + excluded.failure_count,
+                    input_tokens = input_tokens + excluded.input_tokens,
+                    output_tokens = output_tokens + excluded.output_tokens,
+                    total_response_time_ms = total_response_time_ms + excluded.total_response_time_ms
+            """, [
+                (prompt_id, hour, rollup.renders, rollup.events, rollup.successes, rollup.failures,
+                 rollup.input_tokens, rollup.output_tokens, rollup.total_response_time_ms)
+                for (prompt_id, hour), rollup in hourly.items()
+            ])
+            statements += 1
+
+        return statements
+
+    def _restore(self, usage_counts: Dict[str, int], hourly: Dict[Tuple[str, str], HourlyUsage],
+                 events: Deque[UsageEvent], pending: int) -> None:
+        """Put a failed batch back in front of anything recorded meanwhile."""
+        with self._lock:
+            for prompt_id, count in usage_counts.items():
+                self._usage_counts[prompt_id] += count
+            for key, rollup in hourly.items():
+                self._hourly[key].merge(rollup)
+            events.extend(self._events)
+            self._events = events
+            while len(self._events) > self.max_buffered_events:
+                self._events.popleft()
+                self.stats["dropped_events"] += 1
+            self._pending += pending
+
+
+# Global usage aggregator instance
+usage_aggregator = UsageAggregator()
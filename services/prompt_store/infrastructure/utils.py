@@ -5,7 +5,7 @@ Provides common utilities for data processing, validation, and formatting.
 
 import re
 import hashlib
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, Callable
 from datetime import datetime, timezone
 
 
@@ -88,13 +88,11 @@ def calculate_prompt_complexity(content: str, variables: Optional[List[str]] = N
     return min(score, 1.0)
 
 
-def format_prompt_template(content: str, variables: Dict[str, Any]) -> str:
-    """Fill template variables with values."""
-    result = content
-    for key, value in variables.items():
-        placeholder = f"{{{{{key}}}}}"
-        result = result.replace(placeholder, str(value))
-    return result
+def format_prompt_template(content: str, variables: Dict[str, Any],
+                           escape: Optional[Callable[[str], str]] = None) -> str:
+    """Fill template variables with values using the cached compiled template."""
+    from .templates import compile_template
+    return compile_template(content).render(variables, escape)
 
 
 def sanitize_prompt_content(content: str) -> str:
@@ -185,7 +183,7 @@ def detect_prompt_drift(current_content: str, historical_versions: List[Dict[str
 
     # Simple text similarity check (could be enhanced with embeddings)
     current_words = set(current_content.lower().split())
-    significant_changes = []
+    similarities = []
 
     for version in historical_versions:
         old_content = version.get("content", "")
@@ -194,14 +192,18 @@ def detect_prompt_drift(current_content: str, historical_versions: List[Dict[str
         # Jaccard similarity
         intersection = len(current_words & old_words)
         union = len(current_words | old_words)
-        similarity = intersection / union if union > 0 else 0
-
-        if similarity < threshold:
-            significant_changes.append({
-                "version": version.get("version", 0),
-                "similarity": similarity,
-                "created_at": version.get("created_at")
-            })
+        similarities.append({
+            "version": version.get("version", 0),
+            "similarity": intersection / union if union > 0 else 0,
+            "created_at": version.get("created_at")
+        })
+
+    return summarize_prompt_drift(similarities, threshold)
+
+
+def summarize_prompt_drift(similarities: List[Dict[str, Any]], threshold: float = 0.7) -> Dict[str, Any]:
+    """Drift report from per-version similarities to the current content."""
+    significant_changes = [version for version in similarities if version["similarity"] < threshold]
 
     drift_score = 1 - (sum(c["similarity"] for c in significant_changes) / len(significant_changes)) if significant_changes else 0
 
@@ -3,7 +3,8 @@
 Main service entry point using the new domain-driven architecture.
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Query
+from fastapi.responses import StreamingResponse
 from typing import Dict, Any, Optional, List
 import asyncio
 
@@ -39,6 +40,7 @@ from services.prompt_store.domain.validation.handlers import ValidationHandlers
 from services.prompt_store.domain.orchestration.handlers import OrchestrationHandlers
 from services.prompt_store.domain.intelligence.handlers import IntelligenceHandlers
 from services.prompt_store.infrastructure.cache import prompt_store_cache
+from services.prompt_store.infrastructure.usage import usage_aggregator
 
 # ============================================================================
 # SERVICE CONFIGURATION
@@ -68,11 +70,13 @@ attach_self_register(app, ServiceNames.PROMPT_STORE)
 async def startup_event():
     """Initialize service components on startup."""
     await prompt_store_cache.initialize()
+    await usage_aggregator.start()
     print("✅ Prompt Store service initialized with domain-driven architecture")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up resources on shutdown."""
+    await usage_aggregator.close()
     await prompt_store_cache.close()
     print("👋 Prompt Store service shut down")
 
@@ -176,9 +180,10 @@ async def get_prompt_suggestions(prompt_id: str):
 # ============================================================================
 
 @app.post("/api/v1/prompts/search", response_model=Dict[str, Any])
-async def search_prompts(query: str, category: Optional[str] = None, tags: Optional[List[str]] = None, limit: int = 50):
+async def search_prompts(query: str, category: Optional[str] = None, tags: Optional[List[str]] = None, limit: int = 50,
+                         tag_match: str = "any", exclude_tags: Optional[List[str]] = None):
     """Advanced prompt search with full-text search."""
-    return await prompt_handlers.handle_search_prompts(query, category, tags, limit)
+    return await prompt_handlers.handle_search_prompts(query, category, tags, limit, tag_match, exclude_tags)
 
 @app.get("/api/v1/prompts/category/{category}", response_model=Dict[str, Any])
 async def get_prompts_by_category(category: str, limit: int = 50, offset: int = 0):
@@ -186,10 +191,16 @@ async def get_prompts_by_category(category: str, limit: int = 50, offset: int =
     # This would be implemented in the handlers
     return create_error_response("Not implemented yet", "NOT_IMPLEMENTED")
 
+@app.post("/api/v1/prompts/tags", response_model=Dict[str, Any])
+async def get_prompts_by_tags(tags: List[str], match: str = "any", exclude_tags: Optional[List[str]] = None,
+                              limit: int = 50, offset: int = 0):
+    """Get prompts matching any or all of the tags, with tag facet counts."""
+    return await prompt_handlers.handle_get_prompts_by_tags(tags, match, exclude_tags, limit, offset)
+
 @app.get("/api/v1/prompts/tags/{tag}", response_model=Dict[str, Any])
 async def get_prompts_by_tag(tag: str, limit: int = 50, offset: int = 0):
     """Get prompts containing a specific tag."""
-    return create_error_response("Not implemented yet", "NOT_IMPLEMENTED")
+    return await prompt_handlers.handle_get_prompts_by_tags([tag], limit=limit, offset=offset)
 
 # ============================================================================
 # BULK OPERATIONS
@@ -363,9 +374,10 @@ async def delete_relationship(relationship_id: str, user_id: str = "api_user"):
     return relationships_handlers.handle_delete_relationship(relationship_id, user_id)
 
 @app.get("/api/v1/prompts/{prompt_id}/relationships/graph", response_model=Dict[str, Any])
-async def get_relationship_graph(prompt_id: str, depth: int = 2):
+async def get_relationship_graph(prompt_id: str, depth: int = 2, relationship_types: Optional[List[str]] = Query(None),
+                                 min_strength: float = 0.0):
     """Get relationship graph for a prompt."""
-    return relationships_handlers.handle_get_relationship_graph(prompt_id, depth)
+    return relationships_handlers.handle_get_relationship_graph(prompt_id, depth, relationship_types, min_strength)
 
 @app.get("/api/v1/relationships/stats", response_model=Dict[str, Any])
 async def get_relationship_stats():
@@ -516,8 +528,14 @@ async def get_standard_test_suites():
     return await validation_handlers.handle_get_standard_test_suites()
 
 @app.post("/api/v1/validation/prompts/{prompt_id}/test", response_model=Dict[str, Any])
-async def run_prompt_tests(prompt_id: str, version: int, test_suite: Dict[str, Any]):
-    """Run a test suite against a specific prompt version."""
+async def run_prompt_tests(prompt_id: str, version: int, test_suite: Dict[str, Any], stream: bool = False):
+    """Run a test suite against a specific prompt version.
+
+    With ``stream=true`` the response is NDJSON, one line per test case as it completes.
+    """
+    if stream:
+        return StreamingResponse(validation_handlers.stream_test_suite(prompt_id, version, test_suite),
+                                 media_type="application/x-ndjson")
     return await validation_handlers.handle_run_test_suite(prompt_id, version, test_suite)
 
 @app.post("/api/v1/validation/lint", response_model=Dict[str, Any])
@@ -559,6 +577,16 @@ async def execute_pipeline(pipeline_id: str, input_data: Dict[str, Any]):
     """Execute a prompt pipeline."""
     return await orchestration_handlers.handle_execute_pipeline(pipeline_id, input_data)
 
+@app.get("/api/v1/orchestration/executions/{execution_id}", response_model=Dict[str, Any])
+async def get_orchestration_execution(execution_id: str):
+    """Get a chain or pipeline execution, including one still running."""
+    return await orchestration_handlers.handle_get_execution(execution_id)
+
+@app.post("/api/v1/orchestration/executions/{execution_id}/resume", response_model=Dict[str, Any])
+async def resume_orchestration_execution(execution_id: str):
+    """Resume a failed or interrupted execution without recomputing finished steps."""
+    return await orchestration_handlers.handle_resume_execution(execution_id)
+
 @app.post("/api/v1/orchestration/prompts/select", response_model=Dict[str, Any])
 async def select_optimal_prompt(task_description: str, context: Dict[str, Any] = None):
     """Select optimal prompt for a task."""
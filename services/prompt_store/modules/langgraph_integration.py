@@ -16,6 +16,10 @@ from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 from services.shared.utilities import get_service_client
 from services.shared.core.constants_new import ServiceNames
 from services.shared.monitoring.logging import fire_and_forget
+from services.prompt_store.infrastructure.usage import UsageEvent, usage_aggregator
+
+# Most recent operations kept per prompt for workflow summaries
+MAX_TRACKED_OPERATIONS = 100
 
 
 class PromptStoreLangGraphIntegration:
@@ -171,9 +175,7 @@ class PromptStoreLangGraphIntegration:
                 )
 
                 # Update local performance tracking
-                if prompt_id not in self.performance_tracker:
-                    self.performance_tracker[prompt_id] = []
-                self.performance_tracker[prompt_id].append({
+                self._append_tracking(prompt_id, {
                     "metrics": enhanced_metrics,
                     "workflow_context": workflow_context,
                     "timestamp": datetime.now().isoformat()
@@ -235,24 +237,34 @@ class PromptStoreLangGraphIntegration:
             "get_workflow_prompts_langgraph": get_workflow_prompts_langgraph
         }
 
+    def _append_tracking(self, prompt_id: str, record: Dict[str, Any]) -> None:
+        """Append to a prompt's bounded operation history."""
+        operations = self.performance_tracker.setdefault(prompt_id, [])
+        operations.append(record)
+        if len(operations) > MAX_TRACKED_OPERATIONS:
+            del operations[:-MAX_TRACKED_OPERATIONS]
+
     def _track_prompt_usage(self, prompt_id: str, workflow_context: Dict[str, Any]):
         """Track prompt usage for performance monitoring."""
-        if prompt_id not in self.performance_tracker:
-            self.performance_tracker[prompt_id] = []
-
         usage_record = {
             "action": "retrieved",
             "workflow_context": workflow_context,
             "timestamp": datetime.now().isoformat()
         }
 
-        self.performance_tracker[prompt_id].append(usage_record)
+        self._append_tracking(prompt_id, usage_record)
+
+        # Buffered; written to prompt_usage with the next batch
+        usage_aggregator.record(UsageEvent(
+            prompt_id=prompt_id,
+            service_name="langgraph",
+            operation="retrieve",
+            session_id=workflow_context.get("workflow_id"),
+            metadata=workflow_context
+        ))
 
     def _track_prompt_optimization(self, prompt_id: str, task_type: str, workflow_context: Dict[str, Any]):
         """Track prompt optimization requests."""
-        if prompt_id not in self.performance_tracker:
-            self.performance_tracker[prompt_id] = []
-
         optimization_record = {
             "action": "optimized",
             "task_type": task_type,
@@ -260,7 +272,7 @@ class PromptStoreLangGraphIntegration:
             "timestamp": datetime.now().isoformat()
         }
 
-        self.performance_tracker[prompt_id].append(optimization_record)
+        self._append_tracking(prompt_id, optimization_record)
 
     async def handle_langgraph_workflow_message(self, message: BaseMessage) -> Dict[str, Any]:
         """Handle incoming LangGraph workflow messages."""
@@ -4,6 +4,7 @@ Advanced document summarization and categorization service for the LLM Documenta
 """
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, field_validator
 from typing import Dict, Any, List, Optional
 import time
@@ -15,6 +16,19 @@ import base64
 import re
 from datetime import datetime, timedelta
 
+try:
+    from .modules.summarization_engine import SummarizationEngine
+    from .modules.document_features import (
+        DocumentFeatureCache, DocumentFeatureIndex, DocumentFeatures, parse_document_date
+    )
+    from .modules.timeline_index import TimelineIndex, TimestampParser
+except ImportError:
+    from modules.summarization_engine import SummarizationEngine
+    from modules.document_features import (
+        DocumentFeatureCache, DocumentFeatureIndex, DocumentFeatures, parse_document_date
+    )
+    from modules.timeline_index import TimelineIndex, TimestampParser
+
 # Service configuration
 SERVICE_NAME = "summarizer-hub"
 SERVICE_TITLE = "Summarizer Hub"
@@ -25,6 +39,27 @@ DEFAULT_PORT = 5160
 LLM_GATEWAY_URL = os.getenv("LLM_GATEWAY_URL", "http://llm-gateway:5055")
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
 
+# Summarization engine configuration
+SUMMARIZER_LLM_CONCURRENCY = int(os.getenv("SUMMARIZER_LLM_CONCURRENCY", "8"))
+SUMMARIZER_BATCH_CONCURRENCY = int(os.getenv("SUMMARIZER_BATCH_CONCURRENCY", "8"))
+SUMMARIZER_CHUNK_TOKENS = int(os.getenv("SUMMARIZER_CHUNK_TOKENS", "1500"))
+SUMMARIZER_CHUNK_SUMMARY_LENGTH = int(os.getenv("SUMMARIZER_CHUNK_SUMMARY_LENGTH", "200"))
+SUMMARIZER_CACHE_SIZE = int(os.getenv("SUMMARIZER_CACHE_SIZE", "2048"))
+SUMMARIZER_FEATURE_CACHE_SIZE = int(os.getenv("SUMMARIZER_FEATURE_CACHE_SIZE", "5000"))
+
+# Drift and alignment patterns, compiled once
+API_DRIFT_PATTERNS = [
+    re.compile(r"api/v\d+", re.IGNORECASE),  # API version patterns
+    re.compile(r"endpoint.*deprecated", re.IGNORECASE),  # Deprecated endpoint mentions
+    re.compile(r"breaking.*change", re.IGNORECASE),  # Breaking change references
+    re.compile(r"migration.*required", re.IGNORECASE),  # Migration requirements
+]
+TECHNICAL_TERM_PATTERN = re.compile(r'\b[A-Z][a-zA-Z]*\b|\bapi/[a-zA-Z_]+\b|\b[A-Z_][A-Z_]+\b')
+INTRO_PATTERN = re.compile(r'\b(intro|overview|summary)\b', re.IGNORECASE)
+EXAMPLES_PATTERN = re.compile(r'\b(example|sample|code)\b', re.IGNORECASE)
+PREREQUISITES_PATTERN = re.compile(r'\b(prereq|requirement|before|needed)\b', re.IGNORECASE)
+CROSS_REFERENCE_PATTERN = re.compile(r'\b(see also|refer to|see|reference|link)\b', re.IGNORECASE)
+
 # Jira configuration
 JIRA_BASE_URL = os.getenv("JIRA_BASE_URL", "https://your-domain.atlassian.net")
 JIRA_USERNAME = os.getenv("JIRA_USERNAME", "")
@@ -198,12 +233,36 @@ class SimpleSummarizer:
             "Requirements",
             "Code Documentation"
         ]
+        self.engine = SummarizationEngine(
+            self._summarize_chunk_with_llm,
+            self.fallback_summarize,
+            llm_concurrency=SUMMARIZER_LLM_CONCURRENCY,
+            batch_concurrency=SUMMARIZER_BATCH_CONCURRENCY,
+            chunk_tokens=SUMMARIZER_CHUNK_TOKENS,
+            chunk_summary_length=SUMMARIZER_CHUNK_SUMMARY_LENGTH,
+            cache_size=SUMMARIZER_CACHE_SIZE
+        )
+        # Content-hash keyed document features shared across recommendation requests
+        self.feature_cache = DocumentFeatureCache(SUMMARIZER_FEATURE_CACHE_SIZE)
+        # Remembers the detected timestamp format across timeline placements
+        self.timestamp_parser = TimestampParser()
+
+    def _build_feature_index(self, documents: List[Dict[str, Any]]) -> DocumentFeatureIndex:
+        """Compute (or reuse cached) features for every document in a request."""
+        return DocumentFeatureIndex(documents, self.feature_cache)
     
     async def summarize_with_llm(self, content: str, max_length: int = 500, style: str = "professional") -> str:
-        """Summarize content using LLM Gateway."""
+        """Summarize content using LLM Gateway.
+
+        Long documents are chunked and map-reduced; chunk summaries are cached by content hash.
+        """
+        return await self.engine.summarize(content, max_length, style or "professional")
+
+    async def _summarize_chunk_with_llm(self, content: str, max_length: int, style: str) -> str:
+        """Single LLM Gateway summarization call; raises on failure so the engine can fall back."""
+        prompt = f"Summarize the following content in a {style} style, keeping it under {max_length} words:\n\n{content}"
+
         try:
-            prompt = f"Summarize the following content in a {style} style, keeping it under {max_length} words:\n\n{content}"
-            
             async with httpx.AsyncClient(timeout=30.0) as client:
                 response = await client.post(
                     f"{LLM_GATEWAY_URL}/query",
@@ -214,16 +273,11 @@ class SimpleSummarizer:
                         "max_tokens": max_length
                     }
                 )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    return result.get("data", {}).get("response", "")
-                else:
-                    return self.fallback_summarize(content, max_length)
-                    
+                response.raise_for_status()
+                return response.json().get("data", {}).get("response", "")
         except Exception as e:
             print(f"LLM summarization failed: {e}")
-            return self.fallback_summarize(content, max_length)
+            raise
     
     def fallback_summarize(self, content: str, max_length: int = 500) -> str:
         """Fallback summarization without LLM."""
@@ -780,21 +834,24 @@ class SimpleSummarizer:
 
         all_recommendations = []
 
+        # Tokenize, split and date-parse each document once for all generators
+        features = self._build_feature_index(documents)
+
         # Generate recommendations for each type
         if "consolidation" in recommendation_types:
-            consolidation_recs = await self._generate_consolidation_recommendations(documents, confidence_threshold)
+            consolidation_recs = await self._generate_consolidation_recommendations(documents, confidence_threshold, features)
             all_recommendations.extend(consolidation_recs)
 
         if "duplicate" in recommendation_types:
-            duplicate_recs = await self._generate_duplicate_recommendations(documents, confidence_threshold)
+            duplicate_recs = await self._generate_duplicate_recommendations(documents, confidence_threshold, features)
             all_recommendations.extend(duplicate_recs)
 
         if "outdated" in recommendation_types:
-            outdated_recs = await self._generate_outdated_recommendations(documents, confidence_threshold)
+            outdated_recs = await self._generate_outdated_recommendations(documents, confidence_threshold, features)
             all_recommendations.extend(outdated_recs)
 
         if "quality" in recommendation_types:
-            quality_recs = await self._generate_quality_recommendations(documents, confidence_threshold)
+            quality_recs = await self._generate_quality_recommendations(documents, confidence_threshold, features)
             all_recommendations.extend(quality_recs)
 
         # Sort by priority and confidence
@@ -830,31 +887,32 @@ class SimpleSummarizer:
         result["jira_ticket_creation"] = jira_ticket_creation
 
         # Add drift detection and alerts
-        drift_analysis = self._detect_drift_and_alerts(documents, all_recommendations)
+        drift_analysis = self._detect_drift_and_alerts(documents, all_recommendations, features)
         result["drift_analysis"] = drift_analysis
 
         # Add documentation alignment analysis
-        alignment_analysis = self._check_documentation_alignment(documents)
+        alignment_analysis = self._check_documentation_alignment(documents, features)
         result["alignment_analysis"] = alignment_analysis
 
         # Add inconclusive recommendation handling
         inconclusive_handling = self._handle_inconclusive_recommendations(documents, all_recommendations, confidence_threshold)
         result["inconclusive_analysis"] = inconclusive_handling
 
-        # Add timeline analysis if timeline is provided
-        if timeline:
-            timeline_analysis = self._analyze_timeline_and_documents(documents, timeline)
-            result["timeline_analysis"] = timeline_analysis
+        # Add timeline analysis (reports "No timeline provided" without one)
+        result["timeline_analysis"] = self._analyze_timeline_and_documents(documents, timeline)
 
         return result
 
-    async def _generate_consolidation_recommendations(self, documents: List[Dict[str, Any]], confidence_threshold: float) -> List[Dict[str, Any]]:
+    async def _generate_consolidation_recommendations(self, documents: List[Dict[str, Any]], confidence_threshold: float,
+                                                      features: Optional[DocumentFeatureIndex] = None) -> List[Dict[str, Any]]:
         """Generate consolidation recommendations."""
         recommendations = []
 
         if len(documents) < 2:
             return recommendations
 
+        features = features or self._build_feature_index(documents)
+
         # Group documents by type
         type_groups = {}
         for doc in documents:
@@ -866,7 +924,7 @@ class SimpleSummarizer:
         for doc_type, docs_in_type in type_groups.items():
             if len(docs_in_type) >= 3:
                 # Calculate similarity within the group
-                avg_similarity = self._calculate_group_similarity(docs_in_type)
+                avg_similarity = self._calculate_group_similarity(docs_in_type, features)
                 type_confidence = self._calculate_type_consolidation_confidence(docs_in_type, avg_similarity)
 
                 if type_confidence >= confidence_threshold:
@@ -891,26 +949,28 @@ class SimpleSummarizer:
 
         return recommendations
 
-    async def _generate_duplicate_recommendations(self, documents: List[Dict[str, Any]], confidence_threshold: float) -> List[Dict[str, Any]]:
+    async def _generate_duplicate_recommendations(self, documents: List[Dict[str, Any]], confidence_threshold: float,
+                                                  features: Optional[DocumentFeatureIndex] = None) -> List[Dict[str, Any]]:
         """Generate duplicate detection recommendations."""
         recommendations = []
 
         if len(documents) < 2:
             return recommendations
 
+        features = features or self._build_feature_index(documents)
+
         processed_pairs = set()
+        doc_features = [features.get(doc) for doc in documents]
 
         for i, doc1 in enumerate(documents):
-            for j, doc2 in enumerate(documents):
-                if i >= j:
-                    continue
-
+            for j in range(i + 1, len(documents)):
+                doc2 = documents[j]
                 pair_key = f"{min(doc1['id'], doc2['id'])}_{max(doc1['id'], doc2['id'])}"
                 if pair_key in processed_pairs:
                     continue
 
                 processed_pairs.add(pair_key)
-                similarity_score = self._calculate_simple_similarity(doc1, doc2)
+                similarity_score = self._feature_similarity(doc_features[i], doc_features[j])
 
                 if similarity_score >= 0.6 and similarity_score >= confidence_threshold:
                     recommendations.append({
@@ -929,14 +989,17 @@ class SimpleSummarizer:
 
         return recommendations
 
-    async def _generate_outdated_recommendations(self, documents: List[Dict[str, Any]], confidence_threshold: float) -> List[Dict[str, Any]]:
+    async def _generate_outdated_recommendations(self, documents: List[Dict[str, Any]], confidence_threshold: float,
+                                                 features: Optional[DocumentFeatureIndex] = None) -> List[Dict[str, Any]]:
         """Generate outdated document recommendations."""
         recommendations = []
-        current_time = datetime.now()
+        current_time = datetime.utcnow()
+        features = features or self._build_feature_index(documents)
 
         for doc in documents:
-            created_date = self._parse_date(doc.get("dateCreated"))
-            updated_date = self._parse_date(doc.get("dateUpdated"))
+            doc_features = features.get(doc)
+            created_date = doc_features.created
+            updated_date = doc_features.updated
 
             if not created_date and not updated_date:
                 continue
@@ -966,12 +1029,14 @@ class SimpleSummarizer:
 
         return recommendations
 
-    async def _generate_quality_recommendations(self, documents: List[Dict[str, Any]], confidence_threshold: float) -> List[Dict[str, Any]]:
+    async def _generate_quality_recommendations(self, documents: List[Dict[str, Any]], confidence_threshold: float,
+                                                features: Optional[DocumentFeatureIndex] = None) -> List[Dict[str, Any]]:
         """Generate comprehensive quality improvement recommendations."""
         recommendations = []
+        features = features or self._build_feature_index(documents)
 
         for doc in documents:
-            quality_analysis = await self._analyze_document_quality_comprehensive(doc)
+            quality_analysis = await self._analyze_document_quality_comprehensive(doc, features.get(doc))
             issues = quality_analysis["issues"]
             metrics = quality_analysis["metrics"]
 
@@ -1001,14 +1066,16 @@ class SimpleSummarizer:
 
         return recommendations
 
-    async def _analyze_document_quality_comprehensive(self, document: Dict[str, Any]) -> Dict[str, Any]:
+    async def _analyze_document_quality_comprehensive(self, document: Dict[str, Any],
+                                                      features: Optional[DocumentFeatures] = None) -> Dict[str, Any]:
         """Perform comprehensive quality analysis on a document."""
         content = document.get("content", "")
         title = document.get("title", "")
+        features = features or DocumentFeatures.from_document(document)
 
         issues = []
         metrics = {
-            "word_count": len(content.split()) if content else 0,
+            "word_count": features.word_count,
             "sentence_count": 0,
             "avg_sentence_length": 0,
             "readability_score": 0,
@@ -1033,23 +1100,23 @@ class SimpleSummarizer:
         issues.extend(length_issues)
 
         # 2. Clarity and Readability Analysis
-        clarity_issues = self._analyze_clarity_and_readability(content, metrics)
+        clarity_issues = self._analyze_clarity_and_readability(content, metrics, features)
         issues.extend(clarity_issues)
 
         # 3. Technical Accuracy Analysis
-        accuracy_issues = self._analyze_technical_accuracy(content, document, metrics)
+        accuracy_issues = self._analyze_technical_accuracy(content, document, metrics, features)
         issues.extend(accuracy_issues)
 
         # 4. Structure and Organization Analysis
-        structure_issues = self._analyze_structure_and_organization(content, title, metrics)
+        structure_issues = self._analyze_structure_and_organization(content, title, metrics, features)
         issues.extend(structure_issues)
 
         # 5. Consistency Analysis
-        consistency_issues = self._analyze_consistency(content, metrics)
+        consistency_issues = self._analyze_consistency(content, metrics, features)
         issues.extend(consistency_issues)
 
         # 6. Completeness Analysis
-        completeness_issues = self._analyze_completeness(content, document, metrics)
+        completeness_issues = self._analyze_completeness(content, document, metrics, features)
         issues.extend(completeness_issues)
 
         # Calculate overall quality score
@@ -1079,10 +1146,12 @@ class SimpleSummarizer:
 
         return issues
 
-    def _analyze_clarity_and_readability(self, content: str, metrics: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _analyze_clarity_and_readability(self, content: str, metrics: Dict[str, Any],
+                                         features: Optional[DocumentFeatures] = None) -> List[Dict[str, Any]]:
         """Analyze clarity and readability issues."""
         issues = []
-        sentences = [s.strip() for s in content.split('.') if s.strip()]
+        features = features or DocumentFeatures(content)
+        sentences = features.sentences
         metrics["sentence_count"] = len(sentences)
 
         if sentences:
@@ -1100,9 +1169,7 @@ class SimpleSummarizer:
                 })
 
         # Check for passive voice (simplified)
-        passive_indicators = ["is", "are", "was", "were", "be", "been", "being"]
-        passive_count = sum(1 for word in content.lower().split() if word in passive_indicators)
-        passive_ratio = passive_count / max(1, len(content.split()))
+        passive_ratio = features.passive_count / max(1, features.word_count)
 
         if passive_ratio > 0.15:  # More than 15% passive voice
             issues.append({
@@ -1114,7 +1181,7 @@ class SimpleSummarizer:
 
         # Check for unclear language
         unclear_terms = ["thing", "stuff", "something", "anything", "etc."]
-        unclear_count = sum(1 for term in unclear_terms if term in content.lower())
+        unclear_count = sum(1 for term in unclear_terms if term in features.content_lower)
 
         if unclear_count > 0:
             issues.append({
@@ -1126,10 +1193,11 @@ class SimpleSummarizer:
 
         return issues
 
-    def _analyze_technical_accuracy(self, content: str, document: Dict[str, Any], metrics: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _analyze_technical_accuracy(self, content: str, document: Dict[str, Any], metrics: Dict[str, Any],
+                                    features: Optional[DocumentFeatures] = None) -> List[Dict[str, Any]]:
         """Analyze technical accuracy issues."""
         issues = []
-        content_lower = content.lower()
+        content_lower = features.content_lower if features else content.lower()
 
         # Check for code-like content without proper formatting
         if any(keyword in content_lower for keyword in ["function", "class", "import", "def ", "return "]):
@@ -1168,15 +1236,16 @@ class SimpleSummarizer:
 
         return issues
 
-    def _analyze_structure_and_organization(self, content: str, title: str, metrics: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _analyze_structure_and_organization(self, content: str, title: str, metrics: Dict[str, Any],
+                                            features: Optional[DocumentFeatures] = None) -> List[Dict[str, Any]]:
         """Analyze document structure and organization."""
         issues = []
+        features = features or DocumentFeatures(content)
 
         # Check for proper heading structure
-        lines = content.split('\n')
-        headings = [line for line in lines if line.strip().startswith('#')]
+        headings = features.headings
 
-        if len(headings) < 2 and len(content.split()) > 200:
+        if len(headings) < 2 and features.word_count > 200:
             issues.append({
                 "type": "poor_structure",
                 "severity": "high",
@@ -1204,9 +1273,9 @@ class SimpleSummarizer:
 
         # Check for logical flow
         transition_words = ["however", "therefore", "additionally", "furthermore", "consequently"]
-        transition_count = sum(1 for word in transition_words if word in content.lower())
+        transition_count = sum(1 for word in transition_words if word in features.content_lower)
 
-        if len(content.split()) > 300 and transition_count < 2:
+        if features.word_count > 300 and transition_count < 2:
             issues.append({
                 "type": "poor_flow",
                 "severity": "medium",
@@ -1218,12 +1287,14 @@ class SimpleSummarizer:
 
         return issues
 
-    def _analyze_consistency(self, content: str, metrics: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _analyze_consistency(self, content: str, metrics: Dict[str, Any],
+                             features: Optional[DocumentFeatures] = None) -> List[Dict[str, Any]]:
         """Analyze consistency issues in the document."""
         issues = []
+        features = features or DocumentFeatures(content)
 
         # Check for inconsistent terminology
-        content_lower = content.lower()
+        content_lower = features.content_lower
 
         # Common inconsistent term pairs
         term_pairs = [
@@ -1244,8 +1315,7 @@ class SimpleSummarizer:
                 })
 
         # Check for formatting consistency
-        lines = content.split('\n')
-        bullet_points = [line for line in lines if line.strip().startswith(('- ', '* ', '+ '))]
+        bullet_points = features.bullet_lines
 
         if len(bullet_points) > 5:
             bullet_styles = set(line.strip()[0] for line in bullet_points)
@@ -1261,10 +1331,11 @@ class SimpleSummarizer:
 
         return issues
 
-    def _analyze_completeness(self, content: str, document: Dict[str, Any], metrics: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _analyze_completeness(self, content: str, document: Dict[str, Any], metrics: Dict[str, Any],
+                              features: Optional[DocumentFeatures] = None) -> List[Dict[str, Any]]:
         """Analyze completeness issues."""
         issues = []
-        content_lower = content.lower()
+        content_lower = features.content_lower if features else content.lower()
 
         # Check for tutorial-like content missing key sections
         if any(word in content_lower for word in ["tutorial", "guide", "how to", "learn"]):
@@ -1393,20 +1464,22 @@ class SimpleSummarizer:
 
         return severity_counts
 
-    def _calculate_group_similarity(self, documents: List[Dict[str, Any]]) -> float:
+    def _calculate_group_similarity(self, documents: List[Dict[str, Any]],
+                                    features: Optional[DocumentFeatureIndex] = None) -> float:
         """Calculate average similarity within a group of documents."""
         if len(documents) < 2:
             return 0.0
 
+        features = features or self._build_feature_index(documents)
+        doc_features = [features.get(doc) for doc in documents]
+
         total_similarity = 0.0
         pair_count = 0
 
-        for i, doc1 in enumerate(documents):
-            for j, doc2 in enumerate(documents):
-                if i < j:
-                    similarity = self._calculate_simple_similarity(doc1, doc2)
-                    total_similarity += similarity
-                    pair_count += 1
+        for i, f1 in enumerate(doc_features):
+            for f2 in doc_features[i + 1:]:
+                total_similarity += self._feature_similarity(f1, f2)
+                pair_count += 1
 
         return total_similarity / pair_count if pair_count > 0 else 0.0
 
@@ -1417,207 +1490,30 @@ class SimpleSummarizer:
         similarity_factor = avg_similarity * 0.4
         return min(count_factor + similarity_factor, 0.95)
 
-    def _calculate_simple_similarity(self, doc1: Dict[str, Any], doc2: Dict[str, Any]) -> float:
+    def _calculate_simple_similarity(self, doc1: Dict[str, Any], doc2: Dict[str, Any],
+                                     features: Optional[DocumentFeatureIndex] = None) -> float:
         """Calculate simple similarity score between two documents."""
-        title1 = doc1.get("title", "").lower()
-        title2 = doc2.get("title", "").lower()
-        content1 = doc1.get("content", "").lower()
-        content2 = doc2.get("content", "").lower()
-
-        title_words1 = set(title1.split())
-        title_words2 = set(title2.split())
-        title_similarity = len(title_words1 & title_words2) / len(title_words1 | title_words2) if (title_words1 | title_words2) else 0
+        if features is not None:
+            f1, f2 = features.get(doc1), features.get(doc2)
+        else:
+            f1, f2 = DocumentFeatures.from_document(doc1), DocumentFeatures.from_document(doc2)
+        return self._feature_similarity(f1, f2)
 
-        content_words1 = set(content1.split())
-        content_words2 = set(content2.split())
-        content_similarity = len(content_words1 & content_words2) / len(content_words1 | content_words2) if (content_words1 | content_words2) else 0
+    def _feature_similarity(self, f1: DocumentFeatures, f2: DocumentFeatures) -> float:
+        """Weighted title/content term overlap of two precomputed documents."""
+        return (self._jaccard(f1.title_terms, f2.title_terms) * 0.6) + (self._jaccard(f1.term_set, f2.term_set) * 0.4)
 
-        return (title_similarity * 0.6) + (content_similarity * 0.4)
+    @staticmethod
+    def _jaccard(set1: frozenset, set2: frozenset) -> float:
+        """Jaccard similarity of two term sets."""
+        if not set1 and not set2:
+            return 0
+        intersection = len(set1 & set2)
+        return intersection / (len(set1) + len(set2) - intersection)
 
     def _parse_date(self, date_str: Optional[str]) -> Optional[datetime]:
-        """Parse date string into datetime object."""
-        if not date_str:
-            return None
-
-        try:
-            return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-        except (ValueError, AttributeError):
-            try:
-                for fmt in ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y/%m/%d"]:
-                    try:
-                        return datetime.strptime(date_str, fmt)
-                    except ValueError:
-                        continue
-            except:
-                pass
-
-        return None
-
-class JiraClient:
-    """Jira API client for creating and managing tickets."""
-
-    def __init__(self, base_url: str = None, username: str = None, api_token: str = None):
-        self.base_url = base_url or JIRA_BASE_URL
-        self.username = username or JIRA_USERNAME
-        self.api_token = api_token or JIRA_API_TOKEN
-        self.auth_header = self._create_auth_header()
-
-    def _create_auth_header(self) -> str:
-        """Create Basic Auth header for Jira API."""
-        if not self.username or not self.api_token:
-            return ""
-
-        credentials = f"{self.username}:{self.api_token}"
-        encoded_credentials = base64.b64encode(credentials.encode()).decode()
-        return f"Basic {encoded_credentials}"
-
-    def is_configured(self) -> bool:
-        """Check if Jira client is properly configured."""
-        return bool(self.base_url and self.username and self.api_token and self.auth_header)
-
-    async def create_issue(self, project_key: str, summary: str, description: str,
-                          issue_type: str = JiraIssueType.TASK,
-                          priority: str = JiraPriority.MEDIUM,
-                          assignee: str = None,
-                          labels: List[str] = None,
-                          components: List[str] = None,
-                          custom_fields: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Create a Jira issue."""
-        if not self.is_configured():
-            raise HTTPException(status_code=500, detail="Jira client not properly configured")
-
-        url = f"{self.base_url}/rest/api/2/issue"
-
-        # Build issue payload
-        issue_data = {
-            "fields": {
-                "project": {"key": project_key},
-                "summary": summary,
-                "description": description,
-                "issuetype": {"name": issue_type},
-                "priority": {"name": priority}
-            }
-        }
-
-        # Add optional fields
-        if assignee:
-            issue_data["fields"]["assignee"] = {"name": assignee}
-
-        if labels:
-            issue_data["fields"]["labels"] = labels
-
-        if components:
-            issue_data["fields"]["components"] = [{"name": comp} for comp in components]
-
-        if custom_fields:
-            issue_data["fields"].update(custom_fields)
-
-        headers = {
-            "Authorization": self.auth_header,
-            "Content-Type": "application/json"
-        }
-
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(url, json=issue_data, headers=headers)
-
-                if response.status_code == 201:
-                    issue_data = response.json()
-                    return {
-                        "success": True,
-                        "issue_key": issue_data["key"],
-                        "issue_id": issue_data["id"],
-                        "self": issue_data["self"]
-                    }
-                else:
-                    error_detail = response.text
-                    try:
-                        error_json = response.json()
-                        error_detail = error_json.get("errors", {}).get("summary", [error_detail])[0]
-                    except:
-                        pass
-
-                    return {
-                        "success": False,
-                        "error": f"Jira API error: {error_detail}",
-                        "status_code": response.status_code
-                    }
-
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Failed to create Jira issue: {str(e)}"
-            }
-
-    async def get_project(self, project_key: str) -> Dict[str, Any]:
-        """Get Jira project details."""
-        if not self.is_configured():
-            return {"success": False, "error": "Jira client not configured"}
-
-        url = f"{self.base_url}/rest/api/2/project/{project_key}"
-        headers = {"Authorization": self.auth_header}
-
-        try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(url, headers=headers)
-
-                if response.status_code == 200:
-                    project_data = response.json()
-                    return {
-                        "success": True,
-                        "project": {
-                            "key": project_data["key"],
-                            "name": project_data["name"],
-                            "id": project_data["id"]
-                        }
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "error": f"Project not found: {response.status_code}"
-                    }
-
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Failed to get project: {str(e)}"
-            }
-
-    def map_recommendation_to_jira(self, recommendation: Dict[str, Any]) -> Dict[str, Any]:
-        """Map a recommendation to Jira ticket parameters."""
-        rec_type = recommendation.get("type", "general")
-        priority = recommendation.get("priority", "medium")
-
-        # Map recommendation type to issue type
-        issue_type_map = {
-            "consolidation": JiraIssueType.TASK,
-            "duplicate": JiraIssueType.TASK,
-            "outdated": JiraIssueType.TASK,
-            "quality": JiraIssueType.BUG
-        }
-
-        # Map priority
-        priority_map = {
-            "critical": JiraPriority.HIGHEST,
-            "high": JiraPriority.HIGH,
-            "medium": JiraPriority.MEDIUM,
-            "low": JiraPriority.LOW
-        }
-
-        # Create summary based on recommendation type
-        summary_map = {
-            "consolidation": "📋 Consolidate Similar Documentation",
-            "duplicate": "🔄 Remove Duplicate Documentation",
-            "outdated": "⏰ Update Outdated Documentation",
-            "quality": "✨ Improve Documentation Quality"
-        }
-
-        return {
-            "issue_type": issue_type_map.get(rec_type, JiraIssueType.TASK),
-            "priority": priority_map.get(priority, JiraPriority.MEDIUM),
-            "summary_prefix": summary_map.get(rec_type, "📝 Documentation Task"),
-            "labels": ["documentation", rec_type, f"priority-{priority}"]
-        }
+        """Parse date string into a naive UTC datetime object."""
+        return parse_document_date(date_str)
 
     def _generate_jira_ticket_suggestions(self, recommendations: List[Dict[str, Any]], documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Generate suggested Jira tickets based on recommendations."""
@@ -1833,41 +1729,37 @@ class JiraClient:
 
         return suggested_tickets
 
-    def _detect_drift_and_alerts(self, documents: List[Dict[str, Any]], recommendations: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _detect_drift_and_alerts(self, documents: List[Dict[str, Any]], recommendations: List[Dict[str, Any]],
+                                 features: Optional[DocumentFeatureIndex] = None) -> Dict[str, Any]:
         """Detect documentation and API drift and generate alerts."""
         drift_alerts = []
         api_drift_issues = []
         documentation_drift_issues = []
+        features = features or self._build_feature_index(documents)
+        now = datetime.utcnow()
 
         # Analyze documents for drift indicators
         for doc in documents:
-            content = doc.get("content", "")
+            doc_features = features.get(doc)
+            content = doc_features.content
             title = doc.get("title", "")
-            last_updated = doc.get("last_updated", doc.get("dateUpdated"))
 
             # API drift detection
             if content:
                 # Check for outdated API references
-                api_patterns = [
-                    r"api/v\d+",  # API version patterns
-                    r"endpoint.*deprecated",  # Deprecated endpoint mentions
-                    r"breaking.*change",  # Breaking change references
-                    r"migration.*required",  # Migration requirements
-                ]
-
-                for pattern in api_patterns:
-                    if re.search(pattern, content, re.IGNORECASE):
+                for pattern in API_DRIFT_PATTERNS:
+                    if pattern.search(content):
                         api_drift_issues.append({
                             "document_id": doc.get("id", title),
                             "document_title": title,
                             "drift_type": "api_reference",
-                            "pattern": pattern,
+                            "pattern": pattern.pattern,
                             "severity": "medium",
                             "recommendation": "Review API references for currency and update if necessary"
                         })
 
                 # Check for version mismatches
-                version_refs = re.findall(r"v\d+\.\d+", content)
+                version_refs = doc_features.version_refs
                 if len(set(version_refs)) > 2:  # Multiple different versions
                     api_drift_issues.append({
                         "document_id": doc.get("id", title),
@@ -1879,18 +1771,13 @@ class JiraClient:
                     })
 
             # Documentation drift detection
-            if last_updated:
+            if doc_features.has_last_updated:
                 try:
-                    # Parse last updated date
-                    if isinstance(last_updated, str):
-                        if "T" in last_updated:
-                            last_updated_date = datetime.fromisoformat(last_updated.replace("Z", "+00:00"))
-                        else:
-                            last_updated_date = datetime.strptime(last_updated, "%Y-%m-%d")
-                    else:
-                        last_updated_date = last_updated
+                    last_updated_date = doc_features.last_updated
+                    if last_updated_date is None:
+                        raise ValueError(f"Unrecognized date format: {doc.get('last_updated', doc.get('dateUpdated'))}")
 
-                    days_since_update = (datetime.now() - last_updated_date.replace(tzinfo=None)).days
+                    days_since_update = (now - last_updated_date).days
 
                     if days_since_update > 365:  # Over a year old
                         documentation_drift_issues.append({
@@ -1947,7 +1834,8 @@ class JiraClient:
             "critical_alerts": [alert for alert in drift_alerts if alert.get("severity") == "high"]
         }
 
-    def _check_documentation_alignment(self, documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _check_documentation_alignment(self, documents: List[Dict[str, Any]],
+                                       features: Optional[DocumentFeatureIndex] = None) -> Dict[str, Any]:
         """Check documentation alignment across the document set."""
         alignment_issues = []
         alignment_score = 1.0
@@ -1960,14 +1848,16 @@ class JiraClient:
                 "recommendations": ["Need multiple documents to assess alignment"]
             }
 
+        features = features or self._build_feature_index(documents)
+
         # Check for consistency in terminology
         all_terms = []
         term_frequency = {}
 
         for doc in documents:
-            content = doc.get("content", "").lower()
+            content = features.get(doc).content_lower
             # Extract potential technical terms (capitalized words, API endpoints, etc.)
-            terms = re.findall(r'\b[A-Z][a-zA-Z]*\b|\bapi/[a-zA-Z_]+\b|\b[A-Z_][A-Z_]+\b', content)
+            terms = TECHNICAL_TERM_PATTERN.findall(content)
             all_terms.extend(terms)
 
         # Count term frequencies
@@ -1993,11 +1883,11 @@ class JiraClient:
         # Check for structural alignment
         structure_patterns = []
         for doc in documents:
-            content = doc.get("content", "")
+            content = features.get(doc).content
             # Look for common structural elements
-            has_intro = bool(re.search(r'\b(intro|overview|summary)\b', content, re.IGNORECASE))
-            has_examples = bool(re.search(r'\b(example|sample|code)\b', content, re.IGNORECASE))
-            has_prerequisites = bool(re.search(r'\b(prereq|requirement|before|needed)\b', content, re.IGNORECASE))
+            has_intro = bool(INTRO_PATTERN.search(content))
+            has_examples = bool(EXAMPLES_PATTERN.search(content))
+            has_prerequisites = bool(PREREQUISITES_PATTERN.search(content))
 
             structure_patterns.append({
                 "document": doc.get("title", "Unknown"),
@@ -2020,9 +1910,9 @@ class JiraClient:
         # Check for cross-references
         cross_ref_count = 0
         for doc in documents:
-            content = doc.get("content", "")
+            content = features.get(doc).content
             # Look for see also, refer to, etc.
-            cross_refs = re.findall(r'\b(see also|refer to|see|reference|link)\b', content, re.IGNORECASE)
+            cross_refs = CROSS_REFERENCE_PATTERN.findall(content)
             cross_ref_count += len(cross_refs)
 
         if cross_ref_count < len(documents) * 0.5:  # Less than 0.5 cross-refs per document
@@ -2175,7 +2065,9 @@ class JiraClient:
         }
 
         # Analyze document placement on timeline
-        document_placements = self._analyze_document_timeline_placement(documents, timeline_phases)
+        document_placements = self._analyze_document_timeline_placement(
+            documents, timeline_phases, timeline.get("start_date")
+        )
         timeline_analysis["document_placement"] = document_placements
 
         # Calculate placement score
@@ -2196,11 +2088,28 @@ class JiraClient:
 
         return timeline_analysis
 
-    def _analyze_document_timeline_placement(self, documents: List[Dict[str, Any]], timeline_phases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Analyze how documents fit into the timeline."""
-        placements = []
+    def _analyze_document_timeline_placement(self, documents: List[Dict[str, Any]], timeline_phases: List[Dict[str, Any]],
+                                             timeline_start: Any = None) -> List[Dict[str, Any]]:
+        """Analyze how documents fit into the timeline.
 
+        Document dates are parsed once per distinct value and the phases are
+        indexed once, so each dated document is placed with a single bisect.
+        Week-based phases are anchored at ``timeline_start`` or, without one,
+        at the earliest document date.
+        """
+        document_dates = []
         for doc in documents:
+            last_updated = doc.get("last_updated") or doc.get("dateUpdated")
+            doc_date = self._parse_timestamp(last_updated) if last_updated else None
+            document_dates.append((last_updated, doc_date))
+
+        dated = [doc_date for _, doc_date in document_dates if doc_date is not None]
+        anchor = self._parse_timestamp(timeline_start) or (min(dated) if dated else None)
+        index = TimelineIndex(timeline_phases, self.timestamp_parser, anchor=anchor, max_distance_days=None)
+        positions = index.place_positions([doc_date for _, doc_date in document_dates])
+
+        placements = []
+        for doc, (last_updated, doc_date), position in zip(documents, document_dates, positions):
             placement = {
                 "document_id": doc.get("id", "unknown"),
                 "document_title": doc.get("title", "Unknown"),
@@ -2210,31 +2119,18 @@ class JiraClient:
                 "timeline_context": {}
             }
 
-            # Try to determine placement based on timestamps
-            last_updated = doc.get("last_updated") or doc.get("dateUpdated")
-            if last_updated:
-                try:
-                    if isinstance(last_updated, str):
-                        if "T" in last_updated:
-                            doc_date = datetime.fromisoformat(last_updated.replace("Z", "+00:00"))
-                        else:
-                            doc_date = datetime.strptime(last_updated, "%Y-%m-%d")
-                    else:
-                        doc_date = last_updated
-
-                    # Find the most relevant phase for this document
-                    relevant_phase = self._find_relevant_timeline_phase(doc_date, timeline_phases)
-                    if relevant_phase:
-                        placement["placement_phase"] = relevant_phase["name"]
-                        placement["placement_reason"] = "timestamp_match"
-                        placement["relevance_score"] = self._calculate_timeline_relevance(doc_date, relevant_phase)
-                        placement["timeline_context"] = {
-                            "phase_start": relevant_phase.get("start_week", 0),
-                            "phase_duration": relevant_phase.get("duration_weeks", 0),
-                            "document_date": doc_date.isoformat()
-                        }
-                except (ValueError, AttributeError):
-                    placement["placement_reason"] = "date_parse_error"
+            if last_updated and doc_date is None:
+                placement["placement_reason"] = "date_parse_error"
+            elif position is not None:
+                relevant_phase = timeline_phases[position]
+                placement["placement_phase"] = relevant_phase["name"]
+                placement["placement_reason"] = "timestamp_match"
+                placement["relevance_score"] = self._calculate_timeline_relevance(doc_date, relevant_phase)
+                placement["timeline_context"] = {
+                    "phase_start": relevant_phase.get("start_week", 0),
+                    "phase_duration": relevant_phase.get("duration_weeks", 0),
+                    "document_date": doc_date.isoformat()
+                }
 
             # If no timestamp match, try content-based placement
             if placement["placement_reason"] == "unplaced":
@@ -2246,15 +2142,42 @@ class JiraClient:
 
         return placements
 
-    def _find_relevant_timeline_phase(self, doc_date: datetime, timeline_phases: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        """Find the most relevant timeline phase for a document based on date."""
-        # This is a simplified version - in practice you'd need to know the project start date
-        # For now, we'll assume phases are in chronological order
-        for phase in timeline_phases:
-            # This is a placeholder - you'd need actual date mapping logic
-            if phase.get("start_week", 0) >= 0:  # Basic check
-                return phase
-        return None
+    def _parse_timestamp(self, timestamp: Any) -> Optional[datetime]:
+        """Parse a document or phase timestamp into a naive UTC datetime."""
+        return self.timestamp_parser.parse(timestamp)
+
+    def _find_relevant_timeline_phase(self, doc_date: datetime, timeline_phases: List[Dict[str, Any]],
+                                      timeline_start: Any = None) -> Optional[Dict[str, Any]]:
+        """Find the most relevant timeline phase for a document based on date.
+
+        Week-based phases are anchored at ``timeline_start``, or at the document
+        date itself when the project start is unknown.
+        """
+        doc_date = self._parse_timestamp(doc_date)
+        anchor = self._parse_timestamp(timeline_start) or doc_date
+        index = TimelineIndex(timeline_phases, self.timestamp_parser, anchor=anchor, max_distance_days=None)
+        return index.find(doc_date)
+
+    def _group_documents_by_phases(self, document_placements: List[Dict[str, Any]],
+                                   timeline_phases: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Group document placements by timeline phase name."""
+        phase_groups = {
+            phase.get("name", ""): {
+                "documents": [],
+                "document_count": 0,
+                "start_week": phase.get("start_week", 0),
+                "duration_weeks": phase.get("duration_weeks", 0)
+            }
+            for phase in timeline_phases
+        }
+
+        for placement in document_placements:
+            group = phase_groups.get(placement.get("placement_phase"))
+            if group is not None:
+                group["documents"].append(placement)
+                group["document_count"] += 1
+
+        return phase_groups
 
     def _calculate_timeline_relevance(self, doc_date: datetime, phase: Dict[str, Any]) -> float:
         """Calculate how relevant a document is to a timeline phase."""
@@ -2299,16 +2222,10 @@ class JiraClient:
             recommendations.append("Excellent document-timeline alignment. Documentation appears well-structured.")
 
         # Check for phase coverage
-        phase_coverage = {}
-        for placement in placements:
-            phase = placement.get("placement_phase")
-            if phase:
-                phase_coverage[phase] = phase_coverage.get(phase, 0) + 1
-
+        phase_groups = self._group_documents_by_phases(placements, timeline_phases)
         for phase in timeline_phases:
             phase_name = phase.get("name", "")
-            doc_count = phase_coverage.get(phase_name, 0)
-            if doc_count == 0:
+            if phase_groups[phase_name]["document_count"] == 0:
                 recommendations.append(f"No documents found for phase '{phase_name}'. Consider adding documentation.")
 
         return recommendations
@@ -2317,24 +2234,18 @@ class JiraClient:
         """Identify gaps in timeline coverage."""
         gaps = []
 
-        phase_coverage = {}
-        for placement in placements:
-            phase = placement.get("placement_phase")
-            if phase:
-                if phase not in phase_coverage:
-                    phase_coverage[phase] = []
-                phase_coverage[phase].append(placement)
-
+        phase_groups = self._group_documents_by_phases(placements, timeline_phases)
         for phase in timeline_phases:
             phase_name = phase.get("name", "")
-            if phase_name not in phase_coverage:
+            document_count = phase_groups[phase_name]["document_count"]
+            if document_count == 0:
                 gaps.append({
                     "gap_type": "no_documents",
                     "phase": phase_name,
                     "severity": "high",
                     "description": f"No documents found for phase '{phase_name}'"
                 })
-            elif len(phase_coverage[phase_name]) < 2:
+            elif document_count < 2:
                 gaps.append({
                     "gap_type": "insufficient_coverage",
                     "phase": phase_name,
@@ -2344,6 +2255,172 @@ class JiraClient:
 
         return gaps
 
+class JiraClient:
+    """Jira API client for creating and managing tickets."""
+
+    def __init__(self, base_url: str = None, username: str = None, api_token: str = None):
+        self.base_url = base_url or JIRA_BASE_URL
+        self.username = username or JIRA_USERNAME
+        self.api_token = api_token or JIRA_API_TOKEN
+        self.auth_header = self._create_auth_header()
+
+    def _create_auth_header(self) -> str:
+        """Create Basic Auth header for Jira API."""
+        if not self.username or not self.api_token:
+            return ""
+
+        credentials = f"{self.username}:{self.api_token}"
+        encoded_credentials = base64.b64encode(credentials.encode()).decode()
+        return f"Basic {encoded_credentials}"
+
+    def is_configured(self) -> bool:
+        """Check if Jira client is properly configured."""
+        return bool(self.base_url and self.username and self.api_token and self.auth_header)
+
+    async def create_issue(self, project_key: str, summary: str, description: str,
+                          issue_type: str = JiraIssueType.TASK,
+                          priority: str = JiraPriority.MEDIUM,
+                          assignee: str = None,
+                          labels: List[str] = None,
+                          components: List[str] = None,
+                          custom_fields: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Create a Jira issue."""
+        if not self.is_configured():
+            raise HTTPException(status_code=500, detail="Jira client not properly configured")
+
+        url = f"{self.base_url}/rest/api/2/issue"
+
+        # Build issue payload
+        issue_data = {
+            "fields": {
+                "project": {"key": project_key},
+                "summary": summary,
+                "description": description,
+                "issuetype": {"name": issue_type},
+                "priority": {"name": priority}
+            }
+        }
+
+        # Add optional fields
+        if assignee:
+            issue_data["fields"]["assignee"] = {"name": assignee}
+
+        if labels:
+            issue_data["fields"]["labels"] = labels
+
+        if components:
+            issue_data["fields"]["components"] = [{"name": comp} for comp in components]
+
+        if custom_fields:
+            issue_data["fields"].update(custom_fields)
+
+        headers = {
+            "Authorization": self.auth_header,
+            "Content-Type": "application/json"
+        }
+
+        try:
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                response = await client.post(url, json=issue_data, headers=headers)
+
+                if response.status_code == 201:
+                    issue_data = response.json()
+                    return {
+                        "success": True,
+                        "issue_key": issue_data["key"],
+                        "issue_id": issue_data["id"],
+                        "self": issue_data["self"]
+                    }
+                else:
+                    error_detail = response.text
+                    try:
+                        error_json = response.json()
+                        error_detail = error_json.get("errors", {}).get("summary", [error_detail])[0]
+                    except:
+                        pass
+
+                    return {
+                        "success": False,
+                        "error": f"Jira API error: {error_detail}",
+                        "status_code": response.status_code
+                    }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Failed to create Jira issue: {str(e)}"
+            }
+
+    async def get_project(self, project_key: str) -> Dict[str, Any]:
+        """Get Jira project details."""
+        if not self.is_configured():
+            return {"success": False, "error": "Jira client not configured"}
+
+        url = f"{self.base_url}/rest/api/2/project/{project_key}"
+        headers = {"Authorization": self.auth_header}
+
+        try:
+            async with httpx.AsyncClient(timeout=10.0) as client:
+                response = await client.get(url, headers=headers)
+
+                if response.status_code == 200:
+                    project_data = response.json()
+                    return {
+                        "success": True,
+                        "project": {
+                            "key": project_data["key"],
+                            "name": project_data["name"],
+                            "id": project_data["id"]
+                        }
+                    }
+                else:
+                    return {
+                        "success": False,
+                        "error": f"Project not found: {response.status_code}"
+                    }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Failed to get project: {str(e)}"
+            }
+
+    def map_recommendation_to_jira(self, recommendation: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a recommendation to Jira ticket parameters."""
+        rec_type = recommendation.get("type", "general")
+        priority = recommendation.get("priority", "medium")
+
+        # Map recommendation type to issue type
+        issue_type_map = {
+            "consolidation": JiraIssueType.TASK,
+            "duplicate": JiraIssueType.TASK,
+            "outdated": JiraIssueType.TASK,
+            "quality": JiraIssueType.BUG
+        }
+
+        # Map priority
+        priority_map = {
+            "critical": JiraPriority.HIGHEST,
+            "high": JiraPriority.HIGH,
+            "medium": JiraPriority.MEDIUM,
+            "low": JiraPriority.LOW
+        }
+
+        # Create summary based on recommendation type
+        summary_map = {
+            "consolidation": "📋 Consolidate Similar Documentation",
+            "duplicate": "🔄 Remove Duplicate Documentation",
+            "outdated": "⏰ Update Outdated Documentation",
+            "quality": "✨ Improve Documentation Quality"
+        }
+
+        return {
+            "issue_type": issue_type_map.get(rec_type, JiraIssueType.TASK),
+            "priority": priority_map.get(priority, JiraPriority.MEDIUM),
+            "summary_prefix": summary_map.get(rec_type, "📝 Documentation Task"),
+            "labels": ["documentation", rec_type, f"priority-{priority}"]
+        }
+
     async def create_jira_tickets_from_suggestions(self, suggested_tickets: List[Dict[str, Any]], project_key: str = None) -> Dict[str, Any]:
         """Create actual Jira tickets from suggested tickets."""
         if not self.is_configured():
@@ -2425,7 +2502,7 @@ class JiraClient:
             documents = []
 
         # Generate suggestions first
-        suggestions = self._generate_jira_ticket_suggestions(recommendations, documents)
+        suggestions = summarizer._generate_jira_ticket_suggestions(recommendations, documents)
 
         # Then create the tickets
         return await self.create_jira_tickets_from_suggestions(suggestions, project_key)
@@ -2500,6 +2577,19 @@ async def get_capabilities():
         }
     }
 
+def _build_summarize_response(request: SummarizeRequest, summary: str) -> SummarizeResponse:
+    """Build the standard summarization response for a request and its summary."""
+    return SummarizeResponse(
+        success=True,
+        data={
+            "summary": summary,
+            "original_length": len(request.content.split()),
+            "summary_length": len(summary.split()),
+            "compression_ratio": len(summary) / len(request.content) if request.content else 0,
+            "format": request.format
+        }
+    )
+
 @app.post("/summarize", response_model=SummarizeResponse)
 async def summarize_document(request: SummarizeRequest):
     """Summarize a document."""
@@ -2510,16 +2600,7 @@ async def summarize_document(request: SummarizeRequest):
             getattr(request, 'style', 'professional')
         )
         
-        return SummarizeResponse(
-            success=True,
-            data={
-                "summary": summary,
-                "original_length": len(request.content.split()),
-                "summary_length": len(summary.split()),
-                "compression_ratio": len(summary) / len(request.content) if request.content else 0,
-                "format": request.format
-            }
-        )
+        return _build_summarize_response(request, summary)
         
     except Exception as e:
         return SummarizeResponse(
@@ -2772,30 +2853,42 @@ async def analyze_alignment_simple(request: Dict[str, Any]):
         }
 
 @app.post("/batch/summarize")
-async def batch_summarize(requests: List[SummarizeRequest]):
-    """Batch summarize multiple documents."""
-    results = []
-    
-    for request in requests:
-        try:
-            result = await summarize_document(request)
-            results.append(result)
-        except Exception as e:
-            results.append(SummarizeResponse(success=False, error=str(e)))
-    
+async def batch_summarize(requests: List[SummarizeRequest], stream: bool = False):
+    """Batch summarize multiple documents.
+
+    Documents are summarized concurrently (bounded by SUMMARIZER_BATCH_CONCURRENCY).
+    With ``stream=true`` the response is NDJSON, one line per document as it completes.
+    """
+    jobs = [(r.content, r.max_length, r.style or "professional") for r in requests]
+
+    def to_response(index: int, outcome: Any) -> SummarizeResponse:
+        if isinstance(outcome, Exception):
+            return SummarizeResponse(success=False, error=str(outcome))
+        return _build_summarize_response(requests[index], outcome)
+
+    if stream:
+        async def stream_results():
+            async for index, outcome in summarizer.engine.iter_batch(jobs):
+                line = {"index": index, **to_response(index, outcome).model_dump()}
+                yield json.dumps(line) + "\n"
+
+        return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+    outcomes = await summarizer.engine.summarize_batch(jobs)
+    results = [to_response(i, outcome) for i, outcome in enumerate(outcomes)]
+
     return {
         "batch_results": results,
         "total_processed": len(results),
         "successful": sum(1 for r in results if r.success),
-        "failed": sum(1 for r in results if not r.success)
+        "failed": sum(1 for r in results if not r.success),
+        "engine_stats": summarizer.engine.get_stats()
     }
 
 @app.post("/api/v1/summarize")
 async def summarize_v1(request: SummarizeRequest):
     """Summarize text content using standardized API v1 interface."""
     try:
-        summarizer = SimpleSummarizer()
-
         # Generate summary
         summary_text = await summarizer.summarize_with_llm(
             request.content,
@@ -0,0 +1,192 @@
+"""Precomputed document features for Summarizer Hub recommendation generation.
+
+Every recommendation generator needs the same derived views of a document
+(lowercased text, word lists, term sets, sentences, headings, parsed dates).
+DocumentFeatures computes them once per document; a DocumentFeatureIndex shares
+them across all generators of one request, and a content-hash keyed LRU keeps
+them across requests for documents that have not changed.
+"""
+
+import hashlib
+import re
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Tuple
+
+DATE_FORMATS = ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y/%m/%d")
+
+PASSIVE_INDICATORS = frozenset({"is", "are", "was", "were", "be", "been", "being"})
+
+_VERSION_REF = re.compile(r"v\d+\.\d+")
+
+
+def parse_document_date(value: Any) -> Optional[datetime]:
+    """Parse an ISO or common date string into a naive UTC datetime.
+
+    Timezone-aware values are converted to UTC and made naive so they can be
+    compared with ``datetime.now()``-style naive timestamps.
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except (ValueError, AttributeError):
+            parsed = None
+            for fmt in DATE_FORMATS:
+                try:
+                    parsed = datetime.strptime(str(value), fmt)
+                    break
+                except ValueError:
+                    continue
+            if parsed is None:
+                return None
+
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+class DocumentFeatures:
+    """Derived text features of one document, computed once.
+
+    Cheap, universally used views are computed eagerly; the rest are cached
+    properties computed on first access.
+    """
+
+    def __init__(self, content: str = "", title: str = "",
+                 date_created: Any = None, date_updated: Any = None, last_updated: Any = None):
+        self.content = content or ""
+        self.title = title or ""
+        self.content_lower = self.content.lower()
+        self.words = self.content.split()
+        self.word_count = len(self.words)
+        self.lower_words = self.content_lower.split()
+        self.term_set = frozenset(self.lower_words)
+        self.title_terms = frozenset(self.title.lower().split())
+        self._date_created = date_created
+        self._date_updated = date_updated
+        self._last_updated = last_updated
+
+    @classmethod
+    def from_document(cls, document: Dict[str, Any]) -> "DocumentFeatures":
+        return cls(
+            content=document.get("content", ""),
+            title=document.get("title", ""),
+            date_created=document.get("dateCreated"),
+            date_updated=document.get("dateUpdated"),
+            last_updated=document.get("last_updated", document.get("dateUpdated"))
+        )
+
+    @cached_property
+    def sentences(self) -> List[str]:
+        return [s.strip() for s in self.content.split('.') if s.strip()]
+
+    @cached_property
+    def lines(self) -> List[str]:
+        return self.content.split('\n')
+
+    @cached_property
+    def headings(self) -> List[str]:
+        return [line for line in self.lines if line.strip().startswith('#')]
+
+    @cached_property
+    def bullet_lines(self) -> List[str]:
+        return [line for line in self.lines if line.strip().startswith(('- ', '* ', '+ '))]
+
+    @cached_property
+    def passive_count(self) -> int:
+        return sum(1 for word in self.lower_words if word in PASSIVE_INDICATORS)
+
+    @cached_property
+    def version_refs(self) -> List[str]:
+        return _VERSION_REF.findall(self.content)
+
+    @cached_property
+    def created(self) -> Optional[datetime]:
+        return parse_document_date(self._date_created)
+
+    @cached_property
+    def updated(self) -> Optional[datetime]:
+        return parse_document_date(self._date_updated)
+
+    @property
+    def has_last_updated(self) -> bool:
+        return bool(self._last_updated)
+
+    @cached_property
+    def last_updated(self) -> Optional[datetime]:
+        return parse_document_date(self._last_updated)
+
+
+def document_fingerprint(document: Dict[str, Any]) -> str:
+    """Content hash over the fields DocumentFeatures is derived from."""
+    digest = hashlib.blake2b(digest_size=16)
+    for key in ("title", "content", "dateCreated", "dateUpdated", "last_updated"):
+        digest.update(str(document.get(key, "")).encode("utf-8", "surrogatepass"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class DocumentFeatureCache:
+    """LRU of DocumentFeatures keyed by document content hash, shared across requests."""
+
+    def __init__(self, max_entries: int = 5000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, DocumentFeatures]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, document: Dict[str, Any]) -> DocumentFeatures:
+        key = document_fingerprint(document)
+        features = self._entries.get(key)
+        if features is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return features
+
+        self.misses += 1
+        features = DocumentFeatures.from_document(document)
+        self._entries[key] = features
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return features
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "capacity": self.max_entries,
+                "hits": self.hits, "misses": self.misses}
+
+
+class DocumentFeatureIndex:
+    """Per-request view mapping each document to its features.
+
+    Documents are looked up by object identity, so every generator working on the
+    same request list shares a single DocumentFeatures instance per document.
+    """
+
+    def __init__(self, documents: List[Dict[str, Any]], cache: Optional[DocumentFeatureCache] = None):
+        self.cache = cache
+        # id -> (document, features); holding the document keeps its id from being reused
+        self._by_id: Dict[int, Tuple[Dict[str, Any], DocumentFeatures]] = {}
+        for document in documents:
+            self._by_id[id(document)] = (document, self._compute(document))
+
+    def _compute(self, document: Dict[str, Any]) -> DocumentFeatures:
+        if self.cache is not None:
+            return self.cache.get(document)
+        return DocumentFeatures.from_document(document)
+
+    def get(self, document: Dict[str, Any]) -> DocumentFeatures:
+        entry = self._by_id.get(id(document))
+        if entry is None or entry[0] is not document:
+            entry = self._by_id[id(document)] = (document, self._compute(document))
+        return entry[1]
+
+    def __len__(self) -> int:
+        return len(self._by_id)
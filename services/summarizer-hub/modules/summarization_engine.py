@@ -0,0 +1,261 @@
+"""Concurrent map-reduce summarization engine for Summarizer Hub.
+
+Long documents are split into content-defined chunks, the chunks are summarized
+in parallel (bounded by a shared LLM concurrency limit) and the partial summaries
+are reduced into a final summary. Chunk and reduce results are cached by content
+hash, so re-summarizing an edited document only recomputes the chunks that changed.
+Batches fan out with bounded concurrency and can be consumed as they complete.
+"""
+
+import asyncio
+import hashlib
+import re
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+SummarizeFn = Callable[[str, int, str], Awaitable[str]]
+FallbackFn = Callable[[str, int], str]
+
+_PARAGRAPH_SPLIT = re.compile(r"\n\s*\n")
+
+# Result handed to waiters when the call they joined was cancelled; they retry it
+_RETRY = object()
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 tokens per 3 words) without a tokenizer dependency."""
+    return (len(text.split()) * 4 + 2) // 3
+
+
+def _content_hash(*parts: Any) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def _split_oversized(text: str, max_tokens: int) -> List[str]:
+    """Split a paragraph that exceeds the chunk budget by sentences, then by words."""
+    pieces: List[str] = []
+    for sentence in _SENTENCE_SPLIT.split(text):
+        if estimate_tokens(sentence) <= max_tokens:
+            pieces.append(sentence)
+            continue
+        words = sentence.split()
+        step = max(1, (max_tokens * 3) // 4)
+        pieces.extend(" ".join(words[i:i + step]) for i in range(0, len(words), step))
+    return pieces
+
+
+def chunk_document(content: str, max_tokens: int = 1500, boundary_divisor: int = 4) -> List[str]:
+    """Split content into chunks of at most ``max_tokens`` estimated tokens.
+
+    Boundaries are content-defined: a chunk may end after a paragraph whose hash
+    is divisible by ``boundary_divisor`` once it holds at least a quarter of the
+    budget, and must end before it would overflow. An edit therefore only moves
+    the boundaries near it, and the remaining chunks keep their cached summaries.
+    """
+    paragraphs = [p.strip() for p in _PARAGRAPH_SPLIT.split(content) if p.strip()]
+    units: List[str] = []
+    for paragraph in paragraphs:
+        if estimate_tokens(paragraph) > max_tokens:
+            units.extend(_split_oversized(paragraph, max_tokens))
+        else:
+            units.append(paragraph)
+
+    min_tokens = max_tokens // 4
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for unit in units:
+        unit_tokens = estimate_tokens(unit)
+        if current and current_tokens + unit_tokens > max_tokens:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+
+        current.append(unit)
+        current_tokens += unit_tokens
+
+        unit_hash = int(hashlib.blake2b(unit.encode("utf-8"), digest_size=8).hexdigest(), 16)
+        if current_tokens >= min_tokens and unit_hash % boundary_divisor == 0:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+class SummarizationEngine:
+    """Bounded-concurrency map-reduce summarizer with a content-hash result cache."""
+
+    def __init__(self, summarize_fn: SummarizeFn, fallback_fn: Optional[FallbackFn] = None,
+                 llm_concurrency: int = 8, batch_concurrency: int = 8,
+                 chunk_tokens: int = 1500, chunk_summary_length: int = 200,
+                 cache_size: int = 2048):
+        """Create an engine.
+
+        ``summarize_fn(content, max_length, style)`` performs one LLM call and should
+        raise on failure; ``fallback_fn(content, max_length)`` is used instead when it
+        does, and fallback output is never cached.
+        """
+        self.summarize_fn = summarize_fn
+        self.fallback_fn = fallback_fn
+        self.batch_concurrency = max(1, batch_concurrency)
+        self.chunk_tokens = chunk_tokens
+        self.chunk_summary_length = chunk_summary_length
+        self.cache_size = cache_size
+
+        self._llm_semaphore = asyncio.Semaphore(max(1, llm_concurrency))
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats: Dict[str, int] = {
+            "llm_calls": 0,
+            "fallbacks": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "chunked_documents": 0,
+            "chunks": 0
+        }
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        value = self._cache.get(key)
+        if value is not None:
+            self._cache.move_to_end(key)
+        return value
+
+    def _cache_put(self, key: str, value: str):
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def clear_cache(self):
+        """Drop all cached chunk and reduce summaries."""
+        self._cache.clear()
+
+    # ------------------------------------------------------------------
+    # Single LLM call with caching and single-flight
+    # ------------------------------------------------------------------
+
+    async def _summarize_cached(self, content: str, max_length: int, style: str) -> str:
+        key = _content_hash(style, max_length, content)
+        while True:
+            cached = self._cache_get(key)
+            if cached is not None:
+                self.stats["cache_hits"] += 1
+                return cached
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            summary = await asyncio.shield(inflight)
+            if summary is not _RETRY:
+                self.stats["cache_hits"] += 1
+                return summary
+
+        self.stats["cache_misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            summary, cacheable = await self._call_llm(content, max_length, style)
+            if cacheable:
+                self._cache_put(key, summary)
+            future.set_result(summary)
+            return summary
+        except asyncio.CancelledError:
+            # The leader's cancellation is not the waiters' failure: let them retry
+            future.set_result(_RETRY)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unobserved failure doesn't log a warning
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _call_llm(self, content: str, max_length: int, style: str) -> Tuple[str, bool]:
+        async with self._llm_semaphore:
+            self.stats["llm_calls"] += 1
+            try:
+                summary = await self.summarize_fn(content, max_length, style)
+                if summary:
+                    return summary, True
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pass
+
+        self.stats["fallbacks"] += 1
+        if self.fallback_fn is None:
+            return "", False
+        return self.fallback_fn(content, max_length), False
+
+    # ------------------------------------------------------------------
+    # Map-reduce summarization
+    # ------------------------------------------------------------------
+
+    async def summarize(self, content: str, max_length: int = 500, style: str = "professional") -> str:
+        """Summarize a document, chunking and reducing when it exceeds the chunk budget."""
+        if estimate_tokens(content) <= self.chunk_tokens:
+            return await self._summarize_cached(content, max_length, style)
+
+        chunks = chunk_document(content, self.chunk_tokens)
+        self.stats["chunked_documents"] += 1
+        self.stats["chunks"] += len(chunks)
+
+        partials = await asyncio.gather(*(
+            self._summarize_cached(chunk, self.chunk_summary_length, style)
+            for chunk in chunks
+        ))
+
+        combined = "\n\n".join(p for p in partials if p)
+        if estimate_tokens(combined) > self.chunk_tokens and len(combined) < len(content):
+            # Partial summaries still too long: reduce recursively
+            return await self.summarize(combined, max_length, style)
+        return await self._summarize_cached(combined, max_length, style)
+
+    async def summarize_batch(self, contents: List[Tuple[str, int, str]]) -> List[Any]:
+        """Summarize many documents concurrently; results (or exceptions) keep input order."""
+        results: List[Any] = [None] * len(contents)
+        async for index, result in self.iter_batch(contents):
+            results[index] = result
+        return results
+
+    async def iter_batch(self, contents: List[Tuple[str, int, str]]) -> AsyncIterator[Tuple[int, Any]]:
+        """Yield ``(index, summary_or_exception)`` pairs as documents complete.
+
+        At most ``batch_concurrency`` documents are in progress at once; pending
+        work is cancelled if the consumer stops iterating early.
+        """
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+
+        async def run(index: int, content: str, max_length: int, style: str):
+            async with semaphore:
+                try:
+                    return index, await self.summarize(content, max_length, style)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    return index, e
+
+        tasks = [asyncio.create_task(run(i, *item)) for i, item in enumerate(contents)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Engine counters plus current cache occupancy."""
+        return {**self.stats, "cache_entries": len(self._cache), "cache_capacity": self.cache_size}
@@ -0,0 +1,122 @@
+"""Unit tests for precomputed document features in Summarizer Hub."""
+
+from datetime import datetime
+
+import pytest
+
+from main import SimpleSummarizer
+from modules.document_features import (
+    DocumentFeatureCache, DocumentFeatureIndex, DocumentFeatures, parse_document_date
+)
+
+
+def make_documents(count: int):
+    return [
+        {
+            "id": f"doc{i}",
+            "title": f"API Guide {i % 5}",
+            "content": f"# Overview\nThis guide {i} covers the api/v1 endpoints. See also the reference.\n- step one\n- step two",
+            "dateCreated": "2020-01-01T00:00:00Z",
+            "dateUpdated": "2020-06-01",
+            "type": "confluence" if i % 2 else "github"
+        }
+        for i in range(count)
+    ]
+
+
+class TestParseDocumentDate:
+    """Test cases for date parsing."""
+
+    def test_zulu_is_converted_to_naive_utc(self):
+        parsed = parse_document_date("2024-01-15T10:00:00Z")
+        assert parsed == datetime(2024, 1, 15, 10, 0, 0)
+        assert parsed.tzinfo is None
+
+    def test_offset_is_normalized_to_utc(self):
+        assert parse_document_date("2024-01-15T12:00:00+02:00") == datetime(2024, 1, 15, 10, 0, 0)
+
+    def test_fallback_formats_and_invalid(self):
+        assert parse_document_date("2024/01/15") == datetime(2024, 1, 15)
+        assert parse_document_date("not a date") is None
+        assert parse_document_date(None) is None
+
+
+class TestDocumentFeatures:
+    """Test cases for derived document features."""
+
+    def test_features_match_inline_computation(self):
+        content = "# Title\nThe system is fast. It was built in v1.2 and v1.3.\n- item"
+        features = DocumentFeatures(content, "My Doc")
+
+        assert features.word_count == len(content.split())
+        assert features.term_set == frozenset(content.lower().split())
+        assert features.title_terms == frozenset({"my", "doc"})
+        assert features.headings == ["# Title"]
+        assert features.bullet_lines == ["- item"]
+        assert features.passive_count == 2
+        assert features.version_refs == ["v1.2", "v1.3"]
+
+    def test_cache_reuses_features_for_unchanged_content(self):
+        cache = DocumentFeatureCache(max_entries=10)
+        document = {"title": "t", "content": "hello world"}
+
+        first = cache.get(document)
+        second = cache.get(dict(document))
+        changed = cache.get({"title": "t", "content": "hello there"})
+
+        assert first is second
+        assert changed is not first
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["misses"] == 2
+
+    def test_cache_is_bounded(self):
+        cache = DocumentFeatureCache(max_entries=3)
+        for i in range(10):
+            cache.get({"content": f"doc {i}"})
+        assert cache.get_stats()["entries"] == 3
+
+    def test_index_shares_features_per_document(self):
+        documents = make_documents(3)
+        index = DocumentFeatureIndex(documents)
+
+        assert len(index) == 3
+        assert index.get(documents[0]) is index.get(documents[0])
+        # Documents outside the request are computed on demand
+        assert index.get({"content": "extra words"}).word_count == 2
+
+
+class TestRecommendationsWithFeatures:
+    """Recommendation generation using the shared feature index."""
+
+    @pytest.fixture
+    def summarizer(self):
+        return SimpleSummarizer()
+
+    def test_similarity_matches_with_and_without_index(self, summarizer):
+        documents = make_documents(2)
+        index = DocumentFeatureIndex(documents)
+
+        assert summarizer._calculate_simple_similarity(documents[0], documents[1]) == pytest.approx(
+            summarizer._calculate_simple_similarity(documents[0], documents[1], index)
+        )
+
+    @pytest.mark.asyncio
+    async def test_generate_recommendations_populates_feature_cache(self, summarizer):
+        documents = make_documents(20)
+
+        result = await summarizer.generate_recommendations(documents)
+        assert result["total_documents"] == 20
+        assert summarizer.feature_cache.get_stats()["misses"] == 20
+
+        await summarizer.generate_recommendations(documents)
+        assert summarizer.feature_cache.get_stats()["misses"] == 20
+        assert summarizer.feature_cache.get_stats()["hits"] >= 20
+
+    @pytest.mark.asyncio
+    async def test_outdated_recommendations_handle_aware_dates(self, summarizer):
+        documents = make_documents(2)
+
+        recommendations = await summarizer._generate_outdated_recommendations(documents, 0.0)
+
+        assert len(recommendations) == 2
+        assert all(rec["type"] == "outdated" for rec in recommendations)
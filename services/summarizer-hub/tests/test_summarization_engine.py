@@ -0,0 +1,160 @@
+"""Unit tests for the map-reduce summarization engine in Summarizer Hub."""
+
+import asyncio
+import time
+
+import pytest
+
+from modules.summarization_engine import SummarizationEngine, chunk_document, estimate_tokens
+
+
+def make_document(paragraphs: int, words_per_paragraph: int = 60) -> str:
+    """Build a multi-paragraph document with distinct paragraphs."""
+    return "\n\n".join(
+        " ".join(f"p{i}w{j}" for j in range(words_per_paragraph)) + "."
+        for i in range(paragraphs)
+    )
+
+
+class FakeLLM:
+    """Records calls and returns a short deterministic summary."""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, content: str, max_length: int, style: str) -> str:
+        self.calls.append(content)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError("llm unavailable")
+            return f"summary of {len(content.split())} words"
+        finally:
+            self.in_flight -= 1
+
+
+class TestChunking:
+    """Test cases for content-defined chunking."""
+
+    def test_short_document_single_chunk(self):
+        assert chunk_document("A short document.", max_tokens=100) == ["A short document."]
+
+    def test_chunks_respect_token_budget(self):
+        chunks = chunk_document(make_document(50), max_tokens=300)
+        assert len(chunks) > 1
+        assert all(estimate_tokens(c) <= 300 for c in chunks)
+
+    def test_oversized_paragraph_is_split(self):
+        chunks = chunk_document(" ".join(["word"] * 2000), max_tokens=200)
+        assert len(chunks) > 1
+        assert all(estimate_tokens(c) <= 200 for c in chunks)
+
+    def test_edit_only_changes_nearby_chunks(self):
+        original = make_document(80)
+        paragraphs = original.split("\n\n")
+        paragraphs[40] = paragraphs[40] + " extra words inserted here."
+        edited = "\n\n".join(paragraphs)
+
+        before = set(chunk_document(original, max_tokens=300))
+        after = chunk_document(edited, max_tokens=300)
+        changed = [c for c in after if c not in before]
+        assert 1 <= len(changed) <= 2
+
+
+class TestSummarizationEngine:
+    """Test cases for map-reduce summarization, caching and batching."""
+
+    @pytest.mark.asyncio
+    async def test_short_document_single_call(self):
+        llm = FakeLLM()
+        engine = SummarizationEngine(llm, chunk_tokens=500)
+        summary = await engine.summarize("Short text to summarize.", 100)
+        assert summary == "summary of 4 words"
+        assert len(llm.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_long_document_map_reduce(self):
+        llm = FakeLLM()
+        engine = SummarizationEngine(llm, chunk_tokens=300)
+        document = make_document(40)
+        chunk_count = len(chunk_document(document, 300))
+
+        await engine.summarize(document, 100)
+        # One call per chunk plus the reduce step
+        assert len(llm.calls) == chunk_count + 1
+
+    @pytest.mark.asyncio
+    async def test_edited_document_reuses_cached_chunks(self):
+        llm = FakeLLM()
+        engine = SummarizationEngine(llm, chunk_tokens=300)
+        document = make_document(80)
+        await engine.summarize(document, 100)
+        first_calls = len(llm.calls)
+
+        paragraphs = document.split("\n\n")
+        paragraphs[40] = paragraphs[40] + " a small edit."
+        await engine.summarize("\n\n".join(paragraphs), 100)
+
+        recomputed = len(llm.calls) - first_calls
+        assert recomputed <= 3  # changed chunk(s) plus the reduce step
+        assert recomputed < first_calls
+
+    @pytest.mark.asyncio
+    async def test_failures_fall_back_and_are_not_cached(self):
+        llm = FakeLLM(fail=True)
+        engine = SummarizationEngine(llm, fallback_fn=lambda content, n: "fallback")
+        assert await engine.summarize("Some content.", 50) == "fallback"
+
+        llm.fail = False
+        assert await engine.summarize("Some content.", 50) == "summary of 2 words"
+
+    @pytest.mark.asyncio
+    async def test_batch_runs_concurrently_within_limit(self):
+        llm = FakeLLM(delay=0.05)
+        engine = SummarizationEngine(llm, llm_concurrency=4, batch_concurrency=4)
+        jobs = [(f"Document number {i}.", 50, "professional") for i in range(8)]
+
+        start = time.perf_counter()
+        results = await engine.summarize_batch(jobs)
+        elapsed = time.perf_counter() - start
+
+        assert results == ["summary of 3 words"] * 8
+        assert llm.max_in_flight == 4
+        assert elapsed < 8 * 0.05
+
+    @pytest.mark.asyncio
+    async def test_iter_batch_yields_every_index(self):
+        engine = SummarizationEngine(FakeLLM(), batch_concurrency=2)
+        jobs = [(f"Doc {i} text.", 50, "professional") for i in range(5)]
+        indexes = [index async for index, _ in engine.iter_batch(jobs)]
+        assert sorted(indexes) == list(range(5))
+
+    @pytest.mark.asyncio
+    async def test_identical_concurrent_requests_share_one_call(self):
+        llm = FakeLLM(delay=0.02)
+        engine = SummarizationEngine(llm)
+        await engine.summarize_batch([("Same text.", 50, "professional")] * 5)
+        assert len(llm.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_fail_waiters(self):
+        llm = FakeLLM(delay=0.05)
+        engine = SummarizationEngine(llm)
+        leader = asyncio.create_task(engine.summarize("Same text."))
+        await asyncio.sleep(0.01)
+
+        batch = asyncio.create_task(engine.summarize_batch([("Same text.", 500, "professional")] * 3))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        results = await batch
+        assert results == ["summary of 2 words"] * 3
+        assert leader.cancelled()
+        # One waiter re-ran the call; the others joined it
+        assert len(llm.calls) == 2
@@ -132,6 +132,33 @@ class TestTimelineAnalysis:
         # Content-based placement should work for development-related content
         assert placement["placement_reason"] in ["content_match", "timestamp_match", "unplaced"]
 
+    def test_week_based_placement_anchored_at_earliest_document(self, summarizer, sample_timeline):
+        """Test that week-based phases are anchored at the earliest document date."""
+        documents = [
+            {"id": "doc1", "title": "Plan", "dateUpdated": "2024-01-01T10:00:00Z"},
+            {"id": "doc2", "title": "Build", "dateUpdated": "2024-01-22T10:00:00Z"},
+            {"id": "doc3", "title": "Verify", "dateUpdated": "2024-02-14"}
+        ]
+
+        placements = summarizer._analyze_document_timeline_placement(documents, sample_timeline["phases"])
+
+        assert [p["placement_phase"] for p in placements] == ["Planning", "Development", "Testing"]
+        assert all(p["placement_reason"] == "timestamp_match" for p in placements)
+
+    def test_placement_uses_timeline_start_and_reports_parse_errors(self, summarizer, sample_timeline):
+        """Test explicit timeline start anchoring and unparseable dates."""
+        timeline = dict(sample_timeline, start_date="2023-12-04")
+        documents = [
+            {"id": "doc1", "title": "Doc", "dateUpdated": "2024-01-01"},
+            {"id": "doc2", "title": "Broken", "dateUpdated": "yesterday"}
+        ]
+
+        result = summarizer._analyze_timeline_and_documents(documents, timeline)
+        placements = result["document_placement"]
+
+        assert placements[0]["placement_phase"] == "Development"
+        assert placements[1]["placement_reason"] == "date_parse_error"
+
     def test_find_relevant_timeline_phase(self, summarizer, sample_timeline):
         """Test finding relevant timeline phase for a document date."""
         doc_date = datetime(2024, 1, 3)  # Early date, should match first phase
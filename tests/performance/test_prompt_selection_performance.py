@@ -0,0 +1,108 @@
+"""Performance tests for prompt selection over a large prompt library.
+
+Builds the in-memory selection index over a synthetic 50k-prompt library
+and measures top-k query latency, incremental updates and the initial build.
+
+Run with: pytest tests/performance/test_prompt_selection_performance.py -v --benchmark-only
+"""
+
+import itertools
+import random
+import time
+
+import pytest
+
+from services.prompt_store.infrastructure.selection import PromptSelectionIndex
+
+LIBRARY_SIZE = 50_000
+
+VOCABULARY = (
+    "summarize report analyze data translate text review code bug style email customer reply "
+    "write story poem outline draft plan meeting notes extract entities classify sentiment "
+    "generate test sql query api documentation explain concept teach student compare options "
+    "risk security audit contract legal marketing copy product launch tweet blog seo keyword"
+).split()
+CATEGORIES = ["analysis", "code", "writing", "language", "marketing", "education", "legal", "data"]
+TAGS = ["summary", "code", "review", "email", "creative", "sql", "docs", "security", "seo", "teaching"]
+
+QUERIES = [
+    "summarize the quarterly sales report",
+    "review python code for security bugs",
+    "write a marketing email for a product launch",
+    "extract entities from meeting notes",
+    "explain sql query plans to a student",
+]
+
+
+def filler_vocabulary(size: int, rng: random.Random):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choices(letters, k=rng.randint(4, 9))) for _ in range(size)]
+
+
+def synthetic_library(size: int, seed: int = 42):
+    """Prompts mixing task words with Zipf-distributed filler text."""
+    rng = random.Random(seed)
+    filler = filler_vocabulary(20_000, random.Random(0))
+    zipf = list(itertools.accumulate(1.0 / rank for rank in range(1, len(filler) + 1)))
+    for i in range(size):
+        words = rng.choices(VOCABULARY, k=6) + rng.choices(filler, cum_weights=zipf, k=34)
+        rng.shuffle(words)
+        yield {
+            "id": f"prompt_{i}",
+            "name": "_".join(rng.sample(VOCABULARY, 3)) + f"_{i}",
+            "category": rng.choice(CATEGORIES),
+            "description": " ".join(rng.choices(VOCABULARY, k=4) + rng.choices(filler, cum_weights=zipf, k=6)),
+            "content": " ".join(words),
+            "tags": rng.sample(TAGS, rng.randint(0, 3)),
+            "performance_score": rng.random(),
+            "usage_count": rng.randint(0, 5000),
+        }
+
+
+@pytest.mark.performance
+class TestPromptSelectionPerformance:
+    """Performance tests for the prompt selection index."""
+
+    @pytest.fixture(scope="class")
+    def library_index(self):
+        rows = list(synthetic_library(LIBRARY_SIZE))
+        outcomes = [(f"prompt_{i}", [f"prompt_{i + 1}"]) for i in range(0, 2000, 2)]
+        index = PromptSelectionIndex()
+        index.ensure_loaded(lambda: (rows, outcomes))
+        # Compile postings for the query vocabulary once, as steady-state traffic would
+        for query in QUERIES:
+            index.search(query, k=5)
+        return index
+
+    def test_index_build(self):
+        rows = list(synthetic_library(LIBRARY_SIZE))
+        index = PromptSelectionIndex()
+
+        start = time.perf_counter()
+        index.ensure_loaded(lambda: (rows, []))
+        elapsed = time.perf_counter() - start
+
+        assert index.get_stats()["documents"] == LIBRARY_SIZE
+        assert elapsed < 30.0, f"Building the index took {elapsed:.1f}s"
+
+    def test_top_k_query_performance(self, benchmark, library_index):
+        queries = iter(QUERIES * 10_000)
+
+        result = benchmark(lambda: library_index.search(next(queries), k=5))
+
+        assert len(result) == 5
+
+    def test_contextual_query_performance(self, benchmark, library_index):
+        result = benchmark(library_index.search, "review code for bugs", k=10,
+                           category="code", tags=["security"])
+
+        assert len(result) == 10
+        assert all(match.breakdown["text"] > 0 for match in result)
+
+    def test_incremental_update_performance(self, benchmark, library_index):
+        rows = iter(synthetic_library(100_000, seed=7))
+
+        benchmark(lambda: library_index.upsert(next(rows)))
+
+        # Changed prompts are rescored without waiting for a rebuild
+        assert len(library_index.search(QUERIES[0], k=5)) == 5
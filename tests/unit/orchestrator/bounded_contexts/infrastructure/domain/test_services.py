@@ -12,6 +12,7 @@ from unittest.mock import AsyncMock
 from services.orchestrator.domain.infrastructure.services import (
     DLQService, SagaService, TracingService, EventStreamingService
 )
+from services.orchestrator.domain.infrastructure.value_objects import TraceStatus
 
 
 class TestDLQService:
@@ -228,6 +229,71 @@ class TestTracingService:
         assert stats["completed_traces"] == 0
         assert stats["total_spans"] == 2
 
+    def test_completed_traces_are_bounded(self):
+        """Completed traces are kept in a fixed-capacity ring."""
+        tracing_service = TracingService(max_completed_traces=10)
+
+        for i in range(50):
+            trace = tracing_service.start_trace("service1", "op", f"trace{i}")
+            tracing_service.create_span(trace.trace_id, "service1", "op")
+            tracing_service.complete_trace(trace.trace_id)
+
+        stats = tracing_service.get_tracing_stats()
+        assert stats["completed_traces"] == 10
+        assert stats["total_spans"] == 10
+        assert stats["traces_evicted"] == 40
+        assert tracing_service.get_trace("trace0") is None
+        assert tracing_service.get_trace("trace49") is not None
+        assert len(tracing_service.get_service_traces("service1")) == 10
+
+    def test_tail_sampling_always_keeps_failed_traces(self):
+        """Failed traces survive sampling and are not evicted by successful ones."""
+        tracing_service = TracingService(max_completed_traces=5, sample_rate=0.0)
+
+        failed = tracing_service.start_trace("service1", "op", "failed-trace")
+        tracing_service.complete_trace(failed.trace_id, TraceStatus.FAILED)
+        for i in range(20):
+            trace = tracing_service.start_trace("service1", "op", f"ok{i}")
+            tracing_service.complete_trace(trace.trace_id)
+
+        stats = tracing_service.get_tracing_stats()
+        assert tracing_service.get_trace("failed-trace") is not None
+        assert stats["completed_traces"] == 1
+        assert stats["failed_traces"] == 1
+        assert stats["traces_sampled_out"] == 20
+        assert stats["traces_completed_total"] == 21
+
+    def test_latency_histograms_per_operation(self):
+        """Span durations are aggregated per service and operation."""
+        tracing_service = TracingService()
+        trace = tracing_service.start_trace("service1", "op")
+        span = tracing_service.create_span(trace.trace_id, "service1", "query")
+
+        assert tracing_service.finish_span(trace.trace_id, span.span_id) is True
+        assert tracing_service.finish_span(trace.trace_id, "unknown-span") is False
+        tracing_service.create_span(trace.trace_id, "service2", "render")
+        tracing_service.complete_trace(trace.trace_id)
+
+        latency = tracing_service.get_latency_stats()
+        assert latency["service1/query"]["count"] == 1
+        assert latency["service2/render"]["count"] == 1
+        assert list(tracing_service.get_latency_stats("service2")) == ["service2/render"]
+
+    def test_export_finished_traces(self, tmp_path):
+        """Finished traces are exported to a compressed JSON lines file."""
+        export_path = str(tmp_path / "traces.jsonl.gz")
+        tracing_service = TracingService(sample_rate=0.0, export_path=export_path, export_batch_size=2)
+
+        for i in range(3):
+            trace = tracing_service.start_trace("service1", "op", f"trace{i}")
+            tracing_service.create_span(trace.trace_id, "service1", "op")
+            tracing_service.complete_trace(trace.trace_id)
+        tracing_service.flush_export()
+
+        exported = list(TracingService.read_exported_traces(export_path))
+        assert [t["trace_id"] for t in exported] == ["trace0", "trace1", "trace2"]
+        assert exported[0]["span_count"] == 1
+
 
 class TestEventStreamingService:
     """Test EventStreamingService domain service."""
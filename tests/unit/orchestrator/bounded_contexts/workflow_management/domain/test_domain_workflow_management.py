@@ -7,6 +7,8 @@ Tests the core domain logic including value objects, entities, and domain servic
 
 import pytest
 import uuid
+import asyncio
+import time
 from datetime import datetime, timedelta
 from unittest.mock import Mock
 
@@ -366,3 +368,159 @@ class TestActionResult:
         assert result.status == ActionStatus.FAILED
         assert result.has_error is True
         assert result.error_message == "Error occurred"
+
+
+class TestWorkflowExecutor:
+    """Test WorkflowExecutor DAG scheduling."""
+
+    @staticmethod
+    def _action(action_id, depends_on=None, service="svc", delay=0.0, fail=False):
+        return WorkflowAction(
+            action_id=action_id,
+            name=action_id,
+            action_type=ActionType.SERVICE_CALL,
+            config={"service": service, "endpoint": "/run", "delay": delay, "fail": fail},
+            depends_on=depends_on or []
+        )
+
+    @staticmethod
+    def _recording_executor(log):
+        async def run(action, parameters, external_services):
+            log.append(("start", action.action_id))
+            await asyncio.sleep(action.config["delay"])
+            log.append(("end", action.action_id))
+            if action.config["fail"]:
+                raise RuntimeError(f"{action.action_id} failed")
+            return {"action": action.action_id}
+        return run
+
+    def _workflow(self, *actions):
+        workflow = Workflow(name="DAG", created_by="user")
+        for action in actions:
+            workflow.add_action(action)
+        return workflow
+
+    def _execution(self, workflow):
+        execution = WorkflowExecution(workflow_id=workflow.workflow_id)
+        execution.start({})
+        return execution
+
+    @pytest.mark.asyncio
+    async def test_downstream_starts_without_waiting_for_unrelated_branch(self):
+        """A fast branch's successor should not wait for a slow sibling."""
+        log = []
+        workflow = self._workflow(
+            self._action("slow", delay=0.2),
+            self._action("fast", delay=0.01),
+            self._action("after_fast", depends_on=["fast"], delay=0.01)
+        )
+        executor = WorkflowExecutor(self._recording_executor(log))
+
+        execution = await executor.execute_workflow(workflow, self._execution(workflow))
+
+        assert execution.is_successful
+        assert log.index(("end", "after_fast")) < log.index(("end", "slow"))
+
+    @pytest.mark.asyncio
+    async def test_wide_graph_latency_tracks_critical_path(self):
+        """Total time should be close to the longest chain, not the sum of waves."""
+        actions = []
+        for branch in range(5):
+            # Each branch is slow in a different stage; waves would serialize the slow stages
+            for stage in range(3):
+                delay = 0.1 if stage == branch % 3 else 0.01
+                depends_on = [f"b{branch}s{stage - 1}"] if stage else []
+                actions.append(self._action(f"b{branch}s{stage}", depends_on, service=f"svc{branch}", delay=delay))
+        workflow = self._workflow(*actions)
+        executor = WorkflowExecutor(self._recording_executor([]))
+
+        start = time.perf_counter()
+        execution = await executor.execute_workflow(workflow, self._execution(workflow))
+        elapsed = time.perf_counter() - start
+
+        assert execution.is_successful
+        assert elapsed < 0.2
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limits(self):
+        """Global and per-service limits cap in-flight actions."""
+        in_flight = {"total": 0, "max_total": 0, "a": 0, "max_a": 0}
+
+        async def run(action, parameters, external_services):
+            service = action.config["service"]
+            in_flight["total"] += 1
+            in_flight["max_total"] = max(in_flight["max_total"], in_flight["total"])
+            if service == "a":
+                in_flight["a"] += 1
+                in_flight["max_a"] = max(in_flight["max_a"], in_flight["a"])
+            await asyncio.sleep(0.01)
+            in_flight["total"] -= 1
+            if service == "a":
+                in_flight["a"] -= 1
+            return {}
+
+        actions = [self._action(f"a{i}", service="a") for i in range(6)]
+        actions += [self._action(f"b{i}", service="b") for i in range(6)]
+        workflow = self._workflow(*actions)
+        executor = WorkflowExecutor(run, max_concurrency=4, service_concurrency={"a": 2})
+
+        execution = await executor.execute_workflow(workflow, self._execution(workflow))
+
+        assert execution.is_successful
+        assert in_flight["max_total"] <= 4
+        assert in_flight["max_a"] <= 2
+
+    @pytest.mark.asyncio
+    async def test_critical_path_runs_first(self):
+        """With one slot, the head of the longest chain is started before short leaves."""
+        log = []
+        leaf = self._action("leaf")
+        head = self._action("head")
+        head.config["estimated_duration_ms"] = 10
+        tail = self._action("tail", depends_on=["head"])
+        tail.config["estimated_duration_ms"] = 500
+        workflow = self._workflow(leaf, head, tail)
+        executor = WorkflowExecutor(self._recording_executor(log), max_concurrency=1)
+
+        await executor.execute_workflow(workflow, self._execution(workflow))
+
+        assert log[0] == ("start", "head")
+
+    @pytest.mark.asyncio
+    async def test_cycle_fails_before_running_anything(self):
+        """Circular dependencies are rejected before any action runs."""
+        log = []
+        workflow = self._workflow(
+            self._action("independent"),
+            self._action("action1", depends_on=["action2"]),
+            self._action("action2", depends_on=["action1"])
+        )
+        executor = WorkflowExecutor(self._recording_executor(log))
+
+        execution = await executor.execute_workflow(workflow, self._execution(workflow))
+
+        assert execution.status == WorkflowExecutionStatus.FAILED
+        assert "circular" in execution.error_message.lower()
+        assert log == []
+
+    @pytest.mark.asyncio
+    async def test_failure_skips_dependents_and_records_timing(self):
+        """Dependents of a failed action are skipped; executed actions carry timing."""
+        workflow = self._workflow(
+            self._action("ok", delay=0.02),
+            self._action("broken", fail=True),
+            self._action("child", depends_on=["broken"]),
+            self._action("grandchild", depends_on=["child", "ok"])
+        )
+        executor = WorkflowExecutor(self._recording_executor([]))
+
+        execution = await executor.execute_workflow(workflow, self._execution(workflow))
+
+        assert execution.status == WorkflowExecutionStatus.FAILED
+        assert execution.results["broken"].has_error
+        assert execution.results["child"].status == ActionStatus.SKIPPED
+        assert execution.results["grandchild"].status == ActionStatus.SKIPPED
+        ok_result = execution.results["ok"]
+        assert ok_result.execution_time_ms >= 15
+        assert ok_result.queue_time_ms is not None
+        assert ok_result.completed_at >= ok_result.started_at
@@ -0,0 +1,200 @@
+"""
+Event Store Snapshot and Replay Tests
+
+Covers snapshot-based replay over Redis and in memory, reading only the
+tail after a snapshot, and the bounds on in-memory aggregate state.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.orchestrator.modules import event_driven_orchestration as orchestration
+from services.orchestrator.modules.event_driven_orchestration import EventStore, EventType, WorkflowEvent
+
+
+class FakePipeline:
+    """Queues commands and runs them against FakeRedis on execute()."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((name, args, kwargs))
+
+    async def execute(self):
+        results = [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+        self.commands = []
+        return results
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio for the event store."""
+
+    def __init__(self):
+        self.values = {}
+        self.lists = {}
+        self.sorted_sets = {}
+        self.lrange_calls = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+        return len(self.lists[key])
+
+    async def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    async def lrange(self, key, start, end):
+        self.lrange_calls.append((key, start, end))
+        return self.lists.get(key, [])[start:end + 1]
+
+    async def set(self, key, value):
+        self.values[key] = value
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def zadd(self, key, mapping):
+        self.sorted_sets.setdefault(key, {}).update(mapping)
+
+
+def workflow_events(aggregate_id, count, start=None):
+    start = start or datetime(2025, 1, 1, 12, 0, 0)
+    events = [WorkflowEvent(event_type=EventType.WORKFLOW_STARTED, aggregate_id=aggregate_id, timestamp=start)]
+    for i in range(1, count - 1):
+        events.append(WorkflowEvent(event_type=EventType.STEP_COMPLETED, aggregate_id=aggregate_id,
+                                    timestamp=start + timedelta(seconds=i)))
+    events.append(WorkflowEvent(event_type=EventType.WORKFLOW_FAILED, aggregate_id=aggregate_id,
+                                payload={"error": "timeout"}, timestamp=start + timedelta(seconds=count)))
+    return events
+
+
+@pytest.fixture(autouse=True)
+def quiet_logging(monkeypatch):
+    monkeypatch.setattr(orchestration, "fire_and_forget", lambda *args, **kwargs: None)
+
+
+class TestRedisSnapshots:
+    """Test snapshot and replay against Redis."""
+
+    @pytest.mark.asyncio
+    async def test_replay_starts_from_snapshot(self):
+        store = EventStore(snapshot_interval=10)
+        store.redis = FakeRedis()
+
+        for event in workflow_events("wf-1", 25):
+            assert await store.store_event(event)
+
+        snapshot = json.loads(store.redis.values["snapshot:workflow:wf-1"])
+        assert snapshot["version"] == 20
+        assert snapshot["state"]["current_state"] == "running"
+
+        store.redis.lrange_calls.clear()
+        state = await store.replay_events("wf-1")
+
+        assert state["event_count"] == 25
+        assert state["current_state"] == "failed"
+        assert state["failure_reason"] == "timeout"
+        assert isinstance(state["started_at"], datetime)
+        # Only the five events after the snapshot were read
+        assert store.redis.lrange_calls == [("events:workflow:wf-1", 20, 20 + store.read_batch_size - 1)]
+
+    @pytest.mark.asyncio
+    async def test_replay_without_snapshot_reads_whole_stream(self):
+        store = EventStore(snapshot_interval=100)
+        store.redis = FakeRedis()
+        for event in workflow_events("wf-2", 5):
+            await store.store_event(event)
+
+        state = await store.replay_events("wf-2")
+
+        assert state["event_count"] == 5
+        assert state["current_state"] == "failed"
+        assert "snapshot:workflow:wf-2" not in store.redis.values
+
+    @pytest.mark.asyncio
+    async def test_stale_snapshot_is_ignored(self):
+        store = EventStore(snapshot_interval=100)
+        store.redis = FakeRedis()
+        store.redis.values["snapshot:workflow:wf-3"] = json.dumps(
+            {"version": 50, "state": {"aggregate_id": "wf-3", "current_state": "completed"}}
+        )
+        for event in workflow_events("wf-3", 3):
+            await store.store_event(event)
+
+        state = await store.replay_events("wf-3")
+
+        assert state["event_count"] == 3
+        assert state["current_state"] == "failed"
+
+
+class TestMemorySnapshots:
+    """Test snapshot and replay without Redis."""
+
+    @pytest.mark.asyncio
+    async def test_replay_matches_across_snapshots(self):
+        store = EventStore(snapshot_interval=4, max_memory_events=4)
+
+        for event in workflow_events("wf-1", 10):
+            await store.store_event(event)
+
+        assert store._memory_snapshots["wf-1"]["version"] == 8
+        state = await store.replay_events("wf-1")
+        assert state["event_count"] == 10
+        assert state["current_state"] == "failed"
+
+    @pytest.mark.asyncio
+    async def test_evicted_stream_survives_as_snapshot(self):
+        store = EventStore(snapshot_interval=100, max_memory_streams=1)
+
+        for event in workflow_events("wf-1", 3):
+            await store.store_event(event)
+        await store.store_event(WorkflowEvent(aggregate_id="wf-2"))
+
+        assert list(store.event_streams) == ["wf-2"]
+        state = await store.replay_events("wf-1")
+        assert state["event_count"] == 3
+        assert state["current_state"] == "failed"
+
+    @pytest.mark.asyncio
+    async def test_versions_and_snapshots_are_capped_per_aggregate(self):
+        store = EventStore(snapshot_interval=2, max_memory_streams=2, max_memory_aggregates=3)
+
+        for i in range(10):
+            for event in workflow_events(f"wf-{i}", 4):
+                await store.store_event(event)
+
+        assert list(store._memory_versions) == ["wf-7", "wf-8", "wf-9"]
+        assert set(store._memory_snapshots) <= {"wf-7", "wf-8", "wf-9"}
+        assert len(store.event_streams) == 2
+        assert all(snapshot["version"] == 4 for snapshot in store._memory_snapshots.values())
+
+        # A forgotten aggregate starts over
+        await store.store_event(WorkflowEvent(aggregate_id="wf-0"))
+        assert store._memory_versions["wf-0"] == 1
+        assert "wf-7" not in store._memory_versions
+
+    @pytest.mark.asyncio
+    async def test_redis_fallback_snapshots_are_capped(self):
+        store = EventStore(max_memory_streams=1, max_memory_aggregates=2)
+        store.redis = FakeRedis()
+
+        async def failing_set(key, value):
+            raise ConnectionError("redis down")
+
+        store.redis.set = failing_set
+        for i in range(5):
+            await store._save_snapshot(f"wf-{i}", "workflow", 1, {"current_state": "running"})
+
+        assert list(store._memory_snapshots) == ["wf-3", "wf-4"]
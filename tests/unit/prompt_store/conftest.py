@@ -11,6 +11,11 @@ from pathlib import Path
 
 from services.prompt_store.db.schema import init_database
 from services.prompt_store.db.connection import get_prompt_store_connection
+from services.prompt_store.infrastructure.resolution import prompt_resolution_cache
+from services.prompt_store.domain.relationships.repository import relationship_graph_cache
+from services.prompt_store.domain.ab_testing.engine import experiment_registry
+from services.prompt_store.infrastructure.selection import prompt_selection_index
+from services.prompt_store.infrastructure.diff import prompt_diff_cache
 
 
 @pytest.fixture(scope="function")
@@ -47,7 +52,8 @@ def prompt_store_db(temp_db_path):
         'cost_optimization_metrics', 'prompt_evolution_metrics', 'prompt_optimization_suggestions',
         'user_satisfaction_scores', 'prompt_performance_metrics', 'prompt_testing_results',
         'bias_detection_results', 'notifications', 'webhook_deliveries', 'webhooks',
-        'bulk_operations', 'prompt_relationships', 'prompt_usage', 'ab_test_results',
+        'bulk_operations', 'orchestration_step_memo', 'orchestration_step_checkpoints', 'orchestration_executions',
+        'prompt_relationships', 'prompt_usage', 'prompt_usage_hourly', 'prompt_tags', 'ab_test_variants', 'ab_test_results',
         'ab_tests', 'prompt_versions', 'prompts', 'prompts_fts'
     ]
 
@@ -82,6 +88,13 @@ def prompt_store_db(temp_db_path):
 
     conn.close()
 
+    # Cached prompt snapshots, graphs, experiments, the selection index and diffs belong to the previous test's database
+    prompt_resolution_cache.clear()
+    relationship_graph_cache.clear()
+    experiment_registry.clear()
+    prompt_selection_index.clear()
+    prompt_diff_cache.clear()
+
     yield temp_db_path
 
 
@@ -94,8 +107,9 @@ def clean_db(prompt_store_db):
     # Clear all data from tables
     tables_to_clear = [
         'notifications', 'webhook_deliveries', 'webhooks',
-        'bulk_operations', 'prompt_relationships', 'prompt_usage',
-        'ab_test_results', 'ab_tests', 'prompt_versions', 'prompts'
+        'bulk_operations', 'orchestration_step_memo', 'orchestration_step_checkpoints', 'orchestration_executions',
+        'prompt_relationships', 'prompt_usage',
+        'ab_test_variants', 'ab_test_results', 'ab_tests', 'prompt_versions', 'prompts'
     ]
 
     for table in tables_to_clear:
@@ -84,20 +84,17 @@ class TestRefinementService:
         prompt = prompt_service.create_entity({
             "name": unique_name,
             "category": "test",
-            "content": "Original content",
+            "content": f"Original content for {unique_name}",
             "created_by": "test_user"
         })
-
-        # Mock version retrieval
-        with patch.object(prompt_service, '_get_prompt_versions') as mock_versions:
-            mock_versions.return_value = [
-                Mock(content="Version 1 content", version=1),
-                Mock(content="Version 2 content", version=2)
-            ]
-
-            result = await service.compare_prompt_versions(prompt.id, 1, 2)
-            assert result["prompt_id"] == prompt.id
-            assert "comparison" in result
+        prompt_service.update_prompt_content(prompt.id, f"Revised content for {unique_name}")
+
+        result = await service.compare_prompt_versions(prompt.id, 1, 2)
+        assert result["prompt_id"] == prompt.id
+        differences = result["comparison"]["differences"]
+        assert differences["content_changed"]
+        assert differences["content_diff"]["hunks"][0]["token_changes"] == [{"op": "replace", "a": "Original", "b": "Revised"}]
+        assert 0 < differences["similarity"] < 1
 
     @pytest.mark.asyncio
     async def test_replace_prompt_with_refined_success(self):
@@ -6,7 +6,9 @@ Tests covering repository, service, and handler layers for prompt relationships.
 import pytest
 from unittest.mock import Mock, patch
 
-from services.prompt_store.domain.relationships.repository import RelationshipsRepository
+from services.prompt_store.core.entities import Prompt
+from services.prompt_store.domain.prompts.repository import PromptRepository
+from services.prompt_store.domain.relationships.repository import RelationshipsRepository, relationship_graph_cache
 from services.prompt_store.domain.relationships.service import RelationshipsService
 from services.prompt_store.domain.relationships.handlers import RelationshipsHandlers
 from services.prompt_store.core.models import PromptRelationshipCreate
@@ -123,6 +125,63 @@ class TestRelationshipsRepository:
         assert "extends" in types
         assert "references" in types
 
+    def _save_prompts(self, *names):
+        prompt_repo = PromptRepository()
+        for name in names:
+            prompt = Prompt(name=name, category="graph", content=f"{name} content", created_by="test_user")
+            prompt.id = name
+            prompt_repo.save(prompt)
+
+    def test_relationship_graph_depth_and_cycles(self, prompt_store_db):
+        """Test graph expansion is bounded by depth and terminates on cycles."""
+        self._save_prompts("a", "b", "c", "d")
+        repo = RelationshipsRepository()
+        repo.create_relationship("a", "b", "extends")
+        repo.create_relationship("b", "c", "references")
+        repo.create_relationship("c", "a", "similar")
+        repo.create_relationship("d", "c", "depends_on")
+
+        graph = repo.get_relationship_graph("a", depth=1)
+        assert [(n["id"], n["depth"]) for n in graph["nodes"]] == [("a", 0), ("b", 1), ("c", 1)]
+        assert graph["nodes"][1]["name"] == "b"
+        assert len(graph["edges"]) == 3
+
+        graph = repo.get_relationship_graph("a", depth=5)
+        assert [(n["id"], n["depth"]) for n in graph["nodes"]] == [("a", 0), ("b", 1), ("c", 1), ("d", 2)]
+        assert len(graph["edges"]) == 4
+
+        with pytest.raises(ValueError):
+            repo.get_relationship_graph("a", depth=50)
+
+    def test_relationship_graph_filters(self, prompt_store_db):
+        """Test relationship type and strength filters prune the walk."""
+        self._save_prompts("a", "b", "c")
+        repo = RelationshipsRepository()
+        repo.create_relationship("a", "b", "extends", strength=0.9)
+        repo.create_relationship("b", "c", "references", strength=0.9)
+        repo.create_relationship("a", "c", "similar", strength=0.2)
+
+        graph = repo.get_relationship_graph("a", depth=3, relationship_types=["extends"])
+        assert [n["id"] for n in graph["nodes"]] == ["a", "b"]
+
+        graph = repo.get_relationship_graph("a", depth=3, min_strength=0.5)
+        assert [(n["id"], n["depth"]) for n in graph["nodes"]] == [("a", 0), ("b", 1), ("c", 2)]
+        assert {e["type"] for e in graph["edges"]} == {"extends", "references"}
+
+    def test_relationship_graph_cache_cleared_on_write(self, prompt_store_db):
+        """Test cached graphs are dropped when relationships change."""
+        self._save_prompts("a", "b", "c")
+        repo = RelationshipsRepository()
+        repo.create_relationship("a", "b", "extends")
+
+        assert len(repo.get_relationship_graph("a")["nodes"]) == 2
+        repo.get_relationship_graph("a")["nodes"].clear()
+        assert relationship_graph_cache.get_stats()["hits"] >= 1
+        assert len(repo.get_relationship_graph("a")["nodes"]) == 2
+
+        repo.create_relationship("b", "c", "extends")
+        assert len(repo.get_relationship_graph("a")["nodes"]) == 3
+
 
 @pytest.mark.unit
 class TestRelationshipsService:
@@ -273,4 +332,4 @@ class TestRelationshipsHandlers:
 
             assert result["success"] is True
             assert result["data"]["total_nodes"] == 1
-            mock_graph.assert_called_once_with("test_id", 2)
+            mock_graph.assert_called_once_with("test_id", 2, None, 0.0)
@@ -4,6 +4,8 @@ import pytest
 import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from services.prompt_store.domain.prompts.service import PromptService
+from services.prompt_store.domain.validation.runner import LocalPromptExecutor
 from services.prompt_store.domain.validation.service import ValidationService
 from services.prompt_store.domain.validation.entities import (
     PromptTestingResult,
@@ -22,10 +24,13 @@ def validation_service():
 class TestValidationService:
     """Test cases for validation service functionality."""
 
-    async def test_run_prompt_test_success(self, validation_service):
+    async def test_run_prompt_test_success(self, prompt_store_db):
         """Test running a prompt test successfully."""
-        prompt_id = "test_prompt_123"
-        version = 1
+        prompt = PromptService().create_entity({
+            "name": "echo", "category": "test", "created_by": "test_user",
+            "content": "Answer the question: {{input}}"
+        })
+        version = prompt.version
         test_suite_id = "suite_456"
         test_case = {
             "id": "test_001",
@@ -34,29 +39,25 @@ class TestValidationService:
             "expected_output": "Expected result"
         }
 
-        # Mock the LLM call for testing
-        with patch.object(validation_service.clients, 'interpret_query', new_callable=AsyncMock) as mock_interpret:
-            mock_interpret.return_value = {
-                "success": True,
-                "data": {
-                    "response_text": "Test response",
-                    "execution_time": 1.5
-                }
-            }
+        # Scripted stand-in for the LLM
+        validation_service = ValidationService(executor=LocalPromptExecutor(
+            responder=lambda rendered, case: "Expected result"
+        ))
 
-            result = await validation_service.run_prompt_test(
-                prompt_id, version, test_suite_id, test_case
-            )
+        result = await validation_service.run_prompt_test(
+            prompt.id, version, test_suite_id, test_case
+        )
 
-            # Verify result structure
-            assert isinstance(result, PromptTestingResult)
-            assert result.prompt_id == prompt_id
-            assert result.version == version
-            assert result.test_suite_id == test_suite_id
-            assert result.test_case_id == "test_001"
-            assert result.test_name == "Basic Functionality Test"
-            assert result.passed is True  # Mock passes
-            assert result.execution_time_ms == 1500  # 1.5 * 1000
+        # Verify result structure
+        assert isinstance(result, PromptTestingResult)
+        assert result.prompt_id == prompt.id
+        assert result.version == version
+        assert result.test_suite_id == test_suite_id
+        assert result.test_case_id == "test_001"
+        assert result.test_name == "Basic Functionality Test"
+        assert result.passed is True
+        assert result.expected_output_similarity == 1.0
+        assert result.execution_time_ms >= 0
 
     async def test_run_test_suite(self, validation_service):
         """Test running a complete test suite."""
@@ -79,7 +80,8 @@ class TestValidationService:
             ]
         }
 
-        with patch.object(validation_service, 'run_prompt_test', new_callable=AsyncMock) as mock_run_test:
+        with patch.object(validation_service, '_get_version_content', return_value="Prompt text"), \
+                patch.object(validation_service, 'run_prompt_test', new_callable=AsyncMock) as mock_run_test:
             # Mock test results
             mock_run_test.side_effect = [
                 PromptTestingResult(
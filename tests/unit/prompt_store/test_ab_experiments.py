@@ -0,0 +1,264 @@
+"""Tests for the in-memory A/B experimentation engine.
+
+Covers deterministic weighted assignment, running sums and the Welch test,
+sequential winner detection, Thompson allocation, and the service keeping
+database running sums in step with the in-memory experiment.
+"""
+
+import random
+
+import pytest
+
+from services.prompt_store.core.entities import ABTest, ABTestResult
+from services.prompt_store.db.queries import execute_query
+from services.prompt_store.domain.ab_testing.engine import (
+    Experiment, build_variants, experiment_registry, welch_t_test
+)
+from services.prompt_store.domain.ab_testing.repository import ABTestRepository, ABTestResultRepository
+from services.prompt_store.domain.ab_testing.service import ABTestService
+from services.prompt_store.domain.prompts.service import PromptService
+
+
+def make_experiment(prompt_ids=("p_a", "p_b"), weights=None, **kwargs):
+    return Experiment("test_1", build_variants(list(prompt_ids), weights), **kwargs)
+
+
+def create_prompts(count):
+    service = PromptService()
+    return [
+        service.create_entity({
+            "name": f"variant_{i}", "category": "test",
+            "content": f"Version {i}", "created_by": "test_user"
+        })
+        for i in range(count)
+    ]
+
+
+@pytest.mark.unit
+class TestExperimentEngine:
+    """Test assignment and statistics on running sums."""
+
+    def test_assignment_is_sticky_and_follows_weights(self):
+        experiment = make_experiment(weights=[0.7, 0.3])
+        assignments = [experiment.assign(f"user_{i}").prompt_id for i in range(10000)]
+
+        assert 0.67 < assignments.count("p_a") / len(assignments) < 0.73
+        # A fresh instance (another process) assigns every user identically
+        again = make_experiment(weights=[0.7, 0.3])
+        assert [again.assign(f"user_{i}").prompt_id for i in range(200)] == assignments[:200]
+
+    def test_running_sums_and_welch_test(self):
+        experiment = make_experiment()
+        for value in (1, 2, 3, 4, 5):
+            experiment.record("p_a", value)
+        experiment.record("p_b", 2)
+        experiment.record("p_b", 4)
+        experiment.record("p_b", 6, count=1)
+        experiment.record("p_b", 8)
+        experiment.record("p_b", 10)
+
+        first = experiment.variant_for("p_a")
+        second = experiment.variant_for("p_b")
+        assert (first.count, first.mean, first.variance) == (5, 3.0, 2.5)
+        assert (second.mean, second.variance) == (6.0, 10.0)
+
+        result = welch_t_test(first, second)
+        assert result["t_statistic"] == pytest.approx(-1.8974, abs=1e-4)
+        assert result["degrees_of_freedom"] == pytest.approx(5.8824, abs=1e-4)
+        assert result["p_value"] == pytest.approx(0.1075, abs=1e-3)
+
+    def test_sequential_test_waits_for_min_samples(self):
+        experiment = make_experiment(min_samples=10)
+        for _ in range(9):
+            outcome = experiment.record("p_a", 1.0)
+            experiment.record("p_b", 0.0)
+        assert outcome.winner is None
+
+        experiment.record("p_a", 1.0)
+        outcome = experiment.record("p_b", 0.0)
+        assert outcome.statistical_significance
+        assert outcome.winner == "A"
+
+    def test_winner_comes_from_eligible_variants(self):
+        # C leads on two samples but is below min_samples, so it cannot win
+        experiment = make_experiment(("p_a", "p_b", "p_c"), min_samples=10)
+        experiment.record("p_c", 5.0)
+        experiment.record("p_c", 5.0)
+        rng = random.Random(5)
+        outcome = None
+        for _ in range(30):
+            experiment.record("p_a", rng.gauss(1.0, 0.1))
+            outcome = experiment.record("p_b", rng.gauss(0.0, 0.1))
+            if outcome.winner:
+                break
+
+        assert outcome.statistical_significance
+        assert outcome.winner == "A"
+        assert experiment.final_winner() == "A"
+
+    def test_no_winner_between_equal_variants(self):
+        experiment = make_experiment()
+        rng = random.Random(7)
+        for _ in range(2000):
+            experiment.record("p_a", rng.gauss(0.5, 0.1))
+            experiment.record("p_b", rng.gauss(0.5, 0.1))
+
+        assert experiment.winner is None
+        assert experiment.final_winner() is None
+
+    def test_aggregated_results_are_not_repeated_observations(self):
+        # One result with sample_size 100 is a mean, not 100 identical values
+        experiment = make_experiment(min_samples=10)
+        experiment.record("p_a", 0.85, 100)
+        outcome = experiment.record("p_b", 0.84, 100)
+
+        assert not outcome.statistical_significance and outcome.winner is None
+        assert experiment.comparison() is None
+        assert experiment.final_winner() is None
+
+    def test_near_equal_rates_have_no_winner(self):
+        experiment = Experiment("test_1", build_variants(["p_a", "p_b"], bounded=True))
+        for _ in range(5):
+            experiment.record("p_a", 0.85, 100)
+            outcome = experiment.record("p_b", 0.84, 100)
+
+        assert outcome.winner is None and outcome.p_value > 0.05
+        comparison = experiment.comparison()
+        assert abs(comparison["t_statistic"]) < 1 and comparison["p_value"] > 0.5
+        assert experiment.final_winner() is None
+
+    def test_discard_restores_sequential_state(self):
+        experiment = make_experiment(min_samples=2)
+        experiment.record("p_a", 1.0)
+        experiment.record("p_a", 1.0)
+        experiment.record("p_b", 0.0)
+        outcome = experiment.record("p_b", 0.0)
+        assert outcome.winner == "A" and outcome.previous_winner is None
+
+        experiment.discard("p_b", 0.0, 1, outcome)
+
+        assert experiment.winner is None
+        assert experiment.sequential_p_value == outcome.previous_p_value
+        assert experiment.variant_for("p_b").count == 1
+
+    def test_lower_is_better_metrics(self):
+        experiment = make_experiment(lower_is_better=True)
+        rng = random.Random(3)
+        for _ in range(200):
+            experiment.record("p_a", rng.gauss(120, 10))
+            experiment.record("p_b", rng.gauss(300, 10))
+
+        assert experiment.winner == "A"
+
+    def test_thompson_sampling_shifts_traffic_to_best_variant(self):
+        experiment = make_experiment(("p_a", "p_b", "p_c"), allocation="thompson", rng=random.Random(1))
+
+        # Without data every variant still gets traffic
+        assert {experiment.assign().prompt_id for _ in range(50)} == {"p_a", "p_b", "p_c"}
+
+        for prompt_id, rate in (("p_a", 0.2), ("p_b", 0.8), ("p_c", 0.3)):
+            for i in range(100):
+                experiment.record(prompt_id, 1.0 if i < rate * 100 else 0.0)
+
+        picks = [experiment.assign().prompt_id for _ in range(500)]
+        assert picks.count("p_b") > 450
+
+    def test_invalid_definitions(self):
+        with pytest.raises(ValueError):
+            make_experiment(("p_a",))
+        with pytest.raises(ValueError):
+            make_experiment(allocation="greedy")
+        with pytest.raises(ValueError):
+            make_experiment().record("unknown", 1.0)
+
+
+@pytest.mark.unit
+class TestABTestServiceExperiments:
+    """Test the service on top of the experiment engine."""
+
+    @pytest.mark.asyncio
+    async def test_results_update_running_sums_and_winner(self, prompt_store_db):
+        prompt_a, prompt_b = create_prompts(2)
+        service = ABTestService()
+        test = service.create_entity({"name": "exp", "prompt_a_id": prompt_a.id, "prompt_b_id": prompt_b.id})
+
+        for _ in range(20):
+            service.record_test_result(test.id, prompt_a.id, 0.9)
+            service.record_test_result(test.id, prompt_b.id, 0.2)
+
+        row = execute_query("SELECT * FROM ab_test_variants WHERE test_id = ? AND prompt_id = ?",
+                            (test.id, prompt_a.id), fetch_one=True)
+        assert (row["sample_count"], row["result_count"]) == (20, 20)
+        assert row["metric_sum"] == pytest.approx(18.0)
+        assert service.get_entity(test.id).winner == "A"
+
+        # A cold start rebuilds the same statistics from the stored sums
+        experiment_registry.clear()
+        results = service.get_test_results(test.id)
+        assert results["results"][prompt_a.id]["total_samples"] == 20
+        assert results["results"][prompt_b.id]["average_metric"] == pytest.approx(0.2)
+        assert results["winner"] == "A"
+
+    @pytest.mark.asyncio
+    async def test_failed_save_rolls_back_winner(self, prompt_store_db, monkeypatch):
+        prompt_a, prompt_b = create_prompts(2)
+        service = ABTestService()
+        test = service.create_entity({"name": "flaky", "prompt_a_id": prompt_a.id, "prompt_b_id": prompt_b.id})
+        experiment = service._get_experiment(test.id)
+        save = service.result_repository.save_with_stats
+
+        def fail_once(result):
+            monkeypatch.setattr(service.result_repository, "save_with_stats", save)
+            raise RuntimeError("disk full")
+
+        # Every result fails once before it is stored, including the one that decides the test
+        while experiment.winner is None:
+            for prompt_id, value in ((prompt_a.id, 0.9), (prompt_b.id, 0.2)):
+                monkeypatch.setattr(service.result_repository, "save_with_stats", fail_once)
+                with pytest.raises(RuntimeError):
+                    service.record_test_result(test.id, prompt_id, value)
+                assert experiment.winner is None
+                service.record_test_result(test.id, prompt_id, value)
+                if experiment.winner:
+                    break
+
+        assert service.get_entity(test.id).winner == "A"
+
+    @pytest.mark.asyncio
+    async def test_selection_uses_no_database_reads(self, prompt_store_db, monkeypatch):
+        prompts = create_prompts(3)
+        service = ABTestService()
+        test = service.create_entity({
+            "name": "multi", "prompt_a_id": prompts[0].id, "prompt_b_id": prompts[1].id,
+            "additional_prompt_ids": [prompts[2].id]
+        })
+        for prompt in prompts:
+            service.prompt_service.get_entity(prompt.id)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("selection must not query the database")
+
+        monkeypatch.setattr("services.prompt_store.domain.ab_testing.repository.execute_query", fail)
+        monkeypatch.setattr("services.prompt_store.domain.prompts.repository.execute_query", fail)
+
+        variants = {service.select_prompt_for_test(test.id, f"user_{i}")["variant"] for i in range(60)}
+        assert variants == {"A", "B", "C"}
+
+    def test_legacy_tests_are_seeded_from_results(self, prompt_store_db):
+        prompt_a, prompt_b = create_prompts(2)
+        test = ABTest(name="legacy", prompt_a_id=prompt_a.id, prompt_b_id=prompt_b.id,
+                      traffic_split=0.3, created_by="test_user")
+        test.id = "legacy_test"
+        ABTestRepository().save(test)
+        result_repository = ABTestResultRepository()
+        for index, (prompt_id, value, size) in enumerate([(prompt_a.id, 0.5, 4), (prompt_a.id, 1.0, 2),
+                                                           (prompt_b.id, 0.25, 1)]):
+            result = ABTestResult(test_id=test.id, prompt_id=prompt_id, metric_value=value, sample_size=size)
+            result.id = f"result_{index}"
+            result_repository.save(result)
+
+        experiment = ABTestService()._get_experiment(test.id)
+
+        variant_a = experiment.variant_for(prompt_a.id)
+        assert (variant_a.weight, variant_a.count, variant_a.total, variant_a.results) == (0.3, 6, 4.0, 2)
+        assert experiment.variant_for(prompt_b.id).count == 1
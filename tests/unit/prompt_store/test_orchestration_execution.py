@@ -0,0 +1,253 @@
+"""Tests for checkpointed chain and pipeline execution.
+
+Covers dependency planning, concurrent execution of independent steps,
+resume after a failure, durable reads of running executions, memoization
+of deterministic steps and bounded retention of finished executions.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from services.prompt_store.domain.orchestration.executor import plan_dependencies
+from services.prompt_store.domain.orchestration.service import PromptOrchestrator
+
+
+class ScriptedInterpreter:
+    """Stand-in for the Interpreter client that echoes prompts after a delay."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.prompts = []
+
+    async def interpret_query(self, query, user_id):
+        self.prompts.append(query)
+        await asyncio.sleep(self.delay)
+        return {"success": True, "data": {"response_text": f"answer to {query}"}}
+
+
+def make_orchestrator(interpreter=None, **kwargs):
+    orchestrator = PromptOrchestrator(**kwargs)
+    orchestrator.clients = interpreter or ScriptedInterpreter()
+    return orchestrator
+
+
+def llm_step(template, **fields):
+    return {"type": "llm_call", "prompt_template": template, **fields}
+
+
+def upper_step(input_field, output_field):
+    return {"type": "data_transformation",
+            "transformations": [{"type": "uppercase", "input_field": input_field, "output_field": output_field}]}
+
+
+@pytest.mark.unit
+class TestPlanDependencies:
+    """Test dependency inference between steps."""
+
+    def test_reads_after_writes(self):
+        steps = [
+            llm_step("Summarize {{doc_a}}"),
+            llm_step("Summarize {{doc_b}}"),
+            llm_step("Compare: {{response}}"),
+            {"type": "condition_check", "check_conditions": [{"field": "doc_a", "value": "x"}]},
+            upper_step("response", "shout"),
+            llm_step("Reply to {{user}}", conditions=[{"field": "condition_result", "value": True}]),
+        ]
+        orchestrator = PromptOrchestrator()
+
+        dependencies = plan_dependencies(steps, orchestrator._chain_step_io)
+
+        assert dependencies == [set(), set(), {0, 1}, set(), {0, 1, 2, 3}, {3, 4}]
+
+    def test_declared_dependencies(self):
+        steps = [{"id": "fetch"}, {"id": "parse", "depends_on": ["fetch"]}, {"depends_on": [1]}]
+        assert plan_dependencies(steps, lambda step: (None, None)) == [set(), {0}, {1}]
+
+        with pytest.raises(ValueError):
+            plan_dependencies([{"depends_on": ["later"]}, {"id": "later"}], lambda step: (None, None))
+
+
+@pytest.mark.unit
+class TestCheckpointedExecution:
+    """Test checkpointed chain and pipeline execution."""
+
+    @pytest.mark.asyncio
+    async def test_independent_steps_run_concurrently(self, prompt_store_db):
+        interpreter = ScriptedInterpreter(delay=0.1)
+        orchestrator = make_orchestrator(interpreter)
+        chain = await orchestrator.create_conditional_chain({"steps": [
+            llm_step("Summarize {{doc_a}}"),
+            llm_step("Summarize {{doc_b}}"),
+            llm_step("Summarize {{doc_c}}"),
+            llm_step("Summarize {{doc_d}}"),
+            llm_step("Compare: {{response}}"),
+        ]})
+
+        started = time.perf_counter()
+        execution = await orchestrator.execute_conditional_chain(
+            chain["id"], {"doc_a": "a", "doc_b": "b", "doc_c": "c", "doc_d": "d"}
+        )
+
+        # Two rounds of model calls instead of five
+        assert time.perf_counter() - started < 0.4
+        assert execution["status"] == "completed"
+        assert len(execution["step_results"]) == 5
+        # The last independent step's response is the one the compare step sees, as in a sequential run
+        assert interpreter.prompts[-1] == "Compare: answer to Summarize d"
+        assert execution["context"]["response"] == "answer to Compare: answer to Summarize d"
+        assert orchestrator.active_pipelines == {}
+
+    @pytest.mark.asyncio
+    async def test_skipped_and_terminating_steps(self, prompt_store_db):
+        orchestrator = make_orchestrator()
+        chain = await orchestrator.create_conditional_chain({"steps": [
+            llm_step("Escalate {{ticket}}", conditions=[{"field": "priority", "value": "high"}]),
+            upper_step("ticket", "ticket"),
+            llm_step("Close {{ticket}}"),
+            llm_step("Follow up on {{response}}"),
+        ]})
+        original = orchestrator._execute_step
+
+        async def execute_step(step, context):
+            result = await original(step, context)
+            if step.get("prompt_template") == "Close {{ticket}}":
+                result["terminate_chain"] = True
+            return result
+
+        orchestrator._execute_step = execute_step
+        execution = await orchestrator.execute_conditional_chain(chain["id"], {"ticket": "t-1", "priority": "low"})
+
+        assert [result["step_type"] for result in execution["step_results"]] == ["data_transformation", "llm_call"]
+        assert orchestrator.clients.prompts == ["Close T-1"]
+
+    @pytest.mark.asyncio
+    async def test_resume_after_failure_skips_finished_steps(self, prompt_store_db):
+        orchestrator = make_orchestrator()
+        chain = await orchestrator.create_conditional_chain({"steps": [
+            llm_step("Draft {{topic}}"),
+            upper_step("response", "draft"),
+            llm_step("Polish {{draft}}"),
+        ]})
+
+        async def crash(step, context):
+            raise RuntimeError("worker lost")
+
+        orchestrator._execute_transformation_step = crash
+        failed = await orchestrator.execute_conditional_chain(chain["id"], {"topic": "caching"})
+
+        assert failed["status"] == "failed" and failed["error"] == "worker lost"
+        assert failed["completed_steps"] == 1
+
+        # A fresh orchestrator stands in for a restarted service
+        interpreter = ScriptedInterpreter()
+        resumed = await make_orchestrator(interpreter).resume_execution(failed["id"])
+
+        assert resumed["status"] == "completed"
+        assert interpreter.prompts == ["Polish ANSWER TO DRAFT CACHING"]
+        assert len(resumed["step_results"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_resume_reruns_failed_steps(self, prompt_store_db):
+        class DownInterpreter:
+            async def interpret_query(self, query, user_id):
+                raise ConnectionError("interpreter unavailable")
+
+        orchestrator = make_orchestrator(DownInterpreter())
+        chain = await orchestrator.create_conditional_chain({"steps": [
+            llm_step("Draft {{topic}}"),
+            upper_step("topic", "title"),
+        ]})
+
+        async def crash(step, context):
+            raise RuntimeError("worker lost")
+
+        orchestrator._execute_transformation_step = crash
+        failed = await orchestrator.execute_conditional_chain(chain["id"], {"topic": "caching"})
+
+        assert failed["status"] == "failed"
+        assert failed["step_results"][0]["success"] is False
+        assert orchestrator.repository.get_checkpoints(failed["id"])[0]["status"] == "failed"
+
+        interpreter = ScriptedInterpreter()
+        resumed = await make_orchestrator(interpreter).resume_execution(failed["id"])
+
+        assert resumed["status"] == "completed"
+        assert interpreter.prompts == ["Draft caching"]
+        assert resumed["context"]["response"] == "answer to Draft caching"
+
+    @pytest.mark.asyncio
+    async def test_running_execution_is_readable(self, prompt_store_db):
+        release = asyncio.Event()
+        orchestrator = make_orchestrator()
+        chain = await orchestrator.create_conditional_chain({"steps": [
+            llm_step("First {{x}}"),
+            upper_step("response", "loud"),
+        ]})
+        original = orchestrator._execute_transformation_step
+
+        async def blocked(step, context):
+            await release.wait()
+            return await original(step, context)
+
+        orchestrator._execute_transformation_step = blocked
+        run = asyncio.create_task(orchestrator.execute_conditional_chain(chain["id"], {"x": "1"}))
+        while not orchestrator.active_pipelines or not orchestrator.clients.prompts:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.01)
+
+        snapshot = await PromptOrchestrator().get_execution(next(iter(orchestrator.active_pipelines)))
+        assert snapshot["status"] == "running"
+        assert snapshot["completed_steps"] == 1
+        assert snapshot["context"]["response"] == "answer to First 1"
+
+        with pytest.raises(ValueError):
+            await orchestrator.resume_execution(snapshot["id"])
+
+        release.set()
+        execution = await run
+        assert (await orchestrator.get_execution(execution["id"]))["context"]["loud"] == "ANSWER TO FIRST 1"
+
+    @pytest.mark.asyncio
+    async def test_deterministic_steps_are_memoized(self, prompt_store_db):
+        interpreter = ScriptedInterpreter()
+        orchestrator = make_orchestrator(interpreter)
+        chain = await orchestrator.create_conditional_chain({"steps": [
+            llm_step("Classify {{text}}", deterministic=True),
+        ]})
+
+        first = await orchestrator.execute_conditional_chain(chain["id"], {"text": "hello", "noise": 1})
+        second = await orchestrator.execute_conditional_chain(chain["id"], {"text": "hello", "noise": 2})
+        await orchestrator.execute_conditional_chain(chain["id"], {"text": "bye"})
+
+        assert interpreter.prompts == ["Classify hello", "Classify bye"]
+        assert second["step_results"][0]["memoized"]
+        assert second["context"]["response"] == first["context"]["response"]
+
+    @pytest.mark.asyncio
+    async def test_finished_executions_are_bounded(self, prompt_store_db):
+        orchestrator = make_orchestrator(max_finished_executions=2)
+        chain = await orchestrator.create_conditional_chain({"steps": [llm_step("Hi {{name}}")]})
+
+        executions = [await orchestrator.execute_conditional_chain(chain["id"], {"name": str(i)}) for i in range(4)]
+
+        kept = [await orchestrator.get_execution(execution["id"]) for execution in executions]
+        assert [execution is not None for execution in kept] == [False, False, True, True]
+        assert orchestrator.repository.get_checkpoints(executions[0]["id"]) == {}
+
+    @pytest.mark.asyncio
+    async def test_pipeline_stages_are_checkpointed(self, prompt_store_db):
+        orchestrator = make_orchestrator()
+        pipeline = await orchestrator.create_pipeline({"stages": [
+            {"type": "aggregation", "input_fields": ["a", "b"], "output_field": "ab"},
+            {"type": "aggregation", "input_fields": ["c"], "output_field": "c2"},
+            {"type": "aggregation", "input_fields": ["ab", "c2"], "output_field": "all"},
+        ]})
+
+        execution = await orchestrator.execute_pipeline(pipeline["id"], {"a": "1", "b": "2", "c": "3"})
+
+        assert execution["status"] == "completed"
+        assert execution["data"]["all"] == "1 2 3"
+        assert len(execution["stage_results"]) == 3
+        assert (await orchestrator.get_execution(execution["id"]))["pipeline_id"] == pipeline["id"]
@@ -0,0 +1,151 @@
+"""Tests for the prompt diff engine.
+
+Covers line and token hunks, diff-derived similarity, opcode correctness,
+fingerprint-based drift detection, content-hash duplicate detection and
+the diff result cache.
+"""
+
+import random
+
+import pytest
+
+from services.prompt_store.db.queries import execute_query
+from services.prompt_store.domain.prompts.service import PromptService
+from services.prompt_store.domain.refinement.service import PromptRefinementService
+from services.prompt_store.infrastructure.diff import (
+    diff_opcodes, diff_texts, fingerprint_similarity, prompt_diff_cache, token_fingerprint
+)
+
+
+def apply_opcodes(a, b, opcodes):
+    rebuilt = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            assert a[i1:i2] == b[j1:j2]
+            rebuilt.extend(a[i1:i2])
+        else:
+            rebuilt.extend(b[j1:j2])
+    return rebuilt
+
+
+@pytest.mark.unit
+class TestDiffTexts:
+    """Test line and token diffs."""
+
+    def test_hunks_and_token_changes(self):
+        text_a = "You are a helpful assistant.\nAnswer in English.\nBe brief.\n\n\n\n\nSign off politely."
+        text_b = "You are a helpful assistant.\nAnswer in French.\nBe brief.\n\n\n\n\nSign off politely.\nAdd a summary."
+
+        diff = diff_texts(text_a, text_b)
+
+        assert not diff.identical
+        assert (diff.lines_added, diff.lines_removed) == (2, 1)
+        assert len(diff.hunks) == 2
+        first = diff.hunks[0]
+        assert (first["a_start"], first["a_lines"]) == (1, 4)
+        assert first["lines"] == ["  You are a helpful assistant.", "- Answer in English.",
+                                  "+ Answer in French.", "  Be brief.", "  "]
+        assert first["token_changes"] == [{"op": "replace", "a": "English", "b": "French"}]
+        assert diff.hunks[1]["token_changes"] == [{"op": "insert", "a": "", "b": "Add a summary ."}]
+
+    def test_similarity_from_diff(self):
+        assert diff_texts("same text", "same text").similarity == 1.0
+        assert diff_texts("alpha beta", "gamma delta").similarity == 0.0
+        diff = diff_texts("summarize the report", "summarize the long report")
+        assert diff.similarity == pytest.approx(2 * 3 / 7, abs=1e-4)
+        assert diff.line_similarity == 0.0
+
+    def test_opcodes_rebuild_target(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            a = [rng.choice("abcdef") for _ in range(rng.randint(0, 40))]
+            b = [rng.choice("abcdef") for _ in range(rng.randint(0, 40))]
+            assert apply_opcodes(a, b, diff_opcodes(a, b)) == b
+
+
+@pytest.mark.unit
+class TestFingerprints:
+    """Test token fingerprints and drift detection."""
+
+    def test_fingerprint_estimates_word_jaccard(self):
+        rng = random.Random(3)
+        vocabulary = [f"word{i}" for i in range(300)]
+        for _ in range(20):
+            words_a = set(rng.sample(vocabulary, 80))
+            words_b = set(rng.sample(sorted(words_a), 50)) | set(rng.sample(vocabulary, 40))
+            exact = len(words_a & words_b) / len(words_a | words_b)
+
+            estimate = fingerprint_similarity(token_fingerprint(" ".join(words_a)), token_fingerprint(" ".join(words_b)))
+
+            assert abs(estimate - exact) < 0.15
+        assert fingerprint_similarity(token_fingerprint(""), token_fingerprint("text")) == 0.0
+
+    def test_drift_uses_stored_fingerprints(self, prompt_store_db):
+        service = PromptService()
+        prompt = service.create_entity({"name": "drift", "category": "test",
+                                        "content": "Summarize the quarterly sales report in three bullet points"})
+        service.update_prompt_content(prompt.id, "Summarize the quarterly sales report in four bullet points")
+        service.update_prompt_content(prompt.id, "Translate the following customer email into formal German")
+
+        # Versions saved before fingerprints existed are backfilled on first use
+        execute_query("UPDATE prompt_versions SET token_fingerprint = NULL WHERE prompt_id = ?", (prompt.id,))
+        drift = service.detect_drift(prompt.id)
+
+        assert drift["drift_detected"]
+        assert [change["version"] for change in drift["significant_changes"]] == [2, 1]
+        rows = execute_query("SELECT token_fingerprint FROM prompt_versions WHERE prompt_id = ?",
+                             (prompt.id,), fetch_all=True)
+        assert all(row["token_fingerprint"] for row in rows)
+        assert service.detect_drift(prompt.id) == drift
+
+
+@pytest.mark.unit
+class TestContentHash:
+    """Test duplicate detection by content hash."""
+
+    def test_duplicate_content_rejected(self, prompt_store_db):
+        service = PromptService()
+        original = service.create_entity({"name": "first", "category": "test", "content": "Explain {{topic}}",
+                                          "variables": ["topic"]})
+
+        with pytest.raises(ValueError, match="Similar prompt already exists"):
+            service.create_entity({"name": "second", "category": "other", "content": "Explain {{topic}}",
+                                   "variables": ["topic"]})
+
+        # Forks start as copies of their parent
+        fork = service.fork_prompt(original.id, "first_fork", "tester")
+        assert fork.content == original.content
+
+        # Edits keep the stored hash current
+        service.update_entity(original.id, {"variables": ["topic", "audience"]})
+        with pytest.raises(ValueError, match="Similar prompt already exists: first"):
+            service.create_entity({"name": "third", "category": "test", "content": "Explain {{topic}}",
+                                   "variables": ["topic", "audience"]})
+
+    def test_partial_update_of_missing_prompt(self, prompt_store_db):
+        service = PromptService()
+        assert service.update_entity("nope", {"content": "hello"}) is None
+        assert service.update_entity("nope", {"variables": ["topic"]}) is None
+
+
+@pytest.mark.unit
+class TestDiffCache:
+    """Test cached version comparisons."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_comparison_hits_cache(self, prompt_store_db):
+        prompt_service = PromptService()
+        prompt = prompt_service.create_entity({"name": "cached", "category": "test", "content": "Write a haiku"})
+        prompt_service.update_prompt_content(prompt.id, "Write a limerick")
+        service = PromptRefinementService()
+        service.prompt_service = prompt_service
+
+        hits = prompt_diff_cache.get_stats()["hits"]
+        first = await service.compare_prompt_versions(prompt.id, 1, 2)
+        second = await service.compare_prompt_versions(prompt.id, 1, 2)
+
+        assert prompt_diff_cache.get_stats()["hits"] == hits + 1
+        assert first["comparison"]["differences"] == second["comparison"]["differences"]
+        assert first["comparison"]["differences"]["content_diff"]["hunks"][0]["token_changes"] == [
+            {"op": "replace", "a": "haiku", "b": "limerick"}
+        ]
@@ -0,0 +1,158 @@
+"""Tests for the in-memory prompt selection index.
+
+Covers BM25 ranking with category and tag features, incremental updates,
+usage and A/B priors, updates racing the initial load, and the orchestrator
+selecting prompts through the index.
+"""
+
+import pytest
+
+from services.prompt_store.domain.ab_testing.service import ABTestService
+from services.prompt_store.domain.orchestration.service import PromptOrchestrator
+from services.prompt_store.domain.prompts.service import PromptService
+from services.prompt_store.infrastructure.selection import PromptSelectionIndex, tokenize
+
+
+def row(prompt_id, name, content, category="general", tags=None, description="", **extra):
+    return {"id": prompt_id, "name": name, "category": category, "description": description,
+            "content": content, "tags": tags or [], **extra}
+
+
+CORPUS = [
+    row("summarize", "summarize_report", "Summarize the following report in three bullet points",
+        category="analysis", tags=["summary"]),
+    row("translate", "translate_text", "Translate the text into French", category="language"),
+    row("review", "code_review", "Review this Python code for bugs and style issues",
+        category="code", tags=["code", "review"]),
+    row("email", "write_email", "Write a polite email replying to the customer",
+        category="writing", tags=["email"]),
+]
+
+
+@pytest.fixture
+def index():
+    index = PromptSelectionIndex()
+    index.ensure_loaded(lambda: (CORPUS, []))
+    return index
+
+
+def ids(matches):
+    return [match.prompt_id for match in matches]
+
+
+@pytest.mark.unit
+class TestPromptSelectionIndex:
+    """Test ranking and incremental maintenance."""
+
+    def test_tokenize(self):
+        assert tokenize("Summarize the Reports, please!") == ["summarize", "report"]
+
+    def test_text_relevance_ranks_best_match_first(self, index):
+        assert ids(index.search("find bugs in my python code"))[0] == "review"
+        assert ids(index.search("summarize quarterly reports", k=1)) == ["summarize"]
+        assert index.search("astronomy") == []
+
+    def test_category_and_tags_are_features(self, index):
+        # Without matching text, context alone still yields candidates
+        assert ids(index.search("anything", category="writing")) == ["email"]
+        assert ids(index.search("anything", tags=["review"])) == ["review"]
+
+        match = index.search("write text", category="language", k=1)[0]
+        assert match.prompt_id == "translate"
+        assert match.breakdown["category"] == 1.0
+        assert match.matched_terms == ["text"]
+
+    def test_incremental_upsert_and_remove(self, index):
+        index.upsert(row("poem", "write_poem", "Write a haiku poem about autumn", category="writing"))
+        assert ids(index.search("haiku"))[0] == "poem"
+
+        index.upsert(row("poem", "write_poem", "Write a limerick", category="writing"))
+        assert index.search("haiku") == []
+
+        index.upsert(row("email", "write_email", "Write an email", is_active=False))
+        index.remove("poem")
+        assert index.search("write") == []
+        assert index.get_stats()["documents"] == 3
+
+    def test_priors_break_ties_between_equal_texts(self):
+        index = PromptSelectionIndex()
+        index.ensure_loaded(lambda: ([
+            row("plain", "outline", "Draft an outline", performance_score=0.2),
+            row("proven", "outline", "Draft an outline", performance_score=0.9),
+        ], []))
+        assert ids(index.search("outline")) == ["proven", "plain"]
+
+        for _ in range(50):
+            index.note_usage("plain")
+        index.record_ab_outcome("plain", ["proven"])
+        assert ids(index.search("outline")) == ["plain", "proven"]
+
+    def test_ab_outcomes_and_updates_during_load_are_kept(self):
+        index = PromptSelectionIndex()
+        index.upsert(row("ignored", "ignored", "Outline"))  # before loading: nothing to maintain
+
+        def loader():
+            # Arrives while the corpus is being read
+            index.upsert(row("late", "outline_late", "Draft an outline"))
+            return [row("early", "outline", "Draft an outline")], [("early", ["late"])]
+
+        index.ensure_loaded(loader)
+
+        matches = index.search("outline")
+        assert ids(matches) == ["early", "late"]
+        assert matches[0].breakdown["ab_outcome"] > 0.5 > matches[1].breakdown["ab_outcome"]
+
+    def test_exclusions_and_limits(self, index):
+        assert "review" not in ids(index.search("code review", exclude_ids=["review"]))
+        assert len(index.search("write text report code", k=2)) == 2
+        assert index.search("code", k=0) == []
+
+
+@pytest.mark.unit
+class TestOrchestratorSelection:
+    """Test orchestrator selection on top of the index."""
+
+    @pytest.mark.asyncio
+    async def test_select_and_recommend_follow_prompt_changes(self, prompt_store_db):
+        prompt_service = PromptService()
+        created = {
+            data["name"]: prompt_service.create_entity({**data, "created_by": "test_user"})
+            for data in (
+                {"name": "summarize_report", "category": "analysis",
+                 "content": "Summarize the report in three bullet points", "tags": ["summary"]},
+                {"name": "code_review", "category": "code",
+                 "content": "Review this code for bugs", "tags": ["code"]},
+            )
+        }
+        orchestrator = PromptOrchestrator()
+
+        assert await orchestrator.select_optimal_prompt("summarize this report") == created["summarize_report"].id
+        assert await orchestrator.select_optimal_prompt("astronomy") is None
+
+        # Created after the index was loaded
+        email = prompt_service.create_entity({"name": "write_email", "category": "writing",
+                                              "content": "Write a polite email", "created_by": "test_user"})
+        recommendations = await orchestrator.get_prompt_recommendations("write an email", {"limit": 3})
+        assert recommendations[0]["prompt_id"] == email.id
+        assert "'email'" in recommendations[0]["reason"]
+
+        prompt_service.delete_entity(email.id)
+        assert await orchestrator.get_prompt_recommendations("write an email") == []
+
+    @pytest.mark.asyncio
+    async def test_decided_ab_tests_are_loaded(self, prompt_store_db):
+        prompt_service = PromptService()
+        prompt_a, prompt_b = [
+            prompt_service.create_entity({"name": f"outline_{i}", "category": "writing",
+                                          "content": f"Draft an outline, variant {i}", "created_by": "test_user"})
+            for i in range(2)
+        ]
+        ab_service = ABTestService()
+        test = ab_service.create_entity({"name": "outline", "prompt_a_id": prompt_a.id,
+                                         "prompt_b_id": prompt_b.id})
+        ab_service.update_entity(test.id, {"winner": "B"})
+
+        recommendations = await PromptOrchestrator().get_prompt_recommendations("outline")
+
+        assert [item["prompt_id"] for item in recommendations] == [prompt_b.id, prompt_a.id]
+        assert "won A/B tests" in recommendations[0]["reason"]
@@ -0,0 +1,97 @@
+"""Tests for the normalized prompt tag index.
+
+Covers trigger maintenance of prompt_tags, any/all/none tag queries, tag
+filters applied before the search limit, and tag facet counts.
+"""
+
+import pytest
+
+from services.prompt_store.core.entities import Prompt
+from services.prompt_store.db.queries import execute_query
+from services.prompt_store.domain.prompts.repository import PromptRepository
+
+
+def save_prompt(repo, name, tags, content="Summarize the quarterly report"):
+    prompt = Prompt(name=name, category="analysis", content=content, tags=tags, created_by="test_user")
+    prompt.id = f"prompt_{name}"
+    return repo.save(prompt)
+
+
+def names(prompts):
+    return sorted(p.name for p in prompts)
+
+
+@pytest.fixture
+def tagged_repo(prompt_store_db):
+    repo = PromptRepository()
+    save_prompt(repo, "ai_basic", ["ai"])
+    save_prompt(repo, "ai_code", ["ai", "code"])
+    save_prompt(repo, "email_writer", ["email"])
+    save_prompt(repo, "code_review", ["code", "review"])
+    return repo
+
+
+@pytest.mark.unit
+class TestPromptTagIndex:
+    """Test tag-filtered prompt queries."""
+
+    def test_any_match_is_exact(self, tagged_repo):
+        # "ai" must not match the "email" tag
+        assert names(tagged_repo.get_by_tags(["ai"])) == ["ai_basic", "ai_code"]
+        assert names(tagged_repo.get_by_tags(["ai", "review"])) == ["ai_basic", "ai_code", "code_review"]
+
+    def test_all_and_none_match(self, tagged_repo):
+        assert names(tagged_repo.get_by_tags(["ai", "code"], match="all")) == ["ai_code"]
+        assert names(tagged_repo.get_by_tags(["code"], exclude_tags=["ai"])) == ["code_review"]
+
+        with pytest.raises(ValueError):
+            tagged_repo.get_by_tags(["ai"], match="some")
+
+    def test_updates_and_deletes_keep_index_in_sync(self, tagged_repo):
+        prompt_id = "prompt_email_writer"
+
+        def indexed_tags():
+            rows = execute_query("SELECT tag FROM prompt_tags WHERE prompt_id = ? ORDER BY tag",
+                                 (prompt_id,), fetch_all=True)
+            return [row["tag"] for row in rows]
+
+        tagged_repo.update(prompt_id, {"tags": ["ai", "email"]})
+        assert indexed_tags() == ["ai", "email"]
+
+        tagged_repo.update(prompt_id, {"tags": []})
+        assert indexed_tags() == []
+
+        tagged_repo.update(prompt_id, {"tags": ["email"]})
+        execute_query("DELETE FROM prompts WHERE id = ?", (prompt_id,))
+        assert indexed_tags() == []
+
+    def test_search_applies_tags_before_limit(self, tagged_repo):
+        for i in range(5):
+            save_prompt(tagged_repo, f"untagged_{i}", [])
+
+        results = tagged_repo.search_prompts("quarterly", tags=["review"], limit=2)
+
+        assert names(results) == ["code_review"]
+
+    def test_tag_pages_use_offset(self, tagged_repo):
+        first = tagged_repo.get_by_tags(["ai", "code"], limit=2)
+        second = tagged_repo.get_by_tags(["ai", "code"], limit=2, offset=2)
+
+        assert len(first) == 2 and len(second) == 1
+        assert names(first + second) == ["ai_basic", "ai_code", "code_review"]
+
+    def test_search_and_facets_skip_inactive_prompts(self, tagged_repo):
+        tagged_repo.delete("prompt_ai_basic")
+
+        results = tagged_repo.search_prompts("quarterly", tags=["ai"])
+        facets = {facet["tag"]: facet["count"] for facet in tagged_repo.get_tag_facets(["ai"], query="quarterly")}
+
+        assert names(results) == ["ai_code"]
+        assert facets["ai"] == len(results)
+
+    def test_tag_facets(self, tagged_repo):
+        facets = tagged_repo.get_tag_facets()
+        assert facets[:2] == [{"tag": "ai", "count": 2}, {"tag": "code", "count": 2}]
+
+        filtered = tagged_repo.get_tag_facets(tags=["code"])
+        assert {facet["tag"]: facet["count"] for facet in filtered} == {"ai": 1, "code": 2, "review": 1}
@@ -0,0 +1,150 @@
+"""Tests for the prompt resolution cache.
+
+Covers snapshot isolation, the shared second tier, invalidation and
+single-flight loading.
+"""
+
+import threading
+import time
+
+import pytest
+
+from services.prompt_store.core.entities import Prompt
+from services.prompt_store.infrastructure.resolution import PromptResolutionCache, PromptSnapshot
+
+
+def make_prompt(prompt_id="p1", name="summarize", version=1, content="Summarize {{text}}"):
+    prompt = Prompt(name=name, category="analysis", content=content, variables=["text"], version=version)
+    prompt.id = prompt_id
+    return prompt
+
+
+class CountingLoader:
+    """Repository stand-in that counts reads."""
+
+    def __init__(self, prompt, delay=0.0):
+        self.prompt = prompt
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return self.prompt
+
+
+class DictSharedTier:
+    """In-memory stand-in for a synchronous redis client."""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def setex(self, key, ttl, value):
+        self.values[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+
+@pytest.mark.unit
+class TestPromptResolutionCache:
+    """Test prompt resolution by name and id."""
+
+    def test_hits_need_no_loader_and_return_copies(self):
+        cache = PromptResolutionCache()
+        loader = CountingLoader(make_prompt())
+
+        first = cache.get_by_name("analysis", "summarize", loader)
+        first.variables.append("mutated")
+        second = cache.get_by_name("analysis", "summarize", loader)
+        by_id = cache.get_by_id("p1", loader)
+
+        assert loader.calls == 1
+        assert second.variables == ["text"]
+        assert by_id.name == "summarize"
+        assert cache.get_stats()["hits"] == 2
+
+    def test_missing_prompts_are_not_cached(self):
+        cache = PromptResolutionCache()
+        loader = CountingLoader(None)
+
+        assert cache.get_by_name("analysis", "nope", loader) is None
+        assert cache.get_by_name("analysis", "nope", loader) is None
+        assert loader.calls == 2
+
+    def test_invalidation_drops_name_and_id(self):
+        cache = PromptResolutionCache()
+        cache.put(make_prompt())
+
+        cache.invalidate("p1")
+        loader = CountingLoader(make_prompt(version=2, content="New"))
+
+        assert cache.get_by_name("analysis", "summarize", loader).version == 2
+        assert loader.calls == 1
+
+    def test_newer_version_replaces_snapshot(self):
+        cache = PromptResolutionCache()
+        cache.put(make_prompt(version=1))
+        cache.put(make_prompt(version=2, content="v2"))
+
+        prompt = cache.get_by_id("p1", CountingLoader(None))
+        assert (prompt.version, prompt.content) == (2, "v2")
+        assert cache.get_stats()["entries"] == 1
+
+    def test_entries_expire_after_ttl(self):
+        now = [0.0]
+        cache = PromptResolutionCache(ttl_seconds=10, clock=lambda: now[0])
+        loader = CountingLoader(make_prompt())
+
+        cache.get_by_id("p1", loader)
+        now[0] = 11
+        cache.get_by_id("p1", loader)
+
+        assert loader.calls == 2
+
+    def test_shared_tier_warms_other_instances(self):
+        shared = DictSharedTier()
+        writer = PromptResolutionCache(shared=shared)
+        reader = PromptResolutionCache(shared=shared)
+
+        writer.put(make_prompt())
+        loader = CountingLoader(None)
+        prompt = reader.get_by_name("analysis", "summarize", loader)
+
+        assert prompt.id == "p1"
+        assert loader.calls == 0
+        assert reader.get_stats()["shared_hits"] == 1
+
+        writer.invalidate("p1")
+        assert shared.values == {}
+
+    def test_concurrent_misses_share_one_load(self):
+        cache = PromptResolutionCache()
+        loader = CountingLoader(make_prompt(), delay=0.05)
+        results = []
+
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_by_name("analysis", "summarize", loader)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert loader.calls == 1
+        assert len(results) == 8
+        assert all(result.id == "p1" for result in results)
+
+    def test_snapshot_round_trip(self):
+        prompt = make_prompt()
+        snapshot = PromptSnapshot.from_prompt(prompt)
+
+        with pytest.raises(TypeError):
+            snapshot.data["content"] = "changed"
+        assert snapshot.to_prompt().to_dict() == prompt.to_dict()
@@ -0,0 +1,87 @@
+"""Tests for compiled prompt templates.
+
+Covers parsing of both placeholder syntaxes, defaults, escaping and the
+per-version compiled template cache.
+"""
+
+import html
+
+import pytest
+
+from services.prompt_store.infrastructure.templates import CompiledTemplate, TemplateCache
+
+
+@pytest.mark.unit
+class TestCompiledTemplate:
+    """Test template parsing and rendering."""
+
+    def test_double_and_single_brace_placeholders(self):
+        template = CompiledTemplate("Hello {{name}}, welcome to {place}!")
+
+        assert template.variables == ("name", "place")
+        assert template.render({"name": "Alice", "place": "Wonderland"}) == "Hello Alice, welcome to Wonderland!"
+
+    def test_missing_values_are_left_verbatim(self):
+        template = CompiledTemplate("Hello {name}, your score is {{ score }}!")
+
+        assert template.render({"name": "Bob"}) == "Hello Bob, your score is {{ score }}!"
+
+    def test_defaults(self):
+        template = CompiledTemplate("Tone: {{tone|friendly}}. Length: {length|short}.")
+
+        assert template.defaults == {"tone": "friendly", "length": "short"}
+        assert template.required_variables == frozenset()
+        assert template.render({}) == "Tone: friendly. Length: short."
+        assert template.render({"tone": "formal"}) == "Tone: formal. Length: short."
+
+    def test_escaped_braces_and_json_are_literal(self):
+        template = CompiledTemplate('Write \\{{name}} or \\{name} as JSON {"name": "{{name}}"}')
+
+        assert template.variables == ("name",)
+        assert template.render({"name": "x"}) == 'Write {{name}} or {name} as JSON {"name": "x"}'
+
+    def test_value_escaping_is_optional(self):
+        template = CompiledTemplate("<p>{{body}}</p>")
+
+        assert template.render({"body": "<b>"}) == "<p><b></p>"
+        assert template.render({"body": "<b>"}, escape=html.escape) == "<p>&lt;b&gt;</p>"
+
+    def test_missing_variables_respect_defaults(self):
+        template = CompiledTemplate("{{a}} {{b|x}}")
+
+        assert template.missing_variables(["a", "b", "c"], {"c": 1}) == ["a"]
+
+    def test_renders_same_as_replace_loop(self):
+        content = "Summarize {{document}} for {{audience}}. {{document}} again. {{{document}}}"
+        values = {"document": "the report", "audience": "engineers", "unused": "zzz"}
+
+        expected = content
+        for key, value in values.items():
+            expected = expected.replace(f"{{{{{key}}}}}", str(value))
+
+        assert CompiledTemplate(content).render(values) == expected
+
+
+@pytest.mark.unit
+class TestTemplateCache:
+    """Test the compiled template cache."""
+
+    def test_compiles_once_per_version(self):
+        cache = TemplateCache(max_entries=10)
+        content = "Hi {{name}}"
+
+        first = cache.get(content, ("prompt_1", 1))
+        assert cache.get(content, ("prompt_1", 1)) is first
+        assert cache.get_stats()["hits"] == 1
+
+        # Content edited in place without a version bump is recompiled
+        edited = cache.get("Bye {{name}}", ("prompt_1", 1))
+        assert edited is not first
+        assert edited.render({"name": "x"}) == "Bye x"
+
+    def test_cache_is_bounded(self):
+        cache = TemplateCache(max_entries=3)
+        for i in range(10):
+            cache.get(f"template {i} {{{{x}}}}")
+
+        assert cache.get_stats()["entries"] == 3
@@ -0,0 +1,247 @@
+"""Tests for batched usage accounting.
+
+Covers count and interval triggered flushes, the aggregated usage_count
+update, hourly roll-ups, flush hooks and retention across failed flushes.
+"""
+
+import asyncio
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pytest
+
+from services.prompt_store.db.schema import (
+    create_prompts_table,
+    create_prompt_performance_metrics_table,
+    create_prompt_usage_table,
+    create_prompt_usage_hourly_table
+)
+from services.prompt_store.domain.analytics import service as analytics
+from services.prompt_store.domain.analytics.entities import PromptPerformanceMetrics
+from services.prompt_store.infrastructure.usage import UsageAggregator, UsageEvent
+
+
+class UsageDatabase:
+    """SQLite file with the usage tables that counts commits."""
+
+    def __init__(self, path, prompt_ids=("p1", "p2")):
+        self.path = str(path)
+        self.commits = 0
+        self.fail = False
+        conn = sqlite3.connect(self.path)
+        for schema in (create_prompts_table(), create_prompt_usage_table(), create_prompt_usage_hourly_table()):
+            conn.execute(schema)
+        for prompt_id in prompt_ids:
+            conn.execute(
+                "INSERT INTO prompts (id, name, category, content, created_by, created_at, updated_at) "
+                "VALUES (?, ?, 'test', 'content', 'tests', 'now', 'now')",
+                (prompt_id, prompt_id)
+            )
+        conn.commit()
+        conn.close()
+
+    @contextmanager
+    def connect(self):
+        if self.fail:
+            raise sqlite3.OperationalError("database is locked")
+        conn = sqlite3.connect(self.path)
+        database = self
+
+        class CountingConnection:
+            def __getattr__(self, name):
+                return getattr(conn, name)
+
+            def commit(self):
+                database.commits += 1
+                conn.commit()
+
+        try:
+            yield CountingConnection()
+        finally:
+            conn.close()
+
+    def scalar(self, query, params=()):
+        conn = sqlite3.connect(self.path)
+        try:
+            return conn.execute(query, params).fetchone()[0]
+        finally:
+            conn.close()
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def usage_db(tmp_path):
+    return UsageDatabase(tmp_path / "usage.db")
+
+
+def make_aggregator(usage_db, **kwargs):
+    kwargs.setdefault("flush_interval_seconds", 60.0)
+    kwargs.setdefault("clock", Clock())
+    return UsageAggregator(connection_factory=usage_db.connect, **kwargs)
+
+
+@pytest.mark.unit
+class TestUsageAggregator:
+    """Test usage counting and batched writes."""
+
+    def test_renders_flush_in_one_transaction_per_batch(self, usage_db):
+        aggregator = make_aggregator(usage_db, flush_every=100)
+
+        for i in range(250):
+            aggregator.increment("p1" if i % 2 else "p2")
+
+        assert usage_db.commits == 2
+        assert aggregator.pending_count() == 50
+
+        aggregator.flush()
+        assert usage_db.commits == 3
+        assert usage_db.scalar("SELECT usage_count FROM prompts WHERE id = 'p1'") == 125
+        assert usage_db.scalar("SELECT usage_count FROM prompts WHERE id = 'p2'") == 125
+        assert usage_db.scalar("SELECT SUM(render_count) FROM prompt_usage_hourly") == 250
+
+    def test_interval_does_not_flush_inline(self, usage_db):
+        clock = Clock()
+        aggregator = make_aggregator(usage_db, flush_every=1000, flush_interval_seconds=1.0, clock=clock)
+
+        aggregator.increment("p1")
+        clock.now = 1.5
+        aggregator.increment("p1")
+
+        assert usage_db.commits == 0
+        assert aggregator.pending_count() == 2
+
+    @pytest.mark.asyncio
+    async def test_interval_triggers_background_flush(self, usage_db):
+        clock = Clock()
+        aggregator = make_aggregator(usage_db, flush_every=1000, flush_interval_seconds=0.01, clock=clock)
+        await aggregator.start()
+
+        aggregator.increment("p1", 2)
+        clock.now = 1.0
+        for _ in range(100):
+            if usage_db.commits:
+                break
+            await asyncio.sleep(0.01)
+        await aggregator.close()
+
+        assert usage_db.commits == 1
+        assert usage_db.scalar("SELECT usage_count FROM prompts WHERE id = 'p1'") == 2
+
+    def test_events_roll_up_per_prompt_and_hour(self, usage_db):
+        aggregator = make_aggregator(usage_db)
+        nine = datetime(2025, 1, 1, 9, 15, tzinfo=timezone.utc)
+        ten = datetime(2025, 1, 1, 10, 5, tzinfo=timezone.utc)
+
+        aggregator.record(UsageEvent("p1", "gpt-4", input_tokens=10, output_tokens=5,
+                                     response_time_ms=100, created_at=nine))
+        aggregator.record(UsageEvent("p1", "gpt-4", success=False, response_time_ms=300, created_at=nine))
+        aggregator.record(UsageEvent("p1", "gpt-4", created_at=ten), count_usage=True)
+        aggregator.flush()
+
+        assert usage_db.scalar("SELECT COUNT(*) FROM prompt_usage") == 3
+        assert usage_db.scalar("SELECT usage_count FROM prompts WHERE id = 'p1'") == 1
+        assert usage_db.scalar(
+            "SELECT event_count || ',' || failure_count || ',' || input_tokens || ',' || total_response_time_ms "
+            "FROM prompt_usage_hourly WHERE hour_start = ?", (nine.replace(minute=0).isoformat(),)
+        ) == "2,1,10,400.0"
+        assert usage_db.scalar("SELECT COUNT(*) FROM prompt_usage_hourly") == 2
+
+        # Later batches add to the same hour
+        aggregator.record(UsageEvent("p1", "gpt-4", created_at=nine))
+        aggregator.flush()
+        assert usage_db.scalar("SELECT SUM(event_count) FROM prompt_usage_hourly") == 4
+
+    def test_failed_flush_keeps_counts(self, usage_db):
+        aggregator = make_aggregator(usage_db, max_buffered_events=2)
+
+        usage_db.fail = True
+        aggregator.increment("p1", 3)
+        for _ in range(3):
+            aggregator.record(UsageEvent("p2", "svc"))
+        assert aggregator.flush() == 0
+        assert aggregator.get_stats()["dropped_events"] == 1
+
+        usage_db.fail = False
+        aggregator.increment("p1")
+        assert aggregator.flush() == 7
+        assert usage_db.scalar("SELECT usage_count FROM prompts WHERE id = 'p1'") == 4
+        assert usage_db.scalar("SELECT COUNT(*) FROM prompt_usage") == 2
+        assert usage_db.scalar("SELECT SUM(event_count) FROM prompt_usage_hourly WHERE prompt_id = 'p2'") == 3
+
+    def test_flush_hooks_share_the_transaction(self, usage_db):
+        aggregator = make_aggregator(usage_db)
+        committed = []
+
+        def hook(conn):
+            conn.execute("UPDATE prompts SET performance_score = 0.5 WHERE id = 'p1'")
+            return lambda: committed.append(True)
+
+        aggregator.register_flush_hook("score", hook)
+        aggregator.increment("p1")
+        aggregator.flush()
+
+        assert usage_db.commits == 1
+        assert committed == [True]
+        assert usage_db.scalar("SELECT performance_score FROM prompts WHERE id = 'p1'") == 0.5
+
+    @pytest.mark.asyncio
+    async def test_close_drains_buffer(self, usage_db):
+        aggregator = make_aggregator(usage_db)
+        await aggregator.start()
+
+        for _ in range(10):
+            aggregator.increment("p1")
+        await aggregator.close()
+
+        assert aggregator.pending_count() == 0
+        assert usage_db.scalar("SELECT usage_count FROM prompts WHERE id = 'p1'") == 10
+
+
+@pytest.mark.unit
+class TestAnalyticsFlushHook:
+    """Test the performance-metrics hook that may run in the flush thread."""
+
+    @pytest.fixture
+    def metrics_db(self, usage_db):
+        conn = sqlite3.connect(usage_db.path)
+        conn.execute(create_prompt_performance_metrics_table())
+        conn.commit()
+        conn.close()
+        yield usage_db
+        analytics._pending_metrics.clear()
+        analytics._pending_rows.clear()
+
+    def flush_hook(self, usage_db):
+        with usage_db.connect() as conn:
+            forget = analytics._write_pending_metrics(conn)
+            conn.commit()
+        return forget
+
+    def test_hook_writes_rows_serialized_when_recorded(self, metrics_db):
+        metrics = PromptPerformanceMetrics(prompt_id="p1", version=1, total_requests=1)
+        metrics.id = "metrics_p1"
+        analytics._mark_pending(metrics)
+
+        # Changes after the snapshot are not visible to the flush
+        metrics.total_requests = 2
+        forget = self.flush_hook(metrics_db)
+        assert metrics_db.scalar("SELECT total_requests FROM prompt_performance_metrics") == 1
+
+        # Marked again while the flush ran: stays pending for the next one
+        analytics._mark_pending(metrics)
+        forget()
+        assert analytics._get_pending("p1", 1) is metrics
+
+        self.flush_hook(metrics_db)()
+        assert metrics_db.scalar("SELECT total_requests FROM prompt_performance_metrics") == 2
+        assert analytics._get_pending("p1", 1) is None
+        assert analytics._write_pending_metrics(None) is None
+
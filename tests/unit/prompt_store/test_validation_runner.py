@@ -0,0 +1,221 @@
+"""Tests for the concurrent prompt validation runner.
+
+Covers concurrent suite execution against the local executor stand-in,
+per-case deadlines, the (content, case) result cache, streaming in
+completion order, version resolution, and the single-pass rule matcher.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from services.prompt_store.domain.prompts.service import PromptService
+from services.prompt_store.domain.validation.rules import RuleMatcher, prompt_rule_matcher
+from services.prompt_store.domain.validation.runner import LocalPromptExecutor, case_hash
+from services.prompt_store.domain.validation.service import ValidationService
+
+
+def create_prompt(content="Answer the question: {{input}}"):
+    return PromptService().create_entity({
+        "name": "qa", "category": "test", "content": content, "created_by": "test_user"
+    })
+
+
+def make_suite(count, **case_fields):
+    return {
+        "id": "suite_1",
+        "test_cases": [{"id": f"case_{i}", "name": f"Case {i}", "input": f"question {i}", **case_fields}
+                       for i in range(count)]
+    }
+
+
+class CountingResponder:
+    """Scripted model output that records the prompts it was given."""
+
+    def __init__(self, delays=None, output="The answer is 42"):
+        self.delays = delays or {}
+        self.output = output
+        self.prompts = []
+
+    async def __call__(self, prompt, test_case):
+        self.prompts.append(prompt)
+        await asyncio.sleep(self.delays.get(test_case["id"], 0))
+        return self.output
+
+
+@pytest.mark.unit
+class TestValidationRunner:
+    """Test concurrent execution, deadlines and caching."""
+
+    @pytest.mark.asyncio
+    async def test_suite_runs_cases_concurrently(self, prompt_store_db):
+        prompt = create_prompt()
+        responder = CountingResponder()
+        service = ValidationService(executor=LocalPromptExecutor(responder, latency_ms=50))
+
+        started = time.perf_counter()
+        result = await service.run_test_suite(prompt.id, prompt.version, make_suite(200))
+        elapsed = time.perf_counter() - started
+
+        # 200 sequential cases would take 10 seconds
+        assert elapsed < 2.0
+        assert result["passed_tests"] == 200
+        assert [r["test_case_id"] for r in result["test_results"]] == [f"case_{i}" for i in range(200)]
+        assert "Answer the question: question 7" in responder.prompts
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_is_respected(self, prompt_store_db):
+        prompt = create_prompt()
+        running, peak = 0, 0
+
+        async def responder(prompt_text, test_case):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return "ok"
+
+        service = ValidationService(executor=LocalPromptExecutor(responder))
+        suite = {**make_suite(20), "max_concurrency": 4}
+        await service.run_test_suite(prompt.id, prompt.version, suite)
+
+        assert peak == 4
+
+    @pytest.mark.asyncio
+    async def test_case_deadline(self, prompt_store_db):
+        prompt = create_prompt()
+        responder = CountingResponder(delays={"case_0": 5})
+        service = ValidationService(executor=LocalPromptExecutor(responder))
+        suite = {**make_suite(2), "case_timeout_ms": 50}
+
+        started = time.perf_counter()
+        result = await service.run_test_suite(prompt.id, prompt.version, suite)
+
+        assert time.perf_counter() - started < 1.0
+        slow, fast = result["test_results"]
+        assert not slow["passed"] and slow["error_message"] == "Timed out after 50 ms"
+        assert fast["passed"]
+
+    @pytest.mark.asyncio
+    async def test_results_are_cached_by_content_and_case(self, prompt_store_db):
+        prompt = create_prompt()
+        responder = CountingResponder()
+        service = ValidationService(executor=LocalPromptExecutor(responder))
+        suite = make_suite(3)
+
+        await service.run_test_suite(prompt.id, prompt.version, suite)
+        again = await service.run_test_suite(prompt.id, prompt.version, suite)
+        assert len(responder.prompts) == 3
+        assert again["cached_tests"] == 3
+
+        # Renaming a case does not change what it runs
+        renamed = {"id": "suite_2", "test_cases": [{**suite["test_cases"][0], "id": "other", "name": "Other"}]}
+        assert (await service.run_test_suite(prompt.id, prompt.version, renamed))["cached_tests"] == 1
+
+        # A new version has new content
+        updated = PromptService().update_prompt_content(prompt.id, "Reply briefly: {{input}}")
+        await service.run_test_suite(updated.id, updated.version, suite)
+        assert len(responder.prompts) == 6
+        assert responder.prompts[-1].startswith("Reply briefly")
+
+        # Older versions still resolve from the version history
+        old = await service.run_prompt_test(prompt.id, prompt.version, "suite_1", suite["test_cases"][0])
+        assert old.test_metadata["cached"]
+
+    @pytest.mark.asyncio
+    async def test_version_content_resolved_once_per_suite(self, prompt_store_db, monkeypatch):
+        prompt = create_prompt()
+        service = ValidationService(executor=LocalPromptExecutor(CountingResponder()))
+        lookups = []
+        resolve = service._get_version_content
+        monkeypatch.setattr(service, "_get_version_content",
+                            lambda prompt_id, version: lookups.append(version) or resolve(prompt_id, version))
+
+        result = await service.run_test_suite(prompt.id, prompt.version, make_suite(20))
+
+        assert result["passed_tests"] == 20
+        assert lookups == [prompt.version]
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self, prompt_store_db):
+        prompt = create_prompt()
+        calls = []
+
+        def responder(prompt_text, test_case):
+            calls.append(prompt_text)
+            if len(calls) == 1:
+                raise RuntimeError("model unavailable")
+            return "recovered"
+
+        service = ValidationService(executor=LocalPromptExecutor(responder))
+        case = make_suite(1)["test_cases"][0]
+
+        first = await service.run_prompt_test(prompt.id, prompt.version, "suite_1", case)
+        second = await service.run_prompt_test(prompt.id, prompt.version, "suite_1", case)
+
+        assert first.error_message == "Execution failed: model unavailable" and not first.passed
+        assert second.passed and not second.test_metadata["cached"]
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_in_completion_order(self, prompt_store_db):
+        prompt = create_prompt()
+        responder = CountingResponder(delays={"case_0": 0.2, "case_1": 0.1})
+        service = ValidationService(executor=LocalPromptExecutor(responder))
+
+        order = [index async for index, _ in service.stream_test_suite(prompt.id, prompt.version, make_suite(3))]
+
+        assert order == [2, 1, 0]
+
+    @pytest.mark.asyncio
+    async def test_scoring_uses_criteria_and_expected_output(self, prompt_store_db):
+        prompt = create_prompt()
+        service = ValidationService(executor=LocalPromptExecutor(lambda text, case: "The answer is 42"))
+        suite = {"id": "suite_1", "test_cases": [
+            {"id": "match", "input": "q", "expected_output": "The answer is 42"},
+            {"id": "keyword", "input": "q", "expected_criteria": {"required_keywords": ["because"]}},
+            {"id": "differs", "input": "q", "expected_output": "Nobody knows for sure, sorry"},
+        ]}
+
+        suite_result = await service.run_test_suite(prompt.id, prompt.version, suite)
+        results = {r["test_case_id"]: r for r in suite_result["test_results"]}
+
+        assert results["match"]["passed"] and results["match"]["expected_output_similarity"] == 1.0
+        assert not results["keyword"]["passed"] and results["keyword"]["output_quality_score"] == 0.9
+        assert not results["differs"]["passed"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_version(self, prompt_store_db):
+        prompt = create_prompt()
+        service = ValidationService()
+
+        with pytest.raises(ValueError):
+            await service.run_test_suite(prompt.id, 99, make_suite(2))
+
+
+@pytest.mark.unit
+class TestRuleMatcher:
+    """Test the single-pass lint and bias matcher."""
+
+    def test_overlapping_rules_all_match(self):
+        matcher = RuleMatcher([("word", ["class"]), ("phrase", ["working.class"])])
+        assert matcher.scan("The Working-class and the upper class") == {
+            "phrase": ["Working-class"], "word": ["class", "class"]
+        }
+
+    def test_matches_within_a_rule_do_not_overlap(self):
+        # Same result as re.findall(r"\b(class|elite|working.class)\b", ...)
+        matches = prompt_rule_matcher.scan("The working class elite")
+        assert matches["bias:socioeconomic:1"] == ["working class", "elite"]
+
+    def test_instruction_words_are_whole_words(self):
+        matches = prompt_rule_matcher.scan("Do not guess. Don't repeat this. Avoidance is fine.")
+        assert {"negative:do not", "negative:don't", "positive:do", "unclear_reference"} <= set(matches)
+        assert matches["positive:do"] == ["Do"]
+        assert "negative:avoid" not in matches
+
+    def test_case_hash_ignores_labels(self):
+        case = {"id": "a", "name": "A", "input": "x", "expected_criteria": {"min_length": 5}}
+        assert case_hash(case) == case_hash({**case, "id": "b", "timeout_ms": 10})
+        assert case_hash(case) != case_hash({**case, "input": "y"})